@@ -0,0 +1,68 @@
+"""Counts the connections opened by an `explore` run.
+
+Usage:
+    python benchmarks/connections.py --source <SOURCE-SECTION> --metadata <METADATA-SECTION>
+
+Every stage borrows its connections from the pools in `aeda.utils`, the number
+of connections `borrowed` is the number of connections that would have been
+opened without pooling.
+"""
+
+from datetime import datetime
+
+import typer
+from tabulate import tabulate
+
+from aeda import sql as _sql
+from aeda import utils as _utils
+
+app = typer.Typer()
+
+
+@app.command()
+def main(
+    source: str = typer.Option(..., help="Section of the source database."),
+    metadata: str = typer.Option(..., help="Section of the metadata database."),
+    pool_size: int = typer.Option(5, help="Size of the connection pools."),
+):
+    _utils.get_pool(source, size=pool_size)
+    _utils.get_pool(metadata, size=pool_size)
+
+    stages = [
+        ("columns", _sql.insert_or_update_columns),
+        ("tables", _sql.insert_or_update_tables),
+        ("uniques", _sql.insert_or_update_uniques),
+        ("data_values", _sql.insert_or_update_data_values),
+        ("dates", _sql.insert_or_update_dates),
+        ("stats", _sql.insert_or_update_stats),
+    ]
+    results = []
+    for name, stage in stages:
+        before = _utils.pool_stats()
+        start_time = datetime.now()
+        stage(source, metadata)
+        elapsed = datetime.now() - start_time
+        after = _utils.pool_stats()
+        for section in (source, metadata):
+            results.append(
+                [
+                    name,
+                    section,
+                    after[section]["opened"] - before[section]["opened"],
+                    after[section]["borrowed"] - before[section]["borrowed"],
+                    elapsed,
+                ]
+            )
+    _utils.close_pools()
+
+    print(
+        tabulate(
+            results,
+            headers=["stage", "section", "opened", "borrowed", "elapsed"],
+            tablefmt="pretty",
+        )
+    )
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,127 @@
+"""Times the reads and writes of a run on a sqlite3 metadata database, with and
+without the indexes and pragmas that `create_db` and `aeda.utils` set.
+
+Usage:
+    python benchmarks/metadata.py --tables 2000 --columns 50
+
+A synthetic metadata database of `tables` tables of `columns` columns is
+created in a temporary folder twice: once only with the primary keys and the
+default pragmas (`before`), and once as `create_db` creates it (`after`).
+"""
+
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import typer
+from tabulate import tabulate
+
+from aeda import utils as _utils
+from aeda.config import SQL_CREATE_SCRIPTS, SQL_SCRIPTS
+
+app = typer.Typer()
+
+DATA_TYPES = ["integer", "varchar", "real", "date", "text"]
+TABLE_KEY = ("localhost", "main", "source")
+
+
+def query(query_type: str) -> str:
+    return SQL_SCRIPTS[query_type]["sqlite3"]
+
+
+def create_metadata(path: Path, tuned: bool, tables: int, columns: int):
+    conn = sqlite3.connect(path)
+    if tuned:
+        _utils.set_sqlite_pragmas(conn, metadata=True)
+    with open(SQL_CREATE_SCRIPTS["sqlite3"], "r") as f:
+        scripts = f.read().split(";")
+    for script in scripts:
+        if not tuned and "CREATE INDEX" in script:
+            continue
+        conn.execute(script)
+    column_rows = [
+        TABLE_KEY + (f"table_{t}", f"column_{c}", c, DATA_TYPES[c % len(DATA_TYPES)])
+        for t in range(tables)
+        for c in range(columns)
+    ]
+    conn.executemany(query("upsert_into_columns"), column_rows)
+    conn.executemany(
+        query("upsert_into_tables"),
+        [TABLE_KEY + (f"table_{t}", columns, t * 1_000) for t in range(tables)],
+    )
+    conn.executemany(
+        query("upsert_into_uniques"),
+        [row + (c % 100, 0, 0.0) for c, row in enumerate(column_rows)],
+    )
+    conn.commit()
+    return conn
+
+
+def read_metadata(conn, tables: int, columns: int):
+    """Reads the metadata the stages read for every table and column."""
+    cursor = conn.cursor()
+    cursor.execute(query("get_tables").format(0), TABLE_KEY)
+    for _, _, _, table_name, _ in cursor.fetchall():
+        for query_type in [
+            "get_columns",
+            "get_data_values_columns",
+            "get_numeric_columns",
+            "get_date_columns",
+        ]:
+            cursor.execute(query(query_type), TABLE_KEY + (table_name,))
+            cursor.fetchall()
+        for c in range(columns):
+            cursor.execute(
+                query("get_distinct_values"),
+                TABLE_KEY + (table_name, f"column_{c}"),
+            )
+            cursor.fetchone()
+
+
+def write_metadata(conn, tables: int, columns: int):
+    """Writes the data values of every column and marks it done, committing
+    each column as the stages do."""
+    cursor = conn.cursor()
+    for t in range(tables):
+        for c in range(columns):
+            key = TABLE_KEY + (f"table_{t}", f"column_{c}")
+            cursor.executemany(
+                query("upsert_into_data_values"),
+                [key + (str(value), value) for value in range(10)],
+            )
+            cursor.execute(
+                query("insert_into_journal"),
+                TABLE_KEY + (f"table_{t}", "benchmark", "Data values", f"column_{c}"),
+            )
+            conn.commit()
+
+
+@app.command()
+def main(
+    tables: int = typer.Option(2_000, help="Number of tables."),
+    columns: int = typer.Option(50, help="Number of columns per table."),
+):
+    results = []
+    for name, tuned in [("before", False), ("after", True)]:
+        with tempfile.TemporaryDirectory() as folder:
+            conn = create_metadata(Path(folder) / "metadata.db", tuned, tables, columns)
+            row = [name]
+            for path in [read_metadata, write_metadata]:
+                start_time = time.perf_counter()
+                path(conn, tables, columns)
+                row.append(round(time.perf_counter() - start_time, 3))
+            conn.close()
+        results.append(row)
+
+    print(
+        tabulate(
+            results,
+            headers=["metadata", "read (s)", "write (s)"],
+            tablefmt="pretty",
+        )
+    )
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,229 @@
+"""Times the `insert_or_update_*` stages on synthetic sqlite3 sources at several
+scales, and compares the timings with a baseline to catch regressions.
+
+Usage:
+    python benchmarks/stages.py --scale 1 --scale 10 --output report.json
+    python benchmarks/stages.py --scale 1 --scale 10 --baseline report.json
+
+Every schema of `SCHEMAS` is created in a temporary folder for every scale,
+with a sqlite3 metadata database created by `create_database`, and the stages
+are run on it in order. The timings are written to `output` as JSON, by
+schema, scale and stage. With `baseline`, the stages that take more than
+`tolerance` times longer than in the baseline are reported and the command
+exits with status 1.
+"""
+
+import json
+import platform
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Union
+
+import typer
+from tabulate import tabulate
+
+from aeda import sql as _sql
+from aeda import utils as _utils
+
+app = typer.Typer()
+
+SOURCE = "benchmark-source"
+METADATA = "benchmark-metadata"
+DATA_TYPES = ["integer", "real", "varchar", "date"]
+# schema: scale -> (tables, columns, rows, high cardinality)
+SCHEMAS = {
+    "many_tables": lambda scale: (100 * scale, 5, 100, False),
+    "wide_tables": lambda scale: (2, min(100 * scale, 1_000), 1_000, False),
+    "big_tables": lambda scale: (1, 6, 100_000 * scale, False),
+    "high_cardinality": lambda scale: (1, 4, 20_000 * scale, True),
+}
+STAGES = [
+    ("columns", _sql.insert_or_update_columns),
+    ("tables", _sql.insert_or_update_tables),
+    ("uniques", _sql.insert_or_update_uniques),
+    ("data_values", _sql.insert_or_update_data_values),
+    ("dates", _sql.insert_or_update_dates),
+    ("stats", _sql.insert_or_update_stats),
+]
+
+
+def generate_value(rng: random.Random, data_type: str, cardinality: int):
+    """Returns a random value of `data_type` out of `cardinality` values."""
+    i = rng.randrange(cardinality)
+    if data_type == "integer":
+        return i
+    if data_type == "real":
+        return i / 4
+    if data_type == "varchar":
+        return f"value_{i}"
+    return (date(2000, 1, 1) + timedelta(days=i % 10_000)).isoformat()
+
+
+def create_source(
+    path: Path, tables: int, columns: int, rows: int, high_cardinality: bool
+):
+    """Creates a sqlite3 database of `tables` tables of `columns` columns and
+    `rows` rows, with about as many distinct values as rows in every column
+    if `high_cardinality` is set, and 20 otherwise. One in ten values is
+    null."""
+    rng = random.Random(42)
+    cardinality = 10 * rows if high_cardinality else 20
+    conn = sqlite3.connect(path)
+    for t in range(tables):
+        data_types = [DATA_TYPES[c % len(DATA_TYPES)] for c in range(columns)]
+        conn.execute(
+            f"create table table_{t} (id integer primary key, "
+            + ", ".join(f"column_{c} {data_types[c]}" for c in range(columns))
+            + ");"
+        )
+        insert = f"insert into table_{t} values (?{', ?' * columns});"
+        for start in range(0, rows, 10_000):
+            conn.executemany(
+                insert,
+                [
+                    (i,)
+                    + tuple(
+                        (
+                            None
+                            if rng.random() < 0.1
+                            else generate_value(rng, data_type, cardinality)
+                        )
+                        for data_type in data_types
+                    )
+                    for i in range(start, min(start + 10_000, rows))
+                ],
+            )
+        conn.commit()
+    conn.close()
+
+
+def use_databases(folder: Path):
+    """Points `aeda` to a `databases.ini` file with the source and the
+    metadata databases of `folder`."""
+    filename = folder / "databases.ini"
+    filename.write_text(f"""[{SOURCE}]
+db_engine = sqlite3
+host = localhost
+catalog = main
+schema = source
+folder = {folder}
+
+[{METADATA}]
+db_engine = sqlite3
+schema = metadata
+folder = {folder}
+metadata_database = yes
+""")
+    get_db_connection_string = _utils.CONFIG_REGISTRY.get
+    _utils.get_db_connection_string = lambda db_conf, filename=None: (
+        get_db_connection_string(db_conf, filename=folder / "databases.ini")
+    )
+
+
+def run_stages(schema: str, scale: int) -> dict:
+    """Returns the seconds of every stage on `schema` at `scale`."""
+    timings = {}
+    with tempfile.TemporaryDirectory() as folder:
+        create_source(Path(folder) / "source.db", *SCHEMAS[schema](scale))
+        use_databases(Path(folder))
+        _sql.create_database(METADATA)
+        for name, stage in STAGES:
+            start_time = time.perf_counter()
+            stage(SOURCE, METADATA)
+            timings[name] = round(time.perf_counter() - start_time, 3)
+        _utils.close_pools()
+    return timings
+
+
+def compare(report: dict, baseline: dict, tolerance: float, min_seconds: float) -> list:
+    """Returns `[schema, scale, stage, baseline, seconds, ratio, regression]`
+    of the stages of `report` that are in `baseline`.
+
+    A stage is a regression if it takes more than `tolerance` times longer
+    than in the baseline, and at least `min_seconds` more, so the noise of
+    the fastest stages isn't reported.
+    """
+    rows = []
+    for schema, scales in report["timings"].items():
+        for scale, stages in scales.items():
+            for stage, seconds in stages.items():
+                before = baseline["timings"].get(schema, {}).get(scale, {}).get(stage)
+                if before is None:
+                    continue
+                ratio = round(seconds / before, 2) if before > 0 else None
+                regression = (
+                    seconds > before * (1 + tolerance)
+                    and seconds - before >= min_seconds
+                )
+                rows.append([schema, scale, stage, before, seconds, ratio, regression])
+    return rows
+
+
+@app.command()
+def main(
+    scale: list[int] = typer.Option([1, 10], help="Scales of the schemas."),
+    schema: list[str] = typer.Option(
+        list(SCHEMAS), help=f"Schemas to run, of {', '.join(SCHEMAS)}."
+    ),
+    output: Path = typer.Option(
+        Path("benchmark.json"), help="JSON file of the timings."
+    ),
+    baseline: Union[Path, None] = typer.Option(
+        None, help="JSON file of the timings to compare with."
+    ),
+    tolerance: float = typer.Option(
+        0.2, help="Slowdown over the baseline reported as a regression."
+    ),
+    min_seconds: float = typer.Option(
+        0.05, help="Seconds over the baseline ignored as noise."
+    ),
+):
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "timings": {},
+    }
+    results = []
+    for schema_name in schema:
+        for s in scale:
+            timings = run_stages(schema_name, s)
+            report["timings"].setdefault(schema_name, {})[str(s)] = timings
+            results.append([schema_name, s] + list(timings.values()))
+    output.write_text(json.dumps(report, indent=2))
+
+    print(
+        tabulate(
+            results,
+            headers=["schema", "scale"] + [f"{name} (s)" for name, _ in STAGES],
+            tablefmt="pretty",
+        )
+    )
+    if baseline is None:
+        return
+    rows = compare(report, json.loads(baseline.read_text()), tolerance, min_seconds)
+    print(
+        tabulate(
+            rows,
+            headers=[
+                "schema",
+                "scale",
+                "stage",
+                "baseline (s)",
+                "seconds",
+                "ratio",
+                "regression",
+            ],
+            tablefmt="pretty",
+        )
+    )
+    if any(row[-1] for row in rows):
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
@@ -2,10 +2,25 @@ import logging
 from datetime import datetime
 
 import typer
+from tabulate import tabulate
 
+from aeda import exports as _exports
+from aeda import files as _files
+from aeda import hooks as _hooks
+from aeda import querylog as _querylog
+from aeda import session as _session
 from aeda import sql as _sql
 from aeda import utils as _utils
-from aeda.config import EXPLORATION_LEVELS, SUPPORTED_DB_ENGINES, ExplorationLevel
+from aeda.config import (
+    EXPLORATION_LEVELS,
+    FETCH_SIZE,
+    HLL_PRECISION,
+    KLL_K,
+    PARTITION_MIN_ROWS,
+    SAMPLE_MIN_ROWS,
+    SUPPORTED_DB_ENGINES,
+    ExplorationLevel,
+)
 
 FORMAT = "%(asctime)-15s %(message)s"
 logging.basicConfig(level=logging.INFO, format=FORMAT)
@@ -41,9 +56,62 @@ def explore(
     metadata: str = typer.Option(..., help="Metadata database connection string."),
     level: str = typer.Option("server", help="Exploration level."),
     overwrite: bool = typer.Option(True, help="Overwrite existing metadata."),
+    overwrite_stats: bool = typer.Option(
+        False, help="Overwrite the existing stats too."
+    ),
     threshold: int = typer.Option(5_000, help="Threshold for data values."),
     min_n_rows: int = typer.Option(0, help="Minimum number of rows for data_values."),
     percentiles: bool = typer.Option(False, help="Compute percentiles."),
+    workers: int = typer.Option(1, help="Number of tables profiled concurrently."),
+    fused: bool = typer.Option(False, help="Read each small table only once."),
+    fetch_size: int = typer.Option(
+        FETCH_SIZE, help="Rows fetched at a time when reading tables."
+    ),
+    approx_distinct: bool = typer.Option(
+        False, help="Approximate distinct counts of big tables."
+    ),
+    hll_precision: int = typer.Option(
+        HLL_PRECISION, help="Precision of the HyperLogLog sketches."
+    ),
+    top_k: int = typer.Option(
+        0, help="Most frequent values stored for columns above the threshold."
+    ),
+    sketch_percentiles: bool = typer.Option(
+        False, help="Estimate percentiles with KLL sketches."
+    ),
+    kll_k: int = typer.Option(KLL_K, help="Accuracy of the KLL sketches."),
+    sample: float = typer.Option(
+        0, help="Fraction or number of rows profiled of the big tables."
+    ),
+    sample_min_rows: int = typer.Option(
+        SAMPLE_MIN_ROWS, help="Minimum number of rows of the tables sampled."
+    ),
+    sample_table: list[str] = typer.Option(
+        [], help="Sample of a table as TABLE=SAMPLE, can be repeated."
+    ),
+    incremental: bool = typer.Option(False, help="Skip the unchanged tables."),
+    checksum: bool = typer.Option(
+        False, help="Add a checksum of the rows to the fingerprints."
+    ),
+    resume: str = typer.Option(None, help="Identifier of the run to resume."),
+    partitions: int = typer.Option(
+        1, help="Key ranges profiled concurrently of the big tables."
+    ),
+    partition_min_rows: int = typer.Option(
+        PARTITION_MIN_ROWS, help="Minimum number of rows of the tables split."
+    ),
+    write_behind: bool = typer.Option(
+        False, help="Write the metadata in batches from a background thread."
+    ),
+    export: str = typer.Option(
+        None, help="Export the metadata after the run, e.g. parquet:/path."
+    ),
+    query_log: bool = typer.Option(
+        False, help="Log every query of the run to the query_log table."
+    ),
+    trace: str = typer.Option(
+        None, help="Write a Chrome trace of the run to a JSON file."
+    ),
 ):
     """
     Parameters:
@@ -55,11 +123,53 @@ def explore(
 
         overwrite (bool): Overwrite metadata information.
 
+        overwrite_stats (bool): Overwrite the existing stats too, they are kept by default even with `overwrite`.
+
         threshold (int): Maximum unique values to store in data values.
 
         min_n_rows (int): Minimum number of rows for a table to be processed.
 
         percentiles (bool): Compute percentiles.
+
+        workers (int): Number of tables profiled concurrently, each with its own connection to the source.
+
+        fused (bool): Compute uniques, data values, dates and stats of the small tables from a single read of each table.
+
+        fetch_size (int): Number of rows fetched at a time when the rows of a table are read on the client.
+
+        approx_distinct (bool): Approximate the distinct values of the tables profiled on the server side.
+
+        hll_precision (int): Precision of the HyperLogLog sketches, used when the source has no native approximate distinct count.
+
+        top_k (int): Number of most frequent values stored in data values for the columns with more unique values than the threshold, 0 to skip them.
+
+        sketch_percentiles (bool): Estimate the percentiles with KLL sketches built in a single pass of each table.
+
+        kll_k (int): Accuracy of the KLL sketches, the rank error of the percentiles is about 1.65 / kll_k.
+
+        sample (float): Sample profiled of the tables with at least `sample_min_rows` rows, a fraction of their rows if it's less than 1 or a number of rows otherwise, 0 to profile all the rows.
+
+        sample_min_rows (int): Minimum number of rows of the tables profiled from a sample.
+
+        sample_table (list[str]): Sample of specific tables as `TABLE=SAMPLE`, overriding `sample` and `sample_min_rows`.
+
+        incremental (bool): Skip the tables whose number of rows, last modification and checksum haven't changed since they were profiled, overwriting the metadata of the ones that changed.
+
+        checksum (bool): Add an aggregate checksum of the rows to the fingerprint of the tables, reading all their rows.
+
+        resume (str): Identifier of a previous run, logged when it started, to continue it skipping the stages, tables and columns it completed.
+
+        partitions (int): Number of key ranges the tables with at least `partition_min_rows` rows are split in, each profiled concurrently with its own connection to the source.
+
+        partition_min_rows (int): Minimum number of rows of the tables split in key ranges.
+
+        write_behind (bool): Write the metadata from a background thread with its own connection, committing in batches while the source is queried.
+
+        export (str): Where the metadata of the schema is exported from the metadata database when the run finishes, `parquet:<path>` for a directory of Parquet files partitioned by server, catalog and schema.
+
+        query_log (bool): Log the template, target table and column, latency and rows of every query run on the source and the metadata to the `query_log` table of the metadata, see `aeda report`.
+
+        trace (str): JSON file the stages, tables and queries of the run are written to as Chrome trace events, to open in a timeline viewer like Perfetto or chrome://tracing.
     """
 
     db_engine_source = source
@@ -77,47 +187,136 @@ def explore(
 
     _utils.check_database_connections(conn_string_source, conn_string_metadata)
 
+    sample_tables = {}
+    for table_sample in sample_table:
+        table_name, _, value = table_sample.rpartition("=")
+        assert table_name, f"{table_sample} is not TABLE=SAMPLE."
+        sample_tables[table_name] = float(value)
+
+    metadata_export = _exports.get_export(export) if export else None
+    hooks = [_hooks.ChromeTrace(trace)] if trace else []
+
     start_time = datetime.now()
 
-    if level == "server":
-        _sql.insert_or_update_columns(
-            db_engine_source, db_engine_metadata, overwrite=overwrite
-        )
-        _sql.insert_or_update_tables(
-            db_engine_source, db_engine_metadata, overwrite=overwrite
-        )
-        _sql.insert_or_update_uniques(
-            db_engine_source,
-            db_engine_metadata,
-            overwrite=overwrite,
-            min_n_rows=min_n_rows,
-        )
-        _sql.insert_or_update_data_values(
-            db_engine_source,
-            db_engine_metadata,
-            overwrite=overwrite,
-            threshold=threshold,
-            min_n_rows=min_n_rows,
-        )
-        _sql.insert_or_update_dates(
-            db_engine_source,
-            db_engine_metadata,
-            overwrite=overwrite,
-            min_n_rows=min_n_rows,
-        )
-        _sql.insert_or_update_stats(
-            db_engine_source,
-            db_engine_metadata,
-            with_percentiles=percentiles,
-            min_n_rows=min_n_rows,
-        )
+    session = _session.ProfilingSession(
+        db_engine_source,
+        db_engine_metadata,
+        overwrite=overwrite,
+        overwrite_stats=overwrite_stats,
+        threshold=threshold,
+        min_n_rows=min_n_rows,
+        with_percentiles=percentiles,
+        workers=workers,
+        fetch_size=fetch_size,
+        approx_distinct=approx_distinct,
+        hll_precision=hll_precision,
+        top_k=top_k,
+        sketch_percentiles=sketch_percentiles,
+        kll_k=kll_k,
+        sample=sample,
+        sample_min_rows=sample_min_rows,
+        sample_tables=sample_tables,
+        incremental=incremental,
+        checksum=checksum,
+        run_id=resume,
+        partitions=partitions,
+        partition_min_rows=partition_min_rows,
+        write_behind=write_behind,
+        query_log=query_log,
+        hooks=hooks,
+    )
+    logger.info(f"Run {session.run_id}, resume it with --resume {session.run_id}")
+    try:
+        if level == "server" and session.source_engine == "file":
+            _files.profile_columns(session)
+            _files.profile_tables(session)
+            _files.profile_files(session)
+        elif level == "server":
+            _sql.profile_columns(session)
+            _sql.profile_tables(session)
+            table_rows = _sql.profile_sampled(session)
+            table_rows = _sql.profile_partitioned(session, table_rows=table_rows)
+            if fused:
+                _sql.profile_fused(session, table_rows=table_rows)
+            else:
+                _sql.profile_uniques(session, table_rows=table_rows)
+                _sql.profile_data_values(session, table_rows=table_rows)
+                _sql.profile_dates(session, table_rows=table_rows)
+                _sql.profile_stats(session, table_rows=table_rows)
+        if metadata_export is not None:
+            session.flush()
+            with session.in_stage("Export"):
+                metadata_export.export(session)
+    finally:
+        session.close()
+        for section, stats in _utils.pool_stats().items():
+            logger.info(
+                f"{section}: {stats['opened']:,} connections opened, {stats['borrowed']:,} borrowed"
+            )
+        _utils.close_pools()
 
     logger.info(f"Profiled in: {datetime.now() - start_time}")
+    if trace:
+        logger.info(f"Trace of the run written to {trace}")
     logger.info("Done!")
 
     return
 
 
+@app.command()
+def report(
+    metadata: str = typer.Option(..., help="Metadata database connection string."),
+    run_id: str = typer.Option(None, help="Identifier of the run."),
+    top: int = typer.Option(20, help="Number of slowest queries."),
+):
+    """Prints the slowest queries of a run explored with `--query-log` and
+    the time spent by each stage on the source and the metadata.
+
+    Args:
+        metadata (str): Metadata database with the query log of the run.
+        run_id (str): Identifier of the run, logged when it started. Defaults to the last run with a query log.
+        top (int): Number of slowest queries printed.
+    """
+    run_id, rows = _sql.get_query_log(metadata, run_id)
+    if len(rows) == 0:
+        logger.warning(f"No queries logged for the run {run_id}")
+        return
+
+    print(f"Slowest queries of the run {run_id}")
+    print(
+        tabulate(
+            _querylog.slowest_queries(rows, top),
+            headers=[
+                "seconds",
+                "database",
+                "stage",
+                "query",
+                "table",
+                "column",
+                "rows",
+            ],
+            tablefmt="pretty",
+        )
+    )
+    print(f"Time per stage of the run {run_id}")
+    print(
+        tabulate(
+            _querylog.stage_breakdown(rows),
+            headers=[
+                "stage",
+                "queries",
+                "source (s)",
+                "metadata (s)",
+                "total (s)",
+                "rows",
+            ],
+            tablefmt="pretty",
+        )
+    )
+
+    return
+
+
 @app.command()
 def test_connections(connection_names: list[str]):
     """Test if a list of connections are responding.
@@ -17,6 +17,8 @@ SUPPORTED_DB_ENGINES = [
     "aurora",
     "saphana",
     "saphana_odbc",
+    "file",
+    "duckdb",
 ]
 
 
@@ -38,6 +40,7 @@ SQL_CREATE_SCRIPTS = {
     "mssqlserver": SQL_SCRIPTS_DIR / "mssqlserver" / "mssqlserver.sql",
     "mariadb": SQL_SCRIPTS_DIR / "mariadb" / "mariadb.sql",
     "snowflake": SQL_SCRIPTS_DIR / "snowflake" / "snowflake.sql",
+    "duckdb": SQL_SCRIPTS_DIR / "duckdb" / "duckdb.sql",
 }
 
 DATA_TYPES = {
@@ -50,6 +53,7 @@ DATA_TYPES = {
         "timestamp_ntz",
         "timestamp_tz",
         "timestamp_ltz",
+        "timestamp with time zone",
     ],
     "numeric_types": [
         "int",
@@ -62,6 +66,12 @@ DATA_TYPES = {
         "bigint",
         "smallint",
         "real",
+        "double",
+        "hugeint",
+        "ubigint",
+        "uinteger",
+        "usmallint",
+        "utinyint",
     ],
     "filter_types": [
         "text",
@@ -83,17 +93,103 @@ DATA_TYPES = {
 
 # MAX_LENGTH_VALUES is the length of the `data_values.data_value` column.
 MAX_LENGTH_VALUES = 255
+# Columns, after SERVER_NAME, TABLE_CATALOG and TABLE_SCHEMA, that identify the
+# metadata replaced at once by the `delete_from_*` query of each table.
+METADATA_KEYS = {
+    "columns": ("TABLE_NAME", "COLUMN_NAME"),
+    "tables": ("TABLE_NAME",),
+    "uniques": ("TABLE_NAME",),
+    "data_values": ("TABLE_NAME", "COLUMN_NAME"),
+    "dates": ("TABLE_NAME", "COLUMN_NAME"),
+    "stats": ("TABLE_NAME", "COLUMN_NAME"),
+}
+# Metadata tables with a single row per key, whose rows are replaced by their
+# `upsert_into_*` query without deleting them first.
+SINGLE_ROW_METADATA = ["columns", "tables", "stats"]
+
+# Connection pool defaults, `pool_size` can be overwritten per section in the
+# `databases.ini` file.
+POOL_SIZE = 5
+# Seconds a connection can stay idle in the pool before being closed.
+POOL_MAX_IDLE = 300
+# Seconds a connection can stay idle before being pinged when borrowed.
+POOL_HEALTH_CHECK = 30
+
+# Number of rows fetched at a time when the rows of a table are streamed.
+FETCH_SIZE = 10_000
+
+# Parameters of the sqlite3 sections of the `databases.ini` file that can be
+# left out, the server and catalog names of the tables in the metadata.
+SQLITE_DEFAULTS = {"host": "localhost", "catalog": "main"}
+# Pragmas of the connections to sqlite3 databases, a page cache of 64 MB and up
+# to 256 MB of the database file mapped in memory.
+SQLITE_PRAGMAS = {"cache_size": -64_000, "mmap_size": 268_435_456}
+# Pragmas of the sqlite3 metadata databases, written in WAL mode so readers
+# don't block the writer, syncing to disk only at checkpoints.
+SQLITE_METADATA_PRAGMAS = {"journal_mode": "WAL", "synchronous": "NORMAL"}
+
+# Precision of the HyperLogLog sketches used to approximate distinct counts,
+# with 2 ** 14 registers the relative standard error is about 0.8%.
+HLL_PRECISION = 14
+# Accuracy of the KLL sketches used to approximate percentiles, with 200 the
+# rank error of the percentiles is about 0.8%.
+KLL_K = 200
+# Relative error of the native approximate distinct counts of each engine. The
+# HyperLogLog of `approx_count_distinct` of DuckDB has only 64 registers.
+APPROX_DISTINCT_ERRORS = {
+    "snowflake": 0.0162,
+    "mssqlserver": 0.02,
+    "saphana": 0.02,
+    "saphana_odbc": 0.02,
+    "duckdb": 0.13,
+}
+# Minimum number of rows of the tables profiled from a sample with `--sample`.
+SAMPLE_MIN_ROWS = 1_000_000
+# Minimum number of rows of the tables split in key ranges with `--partitions`.
+PARTITION_MIN_ROWS = 1_000_000
+# Rows and seconds after which the write-behind writer of the metadata commits,
+# and number of writes it queues before the stages wait for it.
+WRITER_BATCH_ROWS = 50_000
+WRITER_BATCH_SECONDS = 1.0
+WRITER_QUEUE_SIZE = 1_000
+
+# Inserts of at least these rows are loaded into a postgres metadata database
+# with `COPY`, the smaller ones with `execute_values` in pages of rows.
+POSTGRES_COPY_MIN_ROWS = 1_000
+POSTGRES_PAGE_SIZE = 1_000
+# Rows of the multi-row inserts into a duckdb metadata database, which runs
+# `executemany` a statement at a time.
+DUCKDB_PAGE_SIZE = 1_000
+
+# Formats of the files of the `file` sources, by suffix, and number of bytes
+# of the blocks the CSV files are parsed in.
+FILE_FORMATS = {".csv": "csv", ".parquet": "parquet"}
+CSV_BLOCK_SIZE = 1 << 20
 
 SQL_SCRIPTS = {
+    "ping": {
+        "mysql": """select 1;""",
+        "postgres": """select 1;""",
+        "snowflake": """select 1;""",
+        "sqlite3": """select 1;""",
+        "mssqlserver": """select 1;""",
+        "mariadb": """select 1;""",
+        "aurora": """select 1;""",
+        "saphana": """select 1 from dummy;""",
+        "saphana_odbc": """select 1 from dummy;""",
+        "duckdb": """select 1;""",
+    },
     "columns": {
         "mysql": """SELECT %s AS SERVER_NAME, C.TABLE_CATALOG, C.TABLE_SCHEMA, C.TABLE_NAME, C.COLUMN_NAME, C.ORDINAL_POSITION, C.DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS AS C INNER JOIN INFORMATION_SCHEMA.TABLES AS T ON C.TABLE_CATALOG = T.TABLE_CATALOG AND C.TABLE_SCHEMA = T.TABLE_SCHEMA AND C.TABLE_NAME = T.TABLE_NAME AND T.TABLE_TYPE = 'BASE TABLE' AND T.TABLE_CATALOG = %s AND T.TABLE_SCHEMA = %s;""",
         "postgres": """SELECT %s AS SERVER_NAME, C.TABLE_CATALOG, C.TABLE_SCHEMA, C.TABLE_NAME, C.COLUMN_NAME, C.ORDINAL_POSITION, C.DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS AS C INNER JOIN INFORMATION_SCHEMA.TABLES AS T ON C.TABLE_CATALOG = T.TABLE_CATALOG AND C.TABLE_SCHEMA = T.TABLE_SCHEMA AND C.TABLE_NAME = T.TABLE_NAME AND T.TABLE_TYPE = 'BASE TABLE' AND T.TABLE_CATALOG = %s AND T.TABLE_SCHEMA = %s;""",
         "snowflake": """SELECT %s AS SERVER_NAME, C.TABLE_CATALOG, C.TABLE_SCHEMA, C.TABLE_NAME, C.COLUMN_NAME, C.ORDINAL_POSITION, C.DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS AS C INNER JOIN INFORMATION_SCHEMA.TABLES AS T ON C.TABLE_CATALOG = T.TABLE_CATALOG AND C.TABLE_SCHEMA = T.TABLE_SCHEMA AND C.TABLE_NAME = T.TABLE_NAME AND T.TABLE_TYPE = 'BASE TABLE' AND T.TABLE_CATALOG = %s AND T.TABLE_SCHEMA = %s;""",
+        "sqlite3": """SELECT ? AS SERVER_NAME, ? AS TABLE_CATALOG, ? AS TABLE_SCHEMA, T.NAME AS TABLE_NAME, C.NAME AS COLUMN_NAME, C.CID + 1 AS ORDINAL_POSITION, lower(trim(case when instr(C.TYPE, '(') > 0 then substr(C.TYPE, 1, instr(C.TYPE, '(') - 1) else C.TYPE end)) AS DATA_TYPE FROM sqlite_master AS T INNER JOIN pragma_table_info(T.NAME) AS C WHERE T.TYPE = 'table' AND T.NAME NOT LIKE 'sqlite_%';""",
         "mssqlserver": """SELECT ? AS SERVER_NAME, C.TABLE_CATALOG, C.TABLE_SCHEMA, C.TABLE_NAME, C.COLUMN_NAME, C.ORDINAL_POSITION, C.DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS AS C INNER JOIN INFORMATION_SCHEMA.TABLES AS T ON C.TABLE_CATALOG = T.TABLE_CATALOG AND C.TABLE_SCHEMA = T.TABLE_SCHEMA AND C.TABLE_NAME = T.TABLE_NAME AND T.TABLE_TYPE = 'BASE TABLE' AND T.TABLE_CATALOG = ? AND T.TABLE_SCHEMA = ?;""",
         "mariadb": """SELECT ? AS SERVER_NAME, C.TABLE_CATALOG, C.TABLE_SCHEMA, C.TABLE_NAME, C.COLUMN_NAME, C.ORDINAL_POSITION, C.DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS AS C INNER JOIN INFORMATION_SCHEMA.TABLES AS T ON C.TABLE_CATALOG = T.TABLE_CATALOG AND C.TABLE_SCHEMA = T.TABLE_SCHEMA AND C.TABLE_NAME = T.TABLE_NAME AND T.TABLE_TYPE = 'BASE TABLE' AND T.TABLE_CATALOG = ? AND T.TABLE_SCHEMA = ?;""",
         "aurora": """SELECT %s AS SERVER_NAME, C.TABLE_CATALOG, C.TABLE_SCHEMA, C.TABLE_NAME, C.COLUMN_NAME, C.ORDINAL_POSITION, C.DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS AS C INNER JOIN INFORMATION_SCHEMA.TABLES AS T ON C.TABLE_CATALOG = T.TABLE_CATALOG AND C.TABLE_SCHEMA = T.TABLE_SCHEMA AND C.TABLE_NAME = T.TABLE_NAME AND T.TABLE_TYPE = 'BASE TABLE' AND T.TABLE_CATALOG = %s AND T.TABLE_SCHEMA = %s;""",
         "saphana": """SELECT ? AS SERVER_NAME, ? AS TABLE_CATALOG, C.SCHEMA_NAME AS TABLE_SCHEMA, C.TABLE_NAME, C.COLUMN_NAME, C.POSITION AS ORDINAL_POSITION, C.DATA_TYPE_NAME AS DATA_TYPE FROM table_columns AS C WHERE schema_name = ?;""",
         "saphana_odbc": """SELECT ? AS SERVER_NAME, ? AS TABLE_CATALOG, C.SCHEMA_NAME AS TABLE_SCHEMA, C.TABLE_NAME, C.COLUMN_NAME, C.POSITION AS ORDINAL_POSITION, C.DATA_TYPE_NAME AS DATA_TYPE FROM table_columns AS C WHERE schema_name = ?;""",
+        "duckdb": """SELECT ? AS SERVER_NAME, C.TABLE_CATALOG, C.TABLE_SCHEMA, C.TABLE_NAME, C.COLUMN_NAME, C.ORDINAL_POSITION, regexp_replace(C.DATA_TYPE, '\\(.*\\)', '') AS DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS AS C INNER JOIN INFORMATION_SCHEMA.TABLES AS T ON C.TABLE_CATALOG = T.TABLE_CATALOG AND C.TABLE_SCHEMA = T.TABLE_SCHEMA AND C.TABLE_NAME = T.TABLE_NAME AND T.TABLE_TYPE = 'BASE TABLE' AND T.TABLE_CATALOG = ? AND T.TABLE_SCHEMA = ?;""",
     },
     "insert_into_columns": {
         "mysql": """insert into columns (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE) values (%s, %s, %s, %s, %s, %s, %s);""",
@@ -102,6 +198,7 @@ SQL_SCRIPTS = {
         "sqlite3": """insert into columns (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE) values (?, ?, ?, ?, ?, ?, ?);""",
         "mssqlserver": """insert into columns (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE) values (?, ?, ?, ?, ?, ?, ?);""",
         "mariadb": """insert into columns (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE) values (?, ?, ?, ?, ?, ?, ?);""",
+        "duckdb": """insert into columns (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE) values (?, ?, ?, ?, ?, ?, ?);""",
     },
     "insert_into_tables": {
         "mysql": """insert into tables (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, N_COLUMNS, N_ROWS) values (%s, %s, %s, %s, %s, %s);""",
@@ -110,14 +207,16 @@ SQL_SCRIPTS = {
         "sqlite3": """insert into tables (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, N_COLUMNS, N_ROWS) values (?, ?, ?, ?, ?, ?);""",
         "mssqlserver": """insert into tables (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, N_COLUMNS, N_ROWS) values (?, ?, ?, ?, ?, ?);""",
         "mariadb": """insert into tables (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, N_COLUMNS, N_ROWS) values (?, ?, ?, ?, ?, ?);""",
+        "duckdb": """insert into tables (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, N_COLUMNS, N_ROWS) values (?, ?, ?, ?, ?, ?);""",
     },
     "insert_into_uniques": {
-        "mysql": """insert into uniques (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES) values (%s, %s, %s, %s, %s, %s, %s, %s, %s)""",
-        "postgres": """insert into uniques (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES) values (%s, %s, %s, %s, %s, %s, %s, %s, %s)""",
-        "snowflake": """insert into uniques (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES) values (%s, %s, %s, %s, %s, %s, %s, %s, %s)""",
-        "sqlite3": """insert into uniques (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES) values (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        "mssqlserver": """insert into uniques (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES) values (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        "mariadb": """insert into uniques (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES) values (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        "mysql": """insert into uniques (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES, DISTINCT_VALUES_ERROR) values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+        "postgres": """insert into uniques (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES, DISTINCT_VALUES_ERROR) values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+        "snowflake": """insert into uniques (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES, DISTINCT_VALUES_ERROR) values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+        "sqlite3": """insert into uniques (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES, DISTINCT_VALUES_ERROR) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        "mssqlserver": """insert into uniques (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES, DISTINCT_VALUES_ERROR) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        "mariadb": """insert into uniques (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES, DISTINCT_VALUES_ERROR) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        "duckdb": """insert into uniques (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES, DISTINCT_VALUES_ERROR) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
     },
     "insert_into_data_values": {
         "mysql": """insert into data_values (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) values (%s, %s, %s, %s, %s, %s, %s);""",
@@ -126,6 +225,7 @@ SQL_SCRIPTS = {
         "sqlite3": """insert or ignore into data_values (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) values (?, ?, ?, ?, ?, ?, ?);""",
         "mssqlserver": """insert into data_values (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) values (?, ?, ?, ?, ?, ?, ?);""",
         "mariadb": """insert into data_values (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) values (?, ?, ?, ?, ?, ?, ?);""",
+        "duckdb": """insert into data_values (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) values (?, ?, ?, ?, ?, ?, ?);""",
     },
     "insert_into_dates": {
         "mysql": """INSERT INTO dates (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) VALUES (%s, %s, %s, %s, %s, %s, %s)""",
@@ -134,6 +234,7 @@ SQL_SCRIPTS = {
         "sqlite3": """INSERT INTO dates (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) VALUES (?, ?, ?, ?, ?, ?, ?)""",
         "mssqlserver": """INSERT INTO dates (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) VALUES (?, ?, ?, ?, ?, ?, ?)""",
         "mariadb": """INSERT INTO dates (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        "duckdb": """INSERT INTO dates (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) VALUES (?, ?, ?, ?, ?, ?, ?)""",
     },
     "insert_into_stats": {
         "mysql": """insert into stats (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, AVG, STDEV, VAR, SUM, MAX, MIN, `RANGE`) values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);""",
@@ -142,6 +243,61 @@ SQL_SCRIPTS = {
         "sqlite3": """insert into stats (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, AVG, STDEV, VAR, SUM, MAX, MIN, "RANGE") values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);""",
         "mssqlserver": """insert into stats (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, AVG, STDEV, VAR, SUM, MAX, MIN, "RANGE") values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);""",
         "mariadb": """insert into stats (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, AVG, STDEV, VAR, SUM, MAX, MIN, `RANGE`) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);""",
+        "duckdb": """insert into stats (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, AVG, STDEV, VAR, SUM, MAX, MIN, "RANGE") values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);""",
+    },
+    "upsert_into_columns": {
+        "mysql": """insert into columns (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE) values (%s, %s, %s, %s, %s, %s, %s) on duplicate key update ORDINAL_POSITION = VALUES(ORDINAL_POSITION), DATA_TYPE = VALUES(DATA_TYPE);""",
+        "postgres": """insert into columns (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE) values (%s, %s, %s, %s, %s, %s, %s) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME) do update set ORDINAL_POSITION = excluded.ORDINAL_POSITION, DATA_TYPE = excluded.DATA_TYPE;""",
+        "snowflake": """MERGE INTO columns AS t USING (SELECT %s AS SERVER_NAME, %s AS TABLE_CATALOG, %s AS TABLE_SCHEMA, %s AS TABLE_NAME, %s AS COLUMN_NAME, %s AS ORDINAL_POSITION, %s AS DATA_TYPE) AS s ON t.SERVER_NAME = s.SERVER_NAME AND t.TABLE_CATALOG = s.TABLE_CATALOG AND t.TABLE_SCHEMA = s.TABLE_SCHEMA AND t.TABLE_NAME = s.TABLE_NAME AND t.COLUMN_NAME = s.COLUMN_NAME WHEN MATCHED THEN UPDATE SET ORDINAL_POSITION = s.ORDINAL_POSITION, DATA_TYPE = s.DATA_TYPE WHEN NOT MATCHED THEN INSERT (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE) VALUES (s.SERVER_NAME, s.TABLE_CATALOG, s.TABLE_SCHEMA, s.TABLE_NAME, s.COLUMN_NAME, s.ORDINAL_POSITION, s.DATA_TYPE);""",
+        "sqlite3": """insert into columns (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE) values (?, ?, ?, ?, ?, ?, ?) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME) do update set ORDINAL_POSITION = excluded.ORDINAL_POSITION, DATA_TYPE = excluded.DATA_TYPE;""",
+        "mssqlserver": """MERGE INTO columns AS t USING (VALUES (?, ?, ?, ?, ?, ?, ?)) AS s (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE) ON t.SERVER_NAME = s.SERVER_NAME AND t.TABLE_CATALOG = s.TABLE_CATALOG AND t.TABLE_SCHEMA = s.TABLE_SCHEMA AND t.TABLE_NAME = s.TABLE_NAME AND t.COLUMN_NAME = s.COLUMN_NAME WHEN MATCHED THEN UPDATE SET ORDINAL_POSITION = s.ORDINAL_POSITION, DATA_TYPE = s.DATA_TYPE WHEN NOT MATCHED THEN INSERT (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE) VALUES (s.SERVER_NAME, s.TABLE_CATALOG, s.TABLE_SCHEMA, s.TABLE_NAME, s.COLUMN_NAME, s.ORDINAL_POSITION, s.DATA_TYPE);""",
+        "mariadb": """insert into columns (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE) values (?, ?, ?, ?, ?, ?, ?) on duplicate key update ORDINAL_POSITION = VALUES(ORDINAL_POSITION), DATA_TYPE = VALUES(DATA_TYPE);""",
+        "duckdb": """insert into columns (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE) values (?, ?, ?, ?, ?, ?, ?) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME) do update set ORDINAL_POSITION = excluded.ORDINAL_POSITION, DATA_TYPE = excluded.DATA_TYPE;""",
+    },
+    "upsert_into_tables": {
+        "mysql": """insert into tables (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, N_COLUMNS, N_ROWS) values (%s, %s, %s, %s, %s, %s) on duplicate key update N_COLUMNS = VALUES(N_COLUMNS), N_ROWS = VALUES(N_ROWS), SAMPLE_ROWS = NULL, SAMPLE_ERROR = NULL;""",
+        "postgres": """insert into tables (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, N_COLUMNS, N_ROWS) values (%s, %s, %s, %s, %s, %s) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME) do update set N_COLUMNS = excluded.N_COLUMNS, N_ROWS = excluded.N_ROWS, SAMPLE_ROWS = NULL, SAMPLE_ERROR = NULL;""",
+        "snowflake": """MERGE INTO tables AS t USING (SELECT %s AS SERVER_NAME, %s AS TABLE_CATALOG, %s AS TABLE_SCHEMA, %s AS TABLE_NAME, %s AS N_COLUMNS, %s AS N_ROWS) AS s ON t.SERVER_NAME = s.SERVER_NAME AND t.TABLE_CATALOG = s.TABLE_CATALOG AND t.TABLE_SCHEMA = s.TABLE_SCHEMA AND t.TABLE_NAME = s.TABLE_NAME WHEN MATCHED THEN UPDATE SET N_COLUMNS = s.N_COLUMNS, N_ROWS = s.N_ROWS, SAMPLE_ROWS = NULL, SAMPLE_ERROR = NULL WHEN NOT MATCHED THEN INSERT (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, N_COLUMNS, N_ROWS) VALUES (s.SERVER_NAME, s.TABLE_CATALOG, s.TABLE_SCHEMA, s.TABLE_NAME, s.N_COLUMNS, s.N_ROWS);""",
+        "sqlite3": """insert into tables (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, N_COLUMNS, N_ROWS) values (?, ?, ?, ?, ?, ?) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME) do update set N_COLUMNS = excluded.N_COLUMNS, N_ROWS = excluded.N_ROWS, SAMPLE_ROWS = NULL, SAMPLE_ERROR = NULL;""",
+        "mssqlserver": """MERGE INTO tables AS t USING (VALUES (?, ?, ?, ?, ?, ?)) AS s (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, N_COLUMNS, N_ROWS) ON t.SERVER_NAME = s.SERVER_NAME AND t.TABLE_CATALOG = s.TABLE_CATALOG AND t.TABLE_SCHEMA = s.TABLE_SCHEMA AND t.TABLE_NAME = s.TABLE_NAME WHEN MATCHED THEN UPDATE SET N_COLUMNS = s.N_COLUMNS, N_ROWS = s.N_ROWS, SAMPLE_ROWS = NULL, SAMPLE_ERROR = NULL WHEN NOT MATCHED THEN INSERT (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, N_COLUMNS, N_ROWS) VALUES (s.SERVER_NAME, s.TABLE_CATALOG, s.TABLE_SCHEMA, s.TABLE_NAME, s.N_COLUMNS, s.N_ROWS);""",
+        "mariadb": """insert into tables (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, N_COLUMNS, N_ROWS) values (?, ?, ?, ?, ?, ?) on duplicate key update N_COLUMNS = VALUES(N_COLUMNS), N_ROWS = VALUES(N_ROWS), SAMPLE_ROWS = NULL, SAMPLE_ERROR = NULL;""",
+        "duckdb": """insert into tables (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, N_COLUMNS, N_ROWS) values (?, ?, ?, ?, ?, ?) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME) do update set N_COLUMNS = excluded.N_COLUMNS, N_ROWS = excluded.N_ROWS, SAMPLE_ROWS = NULL, SAMPLE_ERROR = NULL;""",
+    },
+    "upsert_into_uniques": {
+        "mysql": """insert into uniques (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES, DISTINCT_VALUES_ERROR) values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) on duplicate key update ORDINAL_POSITION = VALUES(ORDINAL_POSITION), DATA_TYPE = VALUES(DATA_TYPE), DISTINCT_VALUES = VALUES(DISTINCT_VALUES), NULL_VALUES = VALUES(NULL_VALUES), DISTINCT_VALUES_ERROR = VALUES(DISTINCT_VALUES_ERROR);""",
+        "postgres": """insert into uniques (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES, DISTINCT_VALUES_ERROR) values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME) do update set ORDINAL_POSITION = excluded.ORDINAL_POSITION, DATA_TYPE = excluded.DATA_TYPE, DISTINCT_VALUES = excluded.DISTINCT_VALUES, NULL_VALUES = excluded.NULL_VALUES, DISTINCT_VALUES_ERROR = excluded.DISTINCT_VALUES_ERROR;""",
+        "snowflake": """MERGE INTO uniques AS t USING (SELECT %s AS SERVER_NAME, %s AS TABLE_CATALOG, %s AS TABLE_SCHEMA, %s AS TABLE_NAME, %s AS COLUMN_NAME, %s AS ORDINAL_POSITION, %s AS DATA_TYPE, %s AS DISTINCT_VALUES, %s AS NULL_VALUES, %s AS DISTINCT_VALUES_ERROR) AS s ON t.SERVER_NAME = s.SERVER_NAME AND t.TABLE_CATALOG = s.TABLE_CATALOG AND t.TABLE_SCHEMA = s.TABLE_SCHEMA AND t.TABLE_NAME = s.TABLE_NAME AND t.COLUMN_NAME = s.COLUMN_NAME WHEN MATCHED THEN UPDATE SET ORDINAL_POSITION = s.ORDINAL_POSITION, DATA_TYPE = s.DATA_TYPE, DISTINCT_VALUES = s.DISTINCT_VALUES, NULL_VALUES = s.NULL_VALUES, DISTINCT_VALUES_ERROR = s.DISTINCT_VALUES_ERROR WHEN NOT MATCHED THEN INSERT (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES, DISTINCT_VALUES_ERROR) VALUES (s.SERVER_NAME, s.TABLE_CATALOG, s.TABLE_SCHEMA, s.TABLE_NAME, s.COLUMN_NAME, s.ORDINAL_POSITION, s.DATA_TYPE, s.DISTINCT_VALUES, s.NULL_VALUES, s.DISTINCT_VALUES_ERROR);""",
+        "sqlite3": """insert into uniques (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES, DISTINCT_VALUES_ERROR) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME) do update set ORDINAL_POSITION = excluded.ORDINAL_POSITION, DATA_TYPE = excluded.DATA_TYPE, DISTINCT_VALUES = excluded.DISTINCT_VALUES, NULL_VALUES = excluded.NULL_VALUES, DISTINCT_VALUES_ERROR = excluded.DISTINCT_VALUES_ERROR;""",
+        "mssqlserver": """MERGE INTO uniques AS t USING (VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)) AS s (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES, DISTINCT_VALUES_ERROR) ON t.SERVER_NAME = s.SERVER_NAME AND t.TABLE_CATALOG = s.TABLE_CATALOG AND t.TABLE_SCHEMA = s.TABLE_SCHEMA AND t.TABLE_NAME = s.TABLE_NAME AND t.COLUMN_NAME = s.COLUMN_NAME WHEN MATCHED THEN UPDATE SET ORDINAL_POSITION = s.ORDINAL_POSITION, DATA_TYPE = s.DATA_TYPE, DISTINCT_VALUES = s.DISTINCT_VALUES, NULL_VALUES = s.NULL_VALUES, DISTINCT_VALUES_ERROR = s.DISTINCT_VALUES_ERROR WHEN NOT MATCHED THEN INSERT (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES, DISTINCT_VALUES_ERROR) VALUES (s.SERVER_NAME, s.TABLE_CATALOG, s.TABLE_SCHEMA, s.TABLE_NAME, s.COLUMN_NAME, s.ORDINAL_POSITION, s.DATA_TYPE, s.DISTINCT_VALUES, s.NULL_VALUES, s.DISTINCT_VALUES_ERROR);""",
+        "mariadb": """insert into uniques (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES, DISTINCT_VALUES_ERROR) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) on duplicate key update ORDINAL_POSITION = VALUES(ORDINAL_POSITION), DATA_TYPE = VALUES(DATA_TYPE), DISTINCT_VALUES = VALUES(DISTINCT_VALUES), NULL_VALUES = VALUES(NULL_VALUES), DISTINCT_VALUES_ERROR = VALUES(DISTINCT_VALUES_ERROR);""",
+        "duckdb": """insert into uniques (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, DATA_TYPE, DISTINCT_VALUES, NULL_VALUES, DISTINCT_VALUES_ERROR) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME) do update set ORDINAL_POSITION = excluded.ORDINAL_POSITION, DATA_TYPE = excluded.DATA_TYPE, DISTINCT_VALUES = excluded.DISTINCT_VALUES, NULL_VALUES = excluded.NULL_VALUES, DISTINCT_VALUES_ERROR = excluded.DISTINCT_VALUES_ERROR;""",
+    },
+    "upsert_into_data_values": {
+        "mysql": """insert into data_values (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) values (%s, %s, %s, %s, %s, %s, %s) on duplicate key update FREQUENCY_NUMBER = VALUES(FREQUENCY_NUMBER);""",
+        "postgres": """insert into data_values (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) values (%s, %s, %s, %s, %s, %s, %s) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE) do update set FREQUENCY_NUMBER = excluded.FREQUENCY_NUMBER;""",
+        "snowflake": """MERGE INTO data_values AS t USING (SELECT %s AS SERVER_NAME, %s AS TABLE_CATALOG, %s AS TABLE_SCHEMA, %s AS TABLE_NAME, %s AS COLUMN_NAME, %s AS DATA_VALUE, %s AS FREQUENCY_NUMBER) AS s ON t.SERVER_NAME = s.SERVER_NAME AND t.TABLE_CATALOG = s.TABLE_CATALOG AND t.TABLE_SCHEMA = s.TABLE_SCHEMA AND t.TABLE_NAME = s.TABLE_NAME AND t.COLUMN_NAME = s.COLUMN_NAME AND t.DATA_VALUE = s.DATA_VALUE WHEN MATCHED THEN UPDATE SET FREQUENCY_NUMBER = s.FREQUENCY_NUMBER WHEN NOT MATCHED THEN INSERT (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) VALUES (s.SERVER_NAME, s.TABLE_CATALOG, s.TABLE_SCHEMA, s.TABLE_NAME, s.COLUMN_NAME, s.DATA_VALUE, s.FREQUENCY_NUMBER);""",
+        "sqlite3": """insert into data_values (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) values (?, ?, ?, ?, ?, ?, ?) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE) do update set FREQUENCY_NUMBER = excluded.FREQUENCY_NUMBER;""",
+        "mssqlserver": """MERGE INTO data_values AS t USING (VALUES (?, ?, ?, ?, ?, ?, ?)) AS s (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) ON t.SERVER_NAME = s.SERVER_NAME AND t.TABLE_CATALOG = s.TABLE_CATALOG AND t.TABLE_SCHEMA = s.TABLE_SCHEMA AND t.TABLE_NAME = s.TABLE_NAME AND t.COLUMN_NAME = s.COLUMN_NAME AND t.DATA_VALUE = s.DATA_VALUE WHEN MATCHED THEN UPDATE SET FREQUENCY_NUMBER = s.FREQUENCY_NUMBER WHEN NOT MATCHED THEN INSERT (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) VALUES (s.SERVER_NAME, s.TABLE_CATALOG, s.TABLE_SCHEMA, s.TABLE_NAME, s.COLUMN_NAME, s.DATA_VALUE, s.FREQUENCY_NUMBER);""",
+        "mariadb": """insert into data_values (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) values (?, ?, ?, ?, ?, ?, ?) on duplicate key update FREQUENCY_NUMBER = VALUES(FREQUENCY_NUMBER);""",
+        "duckdb": """insert into data_values (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) values (?, ?, ?, ?, ?, ?, ?) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE) do update set FREQUENCY_NUMBER = excluded.FREQUENCY_NUMBER;""",
+    },
+    "upsert_into_dates": {
+        "mysql": """insert into dates (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) values (%s, %s, %s, %s, %s, %s, %s) on duplicate key update FREQUENCY_NUMBER = VALUES(FREQUENCY_NUMBER);""",
+        "postgres": """insert into dates (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) values (%s, %s, %s, %s, %s, %s, %s) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE) do update set FREQUENCY_NUMBER = excluded.FREQUENCY_NUMBER;""",
+        "snowflake": """MERGE INTO dates AS t USING (SELECT %s AS SERVER_NAME, %s AS TABLE_CATALOG, %s AS TABLE_SCHEMA, %s AS TABLE_NAME, %s AS COLUMN_NAME, %s AS DATA_VALUE, %s AS FREQUENCY_NUMBER) AS s ON t.SERVER_NAME = s.SERVER_NAME AND t.TABLE_CATALOG = s.TABLE_CATALOG AND t.TABLE_SCHEMA = s.TABLE_SCHEMA AND t.TABLE_NAME = s.TABLE_NAME AND t.COLUMN_NAME = s.COLUMN_NAME AND t.DATA_VALUE = s.DATA_VALUE WHEN MATCHED THEN UPDATE SET FREQUENCY_NUMBER = s.FREQUENCY_NUMBER WHEN NOT MATCHED THEN INSERT (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) VALUES (s.SERVER_NAME, s.TABLE_CATALOG, s.TABLE_SCHEMA, s.TABLE_NAME, s.COLUMN_NAME, s.DATA_VALUE, s.FREQUENCY_NUMBER);""",
+        "sqlite3": """insert into dates (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) values (?, ?, ?, ?, ?, ?, ?) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE) do update set FREQUENCY_NUMBER = excluded.FREQUENCY_NUMBER;""",
+        "mssqlserver": """MERGE INTO dates AS t USING (VALUES (?, ?, ?, ?, ?, ?, ?)) AS s (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) ON t.SERVER_NAME = s.SERVER_NAME AND t.TABLE_CATALOG = s.TABLE_CATALOG AND t.TABLE_SCHEMA = s.TABLE_SCHEMA AND t.TABLE_NAME = s.TABLE_NAME AND t.COLUMN_NAME = s.COLUMN_NAME AND t.DATA_VALUE = s.DATA_VALUE WHEN MATCHED THEN UPDATE SET FREQUENCY_NUMBER = s.FREQUENCY_NUMBER WHEN NOT MATCHED THEN INSERT (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) VALUES (s.SERVER_NAME, s.TABLE_CATALOG, s.TABLE_SCHEMA, s.TABLE_NAME, s.COLUMN_NAME, s.DATA_VALUE, s.FREQUENCY_NUMBER);""",
+        "mariadb": """insert into dates (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) values (?, ?, ?, ?, ?, ?, ?) on duplicate key update FREQUENCY_NUMBER = VALUES(FREQUENCY_NUMBER);""",
+        "duckdb": """insert into dates (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER) values (?, ?, ?, ?, ?, ?, ?) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE) do update set FREQUENCY_NUMBER = excluded.FREQUENCY_NUMBER;""",
+    },
+    "upsert_into_stats": {
+        "mysql": """insert into stats (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, AVG, STDEV, VAR, SUM, MAX, MIN, `RANGE`) values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) on duplicate key update AVG = VALUES(AVG), STDEV = VALUES(STDEV), VAR = VALUES(VAR), SUM = VALUES(SUM), MAX = VALUES(MAX), MIN = VALUES(MIN), `RANGE` = VALUES(`RANGE`), P01 = NULL, P025 = NULL, P05 = NULL, P10 = NULL, Q1 = NULL, Q2 = NULL, Q3 = NULL, P90 = NULL, P95 = NULL, P975 = NULL, P99 = NULL, IQR = NULL;""",
+        "postgres": """insert into stats (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, AVG, STDEV, VAR, SUM, MAX, MIN, "RANGE") values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME) do update set AVG = excluded.AVG, STDEV = excluded.STDEV, VAR = excluded.VAR, SUM = excluded.SUM, MAX = excluded.MAX, MIN = excluded.MIN, "RANGE" = excluded."RANGE", P01 = NULL, P025 = NULL, P05 = NULL, P10 = NULL, Q1 = NULL, Q2 = NULL, Q3 = NULL, P90 = NULL, P95 = NULL, P975 = NULL, P99 = NULL, IQR = NULL;""",
+        "snowflake": """MERGE INTO stats AS t USING (SELECT %s AS SERVER_NAME, %s AS TABLE_CATALOG, %s AS TABLE_SCHEMA, %s AS TABLE_NAME, %s AS COLUMN_NAME, %s AS AVG, %s AS STDEV, %s AS VAR, %s AS SUM, %s AS MAX, %s AS MIN, %s AS "RANGE") AS s ON t.SERVER_NAME = s.SERVER_NAME AND t.TABLE_CATALOG = s.TABLE_CATALOG AND t.TABLE_SCHEMA = s.TABLE_SCHEMA AND t.TABLE_NAME = s.TABLE_NAME AND t.COLUMN_NAME = s.COLUMN_NAME WHEN MATCHED THEN UPDATE SET AVG = s.AVG, STDEV = s.STDEV, VAR = s.VAR, SUM = s.SUM, MAX = s.MAX, MIN = s.MIN, "RANGE" = s."RANGE", P01 = NULL, P025 = NULL, P05 = NULL, P10 = NULL, Q1 = NULL, Q2 = NULL, Q3 = NULL, P90 = NULL, P95 = NULL, P975 = NULL, P99 = NULL, IQR = NULL WHEN NOT MATCHED THEN INSERT (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, AVG, STDEV, VAR, SUM, MAX, MIN, "RANGE") VALUES (s.SERVER_NAME, s.TABLE_CATALOG, s.TABLE_SCHEMA, s.TABLE_NAME, s.COLUMN_NAME, s.AVG, s.STDEV, s.VAR, s.SUM, s.MAX, s.MIN, s."RANGE");""",
+        "sqlite3": """insert into stats (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, AVG, STDEV, VAR, SUM, MAX, MIN, "RANGE") values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME) do update set AVG = excluded.AVG, STDEV = excluded.STDEV, VAR = excluded.VAR, SUM = excluded.SUM, MAX = excluded.MAX, MIN = excluded.MIN, "RANGE" = excluded."RANGE", P01 = NULL, P025 = NULL, P05 = NULL, P10 = NULL, Q1 = NULL, Q2 = NULL, Q3 = NULL, P90 = NULL, P95 = NULL, P975 = NULL, P99 = NULL, IQR = NULL;""",
+        "mssqlserver": """MERGE INTO stats AS t USING (VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)) AS s (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, AVG, STDEV, VAR, SUM, MAX, MIN, "RANGE") ON t.SERVER_NAME = s.SERVER_NAME AND t.TABLE_CATALOG = s.TABLE_CATALOG AND t.TABLE_SCHEMA = s.TABLE_SCHEMA AND t.TABLE_NAME = s.TABLE_NAME AND t.COLUMN_NAME = s.COLUMN_NAME WHEN MATCHED THEN UPDATE SET AVG = s.AVG, STDEV = s.STDEV, VAR = s.VAR, SUM = s.SUM, MAX = s.MAX, MIN = s.MIN, "RANGE" = s."RANGE", P01 = NULL, P025 = NULL, P05 = NULL, P10 = NULL, Q1 = NULL, Q2 = NULL, Q3 = NULL, P90 = NULL, P95 = NULL, P975 = NULL, P99 = NULL, IQR = NULL WHEN NOT MATCHED THEN INSERT (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, AVG, STDEV, VAR, SUM, MAX, MIN, "RANGE") VALUES (s.SERVER_NAME, s.TABLE_CATALOG, s.TABLE_SCHEMA, s.TABLE_NAME, s.COLUMN_NAME, s.AVG, s.STDEV, s.VAR, s.SUM, s.MAX, s.MIN, s."RANGE");""",
+        "mariadb": """insert into stats (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, AVG, STDEV, VAR, SUM, MAX, MIN, `RANGE`) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) on duplicate key update AVG = VALUES(AVG), STDEV = VALUES(STDEV), VAR = VALUES(VAR), SUM = VALUES(SUM), MAX = VALUES(MAX), MIN = VALUES(MIN), `RANGE` = VALUES(`RANGE`), P01 = NULL, P025 = NULL, P05 = NULL, P10 = NULL, Q1 = NULL, Q2 = NULL, Q3 = NULL, P90 = NULL, P95 = NULL, P975 = NULL, P99 = NULL, IQR = NULL;""",
+        "duckdb": """insert into stats (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, AVG, STDEV, VAR, SUM, MAX, MIN, "RANGE") values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME) do update set AVG = excluded.AVG, STDEV = excluded.STDEV, VAR = excluded.VAR, SUM = excluded.SUM, MAX = excluded.MAX, MIN = excluded.MIN, "RANGE" = excluded."RANGE", P01 = NULL, P025 = NULL, P05 = NULL, P10 = NULL, Q1 = NULL, Q2 = NULL, Q3 = NULL, P90 = NULL, P95 = NULL, P975 = NULL, P99 = NULL, IQR = NULL;""",
     },
     "check_if_column_exists": {
         "mysql": """select * from columns WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s;""",
@@ -150,6 +306,7 @@ SQL_SCRIPTS = {
         "sqlite3": """select * from columns WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mssqlserver": """select * from columns WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mariadb": """select * from columns WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
+        "duckdb": """select * from columns WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
     },
     "check_if_table_exists": {
         "mysql": """select * from tables WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s;""",
@@ -158,6 +315,7 @@ SQL_SCRIPTS = {
         "sqlite3": """select * from tables WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
         "mssqlserver": """select * from tables WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
         "mariadb": """select * from tables WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
+        "duckdb": """select * from tables WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
     },
     "check_if_unique_exists": {
         "mysql": """select * from uniques WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s;""",
@@ -166,6 +324,7 @@ SQL_SCRIPTS = {
         "sqlite3": """select * from uniques WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
         "mssqlserver": """select * from uniques WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
         "mariadb": """select * from uniques WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
+        "duckdb": """select * from uniques WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
     },
     "check_if_data_value_exists": {
         "mysql": """select * from data_values WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s;""",
@@ -174,6 +333,7 @@ SQL_SCRIPTS = {
         "sqlite3": """select * from data_values WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mssqlserver": """select * from data_values WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mariadb": """select * from data_values WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
+        "duckdb": """select * from data_values WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
     },
     "check_if_dates_exists": {
         "mysql": """select * from dates WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s;""",
@@ -182,6 +342,7 @@ SQL_SCRIPTS = {
         "sqlite3": """select * from dates WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mssqlserver": """select * from dates WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mariadb": """select * from dates WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
+        "duckdb": """select * from dates WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
     },
     "check_if_stats_exists": {
         "mysql": """select * from stats WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s;""",
@@ -190,6 +351,25 @@ SQL_SCRIPTS = {
         "sqlite3": """select * from stats WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mssqlserver": """select * from stats WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mariadb": """select * from stats WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
+        "duckdb": """select * from stats WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
+    },
+    "get_metadata_keys": {
+        "mysql": """select distinct {1} from {0} WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s;""",
+        "postgres": """select distinct {1} from {0} WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s;""",
+        "snowflake": """select distinct {1} from {0} WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s;""",
+        "sqlite3": """select distinct {1} from {0} WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ?;""",
+        "mssqlserver": """select distinct {1} from {0} WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ?;""",
+        "mariadb": """select distinct {1} from {0} WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ?;""",
+        "duckdb": """select distinct {1} from {0} WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ?;""",
+    },
+    "get_metadata_rows": {
+        "mysql": """select * from {} WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s;""",
+        "postgres": """select * from {} WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s;""",
+        "snowflake": """select * from {} WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s;""",
+        "sqlite3": """select * from {} WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ?;""",
+        "mssqlserver": """select * from {} WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ?;""",
+        "mariadb": """select * from {} WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ?;""",
+        "duckdb": """select * from {} WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ?;""",
     },
     "delete_from_columns": {
         "mysql": """delete from columns WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s;""",
@@ -198,6 +378,7 @@ SQL_SCRIPTS = {
         "sqlite3": """delete from columns WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mssqlserver": """delete from columns WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mariadb": """delete from columns WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
+        "duckdb": """delete from columns WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
     },
     "delete_from_tables": {
         "mysql": """delete from tables WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s;""",
@@ -206,6 +387,7 @@ SQL_SCRIPTS = {
         "sqlite3": """delete from tables WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
         "mssqlserver": """delete from tables WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
         "mariadb": """delete from tables WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
+        "duckdb": """delete from tables WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
     },
     "delete_from_uniques": {
         "mysql": """delete from uniques WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s;""",
@@ -214,6 +396,7 @@ SQL_SCRIPTS = {
         "sqlite3": """delete from uniques WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
         "mssqlserver": """delete from uniques WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
         "mariadb": """delete from uniques WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
+        "duckdb": """delete from uniques WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
     },
     "delete_from_data_values": {
         "mysql": """delete from data_values WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s;""",
@@ -222,6 +405,7 @@ SQL_SCRIPTS = {
         "sqlite3": """delete from data_values WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mssqlserver": """delete from data_values WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mariadb": """delete from data_values WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
+        "duckdb": """delete from data_values WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
     },
     "delete_from_dates": {
         "mysql": """delete from dates WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s;""",
@@ -230,6 +414,7 @@ SQL_SCRIPTS = {
         "sqlite3": """delete from dates WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mssqlserver": """delete from dates WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mariadb": """delete from dates WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
+        "duckdb": """delete from dates WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
     },
     "delete_from_stats": {
         "mysql": """delete from stats WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s;""",
@@ -238,6 +423,7 @@ SQL_SCRIPTS = {
         "sqlite3": """delete from stats WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mssqlserver": """delete from stats WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mariadb": """delete from stats WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
+        "duckdb": """delete from stats WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
     },
     "tables": {
         "mysql": """select distinct SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME from columns where SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s;""",
@@ -246,26 +432,31 @@ SQL_SCRIPTS = {
         "sqlite3": """select distinct SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME from columns where SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ?;""",
         "mssqlserver": """select distinct SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME from columns where SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ?;""",
         "mariadb": """select distinct SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME from columns where SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ?;""",
+        "duckdb": """select distinct SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME from columns where SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ?;""",
     },
     "number_of_columns": {
         "mysql": """SELECT %s AS SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COUNT(*) AS N_COLUMNS, NULL AS N_ROWS FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s GROUP BY TABLE_CATALOG , TABLE_SCHEMA , TABLE_NAME ORDER BY 1,2,3,4;""",
         "postgres": """SELECT %s AS SERVER_NAME , TABLE_CATALOG , TABLE_SCHEMA , TABLE_NAME , COUNT(*) AS N_COLUMNS , NULL AS N_ROWS FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s GROUP BY TABLE_CATALOG , TABLE_SCHEMA , TABLE_NAME ORDER BY 1,2,3,4;""",
         "snowflake": """SELECT %s AS SERVER_NAME , TABLE_CATALOG , TABLE_SCHEMA , TABLE_NAME , COUNT(*) AS N_COLUMNS , NULL AS N_ROWS FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s GROUP BY TABLE_CATALOG , TABLE_SCHEMA , TABLE_NAME ORDER BY 1,2,3,4;""",
+        "sqlite3": """SELECT ? AS SERVER_NAME , ? AS TABLE_CATALOG , ? AS TABLE_SCHEMA , T.NAME AS TABLE_NAME , COUNT(*) AS N_COLUMNS , NULL AS N_ROWS FROM sqlite_master AS T INNER JOIN pragma_table_info(T.NAME) AS C WHERE T.TYPE = 'table' AND T.NAME = ? GROUP BY T.NAME;""",
         "mssqlserver": """SELECT ? AS SERVER_NAME , TABLE_CATALOG , TABLE_SCHEMA , TABLE_NAME , COUNT(*) AS N_COLUMNS , NULL AS N_ROWS FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? GROUP BY TABLE_CATALOG , TABLE_SCHEMA , TABLE_NAME ORDER BY 1,2,3,4;""",
         "mariadb": """SELECT ? AS SERVER_NAME , TABLE_CATALOG , TABLE_SCHEMA , TABLE_NAME , COUNT(*) AS N_COLUMNS , NULL AS N_ROWS FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? GROUP BY TABLE_CATALOG , TABLE_SCHEMA , TABLE_NAME ORDER BY 1,2,3,4;""",
         "aurora": """SELECT %s AS SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COUNT(*) AS N_COLUMNS, NULL AS N_ROWS FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s GROUP BY TABLE_CATALOG , TABLE_SCHEMA , TABLE_NAME ORDER BY 1,2,3,4;""",
         "saphana": """SELECT ? AS SERVER_NAME , ? AS TABLE_CATALOG , SCHEMA_NAME AS TABLE_SCHEMA , TABLE_NAME , COUNT(*) AS N_COLUMNS , NULL AS N_ROWS FROM TABLE_COLUMNS WHERE SCHEMA_NAME = ? AND TABLE_NAME = ? GROUP BY SCHEMA_NAME , TABLE_NAME ORDER BY 1,2,3,4;""",
         "saphana_odbc": """SELECT ? AS SERVER_NAME , ? AS TABLE_CATALOG , SCHEMA_NAME AS TABLE_SCHEMA , TABLE_NAME , COUNT(*) AS N_COLUMNS , NULL AS N_ROWS FROM TABLE_COLUMNS WHERE SCHEMA_NAME = ? AND TABLE_NAME = ? GROUP BY SCHEMA_NAME , TABLE_NAME ORDER BY 1,2,3,4;""",
+        "duckdb": """SELECT ? AS SERVER_NAME , TABLE_CATALOG , TABLE_SCHEMA , TABLE_NAME , COUNT(*) AS N_COLUMNS , NULL AS N_ROWS FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? GROUP BY TABLE_CATALOG , TABLE_SCHEMA , TABLE_NAME ORDER BY 1,2,3,4;""",
     },
     "number_of_rows": {
         "mysql": """select count(*) as n from `{}`.`{}`""",
         "postgres": """select count(*) as n from {}.{}""",
         "snowflake": """select count(*) as n from {}."{}";""",
+        "sqlite3": """select count(*) as n from "{1}";""",
         "mssqlserver": """select count(*) as n from {}.{}""",
         "mariadb": """select count(*) as n from {}.{}""",
         "aurora": """select count(*) as n from `{}`.`{}`""",
         "saphana": '''select count(*) as n from {}."{}"''',
         "saphana_odbc": '''select count(*) as n from {}."{}"''',
+        "duckdb": """select count(*) as n from {}.{}""",
     },
     "update_tables": {
         "mysql": """UPDATE tables SET N_ROWS = %s WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s;""",
@@ -274,6 +465,149 @@ SQL_SCRIPTS = {
         "sqlite3": """UPDATE tables SET N_ROWS = ? WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
         "mssqlserver": """UPDATE tables SET N_ROWS = ? WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
         "mariadb": """UPDATE tables SET N_ROWS = ? WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
+        "duckdb": """UPDATE tables SET N_ROWS = ? WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
+    },
+    "update_table_sample": {
+        "mysql": """UPDATE tables SET SAMPLE_ROWS = %s, SAMPLE_ERROR = %s WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s;""",
+        "postgres": """UPDATE tables SET SAMPLE_ROWS = %s, SAMPLE_ERROR = %s WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s;""",
+        "snowflake": """UPDATE tables SET SAMPLE_ROWS = %s, SAMPLE_ERROR = %s WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s;""",
+        "sqlite3": """UPDATE tables SET SAMPLE_ROWS = ?, SAMPLE_ERROR = ? WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
+        "mssqlserver": """UPDATE tables SET SAMPLE_ROWS = ?, SAMPLE_ERROR = ? WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
+        "mariadb": """UPDATE tables SET SAMPLE_ROWS = ?, SAMPLE_ERROR = ? WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
+        "duckdb": """UPDATE tables SET SAMPLE_ROWS = ?, SAMPLE_ERROR = ? WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
+    },
+    "last_modified": {
+        "mysql": """select UPDATE_TIME from INFORMATION_SCHEMA.TABLES where TABLE_SCHEMA = %s and TABLE_NAME = %s;""",
+        "postgres": """select n_tup_ins + n_tup_upd + n_tup_del from pg_stat_user_tables where schemaname = %s and relname = %s;""",
+        "snowflake": """select LAST_ALTERED from INFORMATION_SCHEMA.TABLES where TABLE_SCHEMA = %s and TABLE_NAME = %s;""",
+        "mssqlserver": """select max(last_user_update) from sys.dm_db_index_usage_stats where database_id = db_id() and object_id = object_id(? + '.' + ?);""",
+        "mariadb": """select UPDATE_TIME from INFORMATION_SCHEMA.TABLES where TABLE_SCHEMA = ? and TABLE_NAME = ?;""",
+        "aurora": """select UPDATE_TIME from INFORMATION_SCHEMA.TABLES where TABLE_SCHEMA = %s and TABLE_NAME = %s;""",
+        "saphana": """select LAST_MODIFY_TIME from M_TABLE_STATISTICS where SCHEMA_NAME = ? and TABLE_NAME = ?;""",
+        "saphana_odbc": """select LAST_MODIFY_TIME from M_TABLE_STATISTICS where SCHEMA_NAME = ? and TABLE_NAME = ?;""",
+    },
+    "table_checksum": {
+        "mysql": """checksum table `{0}`.`{1}`;""",
+        "postgres": """select sum(hashtext(t::text)::bigint) from {0}.{1} as t;""",
+        "snowflake": """select hash_agg(*) from {0}."{1}";""",
+        "mssqlserver": """select checksum_agg(binary_checksum(*)) from {0}.{1};""",
+        "mariadb": """checksum table {0}.{1};""",
+        "aurora": """checksum table `{0}`.`{1}`;""",
+        "duckdb": """select sum(hash(t)) from {0}.{1} as t;""",
+    },
+    "get_fingerprint": {
+        "mysql": """select N_ROWS, LAST_MODIFIED, CHECKSUM from fingerprints WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND STAGE = %s;""",
+        "postgres": """select N_ROWS, LAST_MODIFIED, CHECKSUM from fingerprints WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND STAGE = %s;""",
+        "snowflake": """select N_ROWS, LAST_MODIFIED, CHECKSUM from fingerprints WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND STAGE = %s;""",
+        "sqlite3": """select N_ROWS, LAST_MODIFIED, CHECKSUM from fingerprints WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND STAGE = ?;""",
+        "mssqlserver": """select N_ROWS, LAST_MODIFIED, CHECKSUM from fingerprints WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND STAGE = ?;""",
+        "mariadb": """select N_ROWS, LAST_MODIFIED, CHECKSUM from fingerprints WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND STAGE = ?;""",
+        "duckdb": """select N_ROWS, LAST_MODIFIED, CHECKSUM from fingerprints WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND STAGE = ?;""",
+    },
+    "delete_from_fingerprints": {
+        "mysql": """DELETE FROM fingerprints WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND STAGE = %s;""",
+        "postgres": """DELETE FROM fingerprints WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND STAGE = %s;""",
+        "snowflake": """DELETE FROM fingerprints WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND STAGE = %s;""",
+        "sqlite3": """DELETE FROM fingerprints WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND STAGE = ?;""",
+        "mssqlserver": """DELETE FROM fingerprints WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND STAGE = ?;""",
+        "mariadb": """DELETE FROM fingerprints WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND STAGE = ?;""",
+        "duckdb": """DELETE FROM fingerprints WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND STAGE = ?;""",
+    },
+    "insert_into_fingerprints": {
+        "mysql": """insert into fingerprints (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE, N_ROWS, LAST_MODIFIED, CHECKSUM) values (%s, %s, %s, %s, %s, %s, %s, %s);""",
+        "postgres": """insert into fingerprints (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE, N_ROWS, LAST_MODIFIED, CHECKSUM) values (%s, %s, %s, %s, %s, %s, %s, %s);""",
+        "snowflake": """insert into fingerprints (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE, N_ROWS, LAST_MODIFIED, CHECKSUM) values (%s, %s, %s, %s, %s, %s, %s, %s);""",
+        "sqlite3": """insert into fingerprints (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE, N_ROWS, LAST_MODIFIED, CHECKSUM) values (?, ?, ?, ?, ?, ?, ?, ?);""",
+        "mssqlserver": """insert into fingerprints (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE, N_ROWS, LAST_MODIFIED, CHECKSUM) values (?, ?, ?, ?, ?, ?, ?, ?);""",
+        "mariadb": """insert into fingerprints (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE, N_ROWS, LAST_MODIFIED, CHECKSUM) values (?, ?, ?, ?, ?, ?, ?, ?);""",
+        "duckdb": """insert into fingerprints (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE, N_ROWS, LAST_MODIFIED, CHECKSUM) values (?, ?, ?, ?, ?, ?, ?, ?);""",
+    },
+    "upsert_into_fingerprints": {
+        "mysql": """insert into fingerprints (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE, N_ROWS, LAST_MODIFIED, CHECKSUM) values (%s, %s, %s, %s, %s, %s, %s, %s) on duplicate key update N_ROWS = VALUES(N_ROWS), LAST_MODIFIED = VALUES(LAST_MODIFIED), CHECKSUM = VALUES(CHECKSUM);""",
+        "postgres": """insert into fingerprints (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE, N_ROWS, LAST_MODIFIED, CHECKSUM) values (%s, %s, %s, %s, %s, %s, %s, %s) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE) do update set N_ROWS = excluded.N_ROWS, LAST_MODIFIED = excluded.LAST_MODIFIED, CHECKSUM = excluded.CHECKSUM;""",
+        "snowflake": """MERGE INTO fingerprints AS t USING (SELECT %s AS SERVER_NAME, %s AS TABLE_CATALOG, %s AS TABLE_SCHEMA, %s AS TABLE_NAME, %s AS STAGE, %s AS N_ROWS, %s AS LAST_MODIFIED, %s AS CHECKSUM) AS s ON t.SERVER_NAME = s.SERVER_NAME AND t.TABLE_CATALOG = s.TABLE_CATALOG AND t.TABLE_SCHEMA = s.TABLE_SCHEMA AND t.TABLE_NAME = s.TABLE_NAME AND t.STAGE = s.STAGE WHEN MATCHED THEN UPDATE SET N_ROWS = s.N_ROWS, LAST_MODIFIED = s.LAST_MODIFIED, CHECKSUM = s.CHECKSUM WHEN NOT MATCHED THEN INSERT (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE, N_ROWS, LAST_MODIFIED, CHECKSUM) VALUES (s.SERVER_NAME, s.TABLE_CATALOG, s.TABLE_SCHEMA, s.TABLE_NAME, s.STAGE, s.N_ROWS, s.LAST_MODIFIED, s.CHECKSUM);""",
+        "sqlite3": """insert into fingerprints (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE, N_ROWS, LAST_MODIFIED, CHECKSUM) values (?, ?, ?, ?, ?, ?, ?, ?) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE) do update set N_ROWS = excluded.N_ROWS, LAST_MODIFIED = excluded.LAST_MODIFIED, CHECKSUM = excluded.CHECKSUM;""",
+        "mssqlserver": """MERGE INTO fingerprints AS t USING (VALUES (?, ?, ?, ?, ?, ?, ?, ?)) AS s (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE, N_ROWS, LAST_MODIFIED, CHECKSUM) ON t.SERVER_NAME = s.SERVER_NAME AND t.TABLE_CATALOG = s.TABLE_CATALOG AND t.TABLE_SCHEMA = s.TABLE_SCHEMA AND t.TABLE_NAME = s.TABLE_NAME AND t.STAGE = s.STAGE WHEN MATCHED THEN UPDATE SET N_ROWS = s.N_ROWS, LAST_MODIFIED = s.LAST_MODIFIED, CHECKSUM = s.CHECKSUM WHEN NOT MATCHED THEN INSERT (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE, N_ROWS, LAST_MODIFIED, CHECKSUM) VALUES (s.SERVER_NAME, s.TABLE_CATALOG, s.TABLE_SCHEMA, s.TABLE_NAME, s.STAGE, s.N_ROWS, s.LAST_MODIFIED, s.CHECKSUM);""",
+        "mariadb": """insert into fingerprints (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE, N_ROWS, LAST_MODIFIED, CHECKSUM) values (?, ?, ?, ?, ?, ?, ?, ?) on duplicate key update N_ROWS = VALUES(N_ROWS), LAST_MODIFIED = VALUES(LAST_MODIFIED), CHECKSUM = VALUES(CHECKSUM);""",
+        "duckdb": """insert into fingerprints (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE, N_ROWS, LAST_MODIFIED, CHECKSUM) values (?, ?, ?, ?, ?, ?, ?, ?) on conflict (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE) do update set N_ROWS = excluded.N_ROWS, LAST_MODIFIED = excluded.LAST_MODIFIED, CHECKSUM = excluded.CHECKSUM;""",
+    },
+    "get_journal": {
+        "mysql": """select STAGE, TABLE_NAME, COLUMN_NAME from journal WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND RUN_ID = %s;""",
+        "postgres": """select STAGE, TABLE_NAME, COLUMN_NAME from journal WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND RUN_ID = %s;""",
+        "snowflake": """select STAGE, TABLE_NAME, COLUMN_NAME from journal WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND RUN_ID = %s;""",
+        "sqlite3": """select STAGE, TABLE_NAME, COLUMN_NAME from journal WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND RUN_ID = ?;""",
+        "mssqlserver": """select STAGE, TABLE_NAME, COLUMN_NAME from journal WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND RUN_ID = ?;""",
+        "mariadb": """select STAGE, TABLE_NAME, COLUMN_NAME from journal WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND RUN_ID = ?;""",
+        "duckdb": """select STAGE, TABLE_NAME, COLUMN_NAME from journal WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND RUN_ID = ?;""",
+    },
+    "insert_into_journal": {
+        "mysql": """insert into journal (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, RUN_ID, STAGE, COLUMN_NAME) values (%s, %s, %s, %s, %s, %s, %s);""",
+        "postgres": """insert into journal (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, RUN_ID, STAGE, COLUMN_NAME) values (%s, %s, %s, %s, %s, %s, %s);""",
+        "snowflake": """insert into journal (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, RUN_ID, STAGE, COLUMN_NAME) values (%s, %s, %s, %s, %s, %s, %s);""",
+        "sqlite3": """insert into journal (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, RUN_ID, STAGE, COLUMN_NAME) values (?, ?, ?, ?, ?, ?, ?);""",
+        "mssqlserver": """insert into journal (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, RUN_ID, STAGE, COLUMN_NAME) values (?, ?, ?, ?, ?, ?, ?);""",
+        "mariadb": """insert into journal (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, RUN_ID, STAGE, COLUMN_NAME) values (?, ?, ?, ?, ?, ?, ?);""",
+        "duckdb": """insert into journal (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, RUN_ID, STAGE, COLUMN_NAME) values (?, ?, ?, ?, ?, ?, ?);""",
+    },
+    "insert_into_query_log": {
+        "mysql": """insert into query_log (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, RUN_ID, TARGET_DATABASE, STAGE, QUERY_TYPE, TABLE_NAME, COLUMN_NAME, STARTED_AT, SECONDS, N_ROWS) values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);""",
+        "postgres": """insert into query_log (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, RUN_ID, TARGET_DATABASE, STAGE, QUERY_TYPE, TABLE_NAME, COLUMN_NAME, STARTED_AT, SECONDS, N_ROWS) values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);""",
+        "snowflake": """insert into query_log (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, RUN_ID, TARGET_DATABASE, STAGE, QUERY_TYPE, TABLE_NAME, COLUMN_NAME, STARTED_AT, SECONDS, N_ROWS) values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);""",
+        "sqlite3": """insert into query_log (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, RUN_ID, TARGET_DATABASE, STAGE, QUERY_TYPE, TABLE_NAME, COLUMN_NAME, STARTED_AT, SECONDS, N_ROWS) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);""",
+        "mssqlserver": """insert into query_log (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, RUN_ID, TARGET_DATABASE, STAGE, QUERY_TYPE, TABLE_NAME, COLUMN_NAME, STARTED_AT, SECONDS, N_ROWS) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);""",
+        "mariadb": """insert into query_log (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, RUN_ID, TARGET_DATABASE, STAGE, QUERY_TYPE, TABLE_NAME, COLUMN_NAME, STARTED_AT, SECONDS, N_ROWS) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);""",
+        "duckdb": """insert into query_log (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, RUN_ID, TARGET_DATABASE, STAGE, QUERY_TYPE, TABLE_NAME, COLUMN_NAME, STARTED_AT, SECONDS, N_ROWS) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);""",
+    },
+    "get_query_log": {
+        "mysql": """select TARGET_DATABASE, STAGE, QUERY_TYPE, TABLE_NAME, COLUMN_NAME, STARTED_AT, SECONDS, N_ROWS from query_log WHERE RUN_ID = %s;""",
+        "postgres": """select TARGET_DATABASE, STAGE, QUERY_TYPE, TABLE_NAME, COLUMN_NAME, STARTED_AT, SECONDS, N_ROWS from query_log WHERE RUN_ID = %s;""",
+        "snowflake": """select TARGET_DATABASE, STAGE, QUERY_TYPE, TABLE_NAME, COLUMN_NAME, STARTED_AT, SECONDS, N_ROWS from query_log WHERE RUN_ID = %s;""",
+        "sqlite3": """select TARGET_DATABASE, STAGE, QUERY_TYPE, TABLE_NAME, COLUMN_NAME, STARTED_AT, SECONDS, N_ROWS from query_log WHERE RUN_ID = ?;""",
+        "mssqlserver": """select TARGET_DATABASE, STAGE, QUERY_TYPE, TABLE_NAME, COLUMN_NAME, STARTED_AT, SECONDS, N_ROWS from query_log WHERE RUN_ID = ?;""",
+        "mariadb": """select TARGET_DATABASE, STAGE, QUERY_TYPE, TABLE_NAME, COLUMN_NAME, STARTED_AT, SECONDS, N_ROWS from query_log WHERE RUN_ID = ?;""",
+        "duckdb": """select TARGET_DATABASE, STAGE, QUERY_TYPE, TABLE_NAME, COLUMN_NAME, STARTED_AT, SECONDS, N_ROWS from query_log WHERE RUN_ID = ?;""",
+    },
+    "get_last_query_log_run": {
+        "mysql": """select max(RUN_ID) from query_log;""",
+        "postgres": """select max(RUN_ID) from query_log;""",
+        "snowflake": """select max(RUN_ID) from query_log;""",
+        "sqlite3": """select max(RUN_ID) from query_log;""",
+        "mssqlserver": """select max(RUN_ID) from query_log;""",
+        "mariadb": """select max(RUN_ID) from query_log;""",
+        "duckdb": """select max(RUN_ID) from query_log;""",
+    },
+    "get_metadata_columns": {
+        "mysql": """select * from {0} where 1 = 0;""",
+        "postgres": """select * from {0} where 1 = 0;""",
+        "snowflake": """select * from {0} where 1 = 0;""",
+        "sqlite3": """select * from {0} where 1 = 0;""",
+        "mssqlserver": """select * from {0} where 1 = 0;""",
+        "mariadb": """select * from {0} where 1 = 0;""",
+        "duckdb": """select * from {0} where 1 = 0;""",
+    },
+    "add_metadata_column": {
+        "mysql": """alter table {0} add column {1} {2};""",
+        "postgres": """alter table {0} add column {1} {2};""",
+        "snowflake": """alter table {0} add column {1} {2};""",
+        "sqlite3": """alter table {0} add column {1} {2};""",
+        "mssqlserver": """alter table {0} add {1} {2};""",
+        "mariadb": """alter table {0} add column {1} {2};""",
+        "duckdb": """alter table {0} add column {1} {2};""",
+    },
+    # the unique keys of the upserts that the tables of older databases don't
+    # have, the sqlite3 tables always had them and snowflake and mssqlserver
+    # merge without them
+    "count_metadata_keys": {
+        "mysql": """select count(*) from information_schema.table_constraints where table_schema = database() and table_name = %s and constraint_type in ('UNIQUE', 'PRIMARY KEY');""",
+        "postgres": """select count(*) from pg_indexes where tablename = %s and indexdef like 'CREATE UNIQUE%%';""",
+        "mariadb": """select count(*) from information_schema.table_constraints where table_schema = database() and table_name = ? and constraint_type in ('UNIQUE', 'PRIMARY KEY');""",
+        "duckdb": """select count(*) from duckdb_constraints() where table_name = ? and constraint_type in ('UNIQUE', 'PRIMARY KEY');""",
+    },
+    "add_metadata_key": {
+        "mysql": """alter table {0} add unique key {1}_key ({2});""",
+        "postgres": """create unique index if not exists {1}_key on {0} ({2});""",
+        "mariadb": """alter table {0} add unique key {1}_key ({2});""",
+        "duckdb": """create unique index if not exists {1}_key on {0} ({2});""",
     },
     "get_tables": {
         "mysql": """select distinct SERVER_NAME , TABLE_CATALOG , TABLE_SCHEMA , TABLE_NAME , N_ROWS from tables where SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s and N_ROWS > {} order by N_ROWS;""",
@@ -282,6 +616,7 @@ SQL_SCRIPTS = {
         "sqlite3": """select distinct SERVER_NAME , TABLE_CATALOG , TABLE_SCHEMA , TABLE_NAME , N_ROWS from tables where SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? and N_ROWS > {} order by N_ROWS;""",
         "mssqlserver": """select distinct SERVER_NAME , TABLE_CATALOG , TABLE_SCHEMA , TABLE_NAME , N_ROWS from tables where SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? and N_ROWS > {} order by N_ROWS;""",
         "mariadb": """select distinct SERVER_NAME , TABLE_CATALOG , TABLE_SCHEMA , TABLE_NAME , N_ROWS from tables where SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? and N_ROWS > {} order by N_ROWS;""",
+        "duckdb": """select distinct SERVER_NAME , TABLE_CATALOG , TABLE_SCHEMA , TABLE_NAME , N_ROWS from tables where SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? and N_ROWS > {} order by N_ROWS;""",
     },
     "get_columns": {
         "mysql": """select column_name , ORDINAL_POSITION , DATA_TYPE from columns WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s;""",
@@ -292,6 +627,74 @@ SQL_SCRIPTS = {
         ),
         "mssqlserver": """select column_name , ORDINAL_POSITION , DATA_TYPE from columns WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
         "mariadb": """select column_name , ORDINAL_POSITION , DATA_TYPE from columns WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
+        "duckdb": """select column_name , ORDINAL_POSITION , DATA_TYPE from columns WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ?;""",
+    },
+    "select_columns": {
+        "mysql": """select {0} from {1}.{2}.{3};""",
+        "postgres": """select {0} from {1}.{2}.{3};""",
+        "snowflake": """select {0} from {1}.{2}.{3};""",
+        "mssqlserver": """select {0} from {1}.{2}.{3};""",
+        "mariadb": """select {0} from {1}.{2}.{3};""",
+        "aurora": """select {0} from {1}.{2}.{3};""",
+        "saphana": """select {0} from {1}.{2}.{3};""",
+        "saphana_odbc": """select {0} from {1}.{2}.{3};""",
+        "sqlite3": """select {0} from "{3}";""",
+        "duckdb": """select {0} from {1}.{2}.{3};""",
+    },
+    "select_sample": {
+        "postgres": """select {0} from {1}.{2}.{3} tablesample system ({4});""",
+        "snowflake": """select {0} from {1}.{2}.{3} tablesample system ({4});""",
+        "mssqlserver": """select {0} from {1}.{2}.{3} tablesample ({4} percent);""",
+        "saphana": """select {0} from {1}.{2}.{3} tablesample system ({4});""",
+        "saphana_odbc": """select {0} from {1}.{2}.{3} tablesample system ({4});""",
+        "duckdb": """select {0} from {1}.{2}.{3} using sample {4}% (bernoulli);""",
+    },
+    "select_where": {
+        "mysql": """select {0} from {1}.{2}.{3} where {4} {5};""",
+        "postgres": """select {0} from {1}.{2}.{3} where {4} {5};""",
+        "snowflake": """select {0} from {1}.{2}.{3} where {4} {5};""",
+        "mssqlserver": """select {0} from {1}.{2}.{3} where {4} {5};""",
+        "mariadb": """select {0} from {1}.{2}.{3} where {4} {5};""",
+        "aurora": """select {0} from {1}.{2}.{3} where {4} {5};""",
+        "saphana": """select {0} from {1}.{2}.{3} where {4} {5};""",
+        "saphana_odbc": """select {0} from {1}.{2}.{3} where {4} {5};""",
+        "sqlite3": """select {0} from "{3}" where {4} {5};""",
+        "duckdb": """select {0} from {1}.{2}.{3} where {4} {5};""",
+    },
+    "primary_key": {
+        "mysql": """select COLUMN_NAME from INFORMATION_SCHEMA.KEY_COLUMN_USAGE where TABLE_SCHEMA = '{0}' and TABLE_NAME = '{1}' and CONSTRAINT_NAME = 'PRIMARY' order by ORDINAL_POSITION;""",
+        "postgres": """select a.attname from pg_index as i inner join pg_attribute as a on a.attrelid = i.indrelid and a.attnum = any(i.indkey) where i.indrelid = '{0}.{1}'::regclass and i.indisprimary;""",
+        "mssqlserver": """select COLUMN_NAME from INFORMATION_SCHEMA.KEY_COLUMN_USAGE where OBJECTPROPERTY(OBJECT_ID(CONSTRAINT_SCHEMA + '.' + CONSTRAINT_NAME), 'IsPrimaryKey') = 1 and TABLE_SCHEMA = '{0}' and TABLE_NAME = '{1}' order by ORDINAL_POSITION;""",
+        "mariadb": """select COLUMN_NAME from INFORMATION_SCHEMA.KEY_COLUMN_USAGE where TABLE_SCHEMA = '{0}' and TABLE_NAME = '{1}' and CONSTRAINT_NAME = 'PRIMARY' order by ORDINAL_POSITION;""",
+        "aurora": """select COLUMN_NAME from INFORMATION_SCHEMA.KEY_COLUMN_USAGE where TABLE_SCHEMA = '{0}' and TABLE_NAME = '{1}' and CONSTRAINT_NAME = 'PRIMARY' order by ORDINAL_POSITION;""",
+        "saphana": """select COLUMN_NAME from CONSTRAINTS where SCHEMA_NAME = '{0}' and TABLE_NAME = '{1}' and IS_PRIMARY_KEY = 'TRUE' order by POSITION;""",
+        "saphana_odbc": """select COLUMN_NAME from CONSTRAINTS where SCHEMA_NAME = '{0}' and TABLE_NAME = '{1}' and IS_PRIMARY_KEY = 'TRUE' order by POSITION;""",
+        "sqlite3": """select name from pragma_table_info('{1}') where pk > 0 order by pk;""",
+        "duckdb": """select unnest(constraint_column_names) from duckdb_constraints() where schema_name = '{0}' and table_name = '{1}' and constraint_type = 'PRIMARY KEY';""",
+    },
+    "partial_stats_column": {
+        "mysql": """count(`{0}`) , avg(`{0}`) , var_samp(`{0}`) , sum(`{0}`) , max(`{0}`) , min(`{0}`)""",
+        "postgres": """count("{0}") , avg("{0}") , var_samp("{0}") , sum("{0}") , max("{0}") , min("{0}")""",
+        "snowflake": """count("{0}") , avg("{0}") , var_samp("{0}") , sum("{0}") , max("{0}") , min("{0}")""",
+        "mssqlserver": """count("{0}") , avg(cast("{0}" as float)) , var("{0}") , sum("{0}") , max("{0}") , min("{0}")""",
+        "mariadb": """count("{0}") , avg("{0}") , var_samp("{0}") , sum("{0}") , max("{0}") , min("{0}")""",
+        "aurora": """count(`{0}`) , avg(`{0}`) , var_samp(`{0}`) , sum(`{0}`) , max(`{0}`) , min(`{0}`)""",
+        "saphana": """count("{0}") , avg("{0}") , var("{0}") , sum("{0}") , max("{0}") , min("{0}")""",
+        "saphana_odbc": """count("{0}") , avg("{0}") , var("{0}") , sum("{0}") , max("{0}") , min("{0}")""",
+        "sqlite3": """count("{0}") , avg("{0}") , (avg("{0}" * "{0}") - avg("{0}") * avg("{0}")) * count("{0}") / (count("{0}") - 1.0) , sum("{0}") , max("{0}") , min("{0}")""",
+        "duckdb": """count("{0}") , avg("{0}") , var_samp("{0}") , sum("{0}") , max("{0}") , min("{0}")""",
+    },
+    "first_day_of_month_column": {
+        "mysql": """date_add(date(`{0}`), interval - DAY(`{0}`) + 1 DAY)""",
+        "postgres": """date_trunc('month', "{0}")::date""",
+        "snowflake": """date_trunc('month', "{0}")::date""",
+        "mssqlserver": """DATEFROMPARTS(YEAR([{0}]), MONTH([{0}]), 1)""",
+        "mariadb": """date_add(date("{0}"), interval - DAY("{0}") + 1 DAY)""",
+        "aurora": """date_add(date(`{0}`), interval - DAY(`{0}`) + 1 DAY)""",
+        "saphana": """ADD_DAYS(TO_DATE("{0}"), 1 - DAYOFMONTH("{0}"))""",
+        "saphana_odbc": """ADD_DAYS(TO_DATE("{0}"), 1 - DAYOFMONTH("{0}"))""",
+        "sqlite3": """date("{0}", 'start of month')""",
+        "duckdb": """date_trunc('month', "{0}")::date""",
     },
     "get_unique_count": {
         "mysql": """select count(distinct `{0}`) as count_distinct , sum(case when `{0}` is null then 1 else 0 end) as count_null FROM `{1}`.`{2}`""",
@@ -302,6 +705,39 @@ SQL_SCRIPTS = {
         "aurora": """select count(distinct `{0}`) as count_distinct , sum(case when `{0}` is null then 1 else 0 end) as count_null FROM `{1}`.`{2}`""",
         "saphana": """select count(distinct "{0}") as count_distinct , sum(case when "{0}" is null then 1 else 0 end) as count_null FROM {1}."{2}" """,
         "saphana_odbc": """select count(distinct "{0}") as count_distinct , sum(case when "{0}" is null then 1 else 0 end) as count_null FROM {1}."{2}" """,
+        "sqlite3": """select count(distinct "{0}") as count_distinct , sum(case when "{0}" is null then 1 else 0 end) as count_null FROM "{2}";""",
+        "duckdb": """select count(distinct "{0}") as count_distinct , sum(case when "{0}" is null then 1 else 0 end) as count_null FROM {1}.{2}""",
+    },
+    "unique_count_column": {
+        "mysql": """count(distinct `{0}`) , sum(case when `{0}` is null then 1 else 0 end)""",
+        "postgres": """count(distinct "{0}") , sum(case when "{0}" is null then 1 else 0 end)""",
+        "snowflake": """count(distinct "{0}") , sum(case when "{0}" is null then 1 else 0 end)""",
+        "mssqlserver": """count(distinct "{0}") , sum(case when "{0}" is null then 1 else 0 end)""",
+        "mariadb": """count(distinct "{0}") , sum(case when "{0}" is null then 1 else 0 end)""",
+        "aurora": """count(distinct `{0}`) , sum(case when `{0}` is null then 1 else 0 end)""",
+        "saphana": """count(distinct "{0}") , sum(case when "{0}" is null then 1 else 0 end)""",
+        "saphana_odbc": """count(distinct "{0}") , sum(case when "{0}" is null then 1 else 0 end)""",
+        "sqlite3": """count(distinct "{0}") , sum(case when "{0}" is null then 1 else 0 end)""",
+        "duckdb": """count(distinct "{0}") , sum(case when "{0}" is null then 1 else 0 end)""",
+    },
+    "approx_unique_count_column": {
+        "snowflake": """approx_count_distinct("{0}") , sum(case when "{0}" is null then 1 else 0 end)""",
+        "mssqlserver": """approx_count_distinct("{0}") , sum(case when "{0}" is null then 1 else 0 end)""",
+        "saphana": """approx_count_distinct("{0}") , sum(case when "{0}" is null then 1 else 0 end)""",
+        "saphana_odbc": """approx_count_distinct("{0}") , sum(case when "{0}" is null then 1 else 0 end)""",
+        "duckdb": """approx_count_distinct("{0}") , sum(case when "{0}" is null then 1 else 0 end)""",
+    },
+    "get_unique_counts": {
+        "mysql": """select {0} FROM `{1}`.`{2}`""",
+        "postgres": """select {0} FROM {1}.{2}""",
+        "snowflake": """select {0} FROM {1}."{2}";""",
+        "mssqlserver": """select {0} FROM {1}.{2}""",
+        "mariadb": """select {0} FROM {1}.{2}""",
+        "aurora": """select {0} FROM `{1}`.`{2}`""",
+        "saphana": """select {0} FROM {1}."{2}" """,
+        "saphana_odbc": """select {0} FROM {1}."{2}" """,
+        "sqlite3": """select {0} FROM "{2}";""",
+        "duckdb": """select {0} FROM {1}.{2}""",
     },
     "get_distinct_values": {
         "mysql": """select DISTINCT_VALUES from uniques where SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s;""",
@@ -311,6 +747,7 @@ SQL_SCRIPTS = {
         "mssqlserver": """select DISTINCT_VALUES from uniques where SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mariadb": """select DISTINCT_VALUES from uniques where SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "aurora": """select DISTINCT_VALUES from uniques where SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s;""",
+        "duckdb": """select DISTINCT_VALUES from uniques where SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
     },
     "get_frequency": {
         "mysql": """SELECT `{0}` AS `{0}` , COUNT(*) AS N FROM `{1}`.`{2}` GROUP BY `{0}`;""",
@@ -321,6 +758,8 @@ SQL_SCRIPTS = {
         "aurora": """SELECT `{0}` AS `{0}` , COUNT(*) AS N FROM `{1}`.`{2}` GROUP BY `{0}`;""",
         "saphana": """SELECT "{0}" AS "{0}" , COUNT(*) AS N FROM {1}."{2}" GROUP BY "{0}";""",
         "saphana_odbc": """SELECT "{0}" AS "{0}" , COUNT(*) AS N FROM {1}."{2}" GROUP BY "{0}";""",
+        "sqlite3": """SELECT "{0}" AS "{0}" , COUNT(*) AS N FROM "{2}" GROUP BY "{0}";""",
+        "duckdb": """SELECT "{0}" AS "{0}" , COUNT(*) AS N FROM {1}.{2} GROUP BY "{0}";""",
     },
     "get_data_values_columns": {
         "mysql": """select column_name , ORDINAL_POSITION , DATA_TYPE from columns WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND lower(DATA_TYPE) NOT IN ({});""".format(
@@ -341,6 +780,9 @@ SQL_SCRIPTS = {
         "mariadb": """select column_name , ORDINAL_POSITION , DATA_TYPE from columns WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND lower(DATA_TYPE) NOT IN ({});""".format(
             ", ".join(["'" + x + "'" for x in DATA_TYPES["filter_types"]])
         ),
+        "duckdb": """select column_name , ORDINAL_POSITION , DATA_TYPE from columns WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND lower(DATA_TYPE) NOT IN ({});""".format(
+            ", ".join(["'" + x + "'" for x in DATA_TYPES["filter_types"]])
+        ),
     },
     "get_date_columns": {
         "mysql": """select server_name , table_catalog , table_schema , table_name , column_name from columns WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND lower(DATA_TYPE) IN ({});""".format(
@@ -361,6 +803,9 @@ SQL_SCRIPTS = {
         "mariadb": """select server_name , table_catalog , table_schema , table_name , column_name from columns WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND lower(DATA_TYPE) IN ({});""".format(
             ", ".join(["'" + x + "'" for x in DATA_TYPES["date_types"]])
         ),
+        "duckdb": """select server_name , table_catalog , table_schema , table_name , column_name from columns WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND lower(DATA_TYPE) IN ({});""".format(
+            ", ".join(["'" + x + "'" for x in DATA_TYPES["date_types"]])
+        ),
     },
     "get_numeric_columns": {
         "mysql": """select server_name , table_catalog , table_schema , table_name , column_name from columns WHERE SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND lower(DATA_TYPE) IN ({});""".format(
@@ -381,6 +826,9 @@ SQL_SCRIPTS = {
         "mariadb": """select server_name , table_catalog , table_schema , table_name , column_name from columns WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND lower(DATA_TYPE) IN ({});""".format(
             ", ".join(["'" + x + "'" for x in DATA_TYPES["numeric_types"]])
         ),
+        "duckdb": """select server_name , table_catalog , table_schema , table_name , column_name from columns WHERE SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND lower(DATA_TYPE) IN ({});""".format(
+            ", ".join(["'" + x + "'" for x in DATA_TYPES["numeric_types"]])
+        ),
     },
     "get_first_day_of_month": {
         "mysql": """select date_add(`{0}`, interval - DAY(`{0}`) + 1 DAY) as date
@@ -409,6 +857,12 @@ SQL_SCRIPTS = {
                     FROM {1}."{2}"
                     GROUP BY ADD_MONTHS(NEXT_DAY(LAST_DAY(CURRENT_DATE)),-1)
                     ORDER BY N DESC;""",
+        "sqlite3": """select date("{0}", 'start of month') as date , count(*) as N
+                    from "{2}"
+                    group by date("{0}", 'start of month');""",
+        "duckdb": """select date_trunc('month', "{0}")::date , count(*) as N
+                    from {1}.{2}
+                    group by date_trunc('month', "{0}")::date;""",
     },
     "get_basic_stats": {
         "mysql": """SELECT CAST(AVG(`{0}`) as FLOAT) AS AVG_
@@ -475,6 +929,22 @@ SQL_SCRIPTS = {
                     , CAST(MIN("{0}") as FLOAT) AS MIN_
                     , CAST(MAX("{0}") - MIN("{0}") AS FLOAT) as RANGE_
                     FROM "{1}"."{2}";""",
+        "sqlite3": """SELECT AVG("{0}") AS AVG_
+                    , SQRT((AVG("{0}" * "{0}") - AVG("{0}") * AVG("{0}")) * COUNT("{0}") / (COUNT("{0}") - 1)) as STDEV_
+                    , (AVG("{0}" * "{0}") - AVG("{0}") * AVG("{0}")) * COUNT("{0}") / (COUNT("{0}") - 1) as VAR_
+                    , SUM("{0}") as SUM_
+                    , MAX("{0}") AS MAX_
+                    , MIN("{0}") AS MIN_
+                    , MAX("{0}") - MIN("{0}") as RANGE_
+                    FROM "{2}";""",
+        "duckdb": """SELECT AVG("{0}") AS AVG_
+                    , stddev("{0}") as STDEV_
+                    , VARIANCE("{0}") as VAR_
+                    , SUM("{0}") as SUM_
+                    , MAX("{0}") AS MAX_
+                    , MIN("{0}") AS MIN_
+                    , MAX("{0}") - MIN("{0}") as RANGE_
+                    FROM {1}.{2};""",
     },
     "get_percentiles": {
         "mysql": """with cte1 as 
@@ -560,6 +1030,34 @@ SQL_SCRIPTS = {
             , percentile_disc(0.99) within group (order by `{0}`) over (partition by null) as P99
             , percentile_disc(0.975) within group (order by `{0}`) over (partition by null) - percentile_disc(0.25) within group (order by `{0}`) over (partition by null) as IQR
             from {1}.{2}""",
+        "duckdb": """select percentile_disc(0.01) within group (order by "{0}") as P01
+            , percentile_disc(0.025) within group (order by "{0}") as P025
+            , percentile_disc(0.05) within group (order by "{0}") as P05
+            , percentile_disc(0.1) within group (order by "{0}") as P10
+            , percentile_disc(0.25) within group (order by "{0}") as Q1
+            , percentile_disc(0.5) within group (order by "{0}") as Q2
+            , percentile_disc(0.75) within group (order by "{0}") as Q3
+            , percentile_disc(0.90) within group (order by "{0}") as P90
+            , percentile_disc(0.95) within group (order by "{0}") as P95
+            , percentile_disc(0.975) within group (order by "{0}") as P975
+            , percentile_disc(0.99) within group (order by "{0}") as P99
+            , percentile_disc(0.75) within group (order by "{0}") - percentile_disc(0.25) within group (order by "{0}") as IQR
+            from {1}.{2}""",
+        "sqlite3": """select min(case when N_LE >= 0.01 * N then "{0}" end) as P01
+            , min(case when N_LE >= 0.025 * N then "{0}" end) as P025
+            , min(case when N_LE >= 0.05 * N then "{0}" end) as P05
+            , min(case when N_LE >= 0.1 * N then "{0}" end) as P10
+            , min(case when N_LE >= 0.25 * N then "{0}" end) as Q1
+            , min(case when N_LE >= 0.5 * N then "{0}" end) as Q2
+            , min(case when N_LE >= 0.75 * N then "{0}" end) as Q3
+            , min(case when N_LE >= 0.90 * N then "{0}" end) as P90
+            , min(case when N_LE >= 0.95 * N then "{0}" end) as P95
+            , min(case when N_LE >= 0.975 * N then "{0}" end) as P975
+            , min(case when N_LE >= 0.99 * N then "{0}" end) as P99
+            , min(case when N_LE >= 0.75 * N then "{0}" end) - min(case when N_LE >= 0.25 * N then "{0}" end) as IQR
+            from (select "{0}" , count(*) over (order by "{0}") as N_LE , count(*) over () as N
+            from "{2}"
+            where "{0}" is not null);""",
     },
     "update_percentiles": {
         "mysql": """update stats set P01 = %s , P025 = %s , P05 = %s , P10 = %s , Q1 = %s , Q2 = %s , Q3 = %s , P90 = %s , P95 = %s , P975 = %s , P99 = %s , IQR = %s where SERVER_NAME = %s AND TABLE_CATALOG = %s AND TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s;""",
@@ -568,5 +1066,6 @@ SQL_SCRIPTS = {
         "sqlite3": """update stats set P01 = ? , P025 = ? , P05 = ? , P10 = ? , Q1 = ? , Q2 = ? , Q3 = ? , P90 = ? , P95 = ? , P975 = ? , P99 = ? , IQR = ? where SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mssqlserver": """update stats set P01 = ? , P025 = ? , P05 = ? , P10 = ? , Q1 = ? , Q2 = ? , Q3 = ? , P90 = ? , P95 = ? , P975 = ? , P99 = ? , IQR = ? where SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
         "mariadb": """update stats set P01 = ? , P025 = ? , P05 = ? , P10 = ? , Q1 = ? , Q2 = ? , Q3 = ? , P90 = ? , P95 = ? , P975 = ? , P99 = ? , IQR = ? where SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
+        "duckdb": """update stats set P01 = ? , P025 = ? , P05 = ? , P10 = ? , Q1 = ? , Q2 = ? , Q3 = ? , P90 = ? , P95 = ? , P975 = ? , P99 = ? , IQR = ? where SERVER_NAME = ? AND TABLE_CATALOG = ? AND TABLE_SCHEMA = ? AND TABLE_NAME = ? AND COLUMN_NAME = ?;""",
     },
 }
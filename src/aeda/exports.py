@@ -0,0 +1,97 @@
+import logging
+import shutil
+from pathlib import Path
+from urllib.parse import quote
+
+from aeda.config import METADATA_KEYS
+from aeda.session import ProfilingSession
+
+FORMAT = "%(asctime)-15s %(message)s"
+logging.basicConfig(level=logging.INFO, format=FORMAT)
+logger = logging.getLogger(__name__)
+
+PARTITION_COLUMNS = ["SERVER_NAME", "TABLE_CATALOG", "TABLE_SCHEMA"]
+
+
+class ParquetExport:
+    """Exports the metadata of the profiled schema, read back from the
+    metadata database once the run finishes, to a directory of Parquet files,
+    a dataset per metadata table partitioned by server, catalog and schema:
+
+        <path>/<table>/SERVER_NAME=<server>/TABLE_CATALOG=<catalog>/TABLE_SCHEMA=<schema>/part-0.parquet
+
+    Every export replaces the partition of the schema, so the dataset has the
+    same rows as the metadata database. The datasets can be read with
+    `pyarrow.parquet.read_table`, memory-mapping the files.
+
+    Args:
+        path (Path): Root directory of the datasets.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def partition(self, table: str, table_key: tuple) -> Path:
+        """Returns the directory of the partition of `table_key`, the server,
+        catalog and schema names, in the dataset of `table`."""
+        path = self.path / table
+        for column, value in zip(PARTITION_COLUMNS, table_key):
+            path = path / f"{column}={quote(str(value), safe='')}"
+        return path
+
+    def export(self, session: ProfilingSession):
+        """Exports the metadata of the schema of `session`."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table_key = (session.server_name, session.catalog_name, session.schema_name)
+        for table in METADATA_KEYS:
+            with session.metadata_lock:
+                cursor = session.metadata_cursor
+                cursor.execute(
+                    session.metadata_query("get_metadata_rows").format(table),
+                    table_key,
+                )
+                column_names = [column[0].upper() for column in cursor.description]
+                rows = cursor.fetchall()
+            partition = self.partition(table, table_key)
+            shutil.rmtree(partition, ignore_errors=True)
+            if len(rows) == 0:
+                continue
+            data = pa.table(
+                {
+                    column_name: [row[i] for row in rows]
+                    for i, column_name in enumerate(column_names)
+                    if column_name not in PARTITION_COLUMNS
+                }
+            )
+            partition.mkdir(parents=True)
+            pq.write_table(data, partition / "part-0.parquet")
+            logger.info(f"{len(rows):,} rows of {table} exported to {partition}")
+
+    def read(self, table: str):
+        """Returns the dataset of `table` as a `pyarrow.Table`, with the
+        partition columns."""
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        partitioning = ds.partitioning(
+            pa.schema([(column, pa.string()) for column in PARTITION_COLUMNS]),
+            flavor="hive",
+        )
+        return pq.read_table(
+            self.path / table, partitioning=partitioning, memory_map=True
+        )
+
+
+def get_export(uri: str):
+    """Returns the export of `uri`, `parquet:<path>` for a `ParquetExport`.
+
+    Raises:
+        ValueError: If the kind of export isn't supported.
+    """
+    kind, _, location = uri.partition(":")
+    if kind == "parquet" and location:
+        return ParquetExport(Path(location))
+    raise ValueError(f"{uri} is not a supported export, use parquet:<path>.")
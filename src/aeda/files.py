@@ -0,0 +1,299 @@
+import glob
+import logging
+from pathlib import Path
+from typing import Union
+
+from tqdm import tqdm
+
+from aeda.config import CSV_BLOCK_SIZE, FILE_FORMATS
+from aeda.profiler import ColumnProfile, profile_chunks
+from aeda.session import ProfilingSession, profiling_stage
+from aeda.sql import (
+    for_each_table,
+    get_columns_from_metadata,
+    get_metadata_keys,
+    get_tables_from_metadata,
+    replace_metadata,
+    should_profile,
+    write_profiles,
+)
+
+FORMAT = "%(asctime)-15s %(message)s"
+logging.basicConfig(level=logging.INFO, format=FORMAT)
+logger = logging.getLogger(__name__)
+
+
+def list_files(source_params: dict) -> dict:
+    """Returns the path of every file of a `file` source by table name, the
+    name of the file without its suffix.
+
+    The `path` of the source is a folder, whose CSV and Parquet files are
+    profiled, or a glob pattern like `/data/drops/*.parquet`.
+    """
+    path = Path(source_params["path"]).expanduser()
+    if path.is_dir():
+        paths = sorted(path.iterdir())
+    else:
+        paths = sorted(Path(p) for p in glob.glob(str(path)))
+    files = {}
+    for path in paths:
+        if not path.is_file() or path.suffix.lower() not in FILE_FORMATS:
+            continue
+        if path.stem in files:
+            logger.warning(f"{path} skipped, the table {path.stem} is already a file")
+            continue
+        files[path.stem] = path
+    return files
+
+
+def file_format(path: Path) -> str:
+    return FILE_FORMATS[path.suffix.lower()]
+
+
+def open_csv(path: Path, column_names: Union[list, None] = None):
+    """Returns a reader of the record batches of a CSV file, parsed in blocks
+    of `CSV_BLOCK_SIZE` bytes with the types inferred from the first one."""
+    from pyarrow import csv
+
+    return csv.open_csv(
+        path,
+        read_options=csv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+        convert_options=csv.ConvertOptions(include_columns=column_names),
+    )
+
+
+def parquet_file(path: Path):
+    import pyarrow.parquet as pq
+
+    return pq.ParquetFile(path, memory_map=True)
+
+
+def get_data_type(arrow_type) -> str:
+    """Returns the name of the data type of the columns of an arrow type, as
+    listed in `DATA_TYPES`."""
+    import pyarrow as pa
+
+    if pa.types.is_integer(arrow_type):
+        return "bigint"
+    if pa.types.is_floating(arrow_type):
+        return "float"
+    if pa.types.is_decimal(arrow_type):
+        return "decimal"
+    if pa.types.is_timestamp(arrow_type):
+        return "timestamp"
+    if pa.types.is_date(arrow_type):
+        return "date"
+    if pa.types.is_boolean(arrow_type):
+        return "boolean"
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return "varchar"
+    if pa.types.is_binary(arrow_type) or pa.types.is_large_binary(arrow_type):
+        return "binary"
+    if pa.types.is_nested(arrow_type):
+        return "array"
+    return str(arrow_type)
+
+
+def read_schema(path: Path):
+    """Returns the arrow schema of a file, from the footer of the Parquet
+    files and the first block of the CSV files."""
+    if file_format(path) == "parquet":
+        return parquet_file(path).schema_arrow
+    return open_csv(path).schema
+
+
+def count_rows(path: Path, schema=None) -> int:
+    """Returns the number of rows of a file, from the footer of the Parquet
+    files, without decoding them, and parsing the first column of the CSV
+    files, whose `schema` is read if it isn't given."""
+    if file_format(path) == "parquet":
+        return parquet_file(path).metadata.num_rows
+    if schema is None:
+        schema = read_schema(path)
+    return sum(batch.num_rows for batch in open_csv(path, schema.names[:1]))
+
+
+def stream_file(path: Path, column_names: list, batch_size: int):
+    """Yields the values of `column_names` of a file in lists of tuples.
+
+    The row groups of the Parquet files are read from a memory-mapped file in
+    batches of `batch_size` rows, and the CSV files are parsed in blocks of
+    `CSV_BLOCK_SIZE` bytes, so only one batch is held in memory at a time.
+    """
+    import pyarrow as pa
+
+    if file_format(path) == "parquet":
+        batches = parquet_file(path).iter_batches(
+            batch_size=batch_size, columns=column_names
+        )
+    else:
+        batches = open_csv(path, column_names)
+    for batch in batches:
+        columns = []
+        for column_name in column_names:
+            array = batch.column(column_name)
+            values = array.to_pylist()
+            if pa.types.is_nested(array.type):
+                # lists and structs are counted by their text
+                values = [None if value is None else str(value) for value in values]
+            columns.append(values)
+        yield list(zip(*columns))
+
+
+def footer_profiles(path: Path, column_names: list) -> dict:
+    """Returns the `ColumnProfile` of the columns of a Parquet file that can
+    be computed from the statistics of its row groups, without decoding them.
+
+    Those are the columns whose values are all null, and the integer, decimal,
+    boolean and date columns with the same minimum and maximum value in
+    every row group. The statistics of the text and float columns are not
+    used, writers may truncate the former and leave NaN out of the latter.
+    """
+    import pyarrow as pa
+
+    pf = parquet_file(path)
+    metadata = pf.metadata
+    n_rows = metadata.num_rows
+    schema = pf.schema_arrow
+    leaves = {metadata.schema.column(i).path: i for i in range(metadata.num_columns)}
+    profiles = {}
+    for column_name in column_names:
+        if column_name not in leaves:
+            # nested columns have a leaf per field
+            continue
+        arrow_type = schema.field(column_name).type
+        exact = (
+            pa.types.is_integer(arrow_type)
+            or pa.types.is_decimal(arrow_type)
+            or pa.types.is_boolean(arrow_type)
+            or pa.types.is_date(arrow_type)
+        )
+        n_null = 0
+        values = set()
+        for i in range(metadata.num_row_groups):
+            row_group = metadata.row_group(i)
+            statistics = row_group.column(leaves[column_name]).statistics
+            if statistics is None or not statistics.has_null_count:
+                break
+            n_null += statistics.null_count
+            if statistics.null_count == row_group.num_rows:
+                continue
+            if not exact or not statistics.has_min_max:
+                break
+            values.update([statistics.min, statistics.max])
+        else:
+            if len(values) <= 1:
+                profile = ColumnProfile(column_name)
+                for value in values:
+                    profile.frequencies[value] = n_rows - n_null
+                if n_null > 0:
+                    profile.frequencies[None] = n_null
+                profiles[column_name] = profile
+    return profiles
+
+
+@profiling_stage("Columns")
+def profile_columns(session: ProfilingSession):
+    """Inserts the columns of the files of the source into the `columns`
+    table, a table per file. If `overwrite` is set, the existing columns are
+    replaced and the columns dropped from the files are deleted.
+
+    Parameters:
+        session (ProfilingSession): Session of the run.
+    """
+    if session.is_done("Columns"):
+        return
+    table_key = (session.server_name, session.catalog_name, session.schema_name)
+    column_rows = []
+    for table_name, path in list_files(session.source_params).items():
+        schema = read_schema(path)
+        column_rows += [
+            table_key + (table_name, field.name, i, get_data_type(field.type))
+            for i, field in enumerate(schema, start=1)
+        ]
+    columns = {(row[3], row[4]) for row in column_rows}
+    # columns dropped from the files
+    dropped_columns = [
+        key for key in get_metadata_keys(session, "columns") if key not in columns
+    ]
+    with session.transaction():
+        replace_metadata(session, "columns", column_rows, dropped_columns)
+        session.mark_done("Columns")
+    session.flush()
+    return
+
+
+@profiling_stage("Tables")
+def profile_tables(session: ProfilingSession):
+    """Inserts the number of columns and rows of each file into `tables`.
+
+    Parameters:
+        session (ProfilingSession): Session of the run.
+    """
+    table_key = (session.server_name, session.catalog_name, session.schema_name)
+    files = list_files(session.source_params)
+    # files removed from the source
+    dropped_tables = [
+        key for key in get_metadata_keys(session, "tables") if key[0] not in files
+    ]
+    data = []
+    done = []
+    pbar = tqdm(files.items(), desc="Tables: ")
+    for table_name, path in pbar:
+        if session.is_done("Tables", table_name):
+            continue
+        if not should_profile(session, "tables", (table_name,)):
+            continue
+        pbar.set_description(f"Tables - {table_name}")
+        schema = read_schema(path)
+        data.append(table_key + (table_name, len(schema), count_rows(path, schema)))
+        done.append(table_name)
+    with session.transaction():
+        replace_metadata(session, "tables", data, dropped_tables)
+        for table_name in done:
+            session.mark_done("Tables", table_name)
+    session.flush()
+
+    return
+
+
+def profile_files(session: ProfilingSession, table_rows: Union[list, None] = None):
+    """Inserts the uniques, data values, dates and stats of the files of the
+    source, reading each file once.
+
+    The columns of the Parquet files that `footer_profiles` computes from the
+    statistics of their row groups are not decoded. The fingerprint of the
+    files for `--incremental` is their number of rows and modification time.
+
+    Args:
+        session (ProfilingSession): Session of the run.
+        table_rows (list, optional): Tables to profile, as returned by
+            `get_tables_from_metadata`. Defaults to all the tables.
+    """
+    files = list_files(session.source_params)
+
+    def profile_table(table_row):
+        server_name, catalog_name, schema_name, table_name, _ = table_row
+        column_rows = get_columns_from_metadata(
+            session, server_name, catalog_name, schema_name, table_name
+        )
+        if len(column_rows) == 0:
+            return
+        path = files[table_name]
+        column_names = [column_row[0] for column_row in column_rows]
+        profiles = {}
+        if file_format(path) == "parquet":
+            profiles = footer_profiles(path, column_names)
+        decoded = [name for name in column_names if name not in profiles]
+        if len(decoded) > 0:
+            chunks = stream_file(path, decoded, session.fetch_size)
+            profiles.update(profile_chunks(chunks, decoded))
+        write_profiles(session, table_row, column_rows, profiles)
+
+    if table_rows is None:
+        table_rows = get_tables_from_metadata(session)
+    table_rows = [table_row for table_row in table_rows if table_row[3] in files]
+    for table_row in table_rows:
+        modified = files[table_row[3]].stat().st_mtime_ns
+        session.fingerprints.setdefault(table_row, (table_row[4], str(modified), None))
+    for_each_table(session, table_rows, profile_table, "Files")
@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Union
+
+from aeda.querylog import QueryRecord
+
+
+class ProfilingHooks:
+    """Callbacks of the events of a profiling run.
+
+    Subclass it and override the events of interest, and pass the hooks to
+    the `ProfilingSession` of the run. `on_table_start`, `on_table_end` and
+    `on_query` are called from the thread that profiles the table or runs
+    the query, so with several workers they must be thread-safe. The times
+    are values of `time.perf_counter`.
+    """
+
+    def on_stage_start(self, stage: str):
+        """Called when `stage` starts."""
+
+    def on_stage_end(self, stage: str):
+        """Called when `stage` ends, even if it failed."""
+
+    def on_table_start(self, stage: str, table_name: str):
+        """Called when `stage` starts profiling `table_name`."""
+
+    def on_table_end(self, stage: str, table_name: str):
+        """Called when `stage` is done with `table_name`, even if it failed."""
+
+    def on_query(
+        self,
+        record: QueryRecord,
+        call: str,
+        start_time: float,
+        seconds: float,
+        n_rows: int,
+    ):
+        """Called after every call to the database of the query of `record`,
+        `call` being `execute`, `executemany` or `fetch`, that took `seconds`
+        from `start_time` and returned or wrote `n_rows` rows."""
+
+    def close(self):
+        """Called when the session is closed."""
+
+
+class ChromeTrace(ProfilingHooks):
+    """Writes the events of a run to `path` in the Chrome trace event format,
+    to open in a timeline viewer like Perfetto or `chrome://tracing`.
+
+    Every thread of the run is a track. The stages and tables are spans of the
+    thread that runs them, and each call to the source or the metadata is a
+    span nested in them, so the time of a table that isn't covered by its
+    queries is the time spent in the client, like the pandas work. The writes
+    of the write-behind writer are on the track of its own thread.
+
+    Args:
+        path (Union[str, Path]): JSON file of the trace.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.events: list[dict] = []
+        self._pid = os.getpid()
+        self._threads: dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._start_time = time.perf_counter()
+
+    def _add(self, event: dict, start_time: float = None):
+        thread = threading.current_thread()
+        start_time = time.perf_counter() if start_time is None else start_time
+        with self._lock:
+            tid = self._threads.get(thread.ident)
+            if tid is None:
+                tid = self._threads[thread.ident] = len(self._threads) + 1
+                self.events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": self._pid,
+                        "tid": tid,
+                        "args": {"name": thread.name},
+                    }
+                )
+            event.update(
+                pid=self._pid,
+                tid=tid,
+                ts=round((start_time - self._start_time) * 1_000_000, 1),
+            )
+            self.events.append(event)
+
+    def on_stage_start(self, stage: str):
+        self._add({"name": stage, "cat": "stage", "ph": "B"})
+
+    def on_stage_end(self, stage: str):
+        self._add({"name": stage, "cat": "stage", "ph": "E"})
+
+    def on_table_start(self, stage: str, table_name: str):
+        self._add(
+            {"name": table_name, "cat": "table", "ph": "B", "args": {"stage": stage}}
+        )
+
+    def on_table_end(self, stage: str, table_name: str):
+        self._add({"name": table_name, "cat": "table", "ph": "E"})
+
+    def on_query(
+        self,
+        record: QueryRecord,
+        call: str,
+        start_time: float,
+        seconds: float,
+        n_rows: int,
+    ):
+        self._add(
+            {
+                "name": record.query_type,
+                "cat": record.target,
+                "ph": "X",
+                "dur": round(seconds * 1_000_000, 1),
+                "args": {
+                    "call": call,
+                    "table_name": record.table_name,
+                    "column_name": record.column_name,
+                    "rows": n_rows,
+                },
+            },
+            start_time,
+        )
+
+    def close(self):
+        with self._lock:
+            self.path.write_text(
+                json.dumps({"traceEvents": self.events, "displayTimeUnit": "ms"})
+            )
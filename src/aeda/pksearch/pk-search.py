@@ -6,7 +6,7 @@ import pandas as pd
 from sqlalchemy import create_engine
 from tqdm import tqdm
 
-import aeda
+from aeda import utils as _utils
 
 FORMAT = "%(asctime)-15s %(message)s"
 logging.basicConfig(filename="pk-search.log", level=logging.INFO, format=FORMAT)
@@ -18,23 +18,19 @@ TO DO:
 satisfy the number of rows.
 - test if random sampling is more efficient than top n rows.
 """
-SOURCE_ENGINE = "mssqlserver"  # or one of the above
-METADATA_ENGINE = "mssqlserver"  # or one of the above
+# Edit with the sections of your `databases.ini` file
+SOURCE_SECTION = "<SOURCE-SECTION>"
+METADATA_SECTION = "<METADATA-SECTION>"
 
-# Edit with your connections
-source_connection_params = "./string_connections/<CONNECTION_PARAMETERS_TO_SOURCE>"
-metadata_connection_params = "./string_connections/<CONNECTION_PARAMETERS_TO_METADATA>"
+source_connection_params = _utils.get_db_connection_string(SOURCE_SECTION)
+metadata_connection_params = _utils.get_db_connection_string(METADATA_SECTION)
 
-aeda.setSourceConnection(SOURCE_ENGINE, source_connection_params)
-aeda.setMetadataConnection(METADATA_ENGINE, metadata_connection_params)
-
-# The string_connections/<CONNECTION_PARAMETERS_TO_SOURCE> file has the following line (for MSSQLSERVER)
-# mssql+pyodbc://<DOMAIN>\<USER_NAME>:<PASSWORD>@<DATABASE>
-string_connection_file = "string_connections/<CONNECTION_PARAMETERS_TO_SOURCE>"
-with open(string_connection_file, "r") as cs:
-    connection_engine_metadata = cs.read().replace("\n", "")
-
-source_engine = create_engine(connection_engine_metadata)
+# The source section points to a `mssqlserver` database
+source_engine = create_engine(
+    "mssql+pyodbc://{user}:{password}@{host}:{port}/{catalog}?driver=ODBC+Driver+17+for+SQL+Server".format(
+        **source_connection_params
+    )
+)
 connection = source_engine.connect()
 
 # FUNCTIONS
@@ -46,8 +42,8 @@ def run_query_on_source(query):
     This shold be used only for queries that returns 1 row such as counts or summaries for
     performance reasons.
     """
-    conn_source = aeda.get_db_connection(source_connection_params)
-    cursor_source = aeda.get_db_cursor(conn_source)
+    conn_source = _utils.get_db_connection(source_connection_params)
+    cursor_source = conn_source.cursor()
     cursor_source.execute(query)
     rows = cursor_source.fetchall()
     cursor_source.close()
@@ -61,7 +57,7 @@ def get_columns_for_pk_search(server_name, table_catalog, table_schema, table_na
     Ignores columns with NULL values and return columns with more than one unique value.
     Ignores columns with money data type.
     """
-    conn_metadata = aeda.get_db_connection(metadata_connection_params)
+    conn_metadata = _utils.get_db_connection(metadata_connection_params)
     cursor_metadata = conn_metadata.cursor()
     sql = """select column_name 
             from uniques 
@@ -0,0 +1,319 @@
+import math
+from collections import Counter
+from datetime import date
+from typing import Union
+
+import pandas as pd
+
+from aeda.sketches import SpaceSaving, is_null
+
+PERCENTILES = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.975, 0.99)
+
+
+class ColumnProfile:
+    """Frequencies of the values of a column, from which every metric of the
+    metadata database is derived.
+
+    A profile is updated with the values of the column as they are read and
+    profiles of different chunks of the same column can be merged, so the
+    table only needs to be read once to compute the uniques, data values,
+    dates and stats of all its columns.
+
+    With `max_values`, the frequencies are dropped once the column has
+    `max_values` distinct values, counting `None`, and only the nulls and the
+    `top_k` most frequent values, kept by a Space-Saving sketch, are counted
+    from then on, so the memory of the profile stays bounded.
+
+    Args:
+        column_name (str): Name of the column.
+        data_type (str, optional): Data type of the column. Defaults to None.
+        max_values (int, optional): Distinct values after which the
+            frequencies are dropped. Defaults to None, all of them are kept.
+        top_k (int, optional): Most frequent values kept after dropping the
+            frequencies. Defaults to 0.
+
+    Example:
+        >>> profile = ColumnProfile("amount")
+        >>> profile.update([1, 2, 2, None])
+        >>> profile.count_distinct, profile.count_null
+        (2, 1)
+    """
+
+    def __init__(
+        self,
+        column_name: str,
+        data_type: str = None,
+        max_values: int = None,
+        top_k: int = 0,
+    ):
+        self.column_name = column_name
+        self.data_type = data_type
+        self.max_values = max_values
+        self.top_k = top_k
+        self.frequencies = Counter()
+        self.truncated = False
+        self.top = None
+        self._count_null = 0
+
+    def update(self, values):
+        """Counts `values`, an iterable with values of the column, with the
+        NaN values counted as `None`."""
+        return self._add(Counter(None if is_null(value) else value for value in values))
+
+    def merge(self, other: "ColumnProfile"):
+        """Adds the frequencies of `other`, a profile of the same column."""
+        self._add(other.frequencies)
+        if other.truncated:
+            self._truncate()
+            self._count_null += other._count_null
+            if self.top is not None and other.top is not None:
+                self.top.merge(other.top)
+        return self
+
+    def _add(self, counts: Counter):
+        if self.truncated:
+            self._count_null += counts.get(None, 0)
+            if self.top is not None:
+                self.top.update_counts(counts)
+            return self
+        self.frequencies.update(counts)
+        if self.max_values is not None and len(self.frequencies) >= self.max_values:
+            self._truncate()
+        return self
+
+    def _truncate(self):
+        """Drops the frequencies, keeping the nulls and the `top_k` values."""
+        if self.truncated:
+            return
+        counts = self.frequencies
+        self.frequencies = Counter()
+        self.truncated = True
+        if self.top_k > 0:
+            self.top = SpaceSaving(self.top_k)
+        self._add(counts)
+
+    @property
+    def count_null(self) -> int:
+        if self.truncated:
+            return self._count_null
+        return self.frequencies.get(None, 0)
+
+    @property
+    def count_distinct(self) -> Union[int, None]:
+        """Distinct values, without `None`, or None if the frequencies were
+        dropped."""
+        if self.truncated:
+            return None
+        return len(self.frequencies) - (1 if None in self.frequencies else 0)
+
+    def estimate_distinct(self, scale: float = 1.0) -> int:
+        """Returns the distinct values of a column estimated from a uniform
+        sample of `1 / scale` of its rows.
+
+        It's the Guaranteed-Error Estimator, the values seen once in the
+        sample stand for `sqrt(scale)` values of the column, and its ratio
+        error is at most `sqrt(scale)`.
+        """
+        if scale <= 1:
+            return self.count_distinct
+        singletons = sum(
+            1
+            for value, frequency in self.frequencies.items()
+            if value is not None and frequency == 1
+        )
+        return int(round(math.sqrt(scale) * singletons)) + (
+            self.count_distinct - singletons
+        )
+
+    def value_frequencies(self) -> list:
+        """Returns `(value, frequency)` of every value, including `None`."""
+        return list(self.frequencies.items())
+
+    def top_values(self, k: int) -> list:
+        """Returns `(value, frequency)` of the `k` most frequent values."""
+        if self.truncated:
+            return self.top.top()[:k] if self.top is not None else []
+        return self.frequencies.most_common(k)
+
+    def _numeric_frequencies(self) -> list:
+        return sorted(
+            (float(value), frequency)
+            for value, frequency in self.frequencies.items()
+            if value is not None
+        )
+
+    def stats(self) -> tuple:
+        """Returns avg, stdev, var, sum, max, min and range of the values.
+
+        The standard deviation and variance are the sample ones, like the
+        `stdev` and `variance` aggregates of the databases.
+        """
+        frequencies = self._numeric_frequencies()
+        n = sum(frequency for _, frequency in frequencies)
+        if n == 0:
+            return (None,) * 7
+        sum_ = sum(value * frequency for value, frequency in frequencies)
+        avg_ = sum_ / n
+        if n > 1:
+            var_ = sum(
+                frequency * (value - avg_) ** 2 for value, frequency in frequencies
+            ) / (n - 1)
+            stdev_ = math.sqrt(var_)
+        else:
+            var_ = stdev_ = None
+        max_ = frequencies[-1][0]
+        min_ = frequencies[0][0]
+        return avg_, stdev_, var_, sum_, max_, min_, max_ - min_
+
+    def percentiles(self) -> tuple:
+        """Returns the `PERCENTILES` of the values and the interquartile range.
+
+        The percentiles are discrete, like `percentile_disc`: the smallest
+        value whose cumulative frequency reaches the percentile.
+        """
+        frequencies = self._numeric_frequencies()
+        n = sum(frequency for _, frequency in frequencies)
+        if n == 0:
+            return (None,) * (len(PERCENTILES) + 1)
+        values = []
+        cumulative = 0
+        i = 0
+        for value, frequency in frequencies:
+            cumulative += frequency
+            while i < len(PERCENTILES) and cumulative >= PERCENTILES[i] * n:
+                values.append(value)
+                i += 1
+        q1 = values[PERCENTILES.index(0.25)]
+        q3 = values[PERCENTILES.index(0.75)]
+        return tuple(values) + (q3 - q1,)
+
+    def month_frequencies(self) -> list:
+        """Returns `(first_day_of_month, frequency)` of the values, with the
+        values that are not dates counted as `None`."""
+        months = Counter()
+        for value, frequency in self.frequencies.items():
+            months[first_day_of_month(value)] += frequency
+        return list(months.items())
+
+
+class Moments:
+    """Count, mean and sum of squared deviations of the values of a numeric
+    column, with their sum, max and min.
+
+    Moments of disjoint parts of a column are merged exactly with the pairwise
+    update of Chan et al., so the stats of a table can be computed from the
+    aggregates of each of its partitions.
+
+    Example:
+        >>> moments = Moments.from_aggregates(2, 1.5, 0.5, 3, 2, 1)
+        >>> moments.merge(Moments.from_aggregates(1, 3, None, 3, 3, 3))
+        >>> moments.stats()[:3]
+        (2.0, 1.0, 1.0)
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sum = 0.0
+        self.max = None
+        self.min = None
+
+    @classmethod
+    def from_aggregates(cls, count, avg, var, sum_, max_, min_) -> "Moments":
+        """Returns the moments of the `count`, `avg`, sample `var`, `sum`,
+        `max` and `min` aggregates of a part of the column."""
+        moments = cls()
+        moments.n = int(count or 0)
+        if moments.n == 0:
+            return moments
+        moments.mean = float(avg)
+        moments.m2 = float(var) * (moments.n - 1) if var is not None else 0.0
+        moments.sum = float(sum_)
+        moments.max = float(max_)
+        moments.min = float(min_)
+        return moments
+
+    def merge(self, other: "Moments"):
+        """Adds the moments of `other`, a disjoint part of the same column."""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta**2 * self.n * other.n / n
+        self.n = n
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+        self.min = min(self.min, other.min)
+        return self
+
+    def stats(self) -> tuple:
+        """Returns avg, stdev, var, sum, max, min and range of the values, like
+        `ColumnProfile.stats`."""
+        if self.n == 0:
+            return (None,) * 7
+        if self.n > 1:
+            var_ = self.m2 / (self.n - 1)
+            stdev_ = math.sqrt(var_)
+        else:
+            var_ = stdev_ = None
+        return (
+            self.mean,
+            stdev_,
+            var_,
+            self.sum,
+            self.max,
+            self.min,
+            self.max - self.min,
+        )
+
+
+def first_day_of_month(value):
+    """Returns the first day of the month of `value`, or `None` if `value` is
+    not a date."""
+    if value is None:
+        return None
+    try:
+        timestamp = pd.Timestamp(value)
+    except (TypeError, ValueError):
+        return None
+    if pd.isna(timestamp):
+        return None
+    return date(timestamp.year, timestamp.month, 1)
+
+
+def sampling_error(sample_rows: int, n_rows: int) -> float:
+    """Returns the margin of error, with 95% of confidence, of a proportion
+    estimated from a uniform sample of `sample_rows` of `n_rows` rows."""
+    if sample_rows == 0:
+        return 1.0
+    if n_rows <= 1 or sample_rows >= n_rows:
+        return 0.0
+    return 1.96 * math.sqrt(0.25 / sample_rows * (n_rows - sample_rows) / (n_rows - 1))
+
+
+def profile_chunks(
+    chunks, column_names: list, max_values: int = None, top_k: int = 0
+) -> dict:
+    """Profiles every column of `chunks`, an iterable of lists of tuples with
+    the values of `column_names`, and returns a `ColumnProfile` per column
+    name, with `max_values` and `top_k`. Only one chunk is held in memory at
+    a time."""
+    profiles = {
+        column_name: ColumnProfile(column_name, max_values=max_values, top_k=top_k)
+        for column_name in column_names
+    }
+    for rows in chunks:
+        for column_name, values in zip(column_names, zip(*rows)):
+            profiles[column_name].update(values)
+    return profiles
+
+
+def profile_rows(rows: list, column_names: list) -> dict:
+    """Profiles every column of `rows`, a list of tuples with the values of
+    `column_names`, and returns a `ColumnProfile` per column name."""
+    return profile_chunks([rows], column_names)
@@ -0,0 +1,311 @@
+import functools
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Union
+
+# Sections of the `databases.ini` file whose queries are logged, with the log
+# and the role of the database in the run, `source` or `metadata`.
+_LOGS: dict = {}
+_LOGS_LOCK = threading.Lock()
+_context = threading.local()
+
+QUOTED_COLUMNS = ['"{0}"', "`{0}`", "[{0}]"]
+
+
+class Query(str):
+    """Text of a query of `SQL_SCRIPTS` that keeps its `query_type`.
+
+    Formatting it returns a `Query` of the same type, with the column it
+    targets if the template quotes `{0}` as a column name, so the queries
+    run on an `InstrumentedConnection` are logged by template.
+    """
+
+    def __new__(cls, text: str, query_type: str, column_name: str = None):
+        query = super().__new__(cls, text)
+        query.query_type = query_type
+        query.column_name = column_name
+        return query
+
+    def format(self, *args, **kwargs) -> "Query":
+        column_name = None
+        if args and any(quoted in self for quoted in QUOTED_COLUMNS):
+            column_name = str(args[0])
+        return Query(super().format(*args, **kwargs), self.query_type, column_name)
+
+
+class QueryRecord:
+    """A query logged by a `QueryLog`."""
+
+    __slots__ = [
+        "target",
+        "stage",
+        "query_type",
+        "table_name",
+        "column_name",
+        "started_at",
+        "seconds",
+        "n_rows",
+    ]
+
+    def __init__(self, target, stage, query_type, table_name, column_name, started_at):
+        self.target = target
+        self.stage = stage
+        self.query_type = query_type
+        self.table_name = table_name
+        self.column_name = column_name
+        self.started_at = started_at
+        self.seconds = 0.0
+        self.n_rows = 0
+
+    def row(self) -> tuple:
+        return (
+            self.target,
+            self.stage,
+            self.query_type,
+            self.table_name,
+            self.column_name,
+            round(self.started_at, 6),
+            round(self.seconds, 6),
+            self.n_rows,
+        )
+
+
+class QueryLog:
+    """Queries run on the source and the metadata databases during a run.
+
+    Every query run on a connection opened by `utils.get_db_connection` to
+    `source` or `metadata` while the log is registered is recorded with its
+    template, the stage and table being profiled, its latency, the time
+    spent fetching its rows included, and the number of rows it returned or
+    wrote. The `on_query` event of the `hooks` is called after every call to
+    the database of a query.
+
+    Args:
+        source (str): Section of the `databases.ini` file of the source.
+        metadata (str): Section of the `databases.ini` file of the metadata.
+        hooks (list, optional): `ProfilingHooks` of the run. Defaults to None.
+    """
+
+    def __init__(self, source: str, metadata: str, hooks: list = None):
+        self.source = source
+        self.metadata = metadata
+        self.hooks = list(hooks or [])
+        self.records: list[QueryRecord] = []
+        self._start_time = time.perf_counter()
+
+    def record(self, target: str, query) -> QueryRecord:
+        """Returns a new record of `query` run on the `target` database."""
+        query_type = getattr(query, "query_type", None)
+        if query_type is None:
+            query_type = summarize(query)
+        record = QueryRecord(
+            target,
+            getattr(_context, "stage", None),
+            query_type,
+            getattr(_context, "table_name", None),
+            getattr(query, "column_name", None),
+            time.perf_counter() - self._start_time,
+        )
+        self.records.append(record)
+        return record
+
+
+def summarize(query) -> str:
+    """Returns the first words of a query that isn't a `Query`."""
+    if isinstance(query, bytes):
+        query = query[:200].decode(errors="replace")
+    return " ".join(str(query)[:200].split())[:60]
+
+
+def register(query_log: QueryLog):
+    """Starts logging the queries run on the databases of `query_log`."""
+    with _LOGS_LOCK:
+        _LOGS[query_log.metadata] = (query_log, "metadata")
+        _LOGS[query_log.source] = (query_log, "source")
+
+
+def unregister(query_log: QueryLog):
+    """Stops logging the queries run on the databases of `query_log`."""
+    with _LOGS_LOCK:
+        for section in [query_log.source, query_log.metadata]:
+            if _LOGS.get(section, (None,))[0] is query_log:
+                del _LOGS[section]
+
+
+@contextmanager
+def context(stage: str = None, table_name: str = None):
+    """Logs the queries run by the calling thread in the `with` block, or the
+    decorated function, as queries of `stage` on `table_name`."""
+    previous = (
+        getattr(_context, "stage", None),
+        getattr(_context, "table_name", None),
+    )
+    _context.stage = stage or previous[0]
+    _context.table_name = table_name or previous[1]
+    try:
+        yield
+    finally:
+        _context.stage, _context.table_name = previous
+
+
+def bind(function):
+    """Returns `function` wrapped to log the queries it runs, on any thread,
+    as queries of the stage and table of the calling thread."""
+    stage = getattr(_context, "stage", None)
+    table_name = getattr(_context, "table_name", None)
+
+    @functools.wraps(function)
+    def bound(*args, **kwargs):
+        with context(stage, table_name):
+            return function(*args, **kwargs)
+
+    return bound
+
+
+def instrument(conn, section: Union[str, None]):
+    """Returns `conn` wrapped to log its queries if the queries of `section`
+    are logged, or `conn` otherwise."""
+    if section in _LOGS:
+        return InstrumentedConnection(conn, section)
+    return conn
+
+
+class InstrumentedCursor:
+    """DB-API cursor that logs its queries in the `QueryLog` of its section.
+
+    The time spent fetching the rows of a query is added to its latency.
+    Everything else is delegated to the wrapped cursor.
+    """
+
+    def __init__(
+        self,
+        cursor,
+        section: str,
+        record: QueryRecord = None,
+        query_log: QueryLog = None,
+    ):
+        object.__setattr__(self, "_cursor", cursor)
+        object.__setattr__(self, "_section", section)
+        object.__setattr__(self, "_record", record)
+        object.__setattr__(self, "_query_log", query_log)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+    def _start(self, query) -> Union[QueryRecord, None]:
+        query_log, target = _LOGS.get(self._section, (None, None))
+        record = None if query_log is None else query_log.record(target, query)
+        object.__setattr__(self, "_record", record)
+        object.__setattr__(self, "_query_log", query_log)
+        return record
+
+    def _add(self, call: str, start_time: float, n_rows: int):
+        if self._record is None:
+            return
+        seconds = time.perf_counter() - start_time
+        self._record.seconds += seconds
+        self._record.n_rows += n_rows
+        for hook in self._query_log.hooks:
+            hook.on_query(self._record, call, start_time, seconds, n_rows)
+
+    def execute(self, query, *args, **kwargs):
+        record = self._start(query)
+        start_time = time.perf_counter()
+        try:
+            result = self._cursor.execute(query, *args, **kwargs)
+        finally:
+            self._add("execute", start_time, 0)
+        if result is self._cursor:
+            return self
+        if hasattr(result, "fetchall"):
+            # `execute` of the sqlite3 connections returns a new cursor
+            return InstrumentedCursor(result, self._section, record, self._query_log)
+        return result
+
+    def executemany(self, query, seq_of_parameters):
+        self._start(query)
+        start_time = time.perf_counter()
+        try:
+            result = self._cursor.executemany(query, seq_of_parameters)
+        finally:
+            n_rows = (
+                len(seq_of_parameters) if hasattr(seq_of_parameters, "__len__") else 0
+            )
+            self._add("executemany", start_time, n_rows)
+        return self if result is self._cursor else result
+
+    def fetchone(self):
+        start_time = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._add("fetch", start_time, 0 if row is None else 1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        start_time = time.perf_counter()
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._add("fetch", start_time, len(rows))
+        return rows
+
+    def fetchall(self):
+        start_time = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._add("fetch", start_time, len(rows))
+        return rows
+
+    def __iter__(self):
+        rows = iter(self._cursor)
+        while True:
+            start_time = time.perf_counter()
+            try:
+                row = next(rows)
+            except StopIteration:
+                self._add("fetch", start_time, 0)
+                return
+            self._add("fetch", start_time, 1)
+            yield row
+
+
+class InstrumentedConnection(InstrumentedCursor):
+    """DB-API connection whose cursors log their queries. The queries run by
+    the connection itself, like `execute` of sqlite3 and DuckDB, are logged
+    too."""
+
+    def cursor(self, *args, **kwargs) -> InstrumentedCursor:
+        return InstrumentedCursor(self._cursor.cursor(*args, **kwargs), self._section)
+
+
+def slowest_queries(rows: list, n: int) -> list:
+    """Returns `[seconds, target, stage, query_type, table_name, column_name,
+    rows]` of the `n` slowest of the `rows` of `get_query_log`."""
+    slowest = sorted(rows, key=lambda row: row[6] or 0, reverse=True)[:n]
+    return [[row[6], row[0], row[1], row[2], row[3], row[4], row[7]] for row in slowest]
+
+
+def stage_breakdown(rows: list) -> list:
+    """Returns `[stage, queries, source seconds, metadata seconds, seconds,
+    rows]` of every stage of the `rows` of `get_query_log`, in the order
+    the stages started."""
+    stages = defaultdict(lambda: [0, 0.0, 0.0, 0])
+    for target, stage, _, _, _, _, seconds, n_rows in sorted(
+        rows, key=lambda row: row[5] or 0
+    ):
+        totals = stages[stage or "-"]
+        totals[0] += 1
+        totals[1 if target == "source" else 2] += seconds or 0
+        totals[3] += n_rows or 0
+    return [
+        [
+            stage,
+            n,
+            round(source, 3),
+            round(metadata, 3),
+            round(source + metadata, 3),
+            n_rows,
+        ]
+        for stage, (n, source, metadata, n_rows) in stages.items()
+    ]
@@ -0,0 +1,546 @@
+import functools
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+from aeda import querylog as _querylog
+from aeda import utils as _utils
+from aeda.config import (
+    FETCH_SIZE,
+    HLL_PRECISION,
+    KLL_K,
+    PARTITION_MIN_ROWS,
+    SAMPLE_MIN_ROWS,
+    SQL_SCRIPTS,
+)
+from aeda.writer import MetadataWriter
+
+FORMAT = "%(asctime)-15s %(message)s"
+logging.basicConfig(level=logging.INFO, format=FORMAT)
+logger = logging.getLogger(__name__)
+
+
+def prepare_queries(db_engine: str) -> dict[str, str]:
+    """Returns the text of every query of `SQL_SCRIPTS` available for `db_engine`,
+    as a `Query` that keeps its type for the query log."""
+    return {
+        query_type: _querylog.Query(queries[db_engine], query_type)
+        for query_type, queries in SQL_SCRIPTS.items()
+        if db_engine in queries
+    }
+
+
+def profiling_stage(stage: str):
+    """Decorates a stage `profile(session, ...)` to run it in
+    `session.in_stage(stage)`."""
+
+    def decorator(profile):
+        @functools.wraps(profile)
+        def profile_stage(session, *args, **kwargs):
+            with session.in_stage(stage):
+                return profile(session, *args, **kwargs)
+
+        return profile_stage
+
+    return decorator
+
+
+class PartitionExecutor(ThreadPoolExecutor):
+    """Pool of threads that runs the callables submitted to it with
+    `querylog.bind`, so their queries are logged with the stage and table of
+    the thread that submitted them."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(_querylog.bind(fn), *args, **kwargs)
+
+
+class ProfilingSession:
+    """State shared by the stages of an `explore` run.
+
+    The connection parameters, dialects and query text of the source and
+    metadata databases are resolved once when the session is created, and a
+    connection to each database is borrowed from its pool the first time it
+    is used and kept until the session is closed.
+
+    Every thread that queries the source borrows its own connection, while
+    the metadata connection is shared and guarded by `metadata_lock`.
+
+    Args:
+        source (str): Section of the `databases.ini` file of the source.
+        metadata (str): Section of the `databases.ini` file of the metadata.
+        overwrite (bool, optional): Overwrite existing metadata. Defaults to True.
+        overwrite_stats (bool, optional): Overwrite the existing `stats` too,
+            which are kept otherwise, even with `overwrite`. Defaults to False.
+        threshold (int, optional): Maximum number of unique values to store
+            in `data_values`. Defaults to 5_000.
+        min_n_rows (int, optional): Minimum number of rows for a table to be
+            processed. Defaults to 0.
+        with_percentiles (bool, optional): Compute percentiles. Defaults to False.
+        workers (int, optional): Number of tables profiled concurrently.
+            Defaults to 1.
+        fetch_size (int, optional): Number of rows fetched at a time when
+            the rows of a table are streamed. Defaults to `FETCH_SIZE`.
+        approx_distinct (bool, optional): Approximate the distinct values of
+            the tables profiled on the server side. Defaults to False.
+        hll_precision (int, optional): Precision of the HyperLogLog sketches
+            used when the source can't approximate distinct values.
+            Defaults to `HLL_PRECISION`.
+        top_k (int, optional): Number of most frequent values stored in
+            `data_values` for the columns with more than `threshold` distinct
+            values, 0 (zero) to skip those columns. Defaults to 0.
+        sketch_percentiles (bool, optional): Estimate the percentiles with KLL
+            sketches built in a single pass of each table, instead of one
+            sorting query per column. Defaults to False.
+        kll_k (int, optional): Accuracy of the KLL sketches. Defaults to
+            `KLL_K`.
+        sample (float, optional): Sample profiled of the tables with at least
+            `sample_min_rows` rows, a fraction of their rows if it's less than
+            1 or a number of rows otherwise, 0 (zero) to profile all the rows.
+            Defaults to 0.
+        sample_min_rows (int, optional): Minimum number of rows of the tables
+            sampled. Defaults to `SAMPLE_MIN_ROWS`.
+        sample_tables (dict, optional): Sample of specific tables by table
+            name, overriding `sample` and `sample_min_rows`. Defaults to None.
+        incremental (bool, optional): Skip the tables whose fingerprint hasn't
+            changed since they were profiled, and overwrite the metadata of
+            the ones that changed. Defaults to False.
+        checksum (bool, optional): Add an aggregate checksum of the rows to
+            the fingerprint of the tables. Defaults to False.
+        run_id (str, optional): Identifier of a previous run to resume, the
+            work recorded in its journal is skipped. Defaults to None, a new
+            run.
+        partitions (int, optional): Number of key ranges the tables with at
+            least `partition_min_rows` rows are split in, each profiled
+            concurrently with its own connection. Defaults to 1.
+        partition_min_rows (int, optional): Minimum number of rows of the
+            tables split in key ranges. Defaults to `PARTITION_MIN_ROWS`.
+        write_behind (bool, optional): Write the metadata from a background
+            thread with its own connection, committing in batches, so the
+            stages don't wait for the metadata database. Defaults to False.
+        query_log (bool, optional): Log the template, target, latency and
+            rows of every query run on the source and the metadata, written
+            to `query_log` when the session is closed. Defaults to False.
+        hooks (list, optional): `ProfilingHooks` called when the stages and
+            tables start and end and after every call to the databases, like
+            `ChromeTrace`. Defaults to None.
+
+    Example:
+        >>> with ProfilingSession("my-source", "my-metadata") as session:
+        ...     profile_columns(session)
+    """
+
+    def __init__(
+        self,
+        source: str,
+        metadata: str,
+        overwrite: bool = True,
+        overwrite_stats: bool = False,
+        threshold: int = 5_000,
+        min_n_rows: int = 0,
+        with_percentiles: bool = False,
+        workers: int = 1,
+        fetch_size: int = FETCH_SIZE,
+        approx_distinct: bool = False,
+        hll_precision: int = HLL_PRECISION,
+        top_k: int = 0,
+        sketch_percentiles: bool = False,
+        kll_k: int = KLL_K,
+        sample: float = 0,
+        sample_min_rows: int = SAMPLE_MIN_ROWS,
+        sample_tables: dict = None,
+        incremental: bool = False,
+        checksum: bool = False,
+        run_id: str = None,
+        partitions: int = 1,
+        partition_min_rows: int = PARTITION_MIN_ROWS,
+        write_behind: bool = False,
+        query_log: bool = False,
+        hooks: list = None,
+    ):
+        self.source = source
+        self.metadata = metadata
+        self.source_params = _utils.get_db_connection_string(source)
+        self.metadata_params = _utils.get_db_connection_string(metadata)
+        self.source_engine = self.source_params["db_engine"]
+        self.metadata_engine = self.metadata_params["db_engine"]
+        (
+            _,
+            self.server_name,
+            self.catalog_name,
+            self.schema_name,
+        ) = _utils.get_connection_parameters(source)
+        self.source_queries = prepare_queries(self.source_engine)
+        self.metadata_queries = prepare_queries(self.metadata_engine)
+
+        self.overwrite = overwrite or incremental
+        self.overwrite_stats = overwrite_stats or incremental
+        self.threshold = threshold
+        self.min_n_rows = min_n_rows
+        self.with_percentiles = with_percentiles
+        self.workers = max(1, workers)
+        self.fetch_size = fetch_size
+        self.approx_distinct = approx_distinct
+        self.hll_precision = hll_precision
+        self.top_k = top_k
+        self.sketch_percentiles = sketch_percentiles
+        self.kll_k = kll_k
+        self.sample = sample
+        self.sample_min_rows = sample_min_rows
+        self.sample_tables = sample_tables or {}
+        self.incremental = incremental
+        self.checksum = checksum
+        self.fingerprints = {}
+        self.metadata_keys = {}
+        self.resume = run_id is not None
+        self.run_id = run_id or "{}-{}".format(
+            datetime.now().strftime("%Y%m%d%H%M%S"), uuid.uuid4().hex[:6]
+        )
+        self._journal = None
+        self.partitions = max(1, partitions)
+        self.partition_min_rows = partition_min_rows
+        self.write_behind = write_behind
+        self.hooks = list(hooks or [])
+        self.write_query_log = query_log
+        self.query_log = None
+        if query_log or self.hooks:
+            # registered before any connection of the session is opened
+            self.query_log = _querylog.QueryLog(source, metadata, self.hooks)
+            _querylog.register(self.query_log)
+        if self.workers > 1 or self.partitions > 1:
+            # One connection per worker and partition plus the one of the main
+            # thread.
+            partition_connections = self.partitions if self.partitions > 1 else 0
+            _utils.get_pool(source, size=self.workers + partition_connections + 1)
+
+        self.metadata_lock = threading.RLock()
+        self._local = threading.local()
+        self._source_connections = []
+        self._source_lock = threading.Lock()
+        self._executor = None
+        self._partition_executor = None
+        self._metadata_connection = None
+        self._metadata_cursor = None
+        self._writer = None
+        # adds the tables and columns of this version to older databases
+        _utils.upgrade_metadata_database(self.metadata_connection, self.metadata_engine)
+
+    def source_query(self, query_type: str) -> str:
+        """Returns the text of `query_type` in the dialect of the source."""
+        return self.source_queries[query_type]
+
+    def metadata_query(self, query_type: str) -> str:
+        """Returns the text of `query_type` in the dialect of the metadata."""
+        return self.metadata_queries[query_type]
+
+    def table_sample(self, table_name: str, n_rows: int):
+        """Returns the sample profiled of `table_name`, a fraction of its rows
+        or a number of rows, or None if all its `n_rows` rows are profiled."""
+        if table_name in self.sample_tables:
+            sample = self.sample_tables[table_name]
+        elif n_rows >= self.sample_min_rows:
+            sample = self.sample
+        else:
+            return None
+        if sample <= 0 or sample == 1 or sample >= n_rows:
+            return None
+        return sample
+
+    @contextmanager
+    def in_stage(self, stage: str):
+        """Runs the `with` block as `stage`, logging its queries as queries of
+        the stage and calling the `on_stage_start` and `on_stage_end` hooks."""
+        for hook in self.hooks:
+            hook.on_stage_start(stage)
+        try:
+            with _querylog.context(stage):
+                yield
+        finally:
+            for hook in self.hooks:
+                hook.on_stage_end(stage)
+
+    @contextmanager
+    def in_table(self, stage: str, table_name: str):
+        """Runs the `with` block as `stage` on `table_name`, logging its
+        queries as queries of the stage on the table and calling the
+        `on_table_start` and `on_table_end` hooks."""
+        for hook in self.hooks:
+            hook.on_table_start(stage, table_name)
+        try:
+            with _querylog.context(stage, table_name):
+                yield
+        finally:
+            for hook in self.hooks:
+                hook.on_table_end(stage, table_name)
+
+    @property
+    def journal(self) -> set:
+        """`(stage, table_name, column_name)` of the work done by the run,
+        loaded from the metadata when the run is resumed."""
+        if self._journal is None:
+            self._journal = set()
+            if self.resume:
+                with self.metadata_lock:
+                    cursor = self.metadata_cursor
+                    cursor.execute(
+                        self.metadata_query("get_journal"),
+                        (
+                            self.server_name,
+                            self.catalog_name,
+                            self.schema_name,
+                            self.run_id,
+                        ),
+                    )
+                    self._journal = set(cursor.fetchall())
+        return self._journal
+
+    def is_done(self, stage: str, table_name: str = "", column_name: str = ""):
+        """Returns True if the run has done `stage` for the table or column."""
+        return (stage, table_name, column_name) in self.journal
+
+    def mark_done(self, stage: str, table_name: str = "", column_name: str = ""):
+        """Records in the journal of the run that `stage` is done for the
+        table or column, so a resumed run skips it. Call it in the
+        `transaction` that writes the metadata of the work, so they are
+        committed together."""
+        with self.metadata_lock:
+            self.write(
+                [
+                    (
+                        "insert_into_journal",
+                        [
+                            (
+                                self.server_name,
+                                self.catalog_name,
+                                self.schema_name,
+                                table_name,
+                                self.run_id,
+                                stage,
+                                column_name,
+                            )
+                        ],
+                    )
+                ]
+            )
+            self.journal.add((stage, table_name, column_name))
+
+    @property
+    def source_connection(self):
+        """Connection to the source owned by the calling thread."""
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = _utils.get_pool(self.source).acquire()
+            with self._source_lock:
+                self._source_connections.append(conn)
+            self._local.connection = conn
+        return conn
+
+    @property
+    def source_cursor(self):
+        """Cursor on the source owned by the calling thread."""
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = _utils.get_cursor(self.source_connection, self.source_engine)
+            self._local.cursor = cursor
+        return cursor
+
+    @property
+    def metadata_connection(self):
+        if self._metadata_connection is None:
+            self._metadata_connection = _utils.get_pool(self.metadata).acquire()
+            if self.metadata_engine == "sqlite3":
+                _utils.set_sqlite_pragmas(self._metadata_connection, metadata=True)
+        return self._metadata_connection
+
+    @property
+    def metadata_cursor(self):
+        if self._metadata_cursor is None:
+            self._metadata_cursor = _utils.get_cursor(
+                self.metadata_connection, self.metadata_engine
+            )
+        return self._metadata_cursor
+
+    def stream_source(self, query: str):
+        """Runs `query` on the source and yields its rows in chunks of
+        `fetch_size` rows, using a server-side cursor when the driver has
+        one, so only a chunk of the result is held in memory at a time."""
+        cursor = _utils.get_streaming_cursor(self.source_connection, self.source_engine)
+        if self.source_engine != "duckdb":
+            # duckdb cursors have no `arraysize`, they fetch in vectors
+            cursor.arraysize = self.fetch_size
+        try:
+            cursor.execute(query)
+            while True:
+                rows = cursor.fetchmany(self.fetch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cursor.close()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Pool of `workers` threads kept for the whole session, so each
+        worker reuses its source connection from one stage to the next."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="aeda"
+            )
+        return self._executor
+
+    @property
+    def partition_executor(self) -> ThreadPoolExecutor:
+        """Pool of `partitions` threads that profile the key ranges of a
+        table, apart from the workers so a worker can wait for them. The
+        queries run on its threads are logged with the stage and table of
+        the thread that submitted them."""
+        if self._partition_executor is None:
+            self._partition_executor = PartitionExecutor(
+                max_workers=self.partitions, thread_name_prefix="aeda-partition"
+            )
+        return self._partition_executor
+
+    def commit(self):
+        """Commits the changes made to the metadata database."""
+        with self.metadata_lock:
+            self.metadata_connection.commit()
+
+    @property
+    def writer(self) -> MetadataWriter:
+        """Write-behind writer of the metadata, started the first time it is
+        used."""
+        with self.metadata_lock:
+            if self._writer is None:
+                self._writer = MetadataWriter(self.metadata)
+        return self._writer
+
+    @contextmanager
+    def transaction(self):
+        """Collects the metadata written by the calling thread in the `with`
+        block and writes it in a single transaction when the block ends, or
+        none of it if the block fails. The writes of a nested block are
+        committed when the nested block ends."""
+        outer = getattr(self._local, "statements", None)
+        self._local.statements = statements = []
+        try:
+            yield
+        finally:
+            self._local.statements = outer
+        self._write(statements)
+
+    def write(self, statements: list):
+        """Runs the `(query_type, rows)` statements on the metadata in a single
+        transaction, running each query with every one of its rows.
+
+        In a `transaction` the statements are written when it ends. With
+        `write_behind` the statements are queued to the writer, which runs
+        them in the order they are written.
+        """
+        pending = getattr(self._local, "statements", None)
+        if pending is not None:
+            pending.extend(statements)
+            return
+        self._write(statements)
+
+    def _write(self, statements: list):
+        statements = [
+            (self.metadata_query(query_type), rows)
+            for query_type, rows in statements
+            if len(rows) > 0
+        ]
+        if len(statements) == 0:
+            return
+        with self.metadata_lock:
+            if self.write_behind:
+                self.writer.write(statements)
+                return
+            cursor = self.metadata_cursor
+            _utils.begin_transaction(cursor, self.metadata_engine)
+            for query, rows in statements:
+                _utils.write_rows(cursor, query, rows, self.metadata_engine)
+            self.metadata_connection.commit()
+
+    def flush(self):
+        """Waits until the metadata queued to the writer is committed."""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def rollback_source(self):
+        """Ends a failed transaction on the source, so the next query can run."""
+        try:
+            _utils.rollback(self.source_connection)
+        except Exception:
+            logger.warning(f"Couldn't rollback the connection to {self.source}")
+
+    def close(self):
+        """Commits the metadata queued to the writer, returns the
+        connections of the session to their pools and closes the hooks."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self._partition_executor is not None:
+            self._partition_executor.shutdown(wait=True, cancel_futures=True)
+            self._partition_executor = None
+        try:
+            self._write_query_log()
+        finally:
+            writer, self._writer = self._writer, None
+            try:
+                if writer is not None:
+                    writer.close()
+            finally:
+                self._release_connections()
+                self._close_hooks()
+
+    def _write_query_log(self):
+        """Writes the queries logged by the session to `query_log`, the
+        writes of the log itself aren't logged."""
+        query_log, self.query_log = self.query_log, None
+        if query_log is None:
+            return
+        try:
+            # the writes queued to the writer are logged as they run
+            self.flush()
+        finally:
+            _querylog.unregister(query_log)
+        if not self.write_query_log:
+            return
+        key = (self.server_name, self.catalog_name, self.schema_name, self.run_id)
+        self.write(
+            [
+                (
+                    "insert_into_query_log",
+                    [key + record.row() for record in query_log.records],
+                )
+            ]
+        )
+
+    def _close_hooks(self):
+        hooks, self.hooks = self.hooks, []
+        for hook in hooks:
+            try:
+                hook.close()
+            except Exception as e:
+                logger.error(f"Exception: {e} closing the hooks {hook}")
+
+    def _release_connections(self):
+        if self._metadata_cursor is not None:
+            try:
+                _utils.close_cursor(self._metadata_cursor, self._metadata_connection)
+            except Exception:
+                pass
+        for conn in self._source_connections:
+            _utils.get_pool(self.source).release(conn)
+        if self._metadata_connection is not None:
+            _utils.get_pool(self.metadata).release(self._metadata_connection)
+        self._source_connections = []
+        self._local = threading.local()
+        self._metadata_connection = self._metadata_cursor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,316 @@
+import heapq
+import math
+import random
+from collections import Counter
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from aeda.config import HLL_PRECISION, KLL_K
+
+
+def is_null(value) -> bool:
+    """Returns True if `value` is `None` or a NaN float or decimal, which are
+    counted as nulls, like pandas `isnull` does."""
+    if value is None:
+        return True
+    if isinstance(value, float):
+        return value != value
+    if isinstance(value, Decimal):
+        return value.is_nan()
+    return False
+
+
+def hash_values(values) -> np.ndarray:
+    """Returns a 64-bit hash of every value of `values` that is not null.
+
+    The hashes are stable between processes, so sketches built on different
+    machines can be merged.
+    """
+    values = np.array([value for value in values if not is_null(value)], dtype=object)
+    if len(values) == 0:
+        return np.empty(0, dtype=np.uint64)
+    return pd.util.hash_array(values.astype(str))
+
+
+class HyperLogLog:
+    """HyperLogLog sketch to estimate the number of distinct values of a
+    column in constant memory.
+
+    Sketches of different chunks of a column can be merged, the estimate of
+    the merged sketch is the estimate of the distinct values of all the
+    chunks.
+
+    Args:
+        precision (int, optional): Number of bits used to choose a register,
+            the sketch has `2 ** precision` registers and a relative standard
+            error of `1.04 / sqrt(2 ** precision)`. Defaults to `HLL_PRECISION`.
+
+    Example:
+        >>> hll = HyperLogLog(precision=12)
+        >>> hll.update(range(10_000))
+        >>> hll.count()  # about 10_000
+    """
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        if not 4 <= precision <= 18:
+            raise ValueError(f"precision must be between 4 and 18, got {precision}")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        """Relative standard error of the estimate."""
+        return 1.04 / math.sqrt(self.m)
+
+    def update(self, values):
+        """Adds `values`, an iterable with values of the column, ignoring
+        the nulls."""
+        hashes = hash_values(values)
+        if len(hashes) == 0:
+            return self
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        remaining = hashes & np.uint64((1 << (64 - self.precision)) - 1)
+        # position of the leftmost 1 in the remaining 64 - precision bits
+        bit_length = np.frexp(remaining.astype(np.float64))[1]
+        rank = (64 - self.precision - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other: "HyperLogLog"):
+        """Adds the values of `other`, a sketch with the same precision."""
+        if other.precision != self.precision:
+            raise ValueError("Only sketches with the same precision can be merged")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        """Returns the estimated number of distinct values."""
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = (
+            alpha * self.m**2 / np.sum(np.power(2.0, -self.registers.astype(float)))
+        )
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * self.m and zeros > 0:
+            # linear counting for small cardinalities
+            estimate = self.m * math.log(self.m / zeros)
+        return int(round(estimate))
+
+
+class SpaceSaving:
+    """Space-Saving sketch that keeps the `k` most frequent values of a column
+    in bounded memory.
+
+    Every value kept has an estimated frequency and the maximum error of that
+    estimate, the frequency of a value is always between `count - error` and
+    `count`. When the column has `k` or less distinct values, the frequencies
+    are exact. Sketches of different chunks of a column can be merged.
+
+    Args:
+        k (int): Number of values kept.
+
+    Example:
+        >>> top = SpaceSaving(k=2)
+        >>> top.update(["a", "b", "a", "a"])
+        >>> top.top()
+        [('a', 3), ('b', 1)]
+    """
+
+    def __init__(self, k: int):
+        if k < 1:
+            raise ValueError(f"k must be greater than 0, got {k}")
+        self.k = k
+        self.counts = {}
+        self.errors = {}
+
+    @property
+    def min_count(self) -> int:
+        """Frequency that any value not kept in the sketch can have at most."""
+        return min(self.counts.values()) if len(self.counts) >= self.k else 0
+
+    def update(self, values):
+        """Adds `values`, an iterable with values of the column."""
+        return self.update_counts(Counter(values))
+
+    def update_counts(self, counts: dict):
+        """Adds the values of `counts`, the frequency of each value."""
+        return self._combine(counts, {}, 0)
+
+    def merge(self, other: "SpaceSaving"):
+        """Adds the values of `other`, a sketch of another chunk of the column."""
+        return self._combine(other.counts, other.errors, other.min_count)
+
+    def _combine(self, counts: dict, errors: dict, min_count: int):
+        own_min_count = self.min_count
+        combined_counts = {}
+        combined_errors = {}
+        for value in self.counts.keys() | counts.keys():
+            combined_counts[value] = self.counts.get(value, own_min_count) + counts.get(
+                value, min_count
+            )
+            combined_errors[value] = self.errors.get(value, own_min_count) + errors.get(
+                value, min_count
+            )
+        kept = heapq.nlargest(self.k, combined_counts, key=combined_counts.get)
+        self.counts = {value: combined_counts[value] for value in kept}
+        self.errors = {value: combined_errors[value] for value in kept}
+        return self
+
+    def items(self) -> list:
+        """Returns `(value, count, error)` of the values kept, the most
+        frequent first."""
+        return sorted(
+            (
+                (value, count, self.errors[value])
+                for value, count in self.counts.items()
+            ),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+    def top(self) -> list:
+        """Returns `(value, frequency)` of the values that are certainly among
+        the most frequent ones, with the frequency they have at least."""
+        return [
+            (value, count - error)
+            for value, count, error in self.items()
+            if count - error > 0
+        ]
+
+
+class KLL:
+    """KLL sketch to estimate the quantiles of a numeric column in bounded
+    memory, with one pass over the values.
+
+    The sketch keeps at most about `3 * k` values. The quantiles it returns
+    are values of the column whose rank is within about `1.65 / k` of the
+    requested one (1.65% with the default `k`). Sketches of different chunks
+    of a column can be merged.
+
+    Args:
+        k (int, optional): Accuracy of the sketch. Defaults to `KLL_K`.
+        seed (int, optional): Seed of the compactions, so the same values
+            give the same quantiles. Defaults to None.
+
+    Example:
+        >>> kll = KLL(k=200)
+        >>> kll.update(range(1_000_000))
+        >>> kll.quantile(0.5)  # about 500_000
+    """
+
+    def __init__(self, k: int = KLL_K, seed: int = None):
+        if k < 8:
+            raise ValueError(f"k must be at least 8, got {k}")
+        self.k = k
+        self.compactors = [[]]
+        self.random = random.Random(seed)
+        self.n = 0
+
+    def _capacity(self, height: int) -> int:
+        depth = len(self.compactors) - height - 1
+        return int(math.ceil(self.k * (2 / 3) ** depth)) + 1
+
+    def _size(self) -> int:
+        return sum(len(compactor) for compactor in self.compactors)
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(height) for height in range(len(self.compactors)))
+
+    def _compress(self):
+        while self._size() >= self._max_size():
+            for height, compactor in enumerate(self.compactors):
+                if len(compactor) >= self._capacity(height):
+                    if height + 1 == len(self.compactors):
+                        self.compactors.append([])
+                    # keep one of every two values, each with twice the weight
+                    compactor.sort()
+                    offset = self.random.randint(0, 1)
+                    self.compactors[height + 1].extend(compactor[offset::2])
+                    compactor.clear()
+                    break
+
+    def update(self, values):
+        """Adds `values`, an iterable with values of the column, ignoring
+        the nulls."""
+        values = [float(value) for value in values if not is_null(value)]
+        for i in range(0, len(values), self.k):
+            self.compactors[0].extend(values[i : i + self.k])
+            self._compress()
+        self.n += len(values)
+        return self
+
+    def merge(self, other: "KLL"):
+        """Adds the values of `other`, a sketch of another chunk of the column."""
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for height, compactor in enumerate(other.compactors):
+            self.compactors[height].extend(compactor)
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantiles(self, qs) -> list:
+        """Returns the smallest value whose estimated cumulative frequency
+        reaches each quantile of `qs`, `None` if the sketch is empty."""
+        weighted = sorted(
+            (value, 1 << height)
+            for height, compactor in enumerate(self.compactors)
+            for value in compactor
+        )
+        total = sum(weight for _, weight in weighted)
+        if total == 0:
+            return [None] * len(qs)
+        values = []
+        for q in qs:
+            cumulative = 0
+            for value, weight in weighted:
+                cumulative += weight
+                if cumulative >= q * total:
+                    break
+            values.append(value)
+        return values
+
+    def quantile(self, q: float):
+        """Returns the estimated quantile `q` of the values."""
+        return self.quantiles([q])[0]
+
+
+def reservoir_sample(chunks, k: int, seed: int = None) -> list:
+    """Returns `k` rows drawn uniformly at random from `chunks`, an iterable
+    of lists of rows, holding at most `k` rows in memory.
+
+    Args:
+        chunks (iterable): Lists of rows, as yielded by `stream_source`.
+        k (int): Number of rows of the sample.
+        seed (int, optional): Seed of the sampling. Defaults to None.
+
+    Example:
+        >>> rows = reservoir_sample([[(1,), (2,)], [(3,), (4,)]], k=2)
+        >>> len(rows)
+        2
+    """
+    rng = random.Random(seed)
+    sample = []
+    n = 0
+    for rows in chunks:
+        for row in rows:
+            n += 1
+            if len(sample) < k:
+                sample.append(row)
+            else:
+                i = rng.randrange(n)
+                if i < k:
+                    sample[i] = row
+    return sample
+
+
+def bernoulli_sample(chunks, fraction: float, seed: int = None):
+    """Yields the chunks of `chunks` keeping each row with probability
+    `fraction`, so the sample is streamed like the rows it is drawn from."""
+    rng = random.Random(seed)
+    for rows in chunks:
+        sample = [row for row in rows if rng.random() < fraction]
+        if sample:
+            yield sample
@@ -1,12 +1,35 @@
 import logging
 import sqlite3
+from collections import Counter
+from concurrent.futures import as_completed
 from pathlib import Path
+from typing import Iterable, Union
 
+import pandas as pd
 from termcolor import colored
 from tqdm import tqdm
 
+from aeda import querylog as _querylog
 from aeda import utils as _utils
-from aeda.config import MAX_LENGTH_VALUES, SQL_CREATE_SCRIPTS, SQL_SCRIPTS
+from aeda.config import (
+    APPROX_DISTINCT_ERRORS,
+    DATA_TYPES,
+    KLL_K,
+    MAX_LENGTH_VALUES,
+    METADATA_KEYS,
+    SINGLE_ROW_METADATA,
+    SQL_CREATE_SCRIPTS,
+    SQL_SCRIPTS,
+)
+from aeda.profiler import PERCENTILES, Moments, profile_chunks, sampling_error
+from aeda.session import ProfilingSession, profiling_stage
+from aeda.sketches import (
+    KLL,
+    HyperLogLog,
+    SpaceSaving,
+    bernoulli_sample,
+    reservoir_sample,
+)
 
 FORMAT = "%(asctime)-15s %(message)s"
 logging.basicConfig(level=logging.INFO, format=FORMAT)
@@ -42,6 +65,7 @@ def create_database(section: str) -> None:
             cursor.execute(script)
             conn.commit()
         cursor.close()
+        _utils.upgrade_metadata_database(conn, conn_string["db_engine"])
         conn.close()
     elif conn_string["db_engine"] in ["snowflake"]:
         with open(SQL_CREATE_SCRIPTS[conn_string["db_engine"]], "r") as f:
@@ -54,6 +78,34 @@ def create_database(section: str) -> None:
             cursor.execute(script)
             conn.commit()
         cursor.close()
+        _utils.upgrade_metadata_database(conn, conn_string["db_engine"])
+        conn.close()
+    elif conn_string["db_engine"] == "duckdb":
+        dbname = f"{conn_string['catalog']}.duckdb"
+        if not Path(conn_string["folder"]).is_dir():
+            Path(conn_string["folder"]).mkdir(parents=True)
+
+        logger.info(
+            f"Creating database {colored(dbname, 'green')} in {colored(conn_string['folder'], 'yellow')}"
+        )
+
+        conn = _utils.get_db_connection(conn_string)
+        with open(SQL_CREATE_SCRIPTS[conn_string["db_engine"]], "r") as f:
+            sql_script = f.read()
+        scripts = [
+            x
+            for x in sql_script.split(";")
+            if len(x.strip()) > 0 and not x.strip().startswith("--")
+        ]
+
+        cursor = conn.cursor()
+
+        for script in scripts:
+            cursor.execute(script)
+        conn.commit()
+
+        cursor.close()
+        _utils.upgrade_metadata_database(conn, conn_string["db_engine"])
         conn.close()
     elif conn_string["db_engine"] == "sqlite3":
         dbname = str(conn_string["schema"] + ".db")
@@ -65,6 +117,7 @@ def create_database(section: str) -> None:
         )
 
         conn = sqlite3.connect(Path(conn_string["folder"]) / dbname)
+        _utils.set_sqlite_pragmas(conn, metadata=True)
 
         with open(SQL_CREATE_SCRIPTS[conn_string["db_engine"]], "r") as f:
             sql_script = f.read()
@@ -77,6 +130,7 @@ def create_database(section: str) -> None:
             conn.commit()
 
         cursor.close()
+        _utils.upgrade_metadata_database(conn, conn_string["db_engine"])
         conn.close()
     else:
         logger.info(
@@ -133,208 +187,98 @@ def insert_or_update_columns(
 
         overwrite (bool) = True.
     """
+    with ProfilingSession(
+        db_engine_source, db_engine_metadata, overwrite=overwrite
+    ) as session:
+        profile_columns(session)
+    return
 
-    def check_if_column_exists(
-        db_engine_metadata,
-        server_name,
-        table_catalog,
-        table_schema,
-        table_name,
-        column_name,
-    ):
-        conn_string = _utils.get_db_connection_string(db_engine_metadata)
-        query = SQL_SCRIPTS["check_if_column_exists"][conn_string["db_engine"]]
-        conn = _utils.get_db_connection(conn_string)
-        cursor = conn.cursor()
-        cursor.execute(
-            query, (server_name, table_catalog, table_schema, table_name, column_name)
-        )
-        rows = cursor.fetchall()
-        rowcount = len(rows)
-        cursor.close()
-        conn.close()
-
-        if rowcount > 0:
-            return False
-        else:
-            return True
-
-    def delete_from_columns(
-        db_engine_metadata,
-        server_name,
-        table_catalog,
-        table_schema,
-        table_name,
-        column_name,
-    ):
-        conn_string = _utils.get_db_connection_string(db_engine_metadata)
-        conn = _utils.get_db_connection(conn_string)
-        query = SQL_SCRIPTS["delete_from_columns"][conn_string["db_engine"]]
-        cursor = conn.cursor()
-        cursor.execute(
-            query, (server_name, table_catalog, table_schema, table_name, column_name)
-        )
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
-
-    def insert_many_into_columns(db_engine_metadata, data):
-        conn_string = _utils.get_db_connection_string(db_engine_metadata)
-        conn = _utils.get_db_connection(conn_string)
-        query = SQL_SCRIPTS["insert_into_columns"][conn_string["db_engine"]]
-        cursor = conn.cursor()
 
-        for _ in tqdm(get_chunks(data)):
-            cursor.executemany(query, (_))
-            conn.commit()
+@profiling_stage("Columns")
+def profile_columns(session: ProfilingSession):
+    """Inserts the columns of the source into the `columns` table. If
+    `overwrite` is set, the existing columns are replaced and the columns
+    dropped from the source are deleted.
 
-        cursor.close()
-        conn.close()
+    Parameters:
+        session (ProfilingSession): Session of the run.
+    """
+    if session.is_done("Columns"):
         return
-
-    column_rows = get_columns(db_engine_source)
-    data = []
-    pbar = tqdm(column_rows, desc="Columns - ")
-    for row in pbar:
-        (
-            server_name,
-            table_catalog,
-            table_schema,
-            table_name,
-            column_name,
-            ordinal_position,
-            data_type,
-        ) = row
-
-        pbar.set_description(f"Columns: {table_name}.{column_name}")
-        if overwrite and check_if_column_exists(
-            db_engine_metadata,
-            server_name,
-            table_catalog,
-            table_schema,
-            table_name,
-            column_name,
-        ):
-            delete_from_columns(
-                db_engine_metadata,
-                server_name,
-                table_catalog,
-                table_schema,
-                table_name,
-                column_name,
-            )
-
-            data.append(
-                (
-                    server_name,
-                    table_catalog,
-                    table_schema,
-                    table_name,
-                    column_name,
-                    ordinal_position,
-                    data_type,
-                )
-            )
-    insert_many_into_columns(db_engine_metadata, data)
+    column_rows = get_columns(session)
+    columns = {(row[3], row[4]) for row in column_rows}
+    # columns dropped from the source
+    dropped_columns = [
+        key for key in get_metadata_keys(session, "columns") if key not in columns
+    ]
+    with session.transaction():
+        replace_metadata(
+            session, "columns", [tuple(row) for row in column_rows], dropped_columns
+        )
+        session.mark_done("Columns")
+    session.flush()
     return
 
 
-def get_tables(db_engine_source: str, db_engine_metadata: str):
-    conn_string_source = _utils.get_db_connection_string(db_engine_source)
-    conn_string_metadata = _utils.get_db_connection_string(db_engine_metadata)
-
-    query = SQL_SCRIPTS["tables"][conn_string_metadata["db_engine"]]
-
-    conn = _utils.get_db_connection(conn_string_metadata)
-    cursor = conn.cursor()
+def get_tables(session: ProfilingSession):
+    cursor = session.metadata_cursor
     cursor.execute(
-        query,
+        session.metadata_query("tables"),
         (
-            conn_string_source["host"],
-            conn_string_source["catalog"],
-            conn_string_source["schema"],
+            session.source_params["host"],
+            session.source_params["catalog"],
+            session.source_params["schema"],
         ),
     )
     rows = cursor.fetchall()
 
-    cursor.close()
-    conn.close()
-
     return rows
 
 
 def get_number_of_columns(
-    db_engine_source: str,
-    db_engine_metadata: str,
+    session: ProfilingSession,
     server_name: str,
     catalog_name: str,
     schema_name: str,
     table_name: str,
 ):
-    conn_string_source = _utils.get_db_connection_string(db_engine_source)
-    conn_string_metadata = _utils.get_db_connection_string(db_engine_metadata)
-
-    query = SQL_SCRIPTS["number_of_columns"][conn_string_source["db_engine"]]
-
-    conn = _utils.get_db_connection(conn_string_source)
-    cursor = conn.cursor()
+    cursor = session.source_cursor
 
     try:
-        cursor.execute(query, (server_name, catalog_name, schema_name, table_name))
+        cursor.execute(
+            session.source_query("number_of_columns"),
+            (server_name, catalog_name, schema_name, table_name),
+        )
         row = cursor.fetchone()
     except Exception as e:
         logger.error(
             f"Exception: {e} Could't get number of columns from table {colored('.'.join([schema_name,table_name]), 'red')}"
         )
+        session.rollback_source()
         return None
 
-    finally:
-        cursor.close()
-        conn.close()
-
     return row
 
 
-def check_if_table_exists(
-    db_engine_metadata: str, server_name, catalog_name, schema_name, table_name
-):
-    conn_string_metadata = _utils.get_db_connection_string(db_engine_metadata)
-    query = SQL_SCRIPTS["check_if_table_exists"][conn_string_metadata["db_engine"]]
-    conn = _utils.get_db_connection(conn_string_metadata)
-    cursor = conn.cursor()
-    cursor.execute(query, (server_name, catalog_name, schema_name, table_name))
-    rows = cursor.fetchall()
-    rowcount = len(rows)
-    cursor.close()
-    conn.close()
-    return True if rowcount > 0 else False
-
-
 def delete_from_table():
     pass
 
 
-def get_number_of_rows(db_engine_source: str, schema_name: str, table_name: str):
-    conn_string_source = _utils.get_db_connection_string(db_engine_source)
-    conn = _utils.get_db_connection(conn_string_source)
-
-    query = SQL_SCRIPTS["number_of_rows"][conn_string_source["db_engine"]]
-
-    cursor = conn.cursor()
+def get_number_of_rows(session: ProfilingSession, schema_name: str, table_name: str):
+    cursor = session.source_cursor
     try:
         # FIXME chars in SAPHANA with '=', '>', or '#' chars in table names
-        cursor.execute(query.format(schema_name, table_name))
+        cursor.execute(
+            session.source_query("number_of_rows").format(schema_name, table_name)
+        )
 
         num_rows = cursor.fetchone()[0]
     except Exception as e:
         logger.error(
             f"Exception: {e} Could't get number of rows from table {colored('.'.join([schema_name,table_name]), 'red')}"
         )
+        session.rollback_source()
         return None
-    finally:
-        cursor.close()
-        conn.close()
 
     return num_rows
 
@@ -342,54 +286,53 @@ def get_number_of_rows(db_engine_source: str, schema_name: str, table_name: str)
 def insert_or_update_tables(
     db_engine_source: str, db_engine_metadata: str, overwrite: bool = True
 ):
-    conn_string_metadata = _utils.get_db_connection_string(db_engine_metadata)
+    with ProfilingSession(
+        db_engine_source, db_engine_metadata, overwrite=overwrite
+    ) as session:
+        profile_tables(session)
+    return
 
-    conn = _utils.get_db_connection(conn_string_metadata)
-    cursor = conn.cursor()
 
-    query_insert = SQL_SCRIPTS["insert_into_tables"][conn_string_metadata["db_engine"]]
-    query_delete = SQL_SCRIPTS["delete_from_tables"][conn_string_metadata["db_engine"]]
-    query_update = SQL_SCRIPTS["update_tables"][conn_string_metadata["db_engine"]]
+@profiling_stage("Tables")
+def profile_tables(session: ProfilingSession):
+    """Inserts the number of columns and rows of each table into `tables`.
 
-    table_rows = get_tables(db_engine_source, db_engine_metadata)
-    # logger.info("{} tables to be inserted into `tables`".format(len(table_rows)))
+    Parameters:
+        session (ProfilingSession): Session of the run.
+    """
+    table_rows = get_tables(session)
+    tables = {(row[3],) for row in table_rows}
+    # tables dropped from the source
+    dropped_tables = [
+        key for key in get_metadata_keys(session, "tables") if key not in tables
+    ]
+    data = []
+    done = []
     pbar = tqdm(table_rows, desc="Tables: ")
     for row in pbar:
         server_name, catalog_name, schema_name, table_name = row
-        _, _, _, _, n_columns, n_rows = get_number_of_columns(
-            db_engine_source,
-            db_engine_metadata,
+        if session.is_done("Tables", table_name):
+            continue
+        if not should_profile(session, "tables", (table_name,)):
+            continue
+        _, _, _, _, n_columns, _ = get_number_of_columns(
+            session,
             server_name,
             catalog_name,
             schema_name,
             table_name,
         )
         pbar.set_description(f"Tables - {table_name}")
-        if check_if_table_exists(
-            db_engine_metadata, server_name, catalog_name, schema_name, table_name
-        ):
-            if overwrite:
-                cursor.execute(
-                    query_delete, (server_name, catalog_name, schema_name, table_name)
-                )
-                conn.commit()
-            elif not overwrite:
-                continue
-        cursor.execute(
-            query_insert,
-            (server_name, catalog_name, schema_name, table_name, n_columns, n_rows),
-        )
-        conn.commit()
-        num_rows = get_number_of_rows(db_engine_source, schema_name, table_name)
-        cursor.execute(
-            query_update, (num_rows, server_name, catalog_name, schema_name, table_name)
+        num_rows = get_number_of_rows(session, schema_name, table_name)
+        data.append(
+            (server_name, catalog_name, schema_name, table_name, n_columns, num_rows)
         )
-        conn.commit()
-
-    cursor.close()
-    conn.close()
-
-    # logger.info("{} tables inserted into `tables`".format(len(table_rows)))
+        done.append(table_name)
+    with session.transaction():
+        replace_metadata(session, "tables", data, dropped_tables)
+        for table_name in done:
+            session.mark_done("Tables", table_name)
+    session.flush()
 
     return
 
@@ -398,49 +341,236 @@ def get_uniques(db_engine_source, db_engine_metadata):
     pass
 
 
-def get_tables_from_metadata(
-    db_engine_source: str, db_engine_metadata: str, min_n_rows: int = 0
-):
+def get_tables_from_metadata(session: ProfilingSession):
     """
     Returns SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME and N_ROWS
     """
-    conn_string_metadata = _utils.get_db_connection_string(db_engine_metadata)
-    query = SQL_SCRIPTS["get_tables"][conn_string_metadata["db_engine"]]
+    with session.metadata_lock:
+        cursor = session.metadata_cursor
+        cursor.execute(
+            session.metadata_query("get_tables").format(session.min_n_rows),
+            (session.server_name, session.catalog_name, session.schema_name),
+        )
+
+        rows = cursor.fetchall()
+
+    return rows
+
+
+def get_fingerprint(session: ProfilingSession, table_row: tuple) -> tuple:
+    """Returns the fingerprint of a table: its number of rows, when it was last
+    modified according to the catalog of the source and, with
+    `session.checksum`, an aggregate checksum of its rows.
+
+    The parts the source can't provide are None. The fingerprint is computed
+    once per session and reused by the following stages.
+    """
+    if table_row in session.fingerprints:
+        return session.fingerprints[table_row]
+    _, _, schema_name, table_name, n_rows = table_row
+
+    def get_value(query, parameters=()):
+        cursor = session.source_cursor
+        try:
+            cursor.execute(query, parameters)
+            row = cursor.fetchone()
+        except Exception as e:
+            logger.warning(f"Couldn't fingerprint {schema_name}.{table_name}: {e}")
+            session.rollback_source()
+            return None
+        if row is None or row[-1] is None:
+            return None
+        return str(row[-1])
 
-    _, server_name, catalog_name, schema_name = _utils.get_connection_parameters(
-        db_engine_source
-    )
+    last_modified = checksum = None
+    if "last_modified" in session.source_queries:
+        last_modified = get_value(
+            session.source_query("last_modified"), (schema_name, table_name)
+        )
+    if session.checksum and "table_checksum" in session.source_queries:
+        checksum = get_value(
+            session.source_query("table_checksum").format(schema_name, table_name)
+        )
+    fingerprint = (n_rows, last_modified, checksum)
+    session.fingerprints[table_row] = fingerprint
+    return fingerprint
 
-    conn = _utils.get_db_connection(conn_string_metadata)
-    cursor = conn.cursor()
 
-    cursor.execute(query.format(min_n_rows), (server_name, catalog_name, schema_name))
+def skip_unchanged(session: ProfilingSession, profile_table, stage: str):
+    """Returns `profile_table` wrapped to skip the tables whose fingerprint
+    hasn't changed since they were profiled by `stage`, and to store the
+    fingerprint of the tables it profiles."""
 
-    rows = cursor.fetchall()
+    def profile_changed_table(table_row):
+        server_name, catalog_name, schema_name, table_name, _ = table_row
+        key = (server_name, catalog_name, schema_name, table_name, stage)
+        fingerprint = get_fingerprint(session, table_row)
+        with session.metadata_lock:
+            cursor = session.metadata_cursor
+            cursor.execute(session.metadata_query("get_fingerprint"), key)
+            stored = cursor.fetchall()
+        if [tuple(row) for row in stored] == [fingerprint]:
+            return
+        profile_table(table_row)
+        session.write([("upsert_into_fingerprints", [key + fingerprint])])
 
-    cursor.close()
-    conn.close()
+    return profile_changed_table
 
-    return rows
+
+def skip_done(session: ProfilingSession, profile_table, stage: str):
+    """Returns `profile_table` wrapped to skip the tables the run has already
+    profiled in `stage`, and to record in the journal the ones it profiles."""
+
+    def profile_pending_table(table_row):
+        table_name = table_row[3]
+        if session.is_done(stage, table_name):
+            return
+        with session.transaction():
+            profile_table(table_row)
+            session.mark_done(stage, table_name)
+
+    return profile_pending_table
+
+
+def in_table(session: ProfilingSession, profile_table, stage: str):
+    """Returns `profile_table` wrapped to run in `session.in_table`, logging
+    the queries it runs as queries of `stage` on its table and calling the
+    hooks of the table."""
+
+    def profile_table_in_stage(table_row):
+        with session.in_table(stage, table_row[3]):
+            profile_table(table_row)
+
+    return profile_table_in_stage
+
+
+def for_each_table(
+    session: ProfilingSession, table_rows: list, profile_table, desc: str
+):
+    """Calls `profile_table` with every row of `table_rows`.
+
+    With more than one worker in the session, the tables are profiled
+    concurrently on the threads of `session.executor` and the progress bar is
+    updated from the calling thread as they complete. With
+    `session.incremental`, the tables that haven't changed since the last
+    time they were profiled by the stage are skipped. The tables are recorded
+    in the journal of the run as they are profiled, and the ones a resumed run
+    has already profiled are skipped. The stage and every table run in
+    `session.in_stage` and `session.in_table`, so their queries are logged
+    and the hooks of the session are called. The metadata queued to the
+    write-behind writer is committed before returning.
+
+    Args:
+        session (ProfilingSession): Session of the run.
+        table_rows (list): Rows returned by `get_tables_from_metadata`.
+        profile_table (Callable): Function that profiles a single table row.
+        desc (str): Description of the progress bar, and name of the stage
+            in the fingerprints and the journal.
+    """
+    if session.incremental:
+        profile_table = skip_unchanged(session, profile_table, desc)
+    profile_table = skip_done(session, profile_table, desc)
+    profile_table = in_table(session, profile_table, desc)
+    with session.in_stage(desc):
+        pbar = tqdm(total=len(table_rows), desc=desc)
+        if session.workers == 1:
+            for table_row in table_rows:
+                _, _, _, table_name, n_rows = table_row
+                pbar.set_description(f"{desc} - {table_name} ({n_rows:,} rows)")
+                profile_table(table_row)
+                pbar.update()
+        else:
+            futures = {
+                session.executor.submit(profile_table, table_row): table_row
+                for table_row in table_rows
+            }
+            try:
+                for future in as_completed(futures):
+                    future.result()
+                    _, _, _, table_name, n_rows = futures[future]
+                    pbar.set_description(f"{desc} - {table_name} ({n_rows:,} rows)")
+                    pbar.update()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        pbar.close()
+        # the next stages read the metadata of this one
+        session.flush()
 
 
 def get_columns_from_metadata(
-    db_engine_metadata, server_name, catalog_name, schema_name, table_name
+    session: ProfilingSession, server_name, catalog_name, schema_name, table_name
 ):
     """
     Returns column_name, ORDINAL_POSITION and DATA_TYPE
     """
-    conn_string = _utils.get_db_connection_string(db_engine_metadata)
-    query = SQL_SCRIPTS["get_columns"][conn_string["db_engine"]]
-    conn = _utils.get_db_connection(conn_string)
-    cursor = conn.cursor()
-    cursor.execute(query, (server_name, catalog_name, schema_name, table_name))
-    rows = cursor.fetchall()
-    cursor.close()
-    conn.close()
+    with session.metadata_lock:
+        cursor = session.metadata_cursor
+        cursor.execute(
+            session.metadata_query("get_columns"),
+            (server_name, catalog_name, schema_name, table_name),
+        )
+        rows = cursor.fetchall()
     return rows
 
 
+def stream_profiles(
+    session: ProfilingSession,
+    catalog_name: str,
+    table_name: str,
+    column_names: list,
+    max_values: Union[int, None] = None,
+    top_k: int = 0,
+) -> dict:
+    """Reads `column_names` of `table_name` in chunks of `session.fetch_size`
+    rows and returns a `ColumnProfile` per column, merged chunk by chunk.
+
+    The frequencies of the columns with `max_values` distinct values are
+    dropped, keeping only their nulls and `top_k` most frequent values, so the
+    memory used stays bounded whatever the number of rows.
+    """
+    query = session.source_query("select_columns").format(
+        ", ".join(column_names), catalog_name, session.schema_name, table_name
+    )
+    return profile_chunks(
+        session.stream_source(query), column_names, max_values=max_values, top_k=top_k
+    )
+
+
+def build_unique_counts_query(
+    db_engine: str,
+    schema_name: str,
+    table_name: str,
+    column_names: list,
+    approx: bool = False,
+) -> str:
+    """Returns a query that computes the number of distinct values and the
+    number of nulls of every column of `column_names` with one scan of the
+    table.
+
+    The result has one row with `count_distinct` and `count_null` of each
+    column, in the order of `column_names`.
+
+    Args:
+        db_engine (str): Database engine of the source.
+        schema_name (str): Schema of the table.
+        table_name (str): Name of the table.
+        column_names (list): Columns to count.
+        approx (bool, optional): Use the native approximate distinct count
+            of the engine, from `approx_unique_count_column`. Defaults to False.
+    """
+    query_type = "approx_unique_count_column" if approx else "unique_count_column"
+    expressions = " , ".join(
+        SQL_SCRIPTS[query_type][db_engine].format(column_name)
+        for column_name in column_names
+    )
+    query = _querylog.Query(
+        SQL_SCRIPTS["get_unique_counts"][db_engine], "get_unique_counts"
+    )
+    return query.format(expressions, schema_name, table_name)
+
+
 def insert_or_update_uniques(
     db_engine_source: str,
     db_engine_metadata: str,
@@ -460,200 +590,164 @@ def insert_or_update_uniques(
             Use 0 (zero) to process everything on the server side.
             Defaults to 100_000.
         max_columns (int, optional): Max number of columns to query all to the
-            database. Defaults to 50.
+            database, also the size of the batches counted on the server
+            side with a single scan. Defaults to 50.
     """
+    with ProfilingSession(
+        db_engine_source,
+        db_engine_metadata,
+        overwrite=overwrite,
+        min_n_rows=min_n_rows,
+    ) as session:
+        profile_uniques(session, max_rows=max_rows, max_columns=max_columns)
+    return
 
-    def get_unique_values(db_engine_source: str, table_name: str, column_name: str):
-        """
-        Returns `count_distinct` and `count_null`
-        """
-        _, _, _, schema_name = _utils.get_connection_parameters(db_engine_source)
-        conn_string_source = _utils.get_db_connection_string(db_engine_source)
-        conn_source = _utils.get_db_connection(conn_string_source)
 
-        query = SQL_SCRIPTS["get_unique_count"][conn_string_source["db_engine"]]
+def profile_uniques(
+    session: ProfilingSession,
+    max_rows: int = 100_000,
+    max_columns: int = 50,
+    table_rows: Union[list, None] = None,
+):
+    """Insert or update unique values.
 
-        cursor = conn_source.cursor()
-        cursor.execute(query.format(column_name, schema_name, table_name))
-        rows = cursor.fetchone()
-        cursor.close()
-        conn_source.close()
-        return rows
+    Args:
+        session (ProfilingSession): Session of the run.
+        max_rows (int, optional): Max number of rows to process using pandas.
+            Use 0 (zero) to process everything on the server side.
+            Defaults to 100_000.
+        max_columns (int, optional): Max number of columns to query all to the
+            database, also the size of the batches counted on the server
+            side with a single scan. Defaults to 50.
+        table_rows (list, optional): Tables to profile, as returned by
+            `get_tables_from_metadata`. Defaults to all the tables.
+    """
 
-    def insert_into_uniques(
-        db_engine_metadata: str,
-        server_name: str,
-        catalog_name: str,
-        schema_name: str,
-        table_name: str,
-        column_name: str,
-        ordinal_position: str,
-        data_type: str,
-        count_distinct: int,
-        count_null: int,
-    ):
-        conn_string_metadata = _utils.get_db_connection_string(db_engine_metadata)
-        query_insert = SQL_SCRIPTS["insert_into_uniques"][
-            conn_string_metadata["db_engine"]
-        ]
-        conn = _utils.get_db_connection(conn_string_metadata)
-        cursor = conn.cursor()
+    def get_unique_values(catalog_name: str, table_name: str, column_names: list):
+        """
+        Returns `count_distinct`, `count_null` and the relative error of
+        `count_distinct` of every column
+        """
+        approx = session.approx_distinct
+        if approx and session.source_engine not in APPROX_DISTINCT_ERRORS:
+            return get_sketched_unique_values(catalog_name, table_name, column_names)
+        cursor = session.source_cursor
         cursor.execute(
-            query_insert,
-            (
-                server_name,
-                catalog_name,
-                schema_name,
+            build_unique_counts_query(
+                session.source_engine,
+                session.schema_name,
                 table_name,
-                column_name,
-                ordinal_position,
-                data_type,
-                count_distinct,
-                count_null,
-            ),
+                column_names,
+                approx=approx,
+            )
         )
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
-
-    def check_if_unique_exists(
-        db_engine_metadata,
-        server_name,
-        table_catalog,
-        table_schema,
-        table_name,
-    ):
-        conn_string = _utils.get_db_connection_string(db_engine_metadata)
-        query = SQL_SCRIPTS["check_if_unique_exists"][conn_string["db_engine"]]
-        conn = _utils.get_db_connection(conn_string)
-        cursor = conn.cursor()
-        cursor.execute(query, (server_name, table_catalog, table_schema, table_name))
-        rows = cursor.fetchall()
-        rowcount = len(rows)
-        cursor.close()
-        conn.close()
-
-        return True if rowcount > 0 else False
+        row = cursor.fetchone()
+        error = APPROX_DISTINCT_ERRORS[session.source_engine] if approx else 0.0
+        return [(row[2 * i], row[2 * i + 1], error) for i in range(len(column_names))]
 
-    def delete_from_uniques(
-        db_engine_metadata,
-        server_name,
-        table_catalog,
-        table_schema,
-        table_name,
+    def get_sketched_unique_values(
+        catalog_name: str, table_name: str, column_names: list
     ):
-        conn_string = _utils.get_db_connection_string(db_engine_metadata)
-        conn = _utils.get_db_connection(conn_string)
-        query = SQL_SCRIPTS["delete_from_uniques"][conn_string["db_engine"]]
-        cursor = conn.cursor()
-        cursor.execute(query, (server_name, table_catalog, table_schema, table_name))
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
-
-    _, server_name, catalog_name, schema_name = _utils.get_connection_parameters(
-        db_engine_source
-    )
-
-    table_rows = get_tables_from_metadata(
-        db_engine_source, db_engine_metadata, min_n_rows=min_n_rows
-    )
+        """
+        Returns `count_distinct` estimated with a HyperLogLog sketch per column
+        over the streamed rows, `count_null` and the relative error of
+        `count_distinct` of every column
+        """
+        sketches = [HyperLogLog(session.hll_precision) for _ in column_names]
+        count_null = [0] * len(column_names)
+        query = session.source_query("select_columns").format(
+            ", ".join(column_names), catalog_name, session.schema_name, table_name
+        )
+        for rows in session.stream_source(query):
+            for i, values in enumerate(zip(*rows)):
+                sketches[i].update(values)
+                count_null[i] += values.count(None)
+        return [
+            (sketch.count(), nulls, sketch.relative_error)
+            for sketch, nulls in zip(sketches, count_null)
+        ]
 
-    # logger.info("{} tables counting unique and null values".format(len(table_rows)))
-    pbar = tqdm(table_rows, desc="Uniques")
-    for row in pbar:
-        server_name, catalog_name, schema_name, table_name, n_rows = row
-        pbar.set_description(f"Uniques - {table_name} ({n_rows:,} rows)")
-        if check_if_unique_exists(
-            db_engine_metadata, server_name, catalog_name, schema_name, table_name
-        ):
-            if overwrite:
-                delete_from_uniques(
-                    db_engine_metadata,
-                    server_name,
+    def profile_table(table_row):
+        server_name, catalog_name, schema_name, table_name, n_rows = table_row
+        if not should_profile(session, "uniques", (table_name,)):
+            return
+        table_key = (server_name, catalog_name, schema_name, table_name)
+        column_rows = get_columns_from_metadata(session, *table_key)
+        data = []
+        if n_rows < max_rows:
+            # count on the client the tables with less than `max_rows` rows,
+            # streaming them in chunks, and on the server the columns with
+            # more than `threshold` distinct values
+            for batch in get_chunks(column_rows, max_columns):
+                profiles = stream_profiles(
+                    session,
                     catalog_name,
-                    schema_name,
                     table_name,
+                    [column_row[0] for column_row in batch],
+                    max_values=session.threshold,
                 )
-            else:
-                continue
-        column_rows = get_columns_from_metadata(
-            db_engine_metadata, server_name, catalog_name, schema_name, table_name
-        )
-        if n_rows < max_rows:
-            # process in pandas for tables with less than `max_rows` rows
-            import math
-
-            import pandas as pd
-
-            df_ = pd.DataFrame(
-                column_rows, columns=["column_name", "ordinal_position", "data_type"]
-            )
-            _, _, _, schema_name = _utils.get_connection_parameters(db_engine_source)
-            conn_string_source = _utils.get_db_connection_string(db_engine_source)
-            conn_source = _utils.get_db_connection(conn_string_source)
-            cursor = conn_source.cursor()
-            count_distinct = []
-            count_null = []
-            for i in range(math.ceil(len(df_.column_name.to_list()) / max_columns)):
-                columns = df_.column_name.to_list()[
-                    i * max_columns : i * max_columns + max_columns
+                counts = {
+                    column_name: (profile.count_distinct, profile.count_null, 0.0)
+                    for column_name, profile in profiles.items()
+                    if not profile.truncated
+                }
+                truncated = [
+                    column_name
+                    for column_name, profile in profiles.items()
+                    if profile.truncated
                 ]
-
-                query = f"select {', '.join(columns)} from {catalog_name}.{schema_name}.{table_name};"
-
-                cursor.execute(query)
-                rows = cursor.fetchall()
-                df_aux = pd.DataFrame(rows, columns=columns)
-
-                count_distinct.append(df_aux.nunique())
-                count_null.append(df_aux.isnull().sum())
-            cursor.close()
-            conn_source.close()
-
-            df_unique = pd.concat(count_distinct).reset_index()
-            df_unique.columns = ["column_name", "distinct_values"]  # type:ignore
-            df_null = pd.concat(count_null).reset_index()
-            df_null.columns = ["column_name", "null_values"]  # type:ignore
-
-            df_ = df_.merge(df_unique).merge(df_null)
-            for _, r in df_.iterrows():
-                insert_into_uniques(
-                    db_engine_metadata,
-                    server_name,
-                    catalog_name,
-                    schema_name,
-                    table_name,
-                    r["column_name"],
-                    r["ordinal_position"],
-                    r["data_type"],
-                    r["distinct_values"],
-                    r["null_values"],
-                )
+                if len(truncated) > 0:
+                    counts.update(
+                        zip(
+                            truncated,
+                            get_unique_values(catalog_name, table_name, truncated),
+                        )
+                    )
+                for column_name, ordinal_position, data_type in batch:
+                    count_distinct, count_null, error = counts[column_name]
+                    data.append(
+                        table_key
+                        + (
+                            column_name,
+                            ordinal_position,
+                            data_type,
+                            int(count_distinct),
+                            int(count_null),
+                            error,
+                        )
+                    )
         else:
-            pbar1 = tqdm(column_rows, leave=False)
-            for column_row in pbar1:
-                column_name, ordinal_position, data_type = column_row
-                pbar1.set_description(f"Uniques - {table_name}.{column_name}")
-                count_distinct, count_null = get_unique_values(
-                    db_engine_source, table_name, column_name
+            # one scan of the table per batch of `max_columns` columns
+            batches = list(get_chunks(column_rows, max_columns))
+            pbar1 = tqdm(batches, leave=False, disable=session.workers > 1)
+            for batch in pbar1:
+                pbar1.set_description(f"Uniques - {table_name} ({len(batch)} columns)")
+                unique_values = get_unique_values(
+                    catalog_name, table_name, [c[0] for c in batch]
                 )
 
-                insert_into_uniques(
-                    db_engine_metadata,
-                    server_name,
-                    catalog_name,
-                    schema_name,
-                    table_name,
-                    column_name,
-                    ordinal_position,
-                    data_type,
-                    int(count_distinct),  # type:ignore
-                    int(count_null),  # type:ignore
-                )
+                for column_row, (count_distinct, count_null, error) in zip(
+                    batch, unique_values
+                ):
+                    column_name, ordinal_position, data_type = column_row
+                    data.append(
+                        table_key
+                        + (
+                            column_name,
+                            ordinal_position,
+                            data_type,
+                            int(count_distinct),  # type: ignore
+                            int(count_null),  # type: ignore
+                            error,
+                        )
+                    )
             # logger.info("{} columns inserted into `uniques`".format(len(column_rows)))
+        replace_metadata(session, "uniques", data, [(table_name,)])
+
+    if table_rows is None:
+        table_rows = get_tables_from_metadata(session)
+    # logger.info("{} tables counting unique and null values".format(len(table_rows)))
+    for_each_table(session, table_rows, profile_table, "Uniques")
 
 
 def insert_or_update_data_values(
@@ -681,245 +775,155 @@ def insert_or_update_data_values(
         max_columns (int, optional): Max number of columns to query all to the
             database. Defaults to 50.
     """
+    with ProfilingSession(
+        db_engine_source,
+        db_engine_metadata,
+        overwrite=overwrite,
+        threshold=threshold,
+        min_n_rows=min_n_rows,
+    ) as session:
+        profile_data_values(session, max_rows=max_rows, max_columns=max_columns)
+    return
 
-    def get_data_values_columns(
-        db_engine_metadata, server_name, catalog_name, schema_name, table_name
-    ):
+
+def profile_data_values(
+    session: ProfilingSession,
+    max_rows: int = 50_000,
+    max_columns: int = 50,
+    table_rows: Union[list, None] = None,
+):
+    """Insert or update data values.
+
+    Args:
+        session (ProfilingSession): Session of the run.
+        max_rows (int, optional): Max number of rows to process using pandas.
+            Use 0 (zero) to process everything on the server side.
+            Defaults to 50_000.
+        max_columns (int, optional): Max number of columns to query all to the
+            database. Defaults to 50.
+        table_rows (list, optional): Tables to profile, as returned by
+            `get_tables_from_metadata`. Defaults to all the tables.
+    """
+
+    def get_data_values_columns(server_name, catalog_name, schema_name, table_name):
         """
         Returns column_name, ORDINAL_POSITION and DATA_TYPE
         """
-        conn_string = _utils.get_db_connection_string(db_engine_metadata)
-        query = SQL_SCRIPTS["get_data_values_columns"][conn_string["db_engine"]]
-        conn = _utils.get_db_connection(conn_string)
-        cursor = conn.cursor()
-        cursor.execute(query, (server_name, catalog_name, schema_name, table_name))
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        with session.metadata_lock:
+            cursor = session.metadata_cursor
+            cursor.execute(
+                session.metadata_query("get_data_values_columns"),
+                (server_name, catalog_name, schema_name, table_name),
+            )
+            rows = cursor.fetchall()
         return rows
 
-    def check_if_data_value_exists(
-        db_engine_metadata,
-        server_name,
-        table_catalog,
-        table_schema,
-        table_name,
-        column_name,
-    ):
-        conn_string = _utils.get_db_connection_string(db_engine_metadata)
-        query = SQL_SCRIPTS["check_if_data_value_exists"][conn_string["db_engine"]]
-        conn = _utils.get_db_connection(conn_string)
-        cursor = conn.cursor()
-        cursor.execute(
-            query, (server_name, table_catalog, table_schema, table_name, column_name)
-        )
-        rows = cursor.fetchall()
-        rowcount = len(rows)
-        cursor.close()
-        conn.close()
-
-        if rowcount > 0:
-            return True
-        else:
-            return False
-
-    def delete_from_data_values(
-        db_engine_metadata,
-        server_name,
-        table_catalog,
-        table_schema,
-        table_name,
-        column_name,
-    ):
-        conn_string = _utils.get_db_connection_string(db_engine_metadata)
-        conn = _utils.get_db_connection(conn_string)
-        query = SQL_SCRIPTS["delete_from_data_values"][conn_string["db_engine"]]
-        cursor = conn.cursor()
+    def get_frequency(schema_name, table_name, column_name):
+        cursor = session.source_cursor
         cursor.execute(
-            query, (server_name, table_catalog, table_schema, table_name, column_name)
+            session.source_query("get_frequency").format(
+                column_name, schema_name, table_name
+            )
         )
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
-
-    def get_frequency(db_engine_source, schema_name, table_name, column_name):
-        conn_string = _utils.get_db_connection_string(db_engine_source)
-        query = SQL_SCRIPTS["get_frequency"][conn_string["db_engine"]]
-        conn = _utils.get_db_connection(conn_string)
-        cursor = conn.cursor()
-        cursor.execute(query.format(column_name, schema_name, table_name))
         rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
         return rows
 
-    def insert_into_data_values(
-        db_engine_metadata,
-        server_name,
-        catalog_name,
-        schema_name,
-        table_name,
-        column_name,
-        value,
-        num_rows,
-    ):
-        conn_string_metadata = _utils.get_db_connection_string(db_engine_metadata)
-        query_insert = SQL_SCRIPTS["insert_into_data_values"][
-            conn_string_metadata["db_engine"]
-        ]
-        conn = _utils.get_db_connection(conn_string_metadata)
-        cursor = conn.cursor()
-        cursor.execute(
-            query_insert,
-            (
-                server_name,
-                catalog_name,
-                schema_name,
-                table_name,
-                column_name,
-                value,
-                num_rows,
-            ),
-        )
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
-
-    def insert_many_into_data_values(
-        db_engine_metadata,
-        data_value_rows,
-    ):
-        conn_string_metadata = _utils.get_db_connection_string(db_engine_metadata)
-        query_insert = SQL_SCRIPTS["insert_into_data_values"][
-            conn_string_metadata["db_engine"]
-        ]
-        conn = _utils.get_db_connection(conn_string_metadata)
-        cursor = conn.cursor()
-        if conn_string_metadata["db_engine"] == "sqlite3":
-            cursor.executemany(
-                query_insert,
-                list(data_value_rows),
-            )
-        else:
-            cursor.executemany(
-                query_insert,
-                (list(data_value_rows)),
-            )
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
-
     def get_num_distinct_values(
-        db_engine_metadata,
         server_name,
         catalog_name,
         schema_name,
         table_name,
         column_name,
     ):
-        conn_string_metadata = _utils.get_db_connection_string(db_engine_metadata)
-        query = SQL_SCRIPTS["get_distinct_values"][conn_string_metadata["db_engine"]]
-        conn = _utils.get_db_connection(conn_string_metadata)
-        cursor = conn.cursor()
-        cursor.execute(
-            query, (server_name, catalog_name, schema_name, table_name, column_name)
-        )
-        row = cursor.fetchone()
-        cursor.close()
-        conn.close()
+        with session.metadata_lock:
+            cursor = session.metadata_cursor
+            cursor.execute(
+                session.metadata_query("get_distinct_values"),
+                (server_name, catalog_name, schema_name, table_name, column_name),
+            )
+            row = cursor.fetchone()
         if row:
             return row[0]
         else:
             return -1
 
-    table_rows = get_tables_from_metadata(
-        db_engine_source, db_engine_metadata, min_n_rows=min_n_rows
-    )
-    pbar = tqdm(table_rows, desc="Data values")
-    for table_row in pbar:
-        server_name, catalog_name, schema_name, table_name, n_rows = table_row
-        pbar.set_description(f"Data values - {table_name} ({n_rows:,})")
-        column_rows = get_data_values_columns(
-            db_engine_metadata, server_name, catalog_name, schema_name, table_name
+    def get_top_values(catalog_name, table_name, column_names):
+        """
+        Returns the `top_k` most frequent values of every column, kept by a
+        Space-Saving sketch per column over the streamed rows
+        """
+        sketches = [SpaceSaving(session.top_k) for _ in column_names]
+        query = session.source_query("select_columns").format(
+            ", ".join(column_names), catalog_name, session.schema_name, table_name
         )
+        for rows in session.stream_source(query):
+            for i, values in enumerate(zip(*rows)):
+                sketches[i].update(values)
+        return {
+            column_name: sketch.top()
+            for column_name, sketch in zip(column_names, sketches)
+        }
+
+    def data_value_rows(table_key, column_name, values):
+        """
+        Returns the rows of `data_values` of a column from `values`, a list of
+        `(value, frequency)`
+        """
+        return [
+            table_key + (column_name, str(value), int(frequency))
+            for value, frequency in values
+            if len(str(value)) <= MAX_LENGTH_VALUES
+        ]
 
-        if n_rows < max_rows:
-            # Process in pandas
-            import math
-
-            import pandas as pd
-
-            df_ = pd.DataFrame(
-                column_rows, columns=["column_name", "ordinal_position", "data_type"]
-            )
-            _, _, _, schema_name = _utils.get_connection_parameters(db_engine_source)
-            conn_string_source = _utils.get_db_connection_string(db_engine_source)
-            conn_source = _utils.get_db_connection(conn_string_source)
-            cursor = conn_source.cursor()
-            dfs_ = []
-            for i in range(math.ceil(len(df_.column_name.to_list()) / max_columns)):
-                columns = df_.column_name.to_list()[
-                    i * max_columns : i * max_columns + max_columns
-                ]
-
-                query = f"select {', '.join(columns)} from {catalog_name}.{schema_name}.{table_name};"
-                cursor.execute(query)
-                rows = cursor.fetchall()
-                df_aux = pd.DataFrame(rows, columns=columns)
-
-                for col in df_aux.columns:
-                    df_values = df_aux[col].value_counts(dropna=False).reset_index()
-                    df_values.columns = [
-                        "data_value",
-                        "frequency_number",
-                    ]  # type:ignore
-                    df_values["column_name"] = col
-                    if df_values.shape[0] < threshold:
-                        delete_from_data_values(
-                            db_engine_metadata,
-                            server_name,
-                            catalog_name,
-                            schema_name,
-                            table_name,
-                            col,
-                        )
-                        dfs_.append(df_values)
+    threshold = session.threshold
 
-                df_data_values = pd.concat(dfs_)
-            cursor.close()
-            conn_source.close()
+    def profile_table(table_row):
+        server_name, catalog_name, schema_name, table_name, n_rows = table_row
+        table_key = (server_name, catalog_name, schema_name, table_name)
+        column_rows = get_data_values_columns(*table_key)
 
-            data_ = []
-            for i, r in df_data_values.iterrows():  # type:ignore
-                data_.append(
-                    (
-                        server_name,
-                        catalog_name,
-                        schema_name,
-                        table_name,
-                        r["column_name"],
-                        str(r["data_value"]),
-                        int(r["frequency_number"]),
-                    )
+        if n_rows < max_rows:
+            # count on the client, streaming the table in chunks
+            data = []
+            keys = []
+            for batch in get_chunks(column_rows, max_columns):
+                profiles = stream_profiles(
+                    session,
+                    catalog_name,
+                    table_name,
+                    [column_row[0] for column_row in batch],
+                    max_values=threshold,
+                    top_k=session.top_k,
                 )
-
-            insert_many_into_data_values(db_engine_metadata, data_)
+                for column_name, profile in profiles.items():
+                    # the columns with `threshold` distinct values keep only
+                    # their most frequent values
+                    if profile.truncated:
+                        if session.top_k == 0:
+                            continue
+                        value_frequencies = profile.top_values(session.top_k)
+                    else:
+                        value_frequencies = profile.value_frequencies()
+                    data += data_value_rows(table_key, column_name, value_frequencies)
+                    keys.append((table_name, column_name))
+            replace_metadata(session, "data_values", data, keys)
         else:
-            pbar1 = tqdm(column_rows, leave=False)
+            # columns with more than `threshold` distinct values
+            high_cardinality_columns = []
+            pbar1 = tqdm(column_rows, leave=False, disable=session.workers > 1)
             for column_row in pbar1:
                 column_name, ordinal_position, data_type = column_row
                 pbar1.set_description(f"Data values - {table_name}.{column_name}")
-                num_uniques = get_num_distinct_values(
-                    db_engine_metadata,
-                    server_name,
-                    catalog_name,
-                    schema_name,
-                    table_name,
-                    column_name,
-                )
+                if session.is_done("Data values", table_name, column_name):
+                    continue
+                if not should_profile(
+                    session, "data_values", (table_name, column_name)
+                ):
+                    continue
+                num_uniques = get_num_distinct_values(*table_key, column_name)
+                if num_uniques > threshold and session.top_k > 0:
+                    high_cardinality_columns.append(column_name)
+                    continue
                 if num_uniques > threshold or num_uniques < 0:
                     # logger.info(
                     #     "{}.{}.{} has {} unique values, more than the threshold {}".format(
@@ -927,54 +931,64 @@ def insert_or_update_data_values(
                     #     )
                     # )
                     continue
-                if check_if_data_value_exists(
-                    db_engine_metadata,
-                    server_name,
-                    catalog_name,
-                    schema_name,
-                    table_name,
-                    column_name,
-                ):
-                    if overwrite:
-                        delete_from_data_values(
-                            db_engine_metadata,
-                            server_name,
-                            catalog_name,
-                            schema_name,
-                            table_name,
+                with session.transaction():
+                    replace_metadata(
+                        session,
+                        "data_values",
+                        data_value_rows(
+                            table_key,
                             column_name,
+                            get_frequency(schema_name, table_name, column_name),
+                        ),
+                        [(table_name, column_name)],
+                    )
+                    session.mark_done("Data values", table_name, column_name)
+
+            # one scan per batch of columns instead of a group by per column
+            for batch in get_chunks(high_cardinality_columns, max_columns):
+                top_values = get_top_values(catalog_name, table_name, batch)
+                replace_metadata(
+                    session,
+                    "data_values",
+                    [
+                        row
+                        for column_name in batch
+                        for row in data_value_rows(
+                            table_key, column_name, top_values[column_name]
                         )
-                    else:
-                        continue
-                data_value_rows = get_frequency(
-                    db_engine_source, schema_name, table_name, column_name
+                    ],
+                    [(table_name, column_name) for column_name in batch],
                 )
 
-                data = []
-                for i, data_value in enumerate(data_value_rows):
-                    value, num_rows = data_value
-                    if len(str(value)) > MAX_LENGTH_VALUES:
-                        continue
-                    data.append(
-                        (
-                            server_name,
-                            catalog_name,
-                            schema_name,
-                            table_name,
-                            column_name,
-                            str(value),
-                            int(num_rows),
-                        )
-                    )
-                insert_many_into_data_values(db_engine_metadata, data)
+    if table_rows is None:
+        table_rows = get_tables_from_metadata(session)
+    for_each_table(session, table_rows, profile_table, "Data values")
     return
 
 
 def insert_or_update_dates(
     db_engine_source, db_engine_metadata, overwrite=False, min_n_rows: int = 0
 ):
-    def get_date_columns(
+    with ProfilingSession(
+        db_engine_source,
         db_engine_metadata,
+        overwrite=overwrite,
+        min_n_rows=min_n_rows,
+    ) as session:
+        profile_dates(session)
+    return
+
+
+def profile_dates(session: ProfilingSession, table_rows: Union[list, None] = None):
+    """Inserts the monthly frequency of the date columns into `dates`.
+
+    Args:
+        session (ProfilingSession): Session of the run.
+        table_rows (list, optional): Tables to profile, as returned by
+            `get_tables_from_metadata`. Defaults to all the tables.
+    """
+
+    def get_date_columns(
         server_name,
         catalog_name,
         schema_name,
@@ -983,124 +997,41 @@ def insert_or_update_dates(
         """
         Returns server_name, table_catalog, table_schema, table_name, column_name
         """
-        conn_string_metadata = _utils.get_db_connection_string(db_engine_metadata)
-        query = SQL_SCRIPTS["get_date_columns"][conn_string_metadata["db_engine"]]
-        conn = _utils.get_db_connection(conn_string_metadata)
-        cursor = conn.cursor()
-        cursor.execute(query, (server_name, catalog_name, schema_name, table_name))
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        with session.metadata_lock:
+            cursor = session.metadata_cursor
+            cursor.execute(
+                session.metadata_query("get_date_columns"),
+                (server_name, catalog_name, schema_name, table_name),
+            )
+            rows = cursor.fetchall()
         return rows
 
-    def check_if_dates_exists(
-        db_engine_metadata,
-        server_name,
-        catalog_name,
-        schema_name,
-        table_name,
-        column_name,
-    ):
-        conn_string = _utils.get_db_connection_string(db_engine_metadata)
-        query = SQL_SCRIPTS["check_if_dates_exists"][conn_string["db_engine"]]
-        conn = _utils.get_db_connection(conn_string)
-        cursor = conn.cursor()
-        cursor.execute(
-            query, (server_name, catalog_name, schema_name, table_name, column_name)
-        )
-        rows = cursor.fetchall()
-        rowcount = len(rows)
-        cursor.close()
-        conn.close()
-
-        if rowcount > 0:
-            return True
-        else:
-            return False
-
-    def delete_from_dates(
-        db_engine_metadata,
-        server_name,
-        catalog_name,
-        schema_name,
-        table_name,
-        column_name,
-    ):
-        conn_string = _utils.get_db_connection_string(db_engine_metadata)
-        conn = _utils.get_db_connection(conn_string)
-        query = SQL_SCRIPTS["delete_from_dates"][conn_string["db_engine"]]
-        cursor = conn.cursor()
+    def get_dates(schema_name, table_name, column_name):
+        cursor = session.source_cursor
         cursor.execute(
-            query, (server_name, catalog_name, schema_name, table_name, column_name)
+            session.source_query("get_first_day_of_month").format(
+                column_name, schema_name, table_name
+            )
         )
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
-
-    def get_dates(db_engine_source, schema_name, table_name, column_name):
-        conn_string = _utils.get_db_connection_string(db_engine_source)
-        query = SQL_SCRIPTS["get_first_day_of_month"][conn_string["db_engine"]]
-        conn = _utils.get_db_connection(conn_string)
-        cursor = conn.cursor()
-        cursor.execute(query.format(column_name, schema_name, table_name))
         rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
         return rows
 
-    def insert_many_into_dates(db_engine_metadata: str, data: list):
-        conn_string_metadata = _utils.get_db_connection_string(db_engine_metadata)
-        query_insert = SQL_SCRIPTS["insert_into_dates"][
-            conn_string_metadata["db_engine"]
-        ]
-        conn = _utils.get_db_connection(conn_string_metadata)
-        cursor = conn.cursor()
-        cursor.executemany(
-            query_insert,
-            (data),
-        )
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
-
-    table_rows = get_tables_from_metadata(
-        db_engine_source, db_engine_metadata, min_n_rows=min_n_rows
-    )
-    pbar = tqdm(table_rows, desc="Dates")
-    for table_row in pbar:
+    def profile_table(table_row):
         server_name, catalog_name, schema_name, table_name, n_rows = table_row
-        pbar.set_description(f"Dates - {table_name} ({n_rows:,} rows)")
         column_rows = get_date_columns(
-            db_engine_metadata, server_name, catalog_name, schema_name, table_name
+            server_name, catalog_name, schema_name, table_name
+        )
+        pbar1 = tqdm(
+            column_rows, leave=False, desc="Dates", disable=session.workers > 1
         )
-        pbar1 = tqdm(column_rows, leave=False, desc="Dates")
         for column_row in pbar1:
             _, _, _, _, column_name = column_row
             pbar1.set_description("Dates - {}.{}".format(table_name, column_name))
-            if check_if_dates_exists(
-                db_engine_metadata,
-                server_name,
-                catalog_name,
-                schema_name,
-                table_name,
-                column_name,
-            ):
-                if overwrite:
-                    delete_from_dates(
-                        db_engine_metadata,
-                        server_name,
-                        catalog_name,
-                        schema_name,
-                        table_name,
-                        column_name,
-                    )
-                else:
-                    continue
-            date_rows = get_dates(
-                db_engine_source, schema_name, table_name, column_name
-            )
+            if session.is_done("Dates", table_name, column_name):
+                continue
+            if not should_profile(session, "dates", (table_name, column_name)):
+                continue
+            date_rows = get_dates(schema_name, table_name, column_name)
             data = []
             for date_row in date_rows:
                 date_value, frequency = date_row
@@ -1116,11 +1047,17 @@ def insert_or_update_dates(
                     )
                 )
             # logger.info(
-            #     "Inserting {} records into `dates` for {}.{}.{}".format(
+            #     "Inserting {} records into `dates` for {}.{}".format(
             #         len(data), table_name, column_name, date_value
             #     )
             # )
-            insert_many_into_dates(db_engine_metadata, data)
+            with session.transaction():
+                replace_metadata(session, "dates", data, [(table_name, column_name)])
+                session.mark_done("Dates", table_name, column_name)
+
+    if table_rows is None:
+        table_rows = get_tables_from_metadata(session)
+    for_each_table(session, table_rows, profile_table, "Dates")
 
 
 def insert_or_update_stats(
@@ -1129,125 +1066,70 @@ def insert_or_update_stats(
     overwrite: bool = False,
     with_percentiles: bool = False,
     min_n_rows: int = 0,
+    sketch_percentiles: bool = False,
+    kll_k: int = KLL_K,
 ):
-    def get_numeric_columns(
-        db_engine_metadata, server_name, catalog_name, schema_name, table_name
-    ):
+    with ProfilingSession(
+        db_engine_source,
+        db_engine_metadata,
+        overwrite=overwrite,
+        overwrite_stats=overwrite,
+        min_n_rows=min_n_rows,
+        with_percentiles=with_percentiles,
+        sketch_percentiles=sketch_percentiles,
+        kll_k=kll_k,
+    ) as session:
+        profile_stats(session)
+    return
+
+
+def profile_stats(session: ProfilingSession, table_rows: Union[list, None] = None):
+    """Inserts the statistics of the numeric columns into `stats`.
+
+    Args:
+        session (ProfilingSession): Session of the run.
+        table_rows (list, optional): Tables to profile, as returned by
+            `get_tables_from_metadata`. Defaults to all the tables.
+    """
+
+    def get_numeric_columns(server_name, catalog_name, schema_name, table_name):
         """
         Returns server_name, catalog_name, schema_name, table_name, column_name
         """
-        conn_string_metadata = _utils.get_db_connection_string(db_engine_metadata)
-        query = SQL_SCRIPTS["get_numeric_columns"][conn_string_metadata["db_engine"]]
-        conn = _utils.get_db_connection(conn_string_metadata)
-        cursor = conn.cursor()
-        cursor.execute(query, (server_name, catalog_name, schema_name, table_name))
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        with session.metadata_lock:
+            cursor = session.metadata_cursor
+            cursor.execute(
+                session.metadata_query("get_numeric_columns"),
+                (server_name, catalog_name, schema_name, table_name),
+            )
+            rows = cursor.fetchall()
         return rows
 
-    def check_if_stats_exists(
-        db_engine_metadata,
-        server_name,
-        catalog_name,
-        schema_name,
-        table_name,
-        column_name,
-    ):
-        conn_string = _utils.get_db_connection_string(db_engine_metadata)
-        query = SQL_SCRIPTS["check_if_stats_exists"][conn_string["db_engine"]]
-        conn = _utils.get_db_connection(conn_string)
-        cursor = conn.cursor()
-        cursor.execute(
-            query, (server_name, catalog_name, schema_name, table_name, column_name)
-        )
-        rows = cursor.fetchall()
-        rowcount = len(rows)
-        cursor.close()
-        conn.close()
-
-        if rowcount > 0:
-            return True
-        else:
-            return False
-
-    def delete_from_stats(
-        db_engine_metadata,
-        server_name,
-        catalog_name,
-        schema_name,
-        table_name,
-        column_name,
-    ):
-        conn_string = _utils.get_db_connection_string(db_engine_metadata)
-        conn = _utils.get_db_connection(conn_string)
-        query = SQL_SCRIPTS["delete_from_stats"][conn_string["db_engine"]]
-        cursor = conn.cursor()
-        cursor.execute(
-            query, (server_name, catalog_name, schema_name, table_name, column_name)
-        )
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
-
-    def get_basic_stats(
-        db_engine_source, catalog_name, schema_name, table_name, column_name
-    ):
+    def get_basic_stats(catalog_name, schema_name, table_name, column_name):
         """
         Returns avg, stdev, var, sum, max, min, range
         """
-        conn_string = _utils.get_db_connection_string(db_engine_source)
-        query = SQL_SCRIPTS["get_basic_stats"][conn_string["db_engine"]]
-        conn = _utils.get_db_connection(conn_string)
-        cursor = conn.cursor()
-        cursor.execute(query.format(column_name, schema_name, table_name))
+        cursor = session.source_cursor
+        cursor.execute(
+            session.source_query("get_basic_stats").format(
+                column_name, schema_name, table_name
+            )
+        )
         rows = cursor.fetchone()
-        cursor.close()
-        conn.close()
         return rows
 
-    def insert_many_into_stats(db_engine_metadata, data):
-        conn_string_metadata = _utils.get_db_connection_string(db_engine_metadata)
-        query_insert = SQL_SCRIPTS["insert_into_stats"][
-            conn_string_metadata["db_engine"]
-        ]
-        conn = _utils.get_db_connection(conn_string_metadata)
-        cursor = conn.cursor()
-        cursor.executemany(
-            query_insert,
-            (data),
+    def get_percentiles(schema_name, table_name, column_name):
+        cursor = session.source_cursor
+        cursor.execute(
+            session.source_query("get_percentiles").format(
+                column_name, schema_name, table_name
+            )
         )
-        conn.commit()
-        cursor.close()
-        conn.close()
-        return
-
-    def get_percentiles(db_engine_source, schema_name, table_name, column_name):
-        conn_string = _utils.get_db_connection_string(db_engine_source)
-        query = SQL_SCRIPTS["get_percentiles"][conn_string["db_engine"]]
-        conn = _utils.get_db_connection(conn_string)
-        cursor = conn.cursor()
-        cursor.execute(query.format(column_name, schema_name, table_name))
         rows = cursor.fetchone()
-        cursor.close()
-        conn.close()
         return rows
 
-    def update_percentiles(db_engine_metadata, data):
-        conn_string_metadata = _utils.get_db_connection_string(db_engine_metadata)
-        query_insert = SQL_SCRIPTS["update_percentiles"][
-            conn_string_metadata["db_engine"]
-        ]
-        conn = _utils.get_db_connection(conn_string_metadata)
-        cursor = conn.cursor()
-        cursor.executemany(
-            query_insert,
-            (data),
-        )
-        conn.commit()
-        cursor.close()
-        conn.close()
+    def update_percentiles(data):
+        session.write([("update_percentiles", data)])
         return
 
     def cast_to_float(value):
@@ -1256,49 +1138,51 @@ def insert_or_update_stats(
         else:
             return float(value)
 
-    table_rows = get_tables_from_metadata(
-        db_engine_source, db_engine_metadata, min_n_rows=min_n_rows
-    )
-    pbar = tqdm(table_rows, desc="Stats")
-    for table_row in pbar:
+    def get_sketched_percentiles(catalog_name, table_name, column_names):
+        """
+        Returns the percentiles and IQR of every column, estimated with a KLL
+        sketch per column over a single streamed pass of the table
+        """
+        sketches = [KLL(session.kll_k, seed=0) for _ in column_names]
+        query = session.source_query("select_columns").format(
+            ", ".join(column_names), catalog_name, session.schema_name, table_name
+        )
+        for rows in session.stream_source(query):
+            for i, values in enumerate(zip(*rows)):
+                sketches[i].update(values)
+        percentiles = {}
+        for column_name, sketch in zip(column_names, sketches):
+            values = sketch.quantiles(PERCENTILES)
+            q1 = values[PERCENTILES.index(0.25)]
+            q3 = values[PERCENTILES.index(0.75)]
+            iqr = q3 - q1 if sketch.n > 0 else None
+            percentiles[column_name] = tuple(values) + (iqr,)
+        return percentiles
+
+    with_percentiles = session.with_percentiles
+    sketch_percentiles = with_percentiles and session.sketch_percentiles
+
+    def profile_table(table_row):
         server_name, catalog_name, schema_name, table_name, n_rows = table_row
-        pbar.set_description(f"Stats - {table_name} ({n_rows:,} rows)")
         column_rows = get_numeric_columns(
-            db_engine_metadata, server_name, catalog_name, schema_name, table_name
+            server_name, catalog_name, schema_name, table_name
         )
         data = []
         if with_percentiles:
             percentiles = []
-        pbar1 = tqdm(column_rows, leave=False, desc="Stats")
+        pbar1 = tqdm(
+            column_rows, leave=False, desc="Stats", disable=session.workers > 1
+        )
         for column_row in pbar1:
             _, _, _, _, column_name = column_row
             pbar1.set_description("Stats - {}.{}".format(table_name, column_name))
-            if check_if_stats_exists(
-                db_engine_metadata,
-                server_name,
-                catalog_name,
-                schema_name,
-                table_name,
-                column_name,
-            ):
-                if overwrite:
-                    delete_from_stats(
-                        db_engine_metadata,
-                        server_name,
-                        catalog_name,
-                        schema_name,
-                        table_name,
-                        column_name,
-                    )
-                else:
-                    continue
+            if not should_profile(session, "stats", (table_name, column_name)):
+                continue
             stats_rows = get_basic_stats(
-                db_engine_source, catalog_name, schema_name, table_name, column_name
+                catalog_name, schema_name, table_name, column_name
             )
-            if with_percentiles:
-                percentile_rows = get_percentiles(
-                    db_engine_source, schema_name, table_name, column_name
-                )
+            if with_percentiles and not sketch_percentiles:
+                percentile_rows = get_percentiles(schema_name, table_name, column_name)
                 (
                     p01,
                     p025,
@@ -1351,15 +1235,23 @@ def insert_or_update_stats(
                     cast_to_float(range_),
                 )
             )
+        if sketch_percentiles and len(data) > 0:
+            column_names = [row[4] for row in data]
+            sketched = get_sketched_percentiles(catalog_name, table_name, column_names)
+            percentiles = [
+                sketched[column_name]
+                + (server_name, catalog_name, schema_name, table_name, column_name)
+                for column_name in column_names
+            ]
         if len(data) > 0:
             # logger.info(
             #     "Inserting {} records into `stats` for {}.{}".format(
             #         len(data), schema_name, table_name
             #     )
             # )
-            insert_many_into_stats(db_engine_metadata, data)
+            replace_metadata(session, "stats", data)
             if with_percentiles:
-                update_percentiles(db_engine_metadata, percentiles)
+                update_percentiles(percentiles)
         else:
             # logger.info(
             #     "{} numeric columns found in {}.{}".format(
@@ -1368,30 +1260,864 @@ def insert_or_update_stats(
             # )
             pass
 
+    if table_rows is None:
+        table_rows = get_tables_from_metadata(session)
+    for_each_table(session, table_rows, profile_table, "Stats")
 
-def get_columns(db_engine_source: str):
-    conn_string = _utils.get_db_connection_string(db_engine_source)
-    conn = _utils.get_db_connection(conn_string)
 
-    query = SQL_SCRIPTS["columns"][conn_string["db_engine"]]
-    cursor = conn.cursor()
+def read_metadata(session: ProfilingSession, query_type: str, parameters) -> list:
+    """Returns the rows of the metadata query `query_type`."""
+    with session.metadata_lock:
+        cursor = session.metadata_cursor
+        cursor.execute(session.metadata_query(query_type), parameters)
+        rows = cursor.fetchall()
+    return rows
+
+
+def get_query_log(metadata: str, run_id: Union[str, None] = None) -> tuple:
+    """Returns the identifier of a run and the rows of its `query_log`, as
+    returned by `get_query_log`.
+
+    Args:
+        metadata (str): Section of the `databases.ini` file of the metadata.
+        run_id (str, optional): Identifier of the run. Defaults to the last
+            run with a query log.
+    """
+    db_engine = _utils.get_db_connection_string(metadata)["db_engine"]
+    with _utils.pooled_connection(metadata) as conn:
+        cursor = _utils.get_cursor(conn, db_engine)
+        if run_id is None:
+            cursor.execute(_utils.get_query("get_last_query_log_run", db_engine))
+            (run_id,) = cursor.fetchone()
+        cursor.execute(_utils.get_query("get_query_log", db_engine), (run_id,))
+        rows = cursor.fetchall()
+        _utils.close_cursor(cursor, conn)
+    return run_id, rows
+
+
+def write_metadata(session: ProfilingSession, query_type: str, rows: list):
+    """Runs the metadata query `query_type` with every row of `rows`."""
+    session.write([(query_type, rows)])
+    return
+
+
+def get_metadata_keys(session: ProfilingSession, table: str) -> set:
+    """Returns the keys of the schema stored in the metadata `table`, as
+    tuples of the columns of `METADATA_KEYS`, loaded with a single query the
+    first time they are needed."""
+    with session.metadata_lock:
+        if table not in session.metadata_keys:
+            cursor = session.metadata_cursor
+            cursor.execute(
+                session.metadata_query("get_metadata_keys").format(
+                    table, ", ".join(METADATA_KEYS[table])
+                ),
+                (session.server_name, session.catalog_name, session.schema_name),
+            )
+            session.metadata_keys[table] = {tuple(row) for row in cursor.fetchall()}
+        return session.metadata_keys[table]
+
+
+def should_profile(session: ProfilingSession, table: str, key: tuple) -> bool:
+    """Returns False if the metadata `table` has `key` and it must be kept.
+    The existing `stats` are only replaced with `session.overwrite_stats`."""
+    overwrite = session.overwrite_stats if table == "stats" else session.overwrite
+    return overwrite or key not in get_metadata_keys(session, table)
+
+
+def replace_metadata(
+    session: ProfilingSession, table: str, rows: list, keys: Iterable = ()
+):
+    """Replaces the metadata of the keys of `rows`, and of `keys`, in the
+    metadata `table` with `rows` in a single transaction.
+
+    The rows are written with the upsert query of `table`. If `overwrite` is
+    set, the keys that exist and may have more rows than the new ones are
+    deleted first with a single bulk statement, otherwise the rows of the
+    keys that exist are not written.
+
+    Args:
+        session (ProfilingSession): Session of the run.
+        table (str): Metadata table.
+        rows (list): Rows of the insert query of `table`.
+        keys (Iterable, optional): Keys to delete that have no rows.
+            Defaults to ().
+    """
+    size = len(METADATA_KEYS[table])
+
+    def key_of(row):
+        return tuple(row[3 : 3 + size])
+
+    with session.metadata_lock:
+        existing = get_metadata_keys(session, table)
+        row_keys = {key_of(row) for row in rows}
+        replaced = (set(keys) | row_keys) & existing
+        if not session.overwrite:
+            rows = [row for row in rows if key_of(row) not in replaced]
+            row_keys -= replaced
+            replaced = set()
+        deleted = replaced
+        if table in SINGLE_ROW_METADATA:
+            # the upsert replaces the row of the keys that have one
+            deleted = replaced - row_keys
+        if len(deleted) == 0 and len(rows) == 0:
+            return
+        table_key = (session.server_name, session.catalog_name, session.schema_name)
+        session.write(
+            [
+                (f"delete_from_{table}", chunk)
+                for chunk in get_chunks([table_key + key for key in deleted])
+            ]
+            + [(f"upsert_into_{table}", chunk) for chunk in get_chunks(rows)]
+        )
+        existing -= deleted
+        existing |= row_keys
+    return
+
+
+def write_profiles(
+    session: ProfilingSession,
+    table_row: tuple,
+    column_rows: list,
+    profiles: dict,
+    scale: float = 1.0,
+):
+    """Inserts the uniques, data values, dates and stats of a table computed
+    from the `ColumnProfile` of each of its columns.
+
+    Args:
+        session (ProfilingSession): Session of the run.
+        table_row (tuple): Table, as returned by `get_tables_from_metadata`.
+        column_rows (list): Name, ordinal position and data type of the
+            columns, as returned by `get_columns_from_metadata`.
+        profiles (dict): `ColumnProfile` of each column name.
+        scale (float, optional): Number of rows of the table per row profiled,
+            greater than 1 when the profiles are of a sample of the table.
+            Defaults to 1.0.
+    """
+    server_name, catalog_name, schema_name, table_name, _ = table_row
+    table_key = (server_name, catalog_name, schema_name, table_name)
+
+    def scaled(frequency):
+        return int(round(frequency * scale))
+
+    distinct_values = {
+        column_name: profile.estimate_distinct(scale)
+        for column_name, profile in profiles.items()
+    }
+    # `DISTINCT_VALUES_ERROR` is the relative error of the sketches, the
+    # estimates of a sample have the error of `tables.SAMPLE_ERROR` instead
+    distinct_values_error = None if scale > 1 else 0.0
+
+    replace_metadata(
+        session,
+        "uniques",
+        [
+            table_key
+            + (
+                column_name,
+                ordinal_position,
+                data_type,
+                distinct_values[column_name],
+                scaled(profiles[column_name].count_null),
+                distinct_values_error,
+            )
+            for column_name, ordinal_position, data_type in column_rows
+        ],
+        [(table_name,)],
+    )
+
+    data_values = []
+    keys = []
+    for column_name, _, _ in read_metadata(
+        session, "get_data_values_columns", table_key
+    ):
+        profile = profiles[column_name]
+        # the values of the column, null included, like `profile_data_values`
+        n_values = distinct_values[column_name] + (1 if profile.count_null else 0)
+        if n_values < session.threshold:
+            value_frequencies = profile.value_frequencies()
+        elif session.top_k > 0:
+            value_frequencies = profile.top_values(session.top_k)
+        else:
+            continue
+        data_values += [
+            table_key + (column_name, str(value), scaled(frequency))
+            for value, frequency in value_frequencies
+            if len(str(value)) <= MAX_LENGTH_VALUES
+        ]
+        keys.append((table_name, column_name))
+    replace_metadata(session, "data_values", data_values, keys)
+
+    dates = []
+    keys = []
+    for *_, column_name in read_metadata(session, "get_date_columns", table_key):
+        dates += [
+            table_key + (column_name, date_value, scaled(frequency))
+            for date_value, frequency in profiles[column_name].month_frequencies()
+        ]
+        keys.append((table_name, column_name))
+    replace_metadata(session, "dates", dates, keys)
+
+    stats = []
+    percentiles = []
+    for *_, column_name in read_metadata(session, "get_numeric_columns", table_key):
+        if not should_profile(session, "stats", (table_name, column_name)):
+            continue
+        avg_, stdev_, var_, sum_, max_, min_, range_ = profiles[column_name].stats()
+        if sum_ is not None:
+            sum_ = sum_ * scale
+        stats.append(
+            table_key + (column_name, avg_, stdev_, var_, sum_, max_, min_, range_)
+        )
+        if session.with_percentiles:
+            percentiles.append(
+                profiles[column_name].percentiles() + table_key + (column_name,)
+            )
+    replace_metadata(session, "stats", stats)
+    write_metadata(session, "update_percentiles", percentiles)
+
+
+def profile_fused(
+    session: ProfilingSession,
+    max_rows: int = 100_000,
+    max_columns: int = 50,
+    table_rows: Union[list, None] = None,
+):
+    """Inserts the uniques, data values, dates and stats of the tables reading
+    each table with less than `max_rows` rows only once.
+
+    The rows of those tables are streamed with a single query and the metrics
+    of every column are computed from the same `ColumnProfile`. The bigger
+    tables are profiled on the server side by the regular stages.
+
+    Args:
+        session (ProfilingSession): Session of the run.
+        max_rows (int, optional): Max number of rows of the tables read once.
+            Defaults to 100_000.
+        max_columns (int, optional): Max number of columns counted with a
+            single scan of the bigger tables. Defaults to 50.
+        table_rows (list, optional): Tables to profile, as returned by
+            `get_tables_from_metadata`. Defaults to all the tables.
+    """
+
+    def profile_table(table_row):
+        server_name, catalog_name, schema_name, table_name, n_rows = table_row
+        column_rows = get_columns_from_metadata(
+            session, server_name, catalog_name, schema_name, table_name
+        )
+        if len(column_rows) == 0:
+            return
+        column_names = [column_row[0] for column_row in column_rows]
+        profiles = stream_profiles(session, catalog_name, table_name, column_names)
+        write_profiles(session, table_row, column_rows, profiles)
+
+    if table_rows is None:
+        table_rows = get_tables_from_metadata(session)
+    small_tables = [table_row for table_row in table_rows if table_row[4] < max_rows]
+    big_tables = [table_row for table_row in table_rows if table_row[4] >= max_rows]
+
+    for_each_table(session, small_tables, profile_table, "Profiles")
+    if len(big_tables) > 0:
+        profile_uniques(
+            session, max_rows=0, max_columns=max_columns, table_rows=big_tables
+        )
+        profile_data_values(session, max_rows=0, table_rows=big_tables)
+        profile_dates(session, table_rows=big_tables)
+        profile_stats(session, table_rows=big_tables)
+
+
+def profile_sampled(
+    session: ProfilingSession,
+    table_rows: Union[list, None] = None,
+    seed: Union[int, None] = None,
+) -> list:
+    """Inserts the uniques, data values, dates and stats of the tables sampled
+    by `session.table_sample`, profiling only a sample of their rows, and
+    returns the tables that are not sampled.
+
+    The sample is drawn with `TABLESAMPLE` on the engines that have it, so the
+    rest of the table is not read, and on the client otherwise. Frequencies,
+    null values and sums are scaled to the number of rows of the table, and
+    the size and margin of error of the sample are stored in `tables`.
+
+    Args:
+        session (ProfilingSession): Session of the run.
+        table_rows (list, optional): Tables to profile, as returned by
+            `get_tables_from_metadata`. Defaults to all the tables.
+        seed (int, optional): Seed of the samples drawn on the client.
+            Defaults to None.
+
+    Returns:
+        list: Tables of `table_rows` that are not sampled.
+    """
+
+    def stream_sample(catalog_name, table_name, column_names, n_rows, sample):
+        """
+        Yields the rows of a sample of the table in chunks
+        """
+        columns = ", ".join(column_names)
+        if "select_sample" in session.source_queries:
+            percent = 100 * sample if sample < 1 else 100 * sample / n_rows
+            query = session.source_query("select_sample").format(
+                columns, catalog_name, session.schema_name, table_name, percent
+            )
+            return session.stream_source(query)
+        query = session.source_query("select_columns").format(
+            columns, catalog_name, session.schema_name, table_name
+        )
+        chunks = session.stream_source(query)
+        if sample < 1:
+            return bernoulli_sample(chunks, sample, seed)
+        return [reservoir_sample(chunks, int(sample), seed)]
+
+    def profile_table(table_row):
+        server_name, catalog_name, schema_name, table_name, n_rows = table_row
+        table_key = (server_name, catalog_name, schema_name, table_name)
+        column_rows = get_columns_from_metadata(session, *table_key)
+        if len(column_rows) == 0:
+            return
+        column_names = [column_row[0] for column_row in column_rows]
+        chunks = stream_sample(
+            catalog_name,
+            table_name,
+            column_names,
+            n_rows,
+            session.table_sample(table_name, n_rows),
+        )
+        profiles = profile_chunks(chunks, column_names)
+        sample_rows = sum(profiles[column_names[0]].frequencies.values())
+        if sample_rows > 0:
+            write_profiles(
+                session, table_row, column_rows, profiles, scale=n_rows / sample_rows
+            )
+        session.write(
+            [
+                (
+                    "update_table_sample",
+                    [(sample_rows, sampling_error(sample_rows, n_rows)) + table_key],
+                )
+            ]
+        )
+
+    if table_rows is None:
+        table_rows = get_tables_from_metadata(session)
+    sampled_tables = [
+        table_row
+        for table_row in table_rows
+        if session.table_sample(table_row[3], table_row[4]) is not None
+    ]
+    for_each_table(session, sampled_tables, profile_table, "Samples")
+    return [table_row for table_row in table_rows if table_row not in sampled_tables]
+
+
+def get_partition_key(
+    session: ProfilingSession, table_name: str, column_rows: list
+) -> Union[str, None]:
+    """Returns the column a table is split by in key ranges: its primary key
+    if it's an integer or date column, or else its first integer or date
+    column. None if the table has none."""
+    key_types = {"int", "integer", "bigint", "smallint", "tinyint"} | set(
+        DATA_TYPES["date_types"]
+    )
+    data_types = {
+        column_name: str(data_type).lower().split(" ")[0].split("(")[0]
+        for column_name, _, data_type in column_rows
+    }
+    candidates = []
+    if "primary_key" in session.source_queries:
+        cursor = session.source_cursor
+        try:
+            cursor.execute(
+                session.source_query("primary_key").format(
+                    session.schema_name, table_name
+                )
+            )
+            candidates += [row[0] for row in cursor.fetchall()[:1]]
+        except Exception as e:
+            logger.warning(f"Couldn't get the primary key of {table_name}: {e}")
+            session.rollback_source()
+    candidates += [column_name for column_name, _, _ in column_rows]
+    for column_name in candidates:
+        if data_types.get(column_name) in key_types:
+            return column_name
+    return None
+
+
+def get_key_ranges(
+    session: ProfilingSession,
+    catalog_name: str,
+    table_name: str,
+    key: str,
+    partitions: int,
+) -> list:
+    """Returns the predicates of `partitions` ranges of the same width of the
+    values of `key`, plus one for the rows without key."""
+    cursor = session.source_cursor
     cursor.execute(
-        query, (conn_string["host"], conn_string["catalog"], conn_string["schema"])
+        session.source_query("select_where").format(
+            f"min({key}), max({key})",
+            catalog_name,
+            session.schema_name,
+            table_name,
+            f"{key} is not null",
+            "",
+        )
+    )
+    low, high = cursor.fetchone()
+    predicates = [f"{key} is null"]
+    if low is None:
+        return predicates
+    if isinstance(low, (int, float)) or str(low).lstrip("-").isdigit():
+        low, high = int(low), int(high)
+        edges = [low + (high - low + 1) * i // partitions for i in range(1, partitions)]
+    else:
+        low, high = pd.Timestamp(low), pd.Timestamp(high)
+        edges = [
+            "'{}'".format((low + (high - low) * i / partitions).floor("s"))
+            for i in range(1, partitions)
+        ]
+    edges = sorted(set(edges))
+    if len(edges) == 0:
+        return predicates + [f"{key} is not null"]
+    predicates.append(f"{key} < {edges[0]}")
+    for lower, upper in zip(edges, edges[1:]):
+        predicates.append(f"{key} >= {lower} and {key} < {upper}")
+    predicates.append(f"{key} >= {edges[-1]}")
+    return predicates
+
+
+def profile_partitioned(
+    session: ProfilingSession,
+    table_rows: Union[list, None] = None,
+    max_columns: int = 50,
+) -> list:
+    """Inserts the uniques, data values, dates and stats of the tables with
+    at least `session.partition_min_rows` rows splitting each table in
+    `session.partitions` key ranges, and returns the tables that are not
+    split.
+
+    The ranges of a table are aggregated concurrently on the source, each on
+    its own connection, and their partial results are merged: the null
+    values and the frequencies of the data values and dates by adding them,
+    and the moments of the numeric columns with the update of Chan et al.
+    The distinct values and percentiles are computed on the source over the
+    whole table, like `profile_uniques` and `profile_stats` do, so they are
+    exact unless `approx_distinct` or `sketch_percentiles` are set.
+
+    The rows of the ranges are only streamed to the client for the sketches
+    asked for, and the sketches of the ranges are merged: HyperLogLog with
+    `approx_distinct` if the source has no approximate distinct count,
+    Space-Saving for the top values of the high cardinality columns with
+    `top_k` and KLL with `sketch_percentiles`.
+
+    Args:
+        session (ProfilingSession): Session of the run.
+        table_rows (list, optional): Tables to profile, as returned by
+            `get_tables_from_metadata`. Defaults to all the tables.
+        max_columns (int, optional): Max number of columns of the distinct
+            values counted with a single scan of the table. Defaults to 50.
+
+    Returns:
+        list: Tables of `table_rows` that are not split.
+    """
+
+    def select_where(cursor, catalog_name, table_name, columns, predicate, group_by):
+        cursor.execute(
+            session.source_query("select_where").format(
+                columns,
+                catalog_name,
+                session.schema_name,
+                table_name,
+                predicate,
+                group_by,
+            )
+        )
+
+    def stream_sketches(catalog_name, table_name, sketches, predicate):
+        """
+        Updates `sketches`, a list of `(column_name, sketch)`, with the rows of
+        a range streamed to the client, and returns them
+        """
+        if len(sketches) == 0:
+            return sketches
+        column_names = list(dict.fromkeys(column_name for column_name, _ in sketches))
+        column_index = {column_name: i for i, column_name in enumerate(column_names)}
+        query = session.source_query("select_where").format(
+            ", ".join(column_names),
+            catalog_name,
+            session.schema_name,
+            table_name,
+            predicate,
+            "",
+        )
+        for rows in session.stream_source(query):
+            columns = list(zip(*rows))
+            for column_name, sketch in sketches:
+                sketch.update(columns[column_index[column_name]])
+        return sketches
+
+    def aggregate_partition(
+        catalog_name,
+        table_name,
+        column_names,
+        numeric_columns,
+        hll_columns,
+        predicate,
+    ):
+        """
+        Returns the null values of every column, the moments of the numeric
+        columns and the HyperLogLog sketches of `hll_columns` of a range
+        """
+        cursor = session.source_cursor
+        select_where(
+            cursor,
+            catalog_name,
+            table_name,
+            " , ".join(
+                ["count(*)"]
+                + [f"count({column_name})" for column_name in column_names]
+                + [
+                    session.source_query("partial_stats_column").format(column_name)
+                    for column_name in numeric_columns
+                ]
+            ),
+            predicate,
+            "",
+        )
+        row = cursor.fetchone()
+        nulls = {
+            column_name: row[0] - row[1 + i]
+            for i, column_name in enumerate(column_names)
+        }
+        offset = 1 + len(column_names)
+        moments = {
+            column_name: Moments.from_aggregates(
+                *row[offset + 6 * i : offset + 6 * i + 6]
+            )
+            for i, column_name in enumerate(numeric_columns)
+        }
+        hlls = stream_sketches(
+            catalog_name,
+            table_name,
+            [
+                (column_name, HyperLogLog(session.hll_precision))
+                for column_name in hll_columns
+            ],
+            predicate,
+        )
+        return nulls, moments, hlls
+
+    def count_partition(
+        catalog_name,
+        table_name,
+        value_columns,
+        date_columns,
+        top_columns,
+        kll_columns,
+        predicate,
+    ):
+        """
+        Returns the frequencies of the values and months of the data value and
+        date columns of a range, and the Space-Saving sketches of
+        `top_columns` and KLL sketches of `kll_columns`
+        """
+        cursor = session.source_cursor
+
+        def count(expression):
+            select_where(
+                cursor,
+                catalog_name,
+                table_name,
+                f"{expression}, count(*)",
+                predicate,
+                f"group by {expression}",
+            )
+            return Counter(dict(cursor.fetchall()))
+
+        frequencies = {column_name: count(column_name) for column_name in value_columns}
+        months = {
+            column_name: count(
+                session.source_query("first_day_of_month_column").format(column_name)
+            )
+            for column_name in date_columns
+        }
+        sketches = stream_sketches(
+            catalog_name,
+            table_name,
+            [(column_name, SpaceSaving(session.top_k)) for column_name in top_columns]
+            + [
+                (column_name, KLL(session.kll_k, seed=0)) for column_name in kll_columns
+            ],
+            predicate,
+        )
+        return frequencies, months, sketches
+
+    def get_distinct_values(table_name, column_names):
+        """
+        Returns the distinct values of every column and their relative error,
+        counted on the source over the whole table with a scan per batch of
+        `max_columns` columns
+        """
+        approx = session.approx_distinct
+
+        def count_batch(batch):
+            cursor = session.source_cursor
+            cursor.execute(
+                build_unique_counts_query(
+                    session.source_engine,
+                    session.schema_name,
+                    table_name,
+                    batch,
+                    approx=approx,
+                )
+            )
+            row = cursor.fetchone()
+            return [row[2 * i] for i in range(len(batch))]
+
+        batches = list(get_chunks(column_names, max_columns))
+        counts = [
+            count
+            for batch_counts in session.partition_executor.map(count_batch, batches)
+            for count in batch_counts
+        ]
+        error = APPROX_DISTINCT_ERRORS[session.source_engine] if approx else 0.0
+        return {
+            column_name: (count, error)
+            for column_name, count in zip(column_names, counts)
+        }
+
+    def get_percentiles(schema_name, table_name, column_name):
+        """
+        Returns the percentiles and IQR of a column computed on the source
+        """
+        cursor = session.source_cursor
+        cursor.execute(
+            session.source_query("get_percentiles").format(
+                column_name, schema_name, table_name
+            )
+        )
+        return tuple(
+            None if value is None else float(value) for value in cursor.fetchone()
+        )
+
+    def profile_table(table_row):
+        server_name, catalog_name, schema_name, table_name, n_rows = table_row
+        table_key = (server_name, catalog_name, schema_name, table_name)
+        key, column_rows = partition_keys[table_row]
+        column_names = [column_row[0] for column_row in column_rows]
+        numeric_columns = [
+            row[-1] for row in read_metadata(session, "get_numeric_columns", table_key)
+        ]
+        date_columns = [
+            row[-1] for row in read_metadata(session, "get_date_columns", table_key)
+        ]
+        data_value_columns = [
+            row[0]
+            for row in read_metadata(session, "get_data_values_columns", table_key)
+        ]
+        predicates = get_key_ranges(
+            session, catalog_name, table_name, key, session.partitions
+        )
+
+        sketch_distinct = (
+            session.approx_distinct
+            and session.source_engine not in APPROX_DISTINCT_ERRORS
+        )
+        hll_columns = column_names if sketch_distinct else []
+        aggregates = list(
+            session.partition_executor.map(
+                lambda predicate: aggregate_partition(
+                    catalog_name,
+                    table_name,
+                    column_names,
+                    numeric_columns,
+                    hll_columns,
+                    predicate,
+                ),
+                predicates,
+            )
+        )
+        nulls, moments, hlls = aggregates[0]
+        for other_nulls, other_moments, other_hlls in aggregates[1:]:
+            for column_name, other in other_nulls.items():
+                nulls[column_name] += other
+            for column_name, other in other_moments.items():
+                moments[column_name].merge(other)
+            for (_, hll), (_, other) in zip(hlls, other_hlls):
+                hll.merge(other)
+        if sketch_distinct:
+            distinct_values = {
+                column_name: (hll.count(), hll.relative_error)
+                for column_name, hll in hlls
+            }
+        else:
+            distinct_values = get_distinct_values(table_name, column_names)
+
+        # like `profile_data_values`, the columns with up to `threshold`
+        # distinct values are counted, and the top values of the others
+        value_columns = [
+            column_name
+            for column_name in data_value_columns
+            if distinct_values[column_name][0] <= session.threshold
+        ]
+        top_columns = [
+            column_name
+            for column_name in data_value_columns
+            if session.top_k > 0 and column_name not in value_columns
+        ]
+        kll_columns = (
+            numeric_columns
+            if session.with_percentiles and session.sketch_percentiles
+            else []
+        )
+        counts = list(
+            session.partition_executor.map(
+                lambda predicate: count_partition(
+                    catalog_name,
+                    table_name,
+                    value_columns,
+                    date_columns,
+                    top_columns,
+                    kll_columns,
+                    predicate,
+                ),
+                predicates,
+            )
+        )
+        frequencies, months, sketches = counts[0]
+        for other_frequencies, other_months, other_sketches in counts[1:]:
+            for column_name, other in other_frequencies.items():
+                frequencies[column_name].update(other)
+            for column_name, other in other_months.items():
+                months[column_name].update(other)
+            for (_, sketch), (_, other) in zip(sketches, other_sketches):
+                sketch.merge(other)
+        tops = dict(sketches[: len(top_columns)])
+        klls = dict(sketches[len(top_columns) :])
+
+        uniques = []
+        for column_name, ordinal_position, data_type in column_rows:
+            if column_name in frequencies:
+                distinct_values[column_name] = (
+                    len(frequencies[column_name])
+                    - (1 if None in frequencies[column_name] else 0),
+                    0.0,
+                )
+            count_distinct, error = distinct_values[column_name]
+            uniques.append(
+                table_key
+                + (
+                    column_name,
+                    ordinal_position,
+                    data_type,
+                    count_distinct,
+                    nulls[column_name],
+                    error,
+                )
+            )
+        replace_metadata(session, "uniques", uniques, [(table_name,)])
+
+        data_values = []
+        keys = []
+        for column_name in data_value_columns:
+            if column_name in frequencies:
+                value_frequencies = frequencies[column_name].items()
+            elif column_name in tops:
+                value_frequencies = tops[column_name].top()
+            else:
+                continue
+            data_values += [
+                table_key + (column_name, str(value), int(frequency))
+                for value, frequency in value_frequencies
+                if len(str(value)) <= MAX_LENGTH_VALUES
+            ]
+            keys.append((table_name, column_name))
+        replace_metadata(session, "data_values", data_values, keys)
+
+        dates = []
+        for column_name in date_columns:
+            dates += [
+                table_key + (column_name, date_value, int(frequency))
+                for date_value, frequency in months[column_name].items()
+            ]
+        replace_metadata(
+            session,
+            "dates",
+            dates,
+            [(table_name, column_name) for column_name in date_columns],
+        )
+
+        stats_columns = [
+            column_name
+            for column_name in numeric_columns
+            if should_profile(session, "stats", (table_name, column_name))
+        ]
+        stats = [
+            table_key + (column_name,) + moments[column_name].stats()
+            for column_name in stats_columns
+        ]
+        percentiles = []
+        if session.with_percentiles and session.sketch_percentiles:
+            for column_name in stats_columns:
+                sketch = klls[column_name]
+                values = sketch.quantiles(PERCENTILES)
+                q1 = values[PERCENTILES.index(0.25)]
+                q3 = values[PERCENTILES.index(0.75)]
+                iqr = q3 - q1 if sketch.n > 0 else None
+                percentiles.append(tuple(values) + (iqr,) + table_key + (column_name,))
+        elif session.with_percentiles:
+            # exact, a query per column over the whole table
+            percentile_rows = session.partition_executor.map(
+                lambda column_name: get_percentiles(
+                    schema_name, table_name, column_name
+                ),
+                stats_columns,
+            )
+            percentiles = [
+                percentile_row + table_key + (column_name,)
+                for column_name, percentile_row in zip(stats_columns, percentile_rows)
+            ]
+        replace_metadata(session, "stats", stats)
+        write_metadata(session, "update_percentiles", percentiles)
+
+    if table_rows is None:
+        table_rows = get_tables_from_metadata(session)
+    if session.partitions == 1:
+        return table_rows
+    partition_keys = {}
+    for table_row in table_rows:
+        if table_row[4] < session.partition_min_rows:
+            continue
+        column_rows = get_columns_from_metadata(session, *table_row[:4])
+        key = get_partition_key(session, table_row[3], column_rows)
+        if key is not None:
+            partition_keys[table_row] = (key, column_rows)
+    for_each_table(session, list(partition_keys), profile_table, "Partitions")
+    return [table_row for table_row in table_rows if table_row not in partition_keys]
+
+
+def get_columns(session: ProfilingSession):
+    cursor = session.source_cursor
+    cursor.execute(
+        session.source_query("columns"),
+        (
+            session.source_params["host"],
+            session.source_params["catalog"],
+            session.source_params["schema"],
+        ),
     )
     rows = cursor.fetchall()
 
     # logger.info(
     #     "{} columns from {}.{}.{}".format(
     #         len(rows),
-    #         conn_string["host"],
-    #         conn_string["catalog"],
-    #         conn_string["schema"],
+    #         session.source_params["host"],
+    #         session.source_params["catalog"],
+    #         session.source_params["schema"],
     #     )
     # )
 
-    cursor.close()
-    conn.close()
-
     return rows
 
 
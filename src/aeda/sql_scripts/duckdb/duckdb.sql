@@ -0,0 +1,119 @@
+CREATE TABLE IF NOT EXISTS columns (SERVER_NAME VARCHAR
+      , TABLE_CATALOG VARCHAR
+      , TABLE_SCHEMA VARCHAR
+      , TABLE_NAME VARCHAR
+      , COLUMN_NAME VARCHAR
+      , ORDINAL_POSITION INTEGER
+      , DATA_TYPE VARCHAR
+      , UNIQUE (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME));
+
+CREATE TABLE IF NOT EXISTS tables (SERVER_NAME VARCHAR
+      , TABLE_CATALOG VARCHAR
+      , TABLE_SCHEMA VARCHAR
+      , TABLE_NAME VARCHAR
+      , N_COLUMNS INTEGER
+      , N_ROWS BIGINT
+      , SAMPLE_ROWS BIGINT
+      , SAMPLE_ERROR DOUBLE
+      , UNIQUE (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME));
+     
+CREATE TABLE IF NOT EXISTS uniques (SERVER_NAME VARCHAR
+      , TABLE_CATALOG VARCHAR
+      , TABLE_SCHEMA VARCHAR
+      , TABLE_NAME VARCHAR
+      , COLUMN_NAME VARCHAR
+      , ORDINAL_POSITION INTEGER
+      , DATA_TYPE VARCHAR
+      , DISTINCT_VALUES BIGINT
+      , DISTINCT_VALUES_ERROR DOUBLE
+      , NULL_VALUES BIGINT
+      , UNIQUE (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME));
+
+CREATE TABLE IF NOT EXISTS data_values (SERVER_NAME VARCHAR
+      , TABLE_CATALOG VARCHAR
+      , TABLE_SCHEMA VARCHAR
+      , TABLE_NAME VARCHAR
+      , COLUMN_NAME VARCHAR
+      , DATA_VALUE VARCHAR
+      , FREQUENCY_NUMBER BIGINT
+      , FREQUENCY_PERCENTAGE DOUBLE
+      , UNIQUE (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE));
+
+CREATE TABLE IF NOT EXISTS dates (SERVER_NAME VARCHAR
+      , TABLE_CATALOG VARCHAR
+      , TABLE_SCHEMA VARCHAR
+      , TABLE_NAME VARCHAR
+      , COLUMN_NAME VARCHAR
+      , DATA_VALUE VARCHAR
+      , FREQUENCY_NUMBER BIGINT
+      , FREQUENCY_PERCENTAGE DOUBLE
+      , UNIQUE (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE));
+
+CREATE TABLE IF NOT EXISTS stats (SERVER_NAME VARCHAR
+      , TABLE_CATALOG VARCHAR
+      , TABLE_SCHEMA VARCHAR
+      , TABLE_NAME VARCHAR
+      , COLUMN_NAME VARCHAR
+      , AVG DOUBLE
+      , STDEV DOUBLE
+      , VAR DOUBLE
+      , SUM DOUBLE
+      , MAX DOUBLE
+      , MIN DOUBLE
+      , "RANGE" DOUBLE
+      , P01 DOUBLE
+      , P025 DOUBLE
+      , P05 DOUBLE
+      , P10 DOUBLE
+      , Q1 DOUBLE
+      , Q2 DOUBLE
+      , Q3 DOUBLE
+      , P90 DOUBLE
+      , P95 DOUBLE
+      , P975 DOUBLE
+      , P99 DOUBLE
+      , IQR DOUBLE
+      , UNIQUE (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME));
+
+CREATE TABLE IF NOT EXISTS fingerprints (SERVER_NAME VARCHAR
+      , TABLE_CATALOG VARCHAR
+      , TABLE_SCHEMA VARCHAR
+      , TABLE_NAME VARCHAR
+      , STAGE VARCHAR
+      , N_ROWS BIGINT
+      , LAST_MODIFIED VARCHAR
+      , CHECKSUM VARCHAR
+      , UNIQUE (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE));
+
+CREATE TABLE IF NOT EXISTS journal (SERVER_NAME VARCHAR
+      , TABLE_CATALOG VARCHAR
+      , TABLE_SCHEMA VARCHAR
+      , TABLE_NAME VARCHAR
+      , RUN_ID VARCHAR
+      , STAGE VARCHAR
+      , COLUMN_NAME VARCHAR);
+
+CREATE TABLE IF NOT EXISTS query_log (SERVER_NAME VARCHAR
+      , TABLE_CATALOG VARCHAR
+      , TABLE_SCHEMA VARCHAR
+      , RUN_ID VARCHAR
+      , TARGET_DATABASE VARCHAR
+      , STAGE VARCHAR
+      , QUERY_TYPE VARCHAR
+      , TABLE_NAME VARCHAR
+      , COLUMN_NAME VARCHAR
+      , STARTED_AT DOUBLE
+      , SECONDS DOUBLE
+      , N_ROWS BIGINT);
+
+CREATE OR REPLACE VIEW servers AS 
+select      server_name
+            , table_catalog
+            , table_schema
+            , count(distinct table_name) as n_tables
+            , sum(n_columns) as n_columns
+            , sum(n_rows) as n_rows 
+from "tables" 
+group by server_name, table_catalog , table_schema;
+
+-- TODO - add view of dates summary
\ No newline at end of file
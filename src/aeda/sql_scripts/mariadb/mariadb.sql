@@ -8,14 +8,18 @@ CREATE TABLE IF NOT EXISTS columns (SERVER_NAME VARCHAR(255)
       , TABLE_NAME VARCHAR(255)
       , COLUMN_NAME VARCHAR(255)
       , ORDINAL_POSITION INTEGER
-      , DATA_TYPE VARCHAR(255));
+      , DATA_TYPE VARCHAR(255)
+      , UNIQUE KEY (SERVER_NAME(100), TABLE_CATALOG(64), TABLE_SCHEMA(64), TABLE_NAME(128), COLUMN_NAME(128)));
 
 CREATE TABLE IF NOT EXISTS tables (SERVER_NAME VARCHAR(255)
       , TABLE_CATALOG VARCHAR(255)
       , TABLE_SCHEMA VARCHAR(255)
       , TABLE_NAME VARCHAR(255)
       , N_COLUMNS INTEGER
-      , N_ROWS INTEGER);
+      , N_ROWS INTEGER
+      , SAMPLE_ROWS INTEGER
+      , SAMPLE_ERROR FLOAT
+      , UNIQUE KEY (SERVER_NAME(100), TABLE_CATALOG(64), TABLE_SCHEMA(64), TABLE_NAME(128)));
      
 CREATE TABLE IF NOT EXISTS uniques (SERVER_NAME VARCHAR(255)
       , TABLE_CATALOG VARCHAR(255)
@@ -25,7 +29,9 @@ CREATE TABLE IF NOT EXISTS uniques (SERVER_NAME VARCHAR(255)
       , ORDINAL_POSITION INTEGER
       , DATA_TYPE VARCHAR(255)
       , DISTINCT_VALUES INTEGER
-      , NULL_VALUES INTEGER);
+      , DISTINCT_VALUES_ERROR FLOAT
+      , NULL_VALUES INTEGER
+      , UNIQUE KEY (SERVER_NAME(100), TABLE_CATALOG(64), TABLE_SCHEMA(64), TABLE_NAME(128), COLUMN_NAME(128)));
 
 CREATE TABLE IF NOT EXISTS data_values (SERVER_NAME VARCHAR(255)
       , TABLE_CATALOG VARCHAR(255)
@@ -34,7 +40,8 @@ CREATE TABLE IF NOT EXISTS data_values (SERVER_NAME VARCHAR(255)
       , COLUMN_NAME VARCHAR(255)
       , DATA_VALUE VARCHAR(255)
       , FREQUENCY_NUMBER INTEGER
-      , FREQUENCY_PERCENTAGE FLOAT);
+      , FREQUENCY_PERCENTAGE FLOAT
+      , UNIQUE KEY (SERVER_NAME(100), TABLE_CATALOG(64), TABLE_SCHEMA(64), TABLE_NAME(128), COLUMN_NAME(128), DATA_VALUE(255)));
 
 CREATE TABLE IF NOT EXISTS dates (SERVER_NAME VARCHAR(255)
       , TABLE_CATALOG VARCHAR(255)
@@ -43,7 +50,8 @@ CREATE TABLE IF NOT EXISTS dates (SERVER_NAME VARCHAR(255)
       , COLUMN_NAME VARCHAR(255)
       , DATA_VALUE VARCHAR(255)
       , FREQUENCY_NUMBER INTEGER
-      , FREQUENCY_PERCENTAGE FLOAT);
+      , FREQUENCY_PERCENTAGE FLOAT
+      , UNIQUE KEY (SERVER_NAME(100), TABLE_CATALOG(64), TABLE_SCHEMA(64), TABLE_NAME(128), COLUMN_NAME(128), DATA_VALUE(255)));
 
 CREATE TABLE IF NOT EXISTS stats (SERVER_NAME VARCHAR(255)
       , TABLE_CATALOG VARCHAR(255)
@@ -68,7 +76,39 @@ CREATE TABLE IF NOT EXISTS stats (SERVER_NAME VARCHAR(255)
       , P95 FLOAT
       , P975 FLOAT
       , P99 FLOAT
-      , IQR FLOAT);
+      , IQR FLOAT
+      , UNIQUE KEY (SERVER_NAME(100), TABLE_CATALOG(64), TABLE_SCHEMA(64), TABLE_NAME(128), COLUMN_NAME(128)));
+
+CREATE TABLE IF NOT EXISTS fingerprints (SERVER_NAME VARCHAR(255)
+      , TABLE_CATALOG VARCHAR(255)
+      , TABLE_SCHEMA VARCHAR(255)
+      , TABLE_NAME VARCHAR(255)
+      , STAGE VARCHAR(255)
+      , N_ROWS INTEGER
+      , LAST_MODIFIED VARCHAR(255)
+      , CHECKSUM VARCHAR(255)
+      , UNIQUE KEY (SERVER_NAME(100), TABLE_CATALOG(64), TABLE_SCHEMA(64), TABLE_NAME(128), STAGE(32)));
+
+CREATE TABLE IF NOT EXISTS journal (SERVER_NAME VARCHAR(255)
+      , TABLE_CATALOG VARCHAR(255)
+      , TABLE_SCHEMA VARCHAR(255)
+      , TABLE_NAME VARCHAR(255)
+      , RUN_ID VARCHAR(255)
+      , STAGE VARCHAR(255)
+      , COLUMN_NAME VARCHAR(255));
+
+CREATE TABLE IF NOT EXISTS query_log (SERVER_NAME VARCHAR(255)
+      , TABLE_CATALOG VARCHAR(255)
+      , TABLE_SCHEMA VARCHAR(255)
+      , RUN_ID VARCHAR(255)
+      , TARGET_DATABASE VARCHAR(255)
+      , STAGE VARCHAR(255)
+      , QUERY_TYPE VARCHAR(255)
+      , TABLE_NAME VARCHAR(255)
+      , COLUMN_NAME VARCHAR(255)
+      , STARTED_AT FLOAT
+      , SECONDS FLOAT
+      , N_ROWS INTEGER);
 
 CREATE VIEW servers AS select server_name, table_catalog , table_schema , count(distinct table_name) as n_tables, sum(n_columns) as n_columns, sum(n_rows) as n_rows
 from `tables`
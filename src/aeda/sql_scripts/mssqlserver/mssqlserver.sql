@@ -19,7 +19,9 @@ CREATE TABLE tables (SERVER_NAME NVARCHAR(255)
       , TABLE_SCHEMA NVARCHAR(255)
       , TABLE_NAME NVARCHAR(255)
       , N_COLUMNS INT
-      , N_ROWS INT);
+      , N_ROWS INT
+      , SAMPLE_ROWS INT
+      , SAMPLE_ERROR FLOAT);
 
 CREATE TABLE uniques (SERVER_NAME NVARCHAR(255)
       , TABLE_CATALOG NVARCHAR(255)
@@ -29,6 +31,7 @@ CREATE TABLE uniques (SERVER_NAME NVARCHAR(255)
       , ORDINAL_POSITION INT
       , DATA_TYPE NVARCHAR(255)
       , DISTINCT_VALUES INT
+      , DISTINCT_VALUES_ERROR FLOAT
       , NULL_VALUES INT);
 
 CREATE TABLE data_values (SERVER_NAME NVARCHAR(255)
@@ -75,6 +78,39 @@ CREATE TABLE stats (SERVER_NAME NVARCHAR(255)
       , IQR FLOAT);
 GO
 
+CREATE TABLE fingerprints (SERVER_NAME NVARCHAR(255)
+      , TABLE_CATALOG NVARCHAR(255)
+      , TABLE_SCHEMA NVARCHAR(255)
+      , TABLE_NAME NVARCHAR(255)
+      , STAGE NVARCHAR(255)
+      , N_ROWS INT
+      , LAST_MODIFIED NVARCHAR(255)
+      , CHECKSUM NVARCHAR(255));
+GO
+
+CREATE TABLE journal (SERVER_NAME NVARCHAR(255)
+      , TABLE_CATALOG NVARCHAR(255)
+      , TABLE_SCHEMA NVARCHAR(255)
+      , TABLE_NAME NVARCHAR(255)
+      , RUN_ID NVARCHAR(255)
+      , STAGE NVARCHAR(255)
+      , COLUMN_NAME NVARCHAR(255));
+GO
+
+CREATE TABLE query_log (SERVER_NAME NVARCHAR(255)
+      , TABLE_CATALOG NVARCHAR(255)
+      , TABLE_SCHEMA NVARCHAR(255)
+      , RUN_ID NVARCHAR(255)
+      , TARGET_DATABASE NVARCHAR(255)
+      , STAGE NVARCHAR(255)
+      , QUERY_TYPE NVARCHAR(255)
+      , TABLE_NAME NVARCHAR(255)
+      , COLUMN_NAME NVARCHAR(255)
+      , STARTED_AT FLOAT
+      , SECONDS FLOAT
+      , N_ROWS INT);
+GO
+
 CREATE VIEW servers AS 
 select      server_name
             , table_catalog 
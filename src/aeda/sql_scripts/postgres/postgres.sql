@@ -7,14 +7,18 @@ CREATE TABLE IF NOT EXISTS metadata.public.columns (SERVER_NAME VARCHAR(255)
       , TABLE_NAME VARCHAR(255)
       , COLUMN_NAME VARCHAR(255)
       , ORDINAL_POSITION INTEGER
-      , DATA_TYPE VARCHAR(255));
+      , DATA_TYPE VARCHAR(255)
+      , UNIQUE (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME));
 
 CREATE TABLE IF NOT EXISTS metadata.public.tables (SERVER_NAME VARCHAR(255)
       , TABLE_CATALOG VARCHAR(255)
       , TABLE_SCHEMA VARCHAR(255)
       , TABLE_NAME VARCHAR(255)
       , N_COLUMNS INTEGER
-      , N_ROWS INTEGER);
+      , N_ROWS INTEGER
+      , SAMPLE_ROWS INTEGER
+      , SAMPLE_ERROR FLOAT
+      , UNIQUE (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME));
      
 CREATE TABLE IF NOT EXISTS metadata.public.uniques (SERVER_NAME VARCHAR(255)
       , TABLE_CATALOG VARCHAR(255)
@@ -24,7 +28,9 @@ CREATE TABLE IF NOT EXISTS metadata.public.uniques (SERVER_NAME VARCHAR(255)
       , ORDINAL_POSITION INTEGER
       , DATA_TYPE VARCHAR(255)
       , DISTINCT_VALUES INTEGER
-      , NULL_VALUES INTEGER);
+      , DISTINCT_VALUES_ERROR FLOAT
+      , NULL_VALUES INTEGER
+      , UNIQUE (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME));
 
 CREATE TABLE IF NOT EXISTS metadata.public.data_values (SERVER_NAME VARCHAR(255)
       , TABLE_CATALOG VARCHAR(255)
@@ -33,7 +39,8 @@ CREATE TABLE IF NOT EXISTS metadata.public.data_values (SERVER_NAME VARCHAR(255)
       , COLUMN_NAME VARCHAR(255)
       , DATA_VALUE VARCHAR(255)
       , FREQUENCY_NUMBER INTEGER
-      , FREQUENCY_PERCENTAGE FLOAT);
+      , FREQUENCY_PERCENTAGE FLOAT
+      , UNIQUE (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE));
 
 CREATE TABLE IF NOT EXISTS metadata.public.dates (SERVER_NAME VARCHAR(255)
       , TABLE_CATALOG VARCHAR(255)
@@ -42,7 +49,8 @@ CREATE TABLE IF NOT EXISTS metadata.public.dates (SERVER_NAME VARCHAR(255)
       , COLUMN_NAME VARCHAR(255)
       , DATA_VALUE VARCHAR(255)
       , FREQUENCY_NUMBER INTEGER
-      , FREQUENCY_PERCENTAGE FLOAT);
+      , FREQUENCY_PERCENTAGE FLOAT
+      , UNIQUE (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE));
 
 CREATE TABLE IF NOT EXISTS metadata.public.stats (SERVER_NAME VARCHAR(255)
       , TABLE_CATALOG VARCHAR(255)
@@ -67,7 +75,39 @@ CREATE TABLE IF NOT EXISTS metadata.public.stats (SERVER_NAME VARCHAR(255)
       , P95 FLOAT
       , P975 FLOAT
       , P99 FLOAT
-      , IQR FLOAT);
+      , IQR FLOAT
+      , UNIQUE (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME));
+
+CREATE TABLE IF NOT EXISTS metadata.public.fingerprints (SERVER_NAME VARCHAR(255)
+      , TABLE_CATALOG VARCHAR(255)
+      , TABLE_SCHEMA VARCHAR(255)
+      , TABLE_NAME VARCHAR(255)
+      , STAGE VARCHAR(255)
+      , N_ROWS INTEGER
+      , LAST_MODIFIED VARCHAR(255)
+      , CHECKSUM VARCHAR(255)
+      , UNIQUE (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE));
+
+CREATE TABLE IF NOT EXISTS metadata.public.journal (SERVER_NAME VARCHAR(255)
+      , TABLE_CATALOG VARCHAR(255)
+      , TABLE_SCHEMA VARCHAR(255)
+      , TABLE_NAME VARCHAR(255)
+      , RUN_ID VARCHAR(255)
+      , STAGE VARCHAR(255)
+      , COLUMN_NAME VARCHAR(255));
+
+CREATE TABLE IF NOT EXISTS metadata.public.query_log (SERVER_NAME VARCHAR(255)
+      , TABLE_CATALOG VARCHAR(255)
+      , TABLE_SCHEMA VARCHAR(255)
+      , RUN_ID VARCHAR(255)
+      , TARGET_DATABASE VARCHAR(255)
+      , STAGE VARCHAR(255)
+      , QUERY_TYPE VARCHAR(255)
+      , TABLE_NAME VARCHAR(255)
+      , COLUMN_NAME VARCHAR(255)
+      , STARTED_AT FLOAT
+      , SECONDS FLOAT
+      , N_ROWS INTEGER);
 
 CREATE OR REPLACE VIEW public.servers AS 
 select      server_name
@@ -15,7 +15,9 @@ CREATE TABLE IF NOT EXISTS tables (SERVER_NAME NVARCHAR(255)
       , TABLE_SCHEMA NVARCHAR(255) DEFAULT NULL
       , TABLE_NAME NVARCHAR(255) DEFAULT NULL
       , N_COLUMNS INT DEFAULT NULL
-      , N_ROWS INT DEFAULT NULL);
+      , N_ROWS INT DEFAULT NULL
+      , SAMPLE_ROWS INT DEFAULT NULL
+      , SAMPLE_ERROR FLOAT DEFAULT NULL);
 
 CREATE TABLE IF NOT EXISTS uniques (SERVER_NAME NVARCHAR(255)
       , TABLE_CATALOG NVARCHAR(255) DEFAULT NULL
@@ -25,6 +27,7 @@ CREATE TABLE IF NOT EXISTS uniques (SERVER_NAME NVARCHAR(255)
       , ORDINAL_POSITION INT DEFAULT NULL
       , DATA_TYPE NVARCHAR(255) DEFAULT NULL
       , DISTINCT_VALUES INT DEFAULT NULL
+      , DISTINCT_VALUES_ERROR FLOAT DEFAULT NULL
       , NULL_VALUES INT DEFAULT NULL);
 
 CREATE TABLE IF NOT EXISTS data_values (SERVER_NAME NVARCHAR(255)
@@ -70,6 +73,36 @@ CREATE TABLE IF NOT EXISTS stats (SERVER_NAME NVARCHAR(255)
       , P99 FLOAT DEFAULT NULL
       , IQR FLOAT DEFAULT NULL);
 
+CREATE TABLE IF NOT EXISTS fingerprints (SERVER_NAME NVARCHAR(255)
+      , TABLE_CATALOG NVARCHAR(255) DEFAULT NULL
+      , TABLE_SCHEMA NVARCHAR(255) DEFAULT NULL
+      , TABLE_NAME NVARCHAR(255) DEFAULT NULL
+      , STAGE NVARCHAR(255) DEFAULT NULL
+      , N_ROWS INT DEFAULT NULL
+      , LAST_MODIFIED NVARCHAR(255) DEFAULT NULL
+      , CHECKSUM NVARCHAR(255) DEFAULT NULL);
+
+CREATE TABLE IF NOT EXISTS journal (SERVER_NAME NVARCHAR(255)
+      , TABLE_CATALOG NVARCHAR(255) DEFAULT NULL
+      , TABLE_SCHEMA NVARCHAR(255) DEFAULT NULL
+      , TABLE_NAME NVARCHAR(255) DEFAULT NULL
+      , RUN_ID NVARCHAR(255) DEFAULT NULL
+      , STAGE NVARCHAR(255) DEFAULT NULL
+      , COLUMN_NAME NVARCHAR(255) DEFAULT NULL);
+
+CREATE TABLE IF NOT EXISTS query_log (SERVER_NAME NVARCHAR(255)
+      , TABLE_CATALOG NVARCHAR(255) DEFAULT NULL
+      , TABLE_SCHEMA NVARCHAR(255) DEFAULT NULL
+      , RUN_ID NVARCHAR(255) DEFAULT NULL
+      , TARGET_DATABASE NVARCHAR(255) DEFAULT NULL
+      , STAGE NVARCHAR(255) DEFAULT NULL
+      , QUERY_TYPE NVARCHAR(255) DEFAULT NULL
+      , TABLE_NAME NVARCHAR(255) DEFAULT NULL
+      , COLUMN_NAME NVARCHAR(255) DEFAULT NULL
+      , STARTED_AT FLOAT DEFAULT NULL
+      , SECONDS FLOAT DEFAULT NULL
+      , N_ROWS INT DEFAULT NULL);
+
 
 CREATE VIEW IF NOT EXISTS servers AS 
 select      server_name
@@ -13,6 +13,8 @@ CREATE TABLE IF NOT EXISTS tables (SERVER_NAME TEXT
       , TABLE_NAME TEXT
       , N_COLUMNS INTEGER
       , N_ROWS INTEGER
+      , SAMPLE_ROWS INTEGER
+      , SAMPLE_ERROR FLOAT
       , PRIMARY KEY (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME));
 
 CREATE TABLE IF NOT EXISTS uniques (SERVER_NAME TEXT
@@ -23,6 +25,7 @@ CREATE TABLE IF NOT EXISTS uniques (SERVER_NAME TEXT
       , ORDINAL_POSITION INTEGER
       , DATA_TYPE TEXT
       , DISTINCT_VALUES INTEGER
+      , DISTINCT_VALUES_ERROR FLOAT
       , NULL_VALUES INTEGER
       , PRIMARY KEY (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME));
 
@@ -72,6 +75,47 @@ CREATE TABLE IF NOT EXISTS stats (SERVER_NAME TEXT
       , IQR FLOAT
       , PRIMARY KEY (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME));
 
+CREATE TABLE IF NOT EXISTS fingerprints (SERVER_NAME TEXT
+      , TABLE_CATALOG TEXT
+      , TABLE_SCHEMA TEXT
+      , TABLE_NAME TEXT
+      , STAGE TEXT
+      , N_ROWS INTEGER
+      , LAST_MODIFIED TEXT
+      , CHECKSUM TEXT
+      , PRIMARY KEY (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, STAGE));
+
+CREATE TABLE IF NOT EXISTS journal (SERVER_NAME TEXT
+      , TABLE_CATALOG TEXT
+      , TABLE_SCHEMA TEXT
+      , TABLE_NAME TEXT
+      , RUN_ID TEXT
+      , STAGE TEXT
+      , COLUMN_NAME TEXT
+      , PRIMARY KEY (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, RUN_ID, STAGE, COLUMN_NAME));
+
+CREATE TABLE IF NOT EXISTS query_log (SERVER_NAME TEXT
+      , TABLE_CATALOG TEXT
+      , TABLE_SCHEMA TEXT
+      , RUN_ID TEXT
+      , TARGET_DATABASE TEXT
+      , STAGE TEXT
+      , QUERY_TYPE TEXT
+      , TABLE_NAME TEXT
+      , COLUMN_NAME TEXT
+      , STARTED_AT FLOAT
+      , SECONDS FLOAT
+      , N_ROWS INTEGER);
+
+-- Covering indexes of the lookups of the columns and tables of a schema
+CREATE INDEX IF NOT EXISTS tables_by_rows ON tables (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, N_ROWS, TABLE_NAME);
+
+CREATE INDEX IF NOT EXISTS columns_by_table ON columns (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, DATA_TYPE, COLUMN_NAME, ORDINAL_POSITION);
+
+CREATE INDEX IF NOT EXISTS journal_by_run ON journal (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, RUN_ID, STAGE, TABLE_NAME, COLUMN_NAME);
+
+CREATE INDEX IF NOT EXISTS query_log_by_run ON query_log (RUN_ID);
+
 CREATE VIEW IF NOT EXISTS servers AS 
 select      server_name
             , table_catalog 
@@ -249,7 +249,7 @@ st.title("Automated Exploratory Data Analysis app")
 
 config = _config.get_db_config()
 config_metadata = []
-for section in config.sections():
+for section in config:
     if "metadata_database" in config[section]:
         if config[section]["metadata_database"] == "yes":
             config_metadata.append(section)
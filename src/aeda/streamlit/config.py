@@ -1,44 +1,23 @@
 import sqlite3
-from configparser import ConfigParser
 from pathlib import Path
-from typing import Union
 
+from aeda import utils as _utils
 
 AEDA_DIR = Path(__file__).parent.absolute().parent
 DB_CONNECTIONS = AEDA_DIR / "connection_strings" / "databases.ini"
 
 
-def get_db_config():
-    config = ConfigParser()
-    config.read(DB_CONNECTIONS)
-    return config
+def get_db_config() -> dict:
+    """Returns the sections of the `databases.ini` file by name."""
+    return _utils.CONFIG_REGISTRY.sections(DB_CONNECTIONS)
 
 
 def get_db_connection_string(db_conf: str) -> dict:
-    parser = ConfigParser()
-    filename = DB_CONNECTIONS
-    parser.read(filename)
+    return _utils.get_db_connection_string(db_conf, filename=DB_CONNECTIONS)
 
-    db = {}
-    if parser.has_section(db_conf):
-        params = parser.items(db_conf)
-        for param in params:
-            db[param[0]] = param[1]
-    else:
-        raise Exception(
-            "Section {0} not found in the {1} file".format(db_conf, filename)
-        )
 
-    return db
-
-
-def get_connection_parameters(db_conf: str) -> Union[str, str, str, str]:
-    connection_string = get_db_connection_string(db_conf)
-    db_engine = connection_string["db_engine"]
-    server_name = connection_string["host"]
-    catalog_name = connection_string["catalog"]
-    schema_name = connection_string["schema"]
-    return db_engine, server_name, catalog_name, schema_name
+def get_connection_parameters(db_conf: str) -> tuple[str, str, str, str]:
+    return _utils.get_connection_parameters(db_conf, filename=DB_CONNECTIONS)
 
 
 def get_db_connection(conn_string):
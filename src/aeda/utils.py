@@ -1,6 +1,12 @@
+import io
 import logging
+import re
 import sqlite3
+import threading
+import time
+import uuid
 from configparser import ConfigParser
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Union
 
@@ -8,38 +14,126 @@ import pandas as pd
 from tabulate import tabulate
 from termcolor import colored
 
-from aeda.config import CONFIG_DB, SQL_SCRIPTS
+from aeda import querylog as _querylog
+from aeda.config import (
+    CONFIG_DB,
+    DUCKDB_PAGE_SIZE,
+    POOL_HEALTH_CHECK,
+    POOL_MAX_IDLE,
+    POOL_SIZE,
+    POSTGRES_COPY_MIN_ROWS,
+    POSTGRES_PAGE_SIZE,
+    SQL_CREATE_SCRIPTS,
+    SQL_SCRIPTS,
+    SQLITE_DEFAULTS,
+    SQLITE_METADATA_PRAGMAS,
+    SQLITE_PRAGMAS,
+)
 
 FORMAT = "%(asctime)-15s %(message)s"
 logging.basicConfig(level=logging.INFO, format=FORMAT)
 logger = logging.getLogger(__name__)
 
 
+class ConfigSection(dict):
+    """Read-only section of the `databases.ini` file.
+
+    Behaves like the `dict` returned by `get_db_connection_string` before,
+    but it can't be modified because the same object is shared by every
+    caller. Use `dict(section)` to get a modifiable copy.
+    """
+
+    def __init__(self, name: str, items):
+        super().__init__(items)
+        self.name = name
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"Section {self.name} of the configuration is read-only")
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __ior__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def __reduce__(self):
+        return (ConfigSection, (self.name, dict(self)))
+
+
+def with_defaults(params: dict) -> dict:
+    """Returns the parameters of a section with the `SQLITE_DEFAULTS` of the
+    sqlite3 sections that are left out."""
+    if params.get("db_engine") == "sqlite3":
+        return {**SQLITE_DEFAULTS, **params}
+    return params
+
+
+class ConfigRegistry:
+    """Process-wide cache of parsed configuration files.
+
+    A file is parsed the first time one of its sections is requested and
+    parsed again only when its modification time changes.
+    """
+
+    def __init__(self):
+        self._files: dict = {}
+        self._lock = threading.Lock()
+
+    def sections(self, filename: Path = CONFIG_DB) -> dict[str, ConfigSection]:
+        """Returns the sections of `filename` by name."""
+        path = Path(filename)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        with self._lock:
+            cached = self._files.get(path)
+            if cached is None or cached[0] != mtime:
+                parser = ConfigParser()
+                parser.read(path)
+                sections = {
+                    name: ConfigSection(name, with_defaults(dict(parser.items(name))))
+                    for name in parser.sections()
+                }
+                cached = (mtime, sections)
+                self._files[path] = cached
+        return cached[1]
+
+    def get(self, section: str, filename: Path = CONFIG_DB) -> ConfigSection:
+        """Returns a section of `filename`.
+
+        Raises:
+            Exception: If the section is not in the file.
+        """
+        sections = self.sections(filename)
+        if section not in sections:
+            raise Exception(
+                "Section {0} not found in the {1} file".format(section, filename)
+            )
+        return sections[section]
+
+    def clear(self):
+        with self._lock:
+            self._files.clear()
+
+
+CONFIG_REGISTRY = ConfigRegistry()
+
+
 def get_db_connection_string(db_conf: str, filename: Path = CONFIG_DB) -> dict:
     """get_db_connection_string(db_conf: str, filename: Path = CONFIG_DB) -> dict
 
     Args:
-        db_conf (str): _description_
-        filename (Path, optional): _description_. Defaults to CONFIG_DB.
+        db_conf (str): Section of the configuration file.
+        filename (Path, optional): Configuration file. Defaults to CONFIG_DB.
 
     Returns:
-        dict: _description_
+        dict: Read-only parameters of the section.
     """
-    parser = ConfigParser()
-    # filename = CONFIG_DB
-    parser.read(filename)
-
-    db = {}
-    if parser.has_section(db_conf):
-        params = parser.items(db_conf)
-        for param in params:
-            db[param[0]] = param[1]
-    else:
-        raise Exception(
-            "Section {0} not found in the {1} file".format(db_conf, filename)
-        )
-
-    return db
+    return CONFIG_REGISTRY.get(db_conf, filename=filename)
 
 
 def get_connection_parameters(
@@ -48,11 +142,11 @@ def get_connection_parameters(
     """get_connection_parameters(db_conf: str, filename: Path = CONFIG_DB) -> Union[str, str, str, str]
 
     Args:
-        db_conf (str): _description_
-        filename (Path, optional): _description_. Defaults to CONFIG_DB.
+        db_conf (str): Section of the configuration file.
+        filename (Path, optional): Configuration file. Defaults to CONFIG_DB.
 
     Returns:
-        Union[str, str, str, str]: _description_
+        Union[str, str, str, str]: db_engine, host, catalog and schema.
     """
     connection_string = get_db_connection_string(db_conf, filename=filename)
     db_engine = connection_string["db_engine"]
@@ -145,10 +239,27 @@ def get_db_connection(conn_string: dict):
     elif conn_string["db_engine"] == "sqlite3":
         try:
             dbname = str(conn_string["schema"] + ".db")
-            conn = sqlite3.connect(Path(conn_string["folder"]) / dbname)
+            # Pooled connections can be borrowed from different threads, the
+            # pool guarantees that only one thread uses them at a time.
+            conn = sqlite3.connect(
+                Path(conn_string["folder"]) / dbname, check_same_thread=False
+            )
+            set_sqlite_pragmas(
+                conn, metadata=conn_string.get("metadata_database") == "yes"
+            )
         except:
             logger.error("Database connection error")
             raise
+    elif conn_string["db_engine"] == "duckdb":
+        try:
+            import duckdb
+
+            conn = duckdb.connect(
+                str(Path(conn_string["folder"]) / f"{conn_string['catalog']}.duckdb")
+            )
+        except Exception:
+            logger.error("Database connection error")
+            raise
     elif conn_string["db_engine"] == "snowflake":
         try:
             import snowflake.connector
@@ -192,31 +303,514 @@ def get_db_connection(conn_string: dict):
             logger.error("Database connection error")
             print(e)
             raise
-    return conn
+    # the queries are logged if a `QueryLog` is registered for the section
+    return _querylog.instrument(conn, getattr(conn_string, "name", None))
+
+
+def rollback(conn):
+    """Rolls back the open transaction of `conn`.
+
+    DuckDB connections are in autocommit mode outside `begin transaction`
+    and raise an error if there is no transaction to roll back, which is
+    ignored.
+    """
+    try:
+        conn.rollback()
+    except Exception as e:
+        if "no transaction is active" not in str(e):
+            raise
+
+
+def get_cursor(conn, db_engine: str):
+    """Returns a cursor of `conn`. The cursors of DuckDB are new connections
+    with their own transactions, so its connections are their own cursor."""
+    if db_engine == "duckdb":
+        return conn
+    return conn.cursor()
+
+
+def close_cursor(cursor, conn):
+    """Closes a cursor returned by `get_cursor`, keeping its connection open."""
+    if cursor is not conn:
+        cursor.close()
+
+
+def begin_transaction(cursor, db_engine: str):
+    """Starts a transaction on the engines that are in autocommit mode by
+    default, so the statements that follow are committed together."""
+    if db_engine == "duckdb":
+        cursor.execute("begin transaction;")
+
+
+def set_sqlite_pragmas(conn, metadata: bool = False):
+    """Sets the `SQLITE_PRAGMAS` of a sqlite3 connection, and the
+    `SQLITE_METADATA_PRAGMAS` if it's a connection to a metadata database."""
+    pragmas = dict(SQLITE_PRAGMAS)
+    if metadata:
+        pragmas.update(SQLITE_METADATA_PRAGMAS)
+    for pragma, value in pragmas.items():
+        conn.execute(f"pragma {pragma} = {value};")
+
+
+CREATE_TABLE = re.compile(
+    r"create table (?:if not exists )?(\S+) \((.*)\)", re.IGNORECASE | re.DOTALL
+)
+CREATE_INDEX = re.compile(
+    r"create (?:unique )?index .* on (\S+) \(.*\)", re.IGNORECASE | re.DOTALL
+)
+TABLE_KEY = re.compile(
+    r"(?:primary key|unique(?: key)?) \((.*)\)", re.IGNORECASE | re.DOTALL
+)
+
+
+def split_definitions(text: str) -> list:
+    """Splits the definitions of a `create table` statement on the commas that
+    aren't in parentheses."""
+    definitions, depth, start = [], 0, 0
+    for i, char in enumerate(text):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            definitions.append(text[start:i].strip())
+            start = i + 1
+    definitions.append(text[start:].strip())
+    return definitions
+
+
+def read_create_script(db_engine: str) -> tuple[list, dict]:
+    """Reads the tables and indexes of the create script of `db_engine`.
+
+    Returns:
+        tuple[list, dict]: The `(table_name, statement, columns, key)` of every
+            table, `columns` being the `(column_name, data_type)` of its columns
+            and `key` the columns of its unique key or None, and the
+            statements of the indexes of every table.
+    """
+    with open(SQL_CREATE_SCRIPTS[db_engine], "r") as f:
+        sql_script = f.read()
+    tables, indexes = [], {}
+    for script in sql_script.split(";"):
+        script = "\n".join(
+            line
+            for line in script.splitlines()
+            if line.strip().upper() != "GO" and not line.strip().startswith("--")
+        ).strip()
+        create_index = CREATE_INDEX.fullmatch(script)
+        if create_index is not None:
+            indexes.setdefault(create_index.group(1), []).append(script + ";")
+        create_table = CREATE_TABLE.fullmatch(script)
+        if create_table is None:
+            continue
+        table_name, definitions = create_table.groups()
+        columns, key = [], None
+        for definition in split_definitions(definitions):
+            table_key = TABLE_KEY.fullmatch(definition)
+            if table_key is not None:
+                key = table_key.group(1)
+            else:
+                column_name, data_type = definition.split(maxsplit=1)
+                columns.append((column_name, data_type))
+        tables.append((table_name, script + ";", columns, key))
+    return tables, indexes
+
+
+def upgrade_metadata_database(conn, db_engine: str) -> bool:
+    """Upgrades a metadata database created by an older version of `aeda` to
+    the create script of `db_engine`.
+
+    If a table or a column of the script is missing, the missing tables are
+    created, and the missing columns and the unique keys of the upserts are
+    added to the existing tables. A database that is up to date isn't
+    changed, so it can run on every connection.
+
+    Args:
+        conn (Connection): Connection to the metadata database.
+        db_engine (str): Engine of the metadata database.
+
+    Returns:
+        bool: True if the database was upgraded.
+    """
+    tables, indexes = read_create_script(db_engine)
+    cursor = get_cursor(conn, db_engine)
+    existing_columns = {}
+    for table_name, _, _, _ in tables:
+        try:
+            cursor.execute(
+                SQL_SCRIPTS["get_metadata_columns"][db_engine].format(table_name)
+            )
+            existing_columns[table_name] = {
+                column[0].upper() for column in cursor.description
+            }
+            cursor.fetchall()
+        except Exception:
+            rollback(conn)
+
+    def is_missing(table_name: str, column_name: str) -> bool:
+        return column_name.strip('"`[]').upper() not in existing_columns[table_name]
+
+    if all(
+        table_name in existing_columns
+        and not any(is_missing(table_name, column_name) for column_name, _ in columns)
+        for table_name, _, columns, _ in tables
+    ):
+        close_cursor(cursor, conn)
+        return False
+
+    logger.info(f"Upgrading the {colored(db_engine, 'green')} metadata database")
+    for table_name, statement, columns, key in tables:
+        if table_name not in existing_columns:
+            cursor.execute(statement)
+            for index in indexes.get(table_name, []):
+                cursor.execute(index)
+            continue
+        for column_name, data_type in columns:
+            if is_missing(table_name, column_name):
+                cursor.execute(
+                    SQL_SCRIPTS["add_metadata_column"][db_engine].format(
+                        table_name, column_name, data_type
+                    )
+                )
+        if key is None or db_engine not in SQL_SCRIPTS["add_metadata_key"]:
+            continue
+        short_name = table_name.split(".")[-1]
+        cursor.execute(SQL_SCRIPTS["count_metadata_keys"][db_engine], (short_name,))
+        if cursor.fetchone()[0] == 0:
+            cursor.execute(
+                SQL_SCRIPTS["add_metadata_key"][db_engine].format(
+                    table_name, short_name, key
+                )
+            )
+    conn.commit()
+    close_cursor(cursor, conn)
+    return True
+
+
+INSERT_QUERY = re.compile(
+    r"insert into (\w+) \(([^)]*)\) values \((?:(?:%s|\?), )*(?:%s|\?)\)(.*)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def write_rows(cursor, query: str, rows: list, db_engine: str):
+    """Runs `query` with every row of `rows`.
+
+    On postgres, where `executemany` runs a statement per row, the inserts of
+    at least `POSTGRES_COPY_MIN_ROWS` rows are streamed with `COPY ... FROM
+    STDIN` to a temporary table and inserted from it with the `on conflict`
+    clause of the query, and the smaller ones, or the ones that can't be
+    copied, are sent in pages of `POSTGRES_PAGE_SIZE` rows with
+    `execute_values`. On duckdb the inserts are sent in multi-row inserts of
+    `DUCKDB_PAGE_SIZE` rows.
+
+    Args:
+        cursor (Cursor): Cursor of the metadata database.
+        query (str): Query with a placeholder per column of the rows.
+        rows (list): Rows of the query.
+        db_engine (str): Engine of the database of the cursor.
+    """
+    insert = INSERT_QUERY.fullmatch(query.strip())
+    if db_engine == "duckdb" and insert is not None and len(rows) > 0:
+        table_name, columns, conflict = insert.groups()
+        values = "({})".format(", ".join(["?"] * len(rows[0])))
+        query_type = getattr(query, "query_type", None)
+        for i in range(0, len(rows), DUCKDB_PAGE_SIZE):
+            page = rows[i : i + DUCKDB_PAGE_SIZE]
+            cursor.execute(
+                # logged as `query` in the query log
+                _querylog.Query(
+                    f"insert into {table_name} ({columns}) values "
+                    f"{', '.join([values] * len(page))}{conflict}",
+                    query_type,
+                ),
+                [value for row in page for value in row],
+            )
+        return
+    if db_engine != "postgres" or insert is None:
+        cursor.executemany(query, rows)
+        return
+    table_name, columns, conflict = insert.groups()
+    if len(rows) >= POSTGRES_COPY_MIN_ROWS:
+        cursor.execute("savepoint aeda_copy;")
+        try:
+            copy_rows(cursor, table_name, columns, conflict, rows)
+            cursor.execute("release savepoint aeda_copy;")
+            return
+        except Exception as e:
+            logger.warning(f"Couldn't copy the rows into {table_name}: {e}")
+            cursor.execute("rollback to savepoint aeda_copy;")
+    from psycopg2.extras import execute_values
+
+    execute_values(
+        cursor,
+        f"insert into {table_name} ({columns}) values %s{conflict}",
+        rows,
+        page_size=POSTGRES_PAGE_SIZE,
+    )
+
+
+def copy_rows(cursor, table_name: str, columns: str, conflict: str, rows: list):
+    """Copies `rows` to a temporary table like `table_name` and inserts them
+    into `table_name` with the `conflict` clause."""
+    staging = f"aeda_copy_{table_name}"
+    buffer = io.StringIO()
+    for row in rows:
+        # every value is quoted, so only the unquoted empty values of None
+        # are NULL
+        buffer.write(
+            ",".join(
+                "" if value is None else '"{}"'.format(str(value).replace('"', '""'))
+                for value in row
+            )
+        )
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor.execute(
+        f"create temporary table if not exists {staging} "
+        f"(like {table_name} including defaults);"
+    )
+    cursor.execute(f"truncate {staging};")
+    cursor.copy_expert(
+        f"copy {staging} ({columns}) from stdin with (format csv)", buffer
+    )
+    cursor.execute(
+        f"insert into {table_name} ({columns}) select {columns} from {staging}{conflict}"
+    )
+
+
+def get_streaming_cursor(conn, db_engine: str):
+    """Returns a cursor that keeps the result set on the server and sends it
+    to the client as it is fetched, if the driver of `db_engine` supports it,
+    or a regular cursor otherwise.
+    """
+    if db_engine == "postgres":
+        # Named cursors are server-side cursors in psycopg2.
+        return conn.cursor(name=f"aeda_{uuid.uuid4().hex}")
+    elif db_engine in ["mysql", "aurora"]:
+        import pymysql
+
+        return conn.cursor(pymysql.cursors.SSCursor)
+    elif db_engine == "mariadb":
+        return conn.cursor(buffered=False)
+    return conn.cursor()
+
+
+class ConnectionPool:
+    """Pool of reusable connections to the database of a `databases.ini` section.
+
+    Connections are created on demand up to `size` and returned to the pool
+    after use. Connections idle for more than `max_idle` seconds are closed,
+    and connections idle for more than `health_check` seconds are pinged
+    before being handed out again.
+
+    Args:
+        section (str): Section of the `databases.ini` file.
+        size (int, optional): Maximum number of open connections. Defaults to
+            the `pool_size` parameter of the section or `POOL_SIZE`.
+        max_idle (float, optional): Defaults to POOL_MAX_IDLE.
+        health_check (float, optional): Defaults to POOL_HEALTH_CHECK.
+        filename (Path, optional): Defaults to CONFIG_DB.
+    """
+
+    def __init__(
+        self,
+        section: str,
+        size: Union[int, None] = None,
+        max_idle: float = POOL_MAX_IDLE,
+        health_check: float = POOL_HEALTH_CHECK,
+        filename: Path = CONFIG_DB,
+    ):
+        self.section = section
+        self.conn_string = get_db_connection_string(section, filename=filename)
+        self.size = int(size or self.conn_string.get("pool_size", POOL_SIZE))
+        self.max_idle = max_idle
+        self.health_check = health_check
+        self.opened = 0
+        self.borrowed = 0
+        self._idle: list = []
+        self._in_use = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout: Union[float, None] = None):
+        """Borrows a connection, waiting up to `timeout` seconds if the pool is
+        exhausted."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                self._evict_idle()
+                while not self._idle and self._in_use >= self.size:
+                    remaining = None
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                    if (remaining is not None and remaining <= 0) or not (
+                        self._condition.wait(remaining)
+                    ):
+                        raise TimeoutError(
+                            f"No connection available for {self.section} after {timeout} seconds"
+                        )
+                self._in_use += 1
+                conn, last_used = self._idle.pop() if self._idle else (None, 0.0)
+            if conn is None:
+                try:
+                    conn = get_db_connection(self.conn_string)
+                except Exception:
+                    self._discard(None)
+                    raise
+                with self._condition:
+                    self.opened += 1
+            elif time.monotonic() - last_used >= self.health_check:
+                if not self._is_alive(conn):
+                    self._discard(conn)
+                    continue
+            with self._condition:
+                self.borrowed += 1
+            return conn
+
+    def release(self, conn, discard: bool = False):
+        """Returns a connection to the pool, ending any open transaction."""
+        if not discard:
+            try:
+                rollback(conn)
+            except Exception:
+                discard = True
+        if discard:
+            self._discard(conn)
+            return
+        with self._condition:
+            self._in_use -= 1
+            self._idle.append((conn, time.monotonic()))
+            self._condition.notify()
+
+    def close(self):
+        """Closes all the idle connections of the pool."""
+        with self._condition:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            _close_quietly(conn)
+
+    def _is_alive(self, conn) -> bool:
+        try:
+            cursor = conn.cursor()
+            cursor.execute(SQL_SCRIPTS["ping"][self.conn_string["db_engine"]])
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception:
+            logger.warning(f"Discarding a stale connection to {self.section}")
+            return False
+
+    def _discard(self, conn):
+        if conn is not None:
+            _close_quietly(conn)
+        with self._condition:
+            self._in_use -= 1
+            self._condition.notify()
+
+    def _evict_idle(self):
+        now = time.monotonic()
+        expired = [x for x in self._idle if now - x[1] > self.max_idle]
+        if expired:
+            self._idle = [x for x in self._idle if now - x[1] <= self.max_idle]
+            for conn, _ in expired:
+                _close_quietly(conn)
+
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+_POOLS: dict[str, ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(section: str, size: Union[int, None] = None) -> ConnectionPool:
+    """Returns the connection pool of a `databases.ini` section, creating it
+    the first time it is requested."""
+    with _POOLS_LOCK:
+        if section not in _POOLS:
+            _POOLS[section] = ConnectionPool(section, size=size)
+        elif size is not None and size > _POOLS[section].size:
+            _POOLS[section].size = size
+        return _POOLS[section]
+
+
+@contextmanager
+def pooled_connection(section: str):
+    """Borrows a connection from the pool of `section` for the duration of the
+    `with` block.
+
+    Example:
+        >>> with pooled_connection("my-metadata-database") as conn:
+        ...     cursor = conn.cursor()
+    """
+    pool = get_pool(section)
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+def pool_stats() -> dict:
+    """Returns the number of connections opened and borrowed per section."""
+    with _POOLS_LOCK:
+        return {
+            section: {"opened": pool.opened, "borrowed": pool.borrowed}
+            for section, pool in _POOLS.items()
+        }
+
+
+def close_pools():
+    """Closes every connection pool."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
 
 
 def check_database_connection(conn_string: dict):
     # conn = get_db_connection(conn_string)
-    try:
-        conn = get_db_connection(conn_string)
-        cursor = conn.cursor()
-        if conn_string["db_engine"] == "sqlite3":
-            db_connection_name = f"{conn_string['schema']}.db"
+    if conn_string["db_engine"] == "file":
+        from aeda.files import list_files
+
+        files = list_files(conn_string)
+        if len(files) > 0:
             print(
-                f"[ {colored('OK', 'green')} ]\t{colored(conn_string['db_engine'], 'green', attrs=['bold'])} connection to {colored(db_connection_name, 'green', attrs=['bold'])} established..."
+                f"[ {colored('OK', 'green')} ]\t{colored('file', 'green', attrs=['bold'])} source with {colored(len(files), 'green', attrs=['bold'])} files in {colored(conn_string['path'], 'green', attrs=['bold'])}..."
             )
         else:
-            db_connection_name = f"{conn_string['host']}.{conn_string['catalog']}.{conn_string['schema']}"
             print(
-                f"[ {colored('OK', 'green')} ]\t{colored(conn_string['db_engine'], 'green', attrs=['bold'])} connection to {colored(db_connection_name, 'green', attrs=['bold'])} established..."
+                f"[{colored('Error', 'red')}]\tNo CSV or Parquet files in {conn_string['path']}..."
             )
-
-        cursor.close()
+        return
+    try:
+        conn = get_db_connection(conn_string)
+        cursor = get_cursor(conn, conn_string["db_engine"])
+        close_cursor(cursor, conn)
         conn.close()
-    except:
+    except Exception:
         print(
             f"[{colored('Error', 'red')}]\tCan't establish connection to the metadata database..."
         )
+        return
+    if conn_string["db_engine"] == "sqlite3":
+        db_connection_name = f"{conn_string['schema']}.db"
+    elif conn_string["db_engine"] == "duckdb":
+        db_connection_name = str(
+            Path(conn_string["folder"]) / f"{conn_string['catalog']}.duckdb"
+        )
+    else:
+        db_connection_name = (
+            f"{conn_string['host']}.{conn_string['catalog']}.{conn_string['schema']}"
+        )
+    print(
+        f"[ {colored('OK', 'green')} ]\t{colored(conn_string['db_engine'], 'green', attrs=['bold'])} connection to {colored(db_connection_name, 'green', attrs=['bold'])} established..."
+    )
     return
 
 
@@ -228,18 +822,13 @@ def check_database_connections(conn_string_source, conn_string_metadata):
 
 def list_connections():
     """List all connections in the config file"""
-    parser = ConfigParser()
-    if Path.exists(CONFIG_DB):
-        filename = CONFIG_DB
-    else:
+    if not Path.exists(CONFIG_DB):
         raise FileNotFoundError(f'Config file not found in "{CONFIG_DB}"')
 
-    parser.read(filename)
-
     dfs = []
-    for section in parser.sections():
-        columns = [key for key, value in parser.items(section)]
-        values = [value for key, value in parser.items(section)]
+    for section, params in CONFIG_REGISTRY.sections(CONFIG_DB).items():
+        columns = list(params.keys())
+        values = list(params.values())
         columns.append("section")
         values.append(section)
         df = pd.DataFrame([values], columns=columns)
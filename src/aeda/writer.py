@@ -0,0 +1,144 @@
+import logging
+import queue
+import threading
+import time
+from typing import Union
+
+from aeda import utils as _utils
+from aeda.config import WRITER_BATCH_ROWS, WRITER_BATCH_SECONDS, WRITER_QUEUE_SIZE
+
+FORMAT = "%(asctime)-15s %(message)s"
+logging.basicConfig(level=logging.INFO, format=FORMAT)
+logger = logging.getLogger(__name__)
+
+
+class MetadataWriter:
+    """Write-behind writer of the metadata database.
+
+    The writes are put in a bounded queue and run in order by a dedicated
+    thread with its own connection to the metadata database, so the stages
+    can query the source while the metadata of the previous tables is being
+    written. The thread commits after `batch_rows` rows or `batch_seconds`
+    seconds, whatever comes first, batching the writes of several tables in
+    the same transaction.
+
+    The first error of the thread is raised by the next call to `write`,
+    `flush` or `close`, the writes that follow it are discarded.
+
+    Args:
+        section (str): Section of the `databases.ini` file of the metadata.
+        batch_rows (int, optional): Rows written before a commit. Defaults to
+            `WRITER_BATCH_ROWS`.
+        batch_seconds (float, optional): Seconds before the pending writes
+            are committed. Defaults to `WRITER_BATCH_SECONDS`.
+        queue_size (int, optional): Writes queued before `write` blocks.
+            Defaults to `WRITER_QUEUE_SIZE`.
+    """
+
+    def __init__(
+        self,
+        section: str,
+        batch_rows: int = WRITER_BATCH_ROWS,
+        batch_seconds: float = WRITER_BATCH_SECONDS,
+        queue_size: int = WRITER_QUEUE_SIZE,
+    ):
+        self.section = section
+        self.batch_rows = batch_rows
+        self.batch_seconds = batch_seconds
+        self.rows_written = 0
+        self.commits = 0
+        self.error: Union[BaseException, None] = None
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.db_engine = _utils.get_db_connection_string(section)["db_engine"]
+        self._connection = _utils.get_pool(section).acquire()
+        if self.db_engine == "sqlite3":
+            _utils.set_sqlite_pragmas(self._connection, metadata=True)
+        self._thread = threading.Thread(
+            target=self._run, name="aeda-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, statements: list):
+        """Queues the `(query, rows)` statements to run in the same
+        transaction, blocking while the queue is full."""
+        self._raise_error()
+        self._queue.put(statements)
+
+    def flush(self):
+        """Waits until every queued write is committed."""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        self._raise_error()
+
+    def close(self):
+        """Commits the queued writes, stops the thread and returns its
+        connection to the pool."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+            _utils.get_pool(self.section).release(self._connection)
+        self._raise_error()
+
+    def _raise_error(self):
+        if self.error is not None:
+            raise RuntimeError(
+                f"Couldn't write to the metadata database {self.section}"
+            ) from self.error
+
+    def _run(self):
+        cursor = _utils.get_cursor(self._connection, self.db_engine)
+        pending = 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+            if isinstance(item, list) and self.error is None:
+                try:
+                    if deadline is None:
+                        _utils.begin_transaction(cursor, self.db_engine)
+                    for query, rows in item:
+                        _utils.write_rows(cursor, query, rows, self.db_engine)
+                        pending += len(rows)
+                except BaseException as e:
+                    logger.error(f"Exception: {e} writing to {self.section}")
+                    self.error = e
+                    self._rollback()
+                    pending = 0
+                if deadline is None:
+                    deadline = time.monotonic() + self.batch_seconds
+            if (
+                pending >= self.batch_rows
+                or not isinstance(item, list)
+                or (deadline is not None and time.monotonic() >= deadline)
+            ):
+                # commits when the batch is full, its time is up, or on
+                # `flush` and `close`
+                if deadline is not None and self.error is None:
+                    self._commit()
+                    self.rows_written += pending
+                pending = 0
+                deadline = None
+            if isinstance(item, threading.Event):
+                item.set()
+            if item is None:
+                break
+        _utils.close_cursor(cursor, self._connection)
+
+    def _commit(self):
+        try:
+            self._connection.commit()
+            self.commits += 1
+        except BaseException as e:
+            logger.error(f"Exception: {e} committing to {self.section}")
+            self.error = e
+            self._rollback()
+
+    def _rollback(self):
+        try:
+            _utils.rollback(self._connection)
+        except Exception:
+            pass
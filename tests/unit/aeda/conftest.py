@@ -0,0 +1,54 @@
+import pytest
+
+from aeda import utils
+
+
+@pytest.fixture
+def aeda_config(tmp_path, monkeypatch):
+    """Points `aeda` to a `databases.ini` file with sqlite3 and duckdb
+    sources and metadata databases in `tmp_path`, and a source of the files
+    of `tmp_path / "files"`."""
+    t_filename = tmp_path / "databases.ini"
+    t_filename.write_text(f"""[sqlite-source-test]
+db_engine = sqlite3
+host = localhost
+catalog = main
+schema = source
+folder = {tmp_path}
+
+[sqlite-metadata-test]
+db_engine = sqlite3
+schema = metadata
+folder = {tmp_path}
+metadata_database = yes
+
+[duckdb-source-test]
+db_engine = duckdb
+host = localhost
+catalog = source
+schema = main
+folder = {tmp_path}
+
+[duckdb-metadata-test]
+db_engine = duckdb
+catalog = metadata
+folder = {tmp_path}
+metadata_database = yes
+
+[file-source-test]
+db_engine = file
+host = localhost
+catalog = drops
+schema = files
+path = {tmp_path / "files"}
+""")
+    get_db_connection_string = utils.get_db_connection_string
+    monkeypatch.setattr(
+        utils,
+        "get_db_connection_string",
+        lambda db_conf, filename=None: get_db_connection_string(
+            db_conf, filename=t_filename
+        ),
+    )
+    yield t_filename
+    utils.close_pools()
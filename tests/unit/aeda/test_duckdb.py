@@ -0,0 +1,136 @@
+import random
+from datetime import date
+
+import pytest
+
+from aeda import sql as _sql
+from aeda.session import ProfilingSession
+
+duckdb = pytest.importorskip("duckdb")
+
+METADATA_TABLES = ["uniques", "data_values", "dates", "stats"]
+
+
+@pytest.fixture
+def duckdb_databases(aeda_config, tmp_path):
+    """Creates a duckdb source with a random table and a duckdb metadata
+    database."""
+    rng = random.Random(11)
+    conn = duckdb.connect(str(tmp_path / "source.duckdb"))
+    conn.execute(
+        "create table orders (id integer primary key, amount double, "
+        "price decimal(10, 2), status varchar, ordered_at date);"
+    )
+    conn.executemany(
+        "insert into orders values (?, ?, ?, ?, ?);",
+        [
+            (
+                i,
+                None if rng.random() < 0.1 else round(rng.uniform(0, 100), 2),
+                rng.choice([1.5, 2.25, 10]),
+                rng.choice(["new", "paid", "sent", None]),
+                date(2023, rng.randint(1, 12), rng.randint(1, 28)),
+            )
+            for i in range(500)
+        ],
+    )
+    conn.close()
+    _sql.create_database("duckdb-metadata-test")
+    return tmp_path / "metadata.duckdb"
+
+
+def read_metadata(metadata_db) -> dict:
+    conn = duckdb.connect(str(metadata_db))
+    results = {
+        table_name: conn.execute(
+            f"select * from {table_name} order by 1, 2, 3, 4, 5, 6;"
+        ).fetchall()
+        for table_name in METADATA_TABLES + ["columns", "tables"]
+    }
+    conn.close()
+    return results
+
+
+def test_duckdb_source_and_metadata(duckdb_databases):
+    with ProfilingSession(
+        "duckdb-source-test", "duckdb-metadata-test", with_percentiles=True
+    ) as session:
+        _sql.profile_columns(session)
+        _sql.profile_tables(session)
+        _sql.profile_uniques(session)
+        _sql.profile_data_values(session)
+        _sql.profile_dates(session)
+        _sql.profile_stats(session)
+        primary_key = _sql.get_partition_key(
+            session, "orders", [("ordered_at", 5, "DATE"), ("id", 1, "INTEGER")]
+        )
+    server_side = read_metadata(duckdb_databases)
+
+    with ProfilingSession(
+        "duckdb-source-test",
+        "duckdb-metadata-test",
+        with_percentiles=True,
+        write_behind=True,
+    ) as session:
+        _sql.profile_fused(session, max_rows=1_000_000)
+    client_side = read_metadata(duckdb_databases)
+
+    assert primary_key == "id"
+    assert [row[3:] for row in server_side["columns"]] == [
+        ("orders", "amount", 2, "DOUBLE"),
+        ("orders", "id", 1, "INTEGER"),
+        ("orders", "ordered_at", 5, "DATE"),
+        ("orders", "price", 3, "DECIMAL"),
+        ("orders", "status", 4, "VARCHAR"),
+    ]
+    assert server_side["tables"][0][3:6] == ("orders", 5, 500)
+    assert {row[4] for row in server_side["stats"]} == {"amount", "id", "price"}
+    assert all(row[-1] is not None for row in server_side["stats"])
+    assert len(server_side["dates"]) == 12
+    for table_name in ["uniques", "data_values", "dates"]:
+        assert client_side[table_name] == server_side[table_name]
+    for client_row, server_row in zip(client_side["stats"], server_side["stats"]):
+        assert client_row[:5] == server_row[:5]
+        assert list(client_row[5:]) == pytest.approx(list(server_row[5:]))
+
+
+def test_approx_distinct_is_pushed_down_to_duckdb(duckdb_databases, monkeypatch):
+    with ProfilingSession(
+        "duckdb-source-test", "duckdb-metadata-test", approx_distinct=True
+    ) as session:
+        _sql.profile_columns(session)
+        _sql.profile_tables(session)
+        # the distinct values are counted by duckdb, not streamed to a sketch
+        monkeypatch.setattr(session, "stream_source", None)
+        _sql.profile_uniques(session, max_rows=0)
+    uniques = read_metadata(duckdb_databases)["uniques"]
+
+    assert {row[4]: row[8] for row in uniques} == {
+        column_name: 0.13
+        for column_name in ["amount", "id", "ordered_at", "price", "status"]
+    }
+
+
+def test_session_upgrades_older_databases(aeda_config, tmp_path):
+    conn = duckdb.connect(str(tmp_path / "metadata.duckdb"))
+    conn.execute(
+        "create table tables (SERVER_NAME varchar, TABLE_CATALOG varchar, "
+        "TABLE_SCHEMA varchar, TABLE_NAME varchar, N_COLUMNS integer, "
+        "N_ROWS integer);"
+    )
+    conn.close()
+    conn = duckdb.connect(str(tmp_path / "source.duckdb"))
+    conn.execute("create table orders (id integer);")
+    conn.execute("insert into orders values (1), (2);")
+    conn.close()
+
+    with ProfilingSession("duckdb-source-test", "duckdb-metadata-test") as session:
+        _sql.profile_columns(session)
+        _sql.profile_tables(session)
+        _sql.profile_tables(session)
+
+    conn = duckdb.connect(str(tmp_path / "metadata.duckdb"))
+    assert conn.execute("select * from tables;").fetchall() == [
+        ("localhost", "source", "main", "orders", 1, 2, None, None)
+    ]
+    conn.close()
@@ -0,0 +1,50 @@
+import pytest
+
+from aeda import sql as _sql
+from aeda.exports import ParquetExport, get_export
+from aeda.session import ProfilingSession
+
+TABLE_KEY = ("localhost", "main", "source")
+
+
+def test_get_export(tmp_path):
+    export = get_export(f"parquet:{tmp_path}")
+
+    assert isinstance(export, ParquetExport)
+    assert export.path == tmp_path
+    with pytest.raises(ValueError):
+        get_export("csv:/tmp/metadata")
+
+
+def test_parquet_export_replaces_the_partition_of_the_schema(aeda_config, tmp_path):
+    pytest.importorskip("pyarrow")
+    _sql.create_database("sqlite-metadata-test")
+    export = ParquetExport(tmp_path / "export")
+    with ProfilingSession("sqlite-source-test", "sqlite-metadata-test") as session:
+        session.write(
+            [
+                (
+                    "upsert_into_data_values",
+                    [TABLE_KEY + ("orders", "status", value, 2) for value in "abc"],
+                ),
+                ("upsert_into_tables", [TABLE_KEY + ("orders", 5, 6)]),
+            ]
+        )
+        export.export(session)
+        session.write([("delete_from_data_values", [TABLE_KEY + ("orders", "status")])])
+        export.export(session)
+        tables = export.read("tables").to_pylist()
+
+    assert (
+        export.path
+        / "tables"
+        / "SERVER_NAME=localhost"
+        / "TABLE_CATALOG=main"
+        / "TABLE_SCHEMA=source"
+        / "part-0.parquet"
+    ).exists()
+    assert len(tables) == 1
+    assert tables[0]["TABLE_NAME"] == "orders"
+    assert tables[0]["N_ROWS"] == 6
+    assert tables[0]["TABLE_SCHEMA"] == "source"
+    assert not export.partition("data_values", TABLE_KEY).exists()
@@ -0,0 +1,158 @@
+import random
+import sqlite3
+from datetime import date
+
+import pytest
+
+from aeda import files as _files
+from aeda import sql as _sql
+from aeda.session import ProfilingSession
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+csv = pytest.importorskip("pyarrow.csv")
+
+
+@pytest.fixture
+def file_source(aeda_config, tmp_path):
+    """Writes the same random table as `orders.parquet`, in row groups of 50
+    rows, and as `orders_csv.csv`, and creates the metadata database."""
+    rng = random.Random(7)
+    n_rows = 200
+    table = pa.table(
+        {
+            "id": list(range(n_rows)),
+            "amount": [
+                None if rng.random() < 0.1 else round(rng.uniform(0, 100), 2)
+                for _ in range(n_rows)
+            ],
+            "status": [rng.choice(["new", "paid", "sent"]) for _ in range(n_rows)],
+            "ordered_at": [
+                date(2023, rng.randint(1, 12), rng.randint(1, 28))
+                for _ in range(n_rows)
+            ],
+            "store": [3] * n_rows,
+            "coupon": pa.array([None] * n_rows, pa.int64()),
+        }
+    )
+    folder = tmp_path / "files"
+    folder.mkdir()
+    pq.write_table(table, folder / "orders.parquet", row_group_size=50)
+    csv.write_csv(table, folder / "orders_csv.csv")
+    (folder / "notes.txt").write_text("not a table")
+    _sql.create_database("sqlite-metadata-test")
+    return tmp_path / "metadata.db"
+
+
+def read_table(metadata_db, table_name: str, file_name: str) -> list:
+    conn = sqlite3.connect(metadata_db)
+    rows = conn.execute(
+        f"select * from {table_name} where TABLE_NAME = ? order by 1, 2, 3, 4, 5, 6;",
+        (file_name,),
+    ).fetchall()
+    conn.close()
+    return [row[4:] for row in rows]
+
+
+def test_list_files(file_source, tmp_path):
+    folder = tmp_path / "files"
+
+    assert _files.list_files({"path": str(folder)}) == {
+        "orders": folder / "orders.parquet",
+        "orders_csv": folder / "orders_csv.csv",
+    }
+    assert _files.list_files({"path": str(folder / "*.csv")}) == {
+        "orders_csv": folder / "orders_csv.csv"
+    }
+
+
+def test_tables_reuse_the_schema_of_the_csv_files(file_source, monkeypatch):
+    opened = []
+    open_csv = _files.open_csv
+
+    def recording_open_csv(path, column_names=None):
+        opened.append((path.stem, column_names))
+        return open_csv(path, column_names)
+
+    monkeypatch.setattr(_files, "open_csv", recording_open_csv)
+    with ProfilingSession("file-source-test", "sqlite-metadata-test") as session:
+        _files.profile_tables(session)
+
+    # the schema, and the first column to count the rows
+    assert opened == [("orders_csv", None), ("orders_csv", ["id"])]
+
+
+def test_profile_files(file_source, monkeypatch):
+    decoded = {}
+    stream_file = _files.stream_file
+
+    def recording_stream_file(path, column_names, batch_size):
+        decoded[path.stem] = column_names
+        return stream_file(path, column_names, batch_size)
+
+    monkeypatch.setattr(_files, "stream_file", recording_stream_file)
+    with ProfilingSession(
+        "file-source-test", "sqlite-metadata-test", fetch_size=64
+    ) as session:
+        _files.profile_columns(session)
+        _files.profile_tables(session)
+        _files.profile_files(session)
+
+    conn = sqlite3.connect(file_source)
+    tables = conn.execute(
+        "select TABLE_NAME, N_COLUMNS, N_ROWS from tables order by 1;"
+    ).fetchall()
+    data_types = dict(
+        conn.execute(
+            "select COLUMN_NAME, DATA_TYPE from columns where TABLE_NAME = 'orders';"
+        ).fetchall()
+    )
+    conn.close()
+    assert tables == [("orders", 6, 200), ("orders_csv", 6, 200)]
+    assert data_types == {
+        "id": "bigint",
+        "amount": "float",
+        "status": "varchar",
+        "ordered_at": "date",
+        "store": "bigint",
+        "coupon": "bigint",
+    }
+    # the constant and null columns of the Parquet file are read from its footer
+    assert sorted(decoded["orders"]) == ["amount", "id", "ordered_at", "status"]
+    assert len(decoded["orders_csv"]) == 6
+    for table_name in ["uniques", "data_values", "dates", "stats"]:
+        parquet_rows = read_table(file_source, table_name, "orders")
+        csv_rows = read_table(file_source, table_name, "orders_csv")
+        if table_name == "uniques":
+            # the type of the CSV columns without values is null
+            parquet_rows = [row[:2] + row[3:] for row in parquet_rows]
+            csv_rows = [row[:2] + row[3:] for row in csv_rows]
+        if table_name == "stats":
+            parquet_rows = [row for row in parquet_rows if row[0] != "coupon"]
+        assert len(parquet_rows) > 0
+        assert parquet_rows == csv_rows
+    uniques = {
+        row[0]: (row[3], row[5]) for row in read_table(file_source, "uniques", "orders")
+    }
+    assert uniques["id"] == (200, 0)
+    assert uniques["store"] == (1, 0)
+    assert uniques["coupon"] == (0, 200)
+    stats = {row[0]: row[1:] for row in read_table(file_source, "stats", "orders")}
+    assert stats["store"][3:7] == (600, 3, 3, 0)
+
+
+def test_profile_files_count_nan_as_null(file_source):
+    folder = file_source.parent / "files"
+    amounts = [1.5, float("nan"), None, 2.5, float("nan")] * 10
+    pq.write_table(pa.table({"amount": amounts}), folder / "amounts.parquet")
+    with ProfilingSession("file-source-test", "sqlite-metadata-test") as session:
+        _files.profile_columns(session)
+        _files.profile_tables(session)
+        _files.profile_files(session)
+
+    uniques = read_table(file_source, "uniques", "amounts")
+    assert [(row[3], row[5]) for row in uniques] == [(2, 30)]
+    data_values = read_table(file_source, "data_values", "amounts")
+    assert [row[1:3] for row in data_values] == [("1.5", 10), ("2.5", 10), ("None", 30)]
+    stats = read_table(file_source, "stats", "amounts")
+    assert stats[0][1] == 2.0
@@ -0,0 +1,138 @@
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from aeda import sql as _sql
+from aeda.hooks import ChromeTrace, ProfilingHooks
+from aeda.session import ProfilingSession
+
+
+class RecordedHooks(ProfilingHooks):
+    def __init__(self):
+        self.events = []
+        self.queries = []
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def on_stage_start(self, stage):
+        self.events.append(("stage_start", stage))
+
+    def on_stage_end(self, stage):
+        self.events.append(("stage_end", stage))
+
+    def on_table_start(self, stage, table_name):
+        with self._lock:
+            self.events.append(("table_start", stage, table_name))
+
+    def on_table_end(self, stage, table_name):
+        with self._lock:
+            self.events.append(("table_end", stage, table_name))
+
+    def on_query(self, record, call, start_time, seconds, n_rows):
+        with self._lock:
+            self.queries.append((record.target, record.query_type, call, n_rows))
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def sqlite_databases(aeda_config, tmp_path):
+    """Creates a sqlite3 source with `orders` and `customers` tables and a
+    sqlite3 metadata database."""
+    conn = sqlite3.connect(tmp_path / "source.db")
+    conn.execute("create table orders (id integer, status varchar, amount real);")
+    conn.executemany(
+        "insert into orders values (?, ?, ?);",
+        [(i, ["new", "paid", "sent"][i % 3], i / 4) for i in range(30)],
+    )
+    conn.execute("create table customers (id integer, name varchar);")
+    conn.executemany(
+        "insert into customers values (?, ?);", [(i, f"c{i}") for i in range(10)]
+    )
+    conn.commit()
+    conn.close()
+    _sql.create_database("sqlite-metadata-test")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_hooks_are_called(sqlite_databases, workers):
+    hooks = RecordedHooks()
+    with ProfilingSession(
+        "sqlite-source-test",
+        "sqlite-metadata-test",
+        workers=workers,
+        hooks=[hooks],
+    ) as session:
+        _sql.profile_columns(session)
+        _sql.profile_tables(session)
+        _sql.profile_uniques(session, max_rows=0)
+        _sql.profile_data_values(session, max_rows=0)
+
+    stages = [event for event in hooks.events if event[0].startswith("stage")]
+    assert stages == [
+        ("stage_start", "Columns"),
+        ("stage_end", "Columns"),
+        ("stage_start", "Tables"),
+        ("stage_end", "Tables"),
+        ("stage_start", "Uniques"),
+        ("stage_end", "Uniques"),
+        ("stage_start", "Data values"),
+        ("stage_end", "Data values"),
+    ]
+    start = hooks.events.index(("stage_start", "Data values"))
+    end = hooks.events.index(("stage_end", "Data values"))
+    tables = hooks.events[start + 1 : end]
+    for table_name in ["orders", "customers"]:
+        table_events = [event for event in tables if event[2] == table_name]
+        assert table_events == [
+            ("table_start", "Data values", table_name),
+            ("table_end", "Data values", table_name),
+        ]
+    assert ("source", "get_frequency", "execute", 0) in hooks.queries
+    assert ("source", "get_frequency", "fetch", 3) in hooks.queries
+    assert any(query[0] == "metadata" for query in hooks.queries)
+    assert hooks.closed
+    # without `query_log` the queries aren't written to the metadata
+    _, rows = _sql.get_query_log("sqlite-metadata-test")
+    assert rows == []
+
+
+def test_chrome_trace(sqlite_databases, tmp_path):
+    path = tmp_path / "trace.json"
+    with ProfilingSession(
+        "sqlite-source-test",
+        "sqlite-metadata-test",
+        workers=2,
+        hooks=[ChromeTrace(path)],
+    ) as session:
+        _sql.profile_columns(session)
+        _sql.profile_tables(session)
+        _sql.profile_uniques(session, max_rows=0)
+
+    events = json.loads(path.read_text())["traceEvents"]
+    threads = {event["args"]["name"] for event in events if event["ph"] == "M"}
+    stages = [event for event in events if event.get("cat") == "stage"]
+    tables = [event for event in events if event.get("cat") == "table"]
+    queries = [event for event in events if event["ph"] == "X"]
+
+    assert "MainThread" in threads
+    assert any(name.startswith("aeda") for name in threads)
+    assert [(event["name"], event["ph"]) for event in stages] == [
+        ("Columns", "B"),
+        ("Columns", "E"),
+        ("Tables", "B"),
+        ("Tables", "E"),
+        ("Uniques", "B"),
+        ("Uniques", "E"),
+    ]
+    assert sorted(event["name"] for event in tables if event["ph"] == "B") == [
+        "customers",
+        "orders",
+    ]
+    assert {event["cat"] for event in queries} == {"source", "metadata"}
+    unique_counts = [e for e in queries if e["name"] == "get_unique_counts"]
+    assert {e["args"]["table_name"] for e in unique_counts} == {"customers", "orders"}
+    assert all(event["dur"] >= 0 and event["ts"] >= 0 for event in queries)
@@ -0,0 +1,145 @@
+import datetime
+import statistics
+
+import pytest
+
+from aeda.profiler import (
+    ColumnProfile,
+    Moments,
+    first_day_of_month,
+    profile_chunks,
+    profile_rows,
+    sampling_error,
+)
+
+
+def test_column_profile_counts():
+    profile = ColumnProfile("status").update(["a", "b", "a", None, None])
+
+    assert profile.count_distinct == 2
+    assert profile.count_null == 2
+    assert dict(profile.value_frequencies()) == {None: 2, "a": 2, "b": 1}
+
+
+def test_column_profile_counts_nan_as_null():
+    nan = float("nan")
+    profile = ColumnProfile("amount").update([1.5, nan, float("nan"), None, 2.5])
+
+    assert profile.count_distinct == 2
+    assert profile.count_null == 3
+    assert sorted(profile.value_frequencies(), key=str) == [
+        (1.5, 1),
+        (2.5, 1),
+        (None, 3),
+    ]
+    assert profile.stats()[3:6] == (4.0, 2.5, 1.5)
+
+
+def test_column_profile_drops_the_frequencies_after_max_values():
+    profile = ColumnProfile("id", max_values=5, top_k=2)
+    for chunk in [[1, 1, 1, None], [2, 3, 4, 5], [6, 1, None, 7]]:
+        profile.update(chunk)
+
+    assert profile.truncated
+    assert len(profile.frequencies) == 0
+    assert profile.count_distinct is None
+    assert profile.count_null == 2
+    assert profile.top_values(1) == [(1, 4)]
+
+
+def test_column_profile_merge():
+    values = [3, 1, 4, 1, 5, 9, 2, 6, None, 5, 3, 5]
+    merged = ColumnProfile("x").update(values[:5])
+    merged.merge(ColumnProfile("x").update(values[5:]))
+
+    assert merged.frequencies == ColumnProfile("x").update(values).frequencies
+
+
+def test_column_profile_stats():
+    values = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5]
+    avg_, stdev_, var_, sum_, max_, min_, range_ = (
+        ColumnProfile("x").update(values + [None]).stats()
+    )
+
+    assert avg_ == pytest.approx(statistics.mean(values))
+    assert stdev_ == pytest.approx(statistics.stdev(values))
+    assert var_ == pytest.approx(statistics.variance(values))
+    assert (sum_, max_, min_, range_) == (44, 9, 1, 8)
+    assert ColumnProfile("x").update([None]).stats() == (None,) * 7
+
+
+def test_column_profile_percentiles():
+    percentiles = ColumnProfile("x").update(range(1, 101)).percentiles()
+
+    # p01, p025, p05, p10, q1, q2, q3, p90, p95, p975, p99, iqr
+    assert percentiles == (1, 3, 5, 10, 25, 50, 75, 90, 95, 98, 99, 50)
+
+
+def test_column_profile_month_frequencies():
+    profile = ColumnProfile("created_at").update(
+        ["2023-01-05", "2023-01-31", datetime.date(2023, 2, 1), None, "not a date"]
+    )
+
+    assert dict(profile.month_frequencies()) == {
+        datetime.date(2023, 1, 1): 2,
+        datetime.date(2023, 2, 1): 1,
+        None: 2,
+    }
+    assert first_day_of_month(datetime.datetime(2023, 3, 9, 10)) == datetime.date(
+        2023, 3, 1
+    )
+
+
+def test_profile_rows():
+    profiles = profile_rows([(1, "a"), (2, None)], ["id", "name"])
+
+    assert profiles["id"].count_distinct == 2
+    assert profiles["name"].count_null == 1
+    assert profile_rows([], ["id"])["id"].count_distinct == 0
+
+
+def test_profile_chunks_merges_chunks():
+    rows = [(i % 7, None if i % 5 == 0 else i % 3) for i in range(100)]
+    chunks = [rows[i : i + 30] for i in range(0, len(rows), 30)]
+
+    profiles = profile_chunks(chunks, ["a", "b"])
+    expected = profile_rows(rows, ["a", "b"])
+
+    assert profiles["a"].frequencies == expected["a"].frequencies
+    assert profiles["b"].frequencies == expected["b"].frequencies
+    assert profiles["b"].count_null == 20
+
+
+def test_estimate_distinct_from_sample():
+    profile = ColumnProfile("id").update([1, 2, 3, 3, 4, 4, None])
+
+    assert profile.estimate_distinct() == 4
+    # 2 singletons stand for 2 * sqrt(9) values
+    assert profile.estimate_distinct(scale=9) == 8
+
+
+def test_sampling_error():
+    assert sampling_error(1_000, 1_000) == 0.0
+    assert sampling_error(0, 1_000) == 1.0
+    assert sampling_error(1_000, 10**9) == pytest.approx(0.031, abs=0.001)
+
+
+def test_moments_merge_matches_the_whole_column():
+    values = [1.5, 2, 8, 3, 3, 10.25, -4, 7]
+    expected = ColumnProfile("x").update(values).stats()
+
+    moments = Moments()
+    for part in (values[:1], [], values[1:5], values[5:]):
+        moments.merge(
+            Moments.from_aggregates(
+                len(part),
+                statistics.mean(part) if part else None,
+                statistics.variance(part) if len(part) > 1 else None,
+                sum(part),
+                max(part, default=None),
+                min(part, default=None),
+            )
+        )
+
+    assert moments.n == len(values)
+    assert moments.stats() == pytest.approx(expected)
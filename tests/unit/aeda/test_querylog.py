@@ -0,0 +1,107 @@
+import sqlite3
+
+import pytest
+
+from aeda import querylog as _querylog
+from aeda import sql as _sql
+from aeda.session import ProfilingSession
+
+
+@pytest.fixture
+def sqlite_databases(aeda_config, tmp_path):
+    """Creates a sqlite3 source with an `orders` table and a sqlite3 metadata
+    database."""
+    conn = sqlite3.connect(tmp_path / "source.db")
+    conn.execute("create table orders (id integer, status varchar, amount real);")
+    conn.executemany(
+        "insert into orders values (?, ?, ?);",
+        [(i, ["new", "paid", "sent"][i % 3], i / 4) for i in range(30)],
+    )
+    conn.commit()
+    conn.close()
+    _sql.create_database("sqlite-metadata-test")
+    return tmp_path / "metadata.db"
+
+
+def test_formatted_queries_keep_their_type():
+    query = _querylog.Query('select "{0}" from {1}.{2};', "get_frequency")
+    unquoted = _querylog.Query("select {0} from {1}.{2};", "select_columns")
+
+    formatted = query.format("status", "main", "orders")
+
+    assert formatted == 'select "status" from main.orders;'
+    assert formatted.query_type == "get_frequency"
+    assert formatted.column_name == "status"
+    assert unquoted.format("id, status", "main", "orders").column_name is None
+
+
+@pytest.mark.parametrize("write_behind", [False, True])
+def test_queries_of_the_run_are_logged(sqlite_databases, write_behind):
+    with ProfilingSession(
+        "sqlite-source-test",
+        "sqlite-metadata-test",
+        query_log=True,
+        write_behind=write_behind,
+    ) as session:
+        _sql.profile_columns(session)
+        _sql.profile_tables(session)
+        _sql.profile_uniques(session, max_rows=0)
+        _sql.profile_data_values(session, max_rows=0)
+        run_id = session.run_id
+    with ProfilingSession("sqlite-source-test", "sqlite-metadata-test") as session:
+        # queries of sessions without a query log aren't logged
+        _sql.profile_columns(session)
+
+    logged_run, rows = _sql.get_query_log("sqlite-metadata-test")
+    logged = {(row[0], row[1], row[2], row[3], row[4]): row for row in rows}
+
+    assert logged_run == run_id
+    assert logged["source", "Columns", "columns", None, None][-1] == 3
+    assert ("source", "Uniques", "get_unique_counts", "orders", None) in logged
+    frequency = logged["source", "Data values", "get_frequency", "orders", "status"]
+    assert frequency[-1] == 3
+    assert frequency[-2] > 0
+    assert {row[0] for row in rows} == {"source", "metadata"}
+    assert not any(row[2] == "insert_into_query_log" for row in rows)
+    assert _querylog._LOGS == {}
+
+
+def test_queries_of_the_partitions_are_logged(sqlite_databases):
+    with ProfilingSession(
+        "sqlite-source-test",
+        "sqlite-metadata-test",
+        query_log=True,
+        partitions=3,
+        partition_min_rows=0,
+    ) as session:
+        _sql.profile_columns(session)
+        _sql.profile_tables(session)
+        _sql.profile_partitioned(session)
+
+    _, rows = _sql.get_query_log("sqlite-metadata-test")
+    # the ranges are aggregated on the threads of the partitions
+    partitions = [
+        (row[1], row[3])
+        for row in rows
+        if row[2] in ["select_where", "get_unique_counts"]
+    ]
+
+    assert len(partitions) > 3
+    assert set(partitions) == {("Partitions", "orders")}
+
+
+def test_report_by_stage():
+    rows = [
+        ("source", "Uniques", "get_unique_counts", "orders", None, 0.1, 2.0, 1),
+        ("metadata", "Uniques", "upsert_into_uniques", "orders", None, 2.1, 0.5, 3),
+        ("source", "Columns", "columns", None, None, 0.0, 0.25, 3),
+    ]
+
+    assert _querylog.slowest_queries(rows, 2) == [
+        [2.0, "source", "Uniques", "get_unique_counts", "orders", None, 1],
+        [0.5, "metadata", "Uniques", "upsert_into_uniques", "orders", None, 3],
+    ]
+    assert _querylog.stage_breakdown(rows) == [
+        ["Columns", 1, 0.25, 0.0, 0.25, 3],
+        ["Uniques", 2, 2.0, 0.5, 2.5, 4],
+    ]
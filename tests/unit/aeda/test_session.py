@@ -0,0 +1,96 @@
+import sqlite3
+from configparser import ConfigParser
+
+import pytest
+
+from aeda import sql as _sql
+from aeda import utils
+from aeda.config import CONFIG_DB, SQL_SCRIPTS
+from aeda.session import ProfilingSession, prepare_queries
+
+
+def test_prepare_queries():
+    queries = prepare_queries("sqlite3")
+
+    assert queries["get_tables"] == SQL_SCRIPTS["get_tables"]["sqlite3"]
+    assert all(isinstance(query, str) for query in queries.values())
+
+
+def test_session_keeps_live_cursors(aeda_config):
+    with ProfilingSession("sqlite-source-test", "sqlite-metadata-test") as session:
+        assert session.metadata_engine == "sqlite3"
+        assert session.metadata_cursor is session.metadata_cursor
+        session.metadata_cursor.execute("select 1;")
+
+    with ProfilingSession("sqlite-source-test", "sqlite-metadata-test") as session:
+        session.metadata_cursor.execute("select 1;")
+
+    stats = utils.pool_stats()["sqlite-metadata-test"]
+    assert stats == {"opened": 1, "borrowed": 2}
+
+
+def test_stream_source_in_chunks(aeda_config, tmp_path):
+    conn = sqlite3.connect(tmp_path / "source.db")
+    conn.execute("create table numbers (n integer);")
+    conn.executemany("insert into numbers values (?);", [(i,) for i in range(25)])
+    conn.commit()
+    conn.close()
+
+    with ProfilingSession(
+        "sqlite-source-test", "sqlite-metadata-test", fetch_size=10
+    ) as session:
+        chunks = list(session.stream_source("select n from numbers;"))
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert [row[0] for chunk in chunks for row in chunk] == list(range(25))
+
+
+@pytest.mark.parametrize("write_behind", [False, True])
+def test_journal_is_committed_with_the_metadata(aeda_config, tmp_path, write_behind):
+    _sql.create_database("sqlite-metadata-test")
+    row = ("localhost", "main", "source", "orders", 2, 10)
+
+    with ProfilingSession(
+        "sqlite-source-test", "sqlite-metadata-test", write_behind=write_behind
+    ) as session:
+        with pytest.raises(RuntimeError):
+            with session.transaction():
+                _sql.replace_metadata(session, "tables", [row], [])
+                session.mark_done("Tables", "orders")
+                raise RuntimeError("interrupted")
+        with session.transaction():
+            _sql.replace_metadata(session, "tables", [row], [])
+            session.mark_done("Tables", "customers")
+
+    conn = sqlite3.connect(tmp_path / "metadata.db")
+    journal = conn.execute("select STAGE, TABLE_NAME from journal;").fetchall()
+    tables = conn.execute("select N_ROWS from tables;").fetchall()
+    conn.close()
+    assert journal == [("Tables", "customers")]
+    assert tables == [(10,)]
+
+
+def test_sqlite3_source_from_the_template(aeda_config, tmp_path):
+    template = ConfigParser()
+    template.read(CONFIG_DB.with_name("databases.ini.template"))
+    params = dict(template["<my-sqlite3-metadata-database>"])
+    del params["metadata_database"]
+    params.update(schema="source", folder=str(tmp_path))
+    with open(aeda_config, "a") as f:
+        f.write("\n[sqlite-template-test]\n")
+        f.writelines(f"{key} = {value}\n" for key, value in params.items())
+    conn = sqlite3.connect(tmp_path / "source.db")
+    conn.execute("create table orders (id integer);")
+    conn.close()
+    _sql.create_database("sqlite-metadata-test")
+
+    with ProfilingSession("sqlite-template-test", "sqlite-metadata-test") as session:
+        _sql.profile_columns(session)
+        _sql.profile_tables(session)
+
+    conn = sqlite3.connect(tmp_path / "metadata.db")
+    tables = conn.execute("select * from tables;").fetchall()
+    conn.close()
+    assert [row[:6] for row in tables] == [
+        ("localhost", "main", "source", "orders", 1, 0)
+    ]
@@ -0,0 +1,119 @@
+import bisect
+import random
+from collections import Counter
+
+import pytest
+
+from aeda.sketches import (
+    KLL,
+    HyperLogLog,
+    SpaceSaving,
+    bernoulli_sample,
+    hash_values,
+    reservoir_sample,
+)
+
+
+def test_hash_values_are_stable():
+    assert list(hash_values(["a", 1, None])) == list(hash_values(["a", 1]))
+    assert len(hash_values([None])) == 0
+
+
+@pytest.mark.parametrize("n", [0, 100, 10_000, 200_000])
+def test_hyperloglog_count(n):
+    hll = HyperLogLog(precision=12).update(range(n))
+
+    assert hll.count() == pytest.approx(n, rel=3 * hll.relative_error, abs=1)
+
+
+def test_hyperloglog_merge():
+    a = HyperLogLog(precision=12).update(range(0, 60_000))
+    b = HyperLogLog(precision=12).update(range(30_000, 90_000))
+    union = HyperLogLog(precision=12).update(range(0, 90_000))
+
+    assert a.merge(b).count() == union.count()
+
+
+def test_hyperloglog_precision():
+    assert HyperLogLog(precision=14).relative_error == pytest.approx(0.008125)
+    with pytest.raises(ValueError):
+        HyperLogLog(precision=2)
+    with pytest.raises(ValueError):
+        HyperLogLog(precision=10).merge(HyperLogLog(precision=12))
+
+
+def test_space_saving_is_exact_with_few_values():
+    values = ["a"] * 5 + ["b"] * 3 + [None] * 2
+    top = SpaceSaving(k=3).update(values[:4]).update(values[4:])
+
+    assert top.top() == [("a", 5), ("b", 3), (None, 2)]
+
+
+def test_space_saving_heavy_hitters():
+    rng = random.Random(7)
+    values = [int(rng.paretovariate(1.1)) for _ in range(50_000)]
+    frequencies = Counter(values)
+
+    chunks = [values[i : i + 5_000] for i in range(0, len(values), 5_000)]
+    top = SpaceSaving(k=50).update(chunks[0])
+    for chunk in chunks[1:]:
+        top.merge(SpaceSaving(k=50).update(chunk))
+
+    assert len(top.items()) == 50
+    for value, count, error in top.items():
+        assert count - error <= frequencies[value] <= count
+        assert error <= len(values) / 50
+    assert [value for value, _ in top.top()[:5]] == [
+        value for value, _ in frequencies.most_common(5)
+    ]
+
+
+def test_kll_quantiles():
+    rng = random.Random(3)
+    values = [rng.gauss(0, 1) for _ in range(100_000)]
+    ordered = sorted(values)
+
+    chunks = [values[i : i + 10_000] for i in range(0, len(values), 10_000)]
+    kll = KLL(k=200, seed=1).update(chunks[0])
+    for chunk in chunks[1:]:
+        kll.merge(KLL(k=200, seed=1).update(chunk))
+
+    assert kll.n == len(values)
+    assert len([v for c in kll.compactors for v in c]) < 3 * 200 + 100
+    for q, value in zip(
+        [0.01, 0.25, 0.5, 0.75, 0.99], kll.quantiles([0.01, 0.25, 0.5, 0.75, 0.99])
+    ):
+        assert bisect.bisect_left(ordered, value) / len(values) == pytest.approx(
+            q, abs=1.65 / 200
+        )
+
+
+def test_kll_is_exact_below_k():
+    kll = KLL(k=200).update([5, None, 1, 3, 2, 4])
+
+    assert kll.quantiles([0.0, 0.5, 1.0]) == [1, 3, 5]
+    assert KLL().quantile(0.5) is None
+
+
+def test_reservoir_sample_is_uniform():
+    chunks = [[(i,) for i in range(start, start + 100)] for start in (0, 100, 200)]
+    picks = Counter()
+    for seed in range(2_000):
+        sample = reservoir_sample(chunks, k=10, seed=seed)
+        assert len(sample) == 10
+        picks.update(row[0] // 100 for row in sample)
+
+    # every chunk contributes a third of the sample
+    assert all(
+        count / 20_000 == pytest.approx(1 / 3, abs=0.02) for count in picks.values()
+    )
+    assert len(reservoir_sample(chunks, k=500)) == 300
+
+
+def test_bernoulli_sample():
+    chunks = [
+        [(i,) for i in range(start, start + 1_000)] for start in range(0, 10_000, 1_000)
+    ]
+    sample = [row for rows in bernoulli_sample(chunks, 0.1, seed=1) for row in rows]
+
+    assert len(sample) == pytest.approx(1_000, rel=0.1)
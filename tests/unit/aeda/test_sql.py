@@ -1,5 +1,819 @@
+import random
+import sqlite3
+
+import pytest
+
 from aeda import sql as _sql
+from aeda import utils as _utils
+from aeda.profiler import ColumnProfile
+from aeda.session import ProfilingSession
+
+SOURCE_TABLES = {
+    "customers": [
+        ("id", "integer"),
+        ("name", "varchar"),
+        ("score", "real"),
+        ("created_at", "date"),
+    ],
+    "orders": [
+        ("id", "integer"),
+        ("customer_id", "integer"),
+        ("amount", "real"),
+        ("status", "varchar"),
+        ("ordered_at", "date"),
+    ],
+    "products": [
+        ("id", "integer"),
+        ("category", "varchar"),
+        ("price", "real"),
+    ],
+}
 
 
 def test_create_database(tmp_path):
     pass
+
+
+def test_metadata_lookups_use_covering_indexes(aeda_config):
+    _sql.create_database("sqlite-metadata-test")
+    with ProfilingSession("sqlite-source-test", "sqlite-metadata-test") as session:
+        cursor = session.metadata_cursor
+        plans = {}
+        for query_type in ["get_tables", "get_columns", "get_numeric_columns"]:
+            query = session.metadata_query(query_type).format(0)
+            cursor.execute(
+                f"explain query plan {query}",
+                ("localhost", "main", "source", "orders")[: query.count("?")],
+            )
+            plans[query_type] = cursor.fetchall()[0][-1]
+        journal_mode = cursor.execute("pragma journal_mode;").fetchone()[0]
+
+    assert "COVERING INDEX tables_by_rows" in plans["get_tables"]
+    assert "COVERING INDEX columns_by_table" in plans["get_columns"]
+    assert "COVERING INDEX columns_by_table" in plans["get_numeric_columns"]
+    assert journal_mode == "wal"
+
+
+def test_create_database_upgrades_older_databases(aeda_config, tmp_path):
+    conn = sqlite3.connect(tmp_path / "metadata.db")
+    conn.execute(
+        "create table uniques (SERVER_NAME TEXT, TABLE_CATALOG TEXT, "
+        "TABLE_SCHEMA TEXT, TABLE_NAME TEXT, COLUMN_NAME TEXT, "
+        "ORDINAL_POSITION INTEGER, DATA_TYPE TEXT, DISTINCT_VALUES INTEGER, "
+        "NULL_VALUES INTEGER, PRIMARY KEY (SERVER_NAME, TABLE_CATALOG, "
+        "TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME));"
+    )
+    conn.execute(
+        "create table tables (SERVER_NAME TEXT, TABLE_CATALOG TEXT, "
+        "TABLE_SCHEMA TEXT, TABLE_NAME TEXT, N_COLUMNS INTEGER, N_ROWS INTEGER, "
+        "PRIMARY KEY (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME));"
+    )
+    conn.execute(
+        "insert into uniques values "
+        "('localhost', 'main', 'source', 'orders', 'id', 1, 'integer', 10, 0);"
+    )
+    conn.commit()
+    conn.close()
+
+    _sql.create_database("sqlite-metadata-test")
+
+    conn = sqlite3.connect(tmp_path / "metadata.db")
+    columns = [row[1] for row in conn.execute("pragma table_info(uniques);")]
+    assert "DISTINCT_VALUES_ERROR" in columns
+    assert conn.execute("select * from uniques;").fetchall() == [
+        ("localhost", "main", "source", "orders", "id", 1, "integer", 10, 0, None)
+    ]
+    columns = [row[1] for row in conn.execute("pragma table_info(tables);")]
+    assert columns[-2:] == ["SAMPLE_ROWS", "SAMPLE_ERROR"]
+    assert conn.execute("select count(*) from journal;").fetchone() == (0,)
+    assert not _utils.upgrade_metadata_database(conn, "sqlite3")
+    conn.close()
+
+
+@pytest.fixture
+def sqlite_databases(aeda_config, tmp_path):
+    """Creates a sqlite3 source with random data and a metadata database
+    that already knows its columns and tables."""
+    rng = random.Random(42)
+    conn = sqlite3.connect(tmp_path / "source.db")
+    for table_name, columns in SOURCE_TABLES.items():
+        conn.execute(
+            f"create table {table_name} ({', '.join(f'{c} {t}' for c, t in columns)});"
+        )
+        rows = []
+        for i in range(rng.randint(50, 300)):
+            row = []
+            for column_name, data_type in columns:
+                if column_name == "id":
+                    row.append(i)
+                elif rng.random() < 0.1:
+                    row.append(None)
+                elif data_type == "integer":
+                    row.append(rng.randint(0, 20))
+                elif data_type == "real":
+                    row.append(round(rng.uniform(0, 100), 2))
+                elif data_type == "date":
+                    row.append(
+                        f"2023-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+                    )
+                else:
+                    row.append(rng.choice(["a", "b", "c", "d"]))
+            rows.append(row)
+        conn.executemany(
+            f"insert into {table_name} values ({', '.join('?' * len(columns))});",
+            rows,
+        )
+        conn.commit()
+    conn.close()
+
+    _sql.create_database("sqlite-metadata-test")
+    conn = sqlite3.connect(tmp_path / "metadata.db")
+    for table_name, columns in SOURCE_TABLES.items():
+        conn.executemany(
+            "insert into columns values (?, ?, ?, ?, ?, ?, ?);",
+            [
+                ("localhost", "main", "source", table_name, column_name, i, data_type)
+                for i, (column_name, data_type) in enumerate(columns, start=1)
+            ],
+        )
+        (n_rows,) = (
+            sqlite3.connect(tmp_path / "source.db")
+            .execute(f"select count(*) from {table_name};")
+            .fetchone()
+        )
+        conn.execute(
+            "insert into tables (SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, "
+            "TABLE_NAME, N_COLUMNS, N_ROWS) values (?, ?, ?, ?, ?, ?);",
+            ("localhost", "main", "source", table_name, len(columns), n_rows),
+        )
+    conn.commit()
+    conn.close()
+    return tmp_path / "metadata.db"
+
+
+def profile(
+    metadata_db, workers: int, max_rows: int, write_behind: bool = False
+) -> dict:
+    with ProfilingSession(
+        "sqlite-source-test",
+        "sqlite-metadata-test",
+        workers=workers,
+        write_behind=write_behind,
+    ) as session:
+        _sql.profile_uniques(session, max_rows=max_rows, max_columns=2)
+        _sql.profile_data_values(session, max_rows=max_rows, max_columns=2)
+        _sql.profile_dates(session)
+        _sql.profile_stats(session)
+
+    conn = sqlite3.connect(metadata_db)
+    results = {
+        table_name: conn.execute(
+            f"select * from {table_name} order by 1, 2, 3, 4, 5, 6;"
+        ).fetchall()
+        for table_name in ["uniques", "data_values", "dates", "stats"]
+    }
+    conn.close()
+    return results
+
+
+def assert_same_stats(actual: list, expected: list):
+    assert len(actual) == len(expected)
+    for actual_row, expected_row in zip(actual, expected):
+        assert actual_row[:5] == expected_row[:5]
+        assert list(actual_row[5:]) == pytest.approx(list(expected_row[5:]))
+
+
+@pytest.mark.parametrize("max_rows", [100_000, 0])
+def test_parallel_profiling_matches_serial(sqlite_databases, max_rows):
+    serial = profile(sqlite_databases, workers=1, max_rows=max_rows)
+    parallel = profile(sqlite_databases, workers=4, max_rows=max_rows)
+
+    assert all(len(rows) > 0 for rows in serial.values())
+    assert parallel["uniques"] == serial["uniques"]
+    assert parallel["data_values"] == serial["data_values"]
+    assert parallel["dates"] == serial["dates"]
+    assert_same_stats(parallel["stats"], serial["stats"])
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_write_behind_matches_direct_writes(sqlite_databases, workers):
+    direct = profile(sqlite_databases, workers=1, max_rows=100_000)
+    conn = sqlite3.connect(sqlite_databases)
+    for table_name in ["uniques", "data_values", "dates", "stats", "journal"]:
+        conn.execute(f"delete from {table_name};")
+    conn.commit()
+    conn.close()
+    write_behind = profile(
+        sqlite_databases, workers=workers, max_rows=100_000, write_behind=True
+    )
+
+    assert write_behind["uniques"] == direct["uniques"]
+    assert write_behind["data_values"] == direct["data_values"]
+    assert write_behind["dates"] == direct["dates"]
+    assert_same_stats(write_behind["stats"], direct["stats"])
+
+
+def test_overwrite_replaces_the_metadata(sqlite_databases):
+    first = profile(sqlite_databases, workers=1, max_rows=100_000)
+    with ProfilingSession(
+        "sqlite-source-test", "sqlite-metadata-test", overwrite=True
+    ) as session:
+        _sql.profile_uniques(session)
+        _sql.profile_data_values(session)
+        _sql.profile_dates(session)
+        _sql.profile_stats(session)
+        keys = session.metadata_keys
+
+    conn = sqlite3.connect(sqlite_databases)
+    second = {
+        table_name: conn.execute(
+            f"select * from {table_name} order by 1, 2, 3, 4, 5, 6;"
+        ).fetchall()
+        for table_name in ["uniques", "data_values", "dates", "stats"]
+    }
+    conn.close()
+
+    assert second["uniques"] == first["uniques"]
+    assert second["data_values"] == first["data_values"]
+    assert second["dates"] == first["dates"]
+    assert_same_stats(second["stats"], first["stats"])
+    assert keys["uniques"] == {(table_name,) for table_name in SOURCE_TABLES}
+
+
+def test_existing_stats_are_kept_unless_overwrite_stats(sqlite_databases):
+    profile(sqlite_databases, workers=1, max_rows=100_000)
+    conn = sqlite3.connect(sqlite_databases)
+    conn.execute("update stats set AVG = -1;")
+    conn.commit()
+
+    for overwrite_stats, kept in [(False, True), (True, False)]:
+        with ProfilingSession(
+            "sqlite-source-test",
+            "sqlite-metadata-test",
+            overwrite=True,
+            overwrite_stats=overwrite_stats,
+        ) as session:
+            _sql.profile_stats(session)
+        averages = {row[0] for row in conn.execute("select AVG from stats;")}
+
+        assert (averages == {-1}) is kept
+    conn.close()
+
+
+def test_columns_dropped_from_the_source_are_deleted(sqlite_databases, monkeypatch):
+    column_rows = [
+        ("localhost", "main", "source", table_name, column_name, i, data_type)
+        for table_name, columns in SOURCE_TABLES.items()
+        for i, (column_name, data_type) in enumerate(columns, start=1)
+        if column_name != "score"
+    ] + [("localhost", "main", "source", "orders", "discount", 6, "real")]
+    monkeypatch.setattr(_sql, "get_columns", lambda session: column_rows)
+
+    for overwrite in [False, True]:
+        with ProfilingSession(
+            "sqlite-source-test", "sqlite-metadata-test", overwrite=overwrite
+        ) as session:
+            _sql.profile_columns(session)
+        conn = sqlite3.connect(sqlite_databases)
+        columns = conn.execute(
+            "select TABLE_NAME, COLUMN_NAME from columns;"
+        ).fetchall()
+        conn.close()
+
+        assert ("orders", "discount") in columns
+        assert (("customers", "score") in columns) is not overwrite
+        assert len(columns) == len(column_rows) + (0 if overwrite else 1)
+
+
+def test_upserts_replace_the_row_of_each_key(sqlite_databases):
+    conn = sqlite3.connect(sqlite_databases)
+    conn.execute("update tables set SAMPLE_ROWS = 10, SAMPLE_ERROR = 0.3;")
+    conn.commit()
+
+    with ProfilingSession(
+        "sqlite-source-test", "sqlite-metadata-test", overwrite=True
+    ) as session:
+        for n_rows in [1, 2]:
+            _sql.replace_metadata(
+                session,
+                "tables",
+                [("localhost", "main", "source", "orders", 5, n_rows)],
+            )
+
+    rows = conn.execute(
+        "select N_ROWS, SAMPLE_ROWS, SAMPLE_ERROR from tables "
+        "where TABLE_NAME = 'orders';"
+    ).fetchall()
+    conn.close()
+
+    assert rows == [(2, None, None)]
+
+
+def test_build_unique_counts_query():
+    query = _sql.build_unique_counts_query(
+        "postgres", "public", "orders", ["id", "status"]
+    )
+
+    assert query.count("count(distinct") == 2
+    assert query.count("FROM") == 1
+    assert query.endswith("FROM public.orders")
+
+
+def test_uniques_with_one_scan_per_batch(sqlite_databases, monkeypatch):
+    pandas_path = profile(sqlite_databases, workers=1, max_rows=100_000)
+
+    queries = []
+    build_unique_counts_query = _sql.build_unique_counts_query
+    monkeypatch.setattr(
+        _sql,
+        "build_unique_counts_query",
+        lambda *args, **kwargs: queries.append(args)
+        or build_unique_counts_query(*args, **kwargs),
+    )
+    server_path = profile(sqlite_databases, workers=1, max_rows=0)
+
+    # 12 columns in 3 tables, counted in batches of 2 columns
+    assert len(queries) == 2 + 3 + 2
+    assert server_path["uniques"] == pandas_path["uniques"]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_fused_profiling_matches_stages(sqlite_databases, workers):
+    stages = profile(sqlite_databases, workers=1, max_rows=0)
+
+    with ProfilingSession(
+        "sqlite-source-test", "sqlite-metadata-test", workers=workers
+    ) as session:
+        _sql.profile_fused(session)
+    conn = sqlite3.connect(sqlite_databases)
+    fused = {
+        table_name: conn.execute(
+            f"select * from {table_name} order by 1, 2, 3, 4, 5, 6;"
+        ).fetchall()
+        for table_name in ["uniques", "data_values", "dates", "stats"]
+    }
+    conn.close()
+
+    assert fused["uniques"] == stages["uniques"]
+    assert fused["data_values"] == stages["data_values"]
+    assert fused["dates"] == stages["dates"]
+    assert_same_stats(fused["stats"], stages["stats"])
+
+
+@pytest.mark.parametrize("threshold", [5, 6])
+def test_fused_data_values_threshold_matches_stages(sqlite_databases, threshold):
+    # `status` has 4 distinct values and nulls, 5 values
+    data_values = {}
+    for fused in [False, True]:
+        with ProfilingSession(
+            "sqlite-source-test", "sqlite-metadata-test", threshold=threshold
+        ) as session:
+            if fused:
+                _sql.profile_fused(session)
+            else:
+                _sql.profile_data_values(session, max_rows=100_000)
+        conn = sqlite3.connect(sqlite_databases)
+        data_values[fused] = conn.execute(
+            "select COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER from data_values "
+            "where TABLE_NAME = 'orders' order by 1, 2;"
+        ).fetchall()
+        conn.execute("delete from data_values;")
+        conn.commit()
+        conn.close()
+
+    assert data_values[True] == data_values[False]
+    status = [row for row in data_values[True] if row[0] == "status"]
+    assert len(status) == (0 if threshold == 5 else 5)
+
+
+def test_build_approx_unique_counts_query():
+    query = _sql.build_unique_counts_query(
+        "snowflake", "public", "orders", ["id", "status"], approx=True
+    )
+
+    assert query.count("approx_count_distinct(") == 2
+    assert "count(distinct" not in query
+
+
+def test_approx_distinct_with_sketches(sqlite_databases):
+    exact = profile(sqlite_databases, workers=1, max_rows=0)
+
+    with ProfilingSession(
+        "sqlite-source-test",
+        "sqlite-metadata-test",
+        approx_distinct=True,
+        hll_precision=10,
+    ) as session:
+        _sql.profile_uniques(session, max_rows=0)
+    conn = sqlite3.connect(sqlite_databases)
+    approx = conn.execute(
+        "select TABLE_NAME, COLUMN_NAME, DISTINCT_VALUES, NULL_VALUES, DISTINCT_VALUES_ERROR "
+        "from uniques order by 1, 2;"
+    ).fetchall()
+    conn.close()
+
+    assert all(exact_row[8] == 0.0 for exact_row in exact["uniques"])
+    assert len(approx) == len(exact["uniques"])
+    for exact_row, (table_name, column_name, distinct, nulls, error) in zip(
+        sorted(exact["uniques"], key=lambda row: (row[3], row[4])), approx
+    ):
+        assert (table_name, column_name) == exact_row[3:5]
+        assert nulls == exact_row[9]
+        assert error == pytest.approx(1.04 / 32)
+        assert distinct == pytest.approx(exact_row[7], rel=3 * error)
+
+
+@pytest.mark.parametrize("max_rows", [100_000, 0])
+def test_top_values_of_high_cardinality_columns(sqlite_databases, max_rows):
+    with ProfilingSession(
+        "sqlite-source-test", "sqlite-metadata-test", threshold=10, top_k=25
+    ) as session:
+        _sql.profile_uniques(session, max_rows=max_rows)
+        _sql.profile_data_values(session, max_rows=max_rows)
+
+    conn = sqlite3.connect(sqlite_databases)
+    stored = conn.execute(
+        "select DATA_VALUE, FREQUENCY_NUMBER from data_values "
+        "where TABLE_NAME = 'orders' and COLUMN_NAME = 'customer_id';"
+    ).fetchall()
+    conn.execute(
+        f"attach database '{sqlite_databases.parent / 'source.db'}' as source;"
+    )
+    frequencies = conn.execute(
+        "select coalesce(cast(customer_id as text), 'None'), count(*) "
+        "from source.orders group by customer_id;"
+    ).fetchall()
+    conn.close()
+
+    # `customer_id` has more than 10 distinct values but less than 25, so its
+    # top 25 values are all its values
+    assert len(frequencies) > 10
+    assert sorted(stored) == sorted(frequencies)
+
+
+def test_client_counts_keep_the_frequencies_bounded(sqlite_databases, monkeypatch):
+    sizes = []
+    add = ColumnProfile._add
+
+    def recording_add(self, counts):
+        add(self, counts)
+        sizes.append(len(self.frequencies))
+        return self
+
+    monkeypatch.setattr(ColumnProfile, "_add", recording_add)
+    with ProfilingSession(
+        "sqlite-source-test",
+        "sqlite-metadata-test",
+        threshold=10,
+        top_k=3,
+        fetch_size=16,
+    ) as session:
+        _sql.profile_uniques(session, max_rows=100_000)
+        _sql.profile_data_values(session, max_rows=100_000)
+
+    conn = sqlite3.connect(sqlite_databases)
+    uniques = conn.execute("select * from uniques order by 1, 2, 3, 4, 5;").fetchall()
+    top_values = conn.execute(
+        "select count(*) from data_values "
+        "where TABLE_NAME = 'orders' and COLUMN_NAME = 'id';"
+    ).fetchone()[0]
+    conn.close()
+    with ProfilingSession("sqlite-source-test", "sqlite-metadata-test") as session:
+        _sql.profile_uniques(session, max_rows=0)
+    conn = sqlite3.connect(sqlite_databases)
+    exact = conn.execute("select * from uniques order by 1, 2, 3, 4, 5;").fetchall()
+    conn.close()
+
+    # the key-like columns drop their frequencies at 10 distinct values and
+    # are counted on the source
+    assert len(sizes) > 0
+    assert max(sizes) < 10
+    assert uniques == exact
+    assert 0 < top_values <= 3
+
+
+def test_sketched_percentiles(sqlite_databases):
+    with ProfilingSession(
+        "sqlite-source-test",
+        "sqlite-metadata-test",
+        with_percentiles=True,
+        sketch_percentiles=True,
+        kll_k=1_000,
+    ) as session:
+        _sql.profile_stats(session)
+
+    conn = sqlite3.connect(sqlite_databases)
+    stored = conn.execute(
+        "select P01, P025, P05, P10, Q1, Q2, Q3, P90, P95, P975, P99, IQR "
+        "from stats where TABLE_NAME = 'orders' and COLUMN_NAME = 'amount';"
+    ).fetchone()
+    conn.execute(
+        f"attach database '{sqlite_databases.parent / 'source.db'}' as source;"
+    )
+    values = [row[0] for row in conn.execute("select amount from source.orders;")]
+    conn.close()
+
+    # with less values than `kll_k` the sketch keeps all of them
+    assert stored == ColumnProfile("amount").update(values).percentiles()
+
+
+def test_percentiles_of_a_sqlite_source(sqlite_databases):
+    with ProfilingSession(
+        "sqlite-source-test", "sqlite-metadata-test", with_percentiles=True
+    ) as session:
+        _sql.profile_stats(session)
+
+    conn = sqlite3.connect(sqlite_databases)
+    stored = conn.execute(
+        "select P01, P025, P05, P10, Q1, Q2, Q3, P90, P95, P975, P99, IQR "
+        "from stats where TABLE_NAME = 'orders' and COLUMN_NAME = 'amount';"
+    ).fetchone()
+    conn.execute(
+        f"attach database '{sqlite_databases.parent / 'source.db'}' as source;"
+    )
+    values = [row[0] for row in conn.execute("select amount from source.orders;")]
+    conn.close()
+
+    assert stored == ColumnProfile("amount").update(values).percentiles()
+
+
+def test_columns_and_tables_of_a_sqlite_source(sqlite_databases):
+    conn = sqlite3.connect(sqlite_databases)
+    expected = {
+        "columns": conn.execute("select * from columns order by 4, 6;").fetchall(),
+        "tables": conn.execute(
+            "select TABLE_NAME, N_COLUMNS, N_ROWS from tables order by 1;"
+        ).fetchall(),
+    }
+    conn.execute("delete from columns;")
+    conn.execute("delete from tables;")
+    conn.commit()
+    conn.close()
+
+    with ProfilingSession("sqlite-source-test", "sqlite-metadata-test") as session:
+        _sql.profile_columns(session)
+        _sql.profile_tables(session)
+
+    conn = sqlite3.connect(sqlite_databases)
+    assert conn.execute("select * from columns order by 4, 6;").fetchall() == (
+        expected["columns"]
+    )
+    assert conn.execute(
+        "select TABLE_NAME, N_COLUMNS, N_ROWS from tables order by 1;"
+    ).fetchall() == (expected["tables"])
+    conn.close()
+
+
+def test_sampled_profiling(sqlite_databases):
+    with ProfilingSession(
+        "sqlite-source-test",
+        "sqlite-metadata-test",
+        sample=40,
+        sample_min_rows=0,
+        sample_tables={"products": 0.5},
+    ) as session:
+        remaining = _sql.profile_sampled(session, seed=0)
+
+    assert remaining == []
+    conn = sqlite3.connect(sqlite_databases)
+    tables = {
+        table_name: (n_rows, sample_rows, sample_error)
+        for table_name, n_rows, sample_rows, sample_error in conn.execute(
+            "select TABLE_NAME, N_ROWS, SAMPLE_ROWS, SAMPLE_ERROR from tables;"
+        )
+    }
+    id_values = dict(
+        conn.execute(
+            "select TABLE_NAME, DISTINCT_VALUES from uniques where COLUMN_NAME = 'id';"
+        ).fetchall()
+    )
+    distinct_values_errors = {
+        error for (error,) in conn.execute("select DISTINCT_VALUES_ERROR from uniques;")
+    }
+    status_frequencies = conn.execute(
+        "select sum(FREQUENCY_NUMBER) from data_values "
+        "where TABLE_NAME = 'orders' and COLUMN_NAME = 'status';"
+    ).fetchone()[0]
+    conn.close()
+
+    assert tables["orders"][1] == tables["customers"][1] == 40
+    assert tables["products"][1] == pytest.approx(tables["products"][0] / 2, rel=0.3)
+    assert all(0 < sample_error < 1 for _, _, sample_error in tables.values())
+    # the ids are unique, the estimate is within the ratio error of the sample
+    n_rows, sample_rows, _ = tables["orders"]
+    ratio = (n_rows / sample_rows) ** 0.5
+    assert n_rows / ratio <= id_values["orders"] <= n_rows * ratio
+    assert status_frequencies == pytest.approx(tables["orders"][0], abs=len("abcd"))
+    # the error of the sample is only in `tables`
+    assert distinct_values_errors == {None}
+
+
+def test_sampled_profiling_only_big_tables(sqlite_databases):
+    with ProfilingSession(
+        "sqlite-source-test", "sqlite-metadata-test", sample=0.5
+    ) as session:
+        table_rows = _sql.get_tables_from_metadata(session)
+        remaining = _sql.profile_sampled(session, table_rows=table_rows)
+
+    assert remaining == table_rows
+
+
+def test_incremental_profiling_skips_unchanged_tables(sqlite_databases):
+    def profile_uniques():
+        with ProfilingSession(
+            "sqlite-source-test", "sqlite-metadata-test", incremental=True
+        ) as session:
+            _sql.profile_uniques(session)
+
+    profile_uniques()
+    conn = sqlite3.connect(sqlite_databases)
+    assert conn.execute("select count(*) from fingerprints;").fetchone() == (3,)
+    conn.execute("delete from uniques where TABLE_NAME = 'customers';")
+    # new rows in orders, as counted by `profile_tables`
+    source = sqlite3.connect(sqlite_databases.parent / "source.db")
+    source.execute("insert into orders (id, status) values (1000, 'z');")
+    source.commit()
+    source.close()
+    conn.execute("update tables set N_ROWS = N_ROWS + 1 where TABLE_NAME = 'orders';")
+    conn.commit()
+
+    profile_uniques()
+    profiled = dict(
+        conn.execute(
+            "select TABLE_NAME, DISTINCT_VALUES from uniques where COLUMN_NAME = 'status';"
+        ).fetchall()
+    )
+    conn.close()
+
+    assert "customers" not in profiled
+    assert profiled["orders"] == 5
+
+
+def test_resume_skips_the_work_done(sqlite_databases):
+    with ProfilingSession("sqlite-source-test", "sqlite-metadata-test") as session:
+        _sql.profile_uniques(session)
+        _sql.profile_dates(session)
+        run_id = session.run_id
+
+    conn = sqlite3.connect(sqlite_databases)
+    # the run stopped while profiling the dates of orders, after its only column
+    conn.execute(
+        "delete from journal where STAGE = 'Dates' and TABLE_NAME = 'orders' "
+        "and COLUMN_NAME = '';"
+    )
+    conn.execute("delete from dates where TABLE_NAME = 'orders';")
+    # and before recording the uniques of customers
+    conn.execute(
+        "delete from journal where STAGE = 'Uniques' and TABLE_NAME = 'customers';"
+    )
+    conn.execute("delete from uniques where TABLE_NAME = 'products';")
+    conn.commit()
+
+    with ProfilingSession(
+        "sqlite-source-test", "sqlite-metadata-test", overwrite=False, run_id=run_id
+    ) as session:
+        _sql.profile_uniques(session)
+        _sql.profile_dates(session)
+
+    uniques = dict(
+        conn.execute(
+            "select TABLE_NAME, count(*) from uniques group by TABLE_NAME;"
+        ).fetchall()
+    )
+    dates = dict(
+        conn.execute("select TABLE_NAME, count(*) from dates group by TABLE_NAME;")
+    )
+    journal = conn.execute(
+        "select count(*) from journal where STAGE = 'Dates' and TABLE_NAME = 'orders';"
+    ).fetchone()[0]
+    conn.close()
+
+    assert uniques == {"customers": 4, "orders": 5}
+    assert "orders" not in dates and dates["customers"] > 0
+    assert journal == 2
+
+
+def test_partitioned_profiling_matches_stages(sqlite_databases):
+    staged = profile(sqlite_databases, workers=1, max_rows=100_000)
+
+    with ProfilingSession(
+        "sqlite-source-test",
+        "sqlite-metadata-test",
+        partitions=4,
+        partition_min_rows=0,
+    ) as session:
+        remaining = _sql.profile_partitioned(session)
+
+    assert remaining == []
+    conn = sqlite3.connect(sqlite_databases)
+    partitioned = {
+        table_name: conn.execute(
+            f"select * from {table_name} order by 1, 2, 3, 4, 5, 6;"
+        ).fetchall()
+        for table_name in ["uniques", "data_values", "dates", "stats"]
+    }
+    conn.close()
+    assert partitioned["uniques"] == staged["uniques"]
+    assert partitioned["data_values"] == staged["data_values"]
+    assert partitioned["dates"] == staged["dates"]
+    assert_same_stats(partitioned["stats"], staged["stats"])
+
+
+def test_partitioned_profiling_is_exact_without_sketches(sqlite_databases, monkeypatch):
+    with ProfilingSession(
+        "sqlite-source-test", "sqlite-metadata-test", with_percentiles=True
+    ) as session:
+        _sql.profile_uniques(session, max_rows=0)
+        _sql.profile_stats(session)
+    conn = sqlite3.connect(sqlite_databases)
+    staged = {
+        table_name: conn.execute(
+            f"select * from {table_name} order by 1, 2, 3, 4, 5, 6;"
+        ).fetchall()
+        for table_name in ["uniques", "stats"]
+    }
+    conn.close()
+
+    def stream_source(self, query):
+        raise AssertionError("no rows are streamed without sketches")
+
+    monkeypatch.setattr(ProfilingSession, "stream_source", stream_source)
+    with ProfilingSession(
+        "sqlite-source-test",
+        "sqlite-metadata-test",
+        overwrite_stats=True,
+        with_percentiles=True,
+        threshold=1,
+        partitions=4,
+        partition_min_rows=0,
+    ) as session:
+        _sql.profile_partitioned(session)
+
+    conn = sqlite3.connect(sqlite_databases)
+    partitioned = {
+        table_name: conn.execute(
+            f"select * from {table_name} order by 1, 2, 3, 4, 5, 6;"
+        ).fetchall()
+        for table_name in ["uniques", "stats"]
+    }
+    conn.close()
+    assert partitioned["uniques"] == staged["uniques"]
+    assert_same_stats(partitioned["stats"], staged["stats"])
+
+
+def test_partitioned_profiling_with_sketches(sqlite_databases):
+    with ProfilingSession(
+        "sqlite-source-test",
+        "sqlite-metadata-test",
+        approx_distinct=True,
+        top_k=3,
+        with_percentiles=True,
+        sketch_percentiles=True,
+        threshold=10,
+        partitions=4,
+        partition_min_rows=0,
+    ) as session:
+        _sql.profile_partitioned(session)
+
+    conn = sqlite3.connect(sqlite_databases)
+    uniques = {
+        (table_name, column_name): (distinct_values, error)
+        for table_name, column_name, distinct_values, error in conn.execute(
+            "select TABLE_NAME, COLUMN_NAME, DISTINCT_VALUES, "
+            "DISTINCT_VALUES_ERROR from uniques;"
+        )
+    }
+    top_values = conn.execute(
+        "select count(*) from data_values "
+        "where TABLE_NAME = 'orders' and COLUMN_NAME = 'id';"
+    ).fetchone()[0]
+    (n_rows,) = conn.execute(
+        "select N_ROWS from tables where TABLE_NAME = 'orders';"
+    ).fetchone()
+    medians = conn.execute("select Q2 from stats where Q2 is not null;").fetchall()
+    conn.close()
+
+    # the status is counted, the ids are estimated by merged HyperLogLogs
+    assert uniques[("orders", "status")] == (4, 0.0)
+    distinct_values, error = uniques[("orders", "id")]
+    assert 0 < error < 0.01
+    assert distinct_values == pytest.approx(n_rows, rel=0.05)
+    assert top_values == 3
+    assert len(medians) > 0
+
+
+@pytest.mark.parametrize("key", ["id", "ordered_at"])
+def test_key_ranges_cover_every_row_once(sqlite_databases, key):
+    with ProfilingSession("sqlite-source-test", "sqlite-metadata-test") as session:
+        predicates = _sql.get_key_ranges(session, "main", "orders", key, 5)
+
+    conn = sqlite3.connect(sqlite_databases.parent / "source.db")
+    counts = [
+        conn.execute(f"select count(*) from orders where {predicate};").fetchone()[0]
+        for predicate in predicates
+    ]
+    (n_rows,) = conn.execute("select count(*) from orders;").fetchone()
+    conn.close()
+
+    assert len(predicates) == 6
+    assert sum(counts) == n_rows
@@ -1,3 +1,6 @@
+import csv
+import io
+import os
 from pathlib import Path
 
 import pytest
@@ -49,3 +52,208 @@ def test_get_query(query):
     t_type, t_engine = query
     t_query = utils.get_query(t_type, t_engine)
     assert isinstance(t_query, str)
+
+
+@pytest.fixture
+def sqlite_config(tmp_path):
+    t_filename = tmp_path / "databases.ini"
+    t_filename.write_text(
+        f"[sqlite-test]\ndb_engine = sqlite3\nschema = metadata\nfolder = {tmp_path}\n"
+    )
+    return t_filename
+
+
+def test_connection_pool_reuses_connections(sqlite_config):
+    pool = utils.ConnectionPool("sqlite-test", size=2, filename=sqlite_config)
+
+    conn = pool.acquire()
+    pool.release(conn)
+    conn_again = pool.acquire()
+    pool.release(conn_again)
+
+    assert conn is conn_again
+    assert pool.opened == 1
+    assert pool.borrowed == 2
+    pool.close()
+
+
+def test_connection_pool_size(sqlite_config):
+    pool = utils.ConnectionPool("sqlite-test", size=1, filename=sqlite_config)
+
+    conn = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.01)
+    pool.release(conn)
+
+    assert pool.acquire(timeout=0.01) is conn
+
+
+def test_connection_pool_evicts_idle_connections(sqlite_config):
+    pool = utils.ConnectionPool(
+        "sqlite-test", size=1, max_idle=0, filename=sqlite_config
+    )
+
+    conn = pool.acquire()
+    pool.release(conn)
+    conn_again = pool.acquire()
+
+    assert conn is not conn_again
+    assert pool.opened == 2
+
+
+def test_connection_pool_health_check(sqlite_config):
+    pool = utils.ConnectionPool(
+        "sqlite-test", size=1, health_check=0, filename=sqlite_config
+    )
+
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.close()
+    conn_again = pool.acquire()
+
+    assert conn is not conn_again
+    assert pool.opened == 2
+
+
+def test_config_registry_reloads_on_change(sqlite_config):
+    registry = utils.ConfigRegistry()
+
+    section = registry.get("sqlite-test", filename=sqlite_config)
+    assert registry.get("sqlite-test", filename=sqlite_config) is section
+
+    sqlite_config.write_text(
+        sqlite_config.read_text() + "\n[sqlite-other]\ndb_engine = sqlite3\n"
+    )
+    # Makes sure the modification time changes on coarse grained filesystems
+    mtime = sqlite_config.stat().st_mtime_ns + 1_000_000_000
+    os.utime(sqlite_config, ns=(mtime, mtime))
+
+    assert "sqlite-other" in registry.sections(sqlite_config)
+    assert registry.get("sqlite-test", filename=sqlite_config) is not section
+
+
+def test_config_section_is_read_only(sqlite_config):
+    section = utils.get_db_connection_string("sqlite-test", filename=sqlite_config)
+
+    with pytest.raises(TypeError):
+        section["schema"] = "other"
+    assert section["schema"] == "metadata"
+
+
+@pytest.mark.parametrize("metadata", ["yes", "no"])
+def test_sqlite_pragmas(tmp_path, metadata):
+    conn = utils.get_db_connection(
+        {
+            "db_engine": "sqlite3",
+            "schema": "metadata",
+            "folder": str(tmp_path),
+            "metadata_database": metadata,
+        }
+    )
+
+    journal_mode = conn.execute("pragma journal_mode;").fetchone()[0]
+    synchronous = conn.execute("pragma synchronous;").fetchone()[0]
+    cache_size = conn.execute("pragma cache_size;").fetchone()[0]
+    conn.close()
+
+    assert journal_mode == ("wal" if metadata == "yes" else "delete")
+    assert synchronous == (1 if metadata == "yes" else 2)
+    assert cache_size == -64_000
+
+
+class RecordingCursor:
+    """Cursor that records the statements it runs instead of running them."""
+
+    def __init__(self, fail_copy: bool = False):
+        self.fail_copy = fail_copy
+        self.statements = []
+        self.copied = None
+
+    def execute(self, query, parameters=None):
+        self.statements.append(query)
+
+    def executemany(self, query, rows):
+        self.statements.append(("executemany", query, len(rows)))
+
+    def copy_expert(self, query, buffer):
+        if self.fail_copy:
+            raise PermissionError("permission denied to create temporary tables")
+        self.statements.append(query)
+        self.copied = buffer.read()
+
+
+def test_write_rows_copies_big_postgres_inserts():
+    query = utils.get_query("upsert_into_data_values", "postgres")
+    rows = [("localhost", "main", "source", "t", "c", f"v{i}", i) for i in range(998)]
+    rows += [
+        ("localhost", "main", "source", "t", "c", None, 1),
+        ("localhost", "main", "source", "t", "c", 'a "quoted",\nvalue', 2),
+    ]
+    cursor = RecordingCursor()
+
+    utils.write_rows(cursor, query, rows, "postgres")
+
+    columns = "SERVER_NAME, TABLE_CATALOG, TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_VALUE, FREQUENCY_NUMBER"
+    assert cursor.statements[:3] == [
+        "savepoint aeda_copy;",
+        "create temporary table if not exists aeda_copy_data_values "
+        "(like data_values including defaults);",
+        "truncate aeda_copy_data_values;",
+    ]
+    assert cursor.statements[3] == (
+        f"copy aeda_copy_data_values ({columns}) from stdin with (format csv)"
+    )
+    assert cursor.statements[4].startswith(
+        f"insert into data_values ({columns}) select {columns} "
+        "from aeda_copy_data_values on conflict"
+    )
+    assert cursor.statements[5] == "release savepoint aeda_copy;"
+    copied = list(csv.reader(io.StringIO(cursor.copied)))
+    assert len(copied) == len(rows)
+    assert copied[-2][5] == ""
+    assert copied[-1][5] == 'a "quoted",\nvalue'
+    assert '"localhost","main","source","t","c",,"1"\n' in cursor.copied
+
+
+@pytest.mark.parametrize(
+    "query_type, db_engine",
+    [("upsert_into_data_values", "sqlite3"), ("delete_from_data_values", "postgres")],
+)
+def test_write_rows_with_executemany(query_type, db_engine):
+    query = utils.get_query(query_type, db_engine)
+    cursor = RecordingCursor()
+
+    utils.write_rows(cursor, query, [("localhost",)] * 1_000, db_engine)
+
+    assert cursor.statements == [("executemany", query, 1_000)]
+
+
+def test_write_rows_falls_back_to_execute_values(monkeypatch):
+    extras = pytest.importorskip("psycopg2.extras")
+    pages = []
+    monkeypatch.setattr(
+        extras,
+        "execute_values",
+        lambda cursor, query, rows, page_size: pages.append(query),
+    )
+    query = utils.get_query("upsert_into_columns", "postgres")
+    row = ("localhost", "main", "source", "t", "c", 1, "integer")
+    cursor = RecordingCursor(fail_copy=True)
+
+    utils.write_rows(cursor, query, [row] * 10, "postgres")
+    utils.write_rows(cursor, query, [row] * 1_000, "postgres")
+
+    assert len(pages) == 2
+    assert all(" values %s on conflict " in page for page in pages)
+    assert "rollback to savepoint aeda_copy;" in cursor.statements
+
+
+@pytest.mark.parametrize("section", ["duckdb-metadata-test", "sqlite-metadata-test"])
+def test_check_database_connection(aeda_config, section, capsys):
+    if section.startswith("duckdb"):
+        pytest.importorskip("duckdb")
+    utils.check_database_connection(utils.get_db_connection_string(section))
+
+    output = capsys.readouterr().out
+    assert "OK" in output
+    assert "Error" not in output
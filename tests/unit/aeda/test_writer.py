@@ -0,0 +1,68 @@
+import sqlite3
+
+import pytest
+
+from aeda import sql as _sql
+from aeda.config import SQL_SCRIPTS
+from aeda.writer import MetadataWriter
+
+UPSERT_INTO_TABLES = SQL_SCRIPTS["upsert_into_tables"]["sqlite3"]
+
+
+def table_rows(n: int) -> list:
+    return [("localhost", "main", "source", f"table_{i}", 1, i) for i in range(n)]
+
+
+def count_tables(metadata_db) -> int:
+    conn = sqlite3.connect(metadata_db)
+    (n,) = conn.execute("select count(*) from tables;").fetchone()
+    conn.close()
+    return n
+
+
+@pytest.fixture
+def metadata_db(aeda_config, tmp_path):
+    _sql.create_database("sqlite-metadata-test")
+    return tmp_path / "metadata.db"
+
+
+def test_writer_commits_in_batches(metadata_db):
+    writer = MetadataWriter("sqlite-metadata-test", batch_rows=10, batch_seconds=60)
+    for chunk in _sql.get_chunks(table_rows(25), 5):
+        writer.write([(UPSERT_INTO_TABLES, chunk)])
+    writer.flush()
+
+    assert count_tables(metadata_db) == 25
+    assert writer.rows_written == 25
+    assert writer.commits == 3
+    writer.close()
+
+
+def test_writer_commits_on_close(metadata_db):
+    writer = MetadataWriter("sqlite-metadata-test", batch_seconds=60)
+    writer.write([(UPSERT_INTO_TABLES, table_rows(5))])
+    writer.close()
+
+    assert count_tables(metadata_db) == 5
+    assert writer.commits == 1
+
+
+def test_writer_raises_the_errors_of_its_thread(metadata_db):
+    writer = MetadataWriter("sqlite-metadata-test", batch_seconds=60)
+    writer.write([(UPSERT_INTO_TABLES, table_rows(5))])
+    writer.flush()
+    writer.write(
+        [
+            (UPSERT_INTO_TABLES, table_rows(10)),
+            ("insert into missing values (?);", [(1,)]),
+        ]
+    )
+
+    with pytest.raises(RuntimeError, match="sqlite-metadata-test"):
+        writer.flush()
+    with pytest.raises(RuntimeError):
+        writer.write([(UPSERT_INTO_TABLES, table_rows(20))])
+    with pytest.raises(RuntimeError) as error:
+        writer.close()
+    assert isinstance(error.value.__cause__, sqlite3.OperationalError)
+    assert count_tables(metadata_db) == 5